@@ -47,6 +47,84 @@ class Settings(BaseSettings):
     # OpenAI
     openai_api_key: str = ""
 
+    # Video processing
+    # "auto" picks seek or linear decode per video (see VideoProcessor.extract_frames)
+    frame_extraction_mode: Literal["auto", "seek", "linear"] = "auto"
+    # Typical keyframe spacing of phone H.264 encoders, used to cost seeks
+    video_keyframe_interval_seconds: float = 2.0
+    # Pose engine worker processes (0 = one per CPU core) and frames per batch
+    pose_workers: int = 0
+    pose_batch_size: int = 4
+    # "sparse" estimates 12 sampled frames, "tracking" tracks every frame
+    pose_mode: Literal["sparse", "tracking"] = "sparse"
+    # Frames are downscaled to this longest side before pose inference (0 = off)
+    pose_input_max_side: int = 640
+    # Dense pose sampling rate (0 = every frame at native fps)
+    pose_target_fps: float = 0.0
+    # Tracking mode re-runs person detection when torso visibility drops below this
+    pose_redetect_confidence: float = 0.5
+    # Dense extraction crops to the subject, padded by this fraction of its size
+    pose_roi_enabled: bool = True
+    pose_roi_padding: float = 0.25
+    # Landmark smoothing before stamp detection ("savgol" is batch only)
+    stamp_smoothing: Literal["one_euro", "savgol", "none"] = "one_euro"
+    stamp_one_euro_min_cutoff: float = 1.0
+    stamp_one_euro_beta: float = 10.0
+    stamp_savgol_window: int = 9
+    stamp_savgol_polyorder: int = 2
+    # Bounded executor for CPU-bound analysis work (see analysis_executor)
+    analysis_executor_workers: int = 2
+    analysis_executor_queue_size: int = 2
+    analysis_executor_retry_after_seconds: int = 30
+    # Admission control for POST /analysis/run (see admission_controller):
+    # analyses running per process, requests waiting for a slot, analyses
+    # one user may have running or waiting, and the longest wait; beyond
+    # these requests get 429 with Retry-After
+    run_admission_max_concurrent: int = 2
+    run_admission_max_queued: int = 4
+    run_admission_max_per_user: int = 1
+    run_admission_queue_timeout_seconds: float = 30.0
+    run_admission_retry_after_seconds: int = 30
+    # Background analysis jobs (see job_queue); "memory" is for tests only,
+    # as the worker runs in a separate process
+    job_queue_backend: Literal["redis", "memory"] = "redis"
+    job_queue_name: str = "analysis"
+    # A reserved job is redelivered if not acked or extended within this time
+    job_visibility_timeout_seconds: float = 120.0
+    job_max_attempts: int = 3
+    # Retry delay doubles per attempt from this base
+    job_retry_backoff_seconds: float = 5.0
+    # Job scheduling (see job_scheduler): waiting this long promotes a job's
+    # priority class one level; fair-share weights of guests and signed-in users
+    scheduler_aging_seconds: float = 120.0
+    scheduler_guest_weight: float = 1.0
+    scheduler_user_weight: float = 2.0
+    # Progress events for WebSocket/SSE clients (see progress_broker);
+    # "memory" only reaches clients of the publishing process (tests)
+    progress_backend: Literal["redis", "memory"] = "redis"
+    # Idle streams send a keepalive this often (also bounds how long a
+    # closed WebSocket keeps its subscription)
+    progress_keepalive_seconds: float = 15.0
+    # Fine-grained progress within a stage (see progress_sink) is written to
+    # the analysis row at most this often; stage transitions always are
+    progress_persist_interval_seconds: float = 5.0
+    # Status payloads served to pollers (see status_cache); entries are
+    # invalidated on every write and expire after the TTL regardless
+    status_cache_backend: Literal["redis", "memory"] = "redis"
+    status_cache_ttl_seconds: float = 300.0
+    # Processing-time estimates (see eta_estimator): weight of each completed
+    # analysis in the per-stage moving averages, and how often a process
+    # reloads the averages and queue depth
+    eta_backend: Literal["redis", "memory"] = "redis"
+    eta_smoothing: float = 0.1
+    eta_refresh_seconds: float = 30.0
+    # Worker (python -m api.worker): concurrent jobs and idle poll interval
+    worker_concurrency: int = 1
+    worker_poll_interval_seconds: float = 1.0
+    # Workers serve GET /metrics on this port (0 = disabled); the API serves
+    # it on its own port
+    worker_metrics_port: int = 9100
+
     @property
     def is_production(self) -> bool:
         """Check if running in production."""
@@ -5,12 +5,18 @@ PunchAnalytics Backend API
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from api.config import get_settings
 from api.routers import auth, body_specs, dashboard, processing, reports, sharing, subject, upload
+from api.services.analysis_executor import analysis_executor
 from api.services.database import init_db, close_db
+from api.services.job_queue import analysis_job_queue
+from api.services.metrics import CONTENT_TYPE, MetricsMiddleware, metrics
+from api.services.pose_engine import pose_engine
+from api.services.progress_broker import progress_broker
+from api.services.status_cache import status_cache
 from api.services.state_store import close_redis
 
 
@@ -32,7 +38,12 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
 
     # Shutdown: close connections
     await close_db()
+    await progress_broker.close()
+    await status_cache.close()
+    # One Redis client serves the queue, broker, cache and estimator
     await close_redis()
+    analysis_executor.shutdown()
+    pose_engine.shutdown()
 
 
 def create_app() -> FastAPI:
@@ -61,6 +72,9 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
         expose_headers=["*"],
     )
+    # Request metrics, served by /metrics below
+    app.add_middleware(MetricsMiddleware)
+    metrics.add_collector(analysis_job_queue.export_metrics)
 
     # Include routers
     app.include_router(auth.router, prefix="/api/v1")
@@ -68,6 +82,7 @@ def create_app() -> FastAPI:
     app.include_router(subject.router, prefix="/api/v1")
     app.include_router(body_specs.router, prefix="/api/v1")
     app.include_router(processing.router, prefix="/api/v1")
+    app.include_router(processing.ws_router)
     app.include_router(reports.router, prefix="/api/v1")
     app.include_router(dashboard.router, prefix="/api/v1")
     app.include_router(dashboard.reports_router, prefix="/api/v1")
@@ -80,6 +95,12 @@ def create_app() -> FastAPI:
         """Health check endpoint for load balancer."""
         return {"status": "healthy", "version": "0.1.0"}
 
+    # Prometheus scrape endpoint (see services/metrics.py)
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        """Metrics of this process in the Prometheus text format."""
+        return Response(await metrics.exposition(), media_type=CONTENT_TYPE)
+
     return app
 
 
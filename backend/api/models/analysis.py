@@ -134,6 +134,14 @@ class Analysis(Base):
     frames_processed: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     frames_failed: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
+    # Stamp counters, written together with the stamps (F006). NULL on
+    # analyses stamped before counters existed; readers fall back to GROUP BY.
+    stamp_total: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    stamp_counts: Mapped[Optional[dict]] = mapped_column(
+        JSON, nullable=True
+    )  # {action_type: count}
+    stamp_avg_confidence: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
     # Worker tracking
     worker_id: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
 
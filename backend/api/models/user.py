@@ -3,7 +3,7 @@ from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
 
-from sqlalchemy import String, SmallInteger, DateTime, Index
+from sqlalchemy import String, SmallInteger, Integer, DateTime, Index
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -35,6 +35,13 @@ class User(Base):
     experience_level: Mapped[Optional[str]] = mapped_column(String(20))
     stance: Mapped[Optional[str]] = mapped_column(String(10))
 
+    # Non-deleted report count for the dashboard total: 0 when the user is
+    # created, then adjusted on every report create / soft delete / restore
+    # (see dashboard_service.adjust_report_count)
+    report_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+
     # Timestamps
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
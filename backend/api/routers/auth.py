@@ -143,14 +143,8 @@ async def get_current_user_or_guest(
     token = authorization[7:]  # Remove "Bearer " prefix
 
     # Verify JWT token (works for both regular and guest users)
-    oauth_service = OAuthService(settings)
     try:
-        payload = oauth_service.verify_access_token(token)
-        return {
-            "id": payload["sub"],
-            "email": payload["email"],
-            "is_guest": payload["email"].endswith("@guest.punchanalytics.app"),
-        }
+        return user_from_access_token(token, settings)
     except ValueError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -159,6 +153,41 @@ async def get_current_user_or_guest(
         )
 
 
+async def get_stream_user(
+    authorization: Annotated[Optional[str], Header()] = None,
+    token: Annotated[Optional[str], Query()] = None,
+    settings: Settings = Depends(get_settings),
+) -> dict:
+    """Dependency for streaming endpoints: Bearer header or ?token= query.
+
+    Browser EventSource and WebSocket clients cannot set headers, so the
+    access token may be passed as a query parameter instead.
+    """
+    if token is None:
+        return await get_current_user_or_guest(authorization, settings)
+    try:
+        return user_from_access_token(token, settings)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired token",
+        )
+
+
+def user_from_access_token(token: str, settings: Settings) -> dict:
+    """Current user (including guest users) of an access token.
+
+    Raises:
+        ValueError: If token is invalid or expired.
+    """
+    payload = OAuthService(settings).verify_access_token(token)
+    return {
+        "id": payload["sub"],
+        "email": payload["email"],
+        "is_guest": payload["email"].endswith("@guest.punchanalytics.app"),
+    }
+
+
 # === Kakao OAuth ===
 
 
@@ -3,7 +3,7 @@
 @feature F010 - Report History Dashboard
 
 Implements:
-- GET /api/v1/dashboard/reports - List user's reports (paginated)
+- GET /api/v1/dashboard/reports - List user's reports (cursor paginated)
 - DELETE /api/v1/reports/{report_id} - Soft delete report
 - POST /api/v1/reports/{report_id}/restore - Restore deleted report (undo)
 
@@ -14,7 +14,7 @@ Acceptance Criteria:
 - AC-059: Delete report shows confirmation dialog
 - AC-060: Empty state shows upload CTA
 """
-from typing import Annotated
+from typing import Annotated, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
@@ -26,6 +26,7 @@ from api.schemas.dashboard import (
     RestoreReportResponse,
 )
 from api.services.dashboard_service import (
+    InvalidCursorError,
     ReportNotFoundError,
     ReportOwnershipError,
     RestoreWindowExpiredError,
@@ -42,13 +43,17 @@ reports_router = APIRouter(prefix="/reports", tags=["reports"])
     "/reports",
     response_model=ReportListResponse,
     responses={
+        400: {"description": "Invalid pagination cursor"},
         401: {"description": "Not authenticated"},
     },
 )
 async def list_reports(
     current_user: Annotated[dict, Depends(get_current_user_or_guest)],
-    page: Annotated[int, Query(ge=1, description="Page number")] = 1,
+    page: Annotated[int, Query(ge=1, description="Page number (ignored with cursor)")] = 1,
     limit: Annotated[int, Query(ge=1, le=50, description="Items per page")] = 10,
+    cursor: Annotated[
+        Optional[str], Query(description="next_cursor from the previous page")
+    ] = None,
 ):
     """List user's analysis reports for dashboard.
 
@@ -56,16 +61,24 @@ async def list_reports(
     AC-057: Each item includes thumbnail, date, and summary indicator (key moments count)
     AC-060: Returns empty list for new users (frontend handles empty state display)
 
-    The response supports pagination for users with many reports.
+    Pass next_cursor back as cursor to load the next page; page-based
+    offset pagination is still accepted for older clients.
     """
     user_id = UUID(current_user["id"])
 
-    async with get_db_session() as session:
-        result = await dashboard_service.list_user_reports(
-            session=session,
-            user_id=user_id,
-            page=page,
-            limit=limit,
+    try:
+        async with get_db_session() as session:
+            result = await dashboard_service.list_user_reports(
+                session=session,
+                user_id=user_id,
+                page=page,
+                limit=limit,
+                cursor=cursor,
+            )
+    except InvalidCursorError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor",
         )
 
     return ReportListResponse(**result)
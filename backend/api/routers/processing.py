@@ -6,26 +6,45 @@ Implements:
 - POST /api/v1/analysis/start/{video_id} - Start analysis
 - POST /api/v1/analysis/run/{video_id} - Run analysis synchronously (free tier)
 - GET /api/v1/processing/status/{analysis_id} - Get status
+- GET /api/v1/processing/status/{analysis_id}/events - Stream status (SSE)
+- WebSocket /ws/status/{analysis_id} - Stream status
 
 Acceptance Criteria:
 - AC-029: Processing progress logged and retrievable via status endpoint
 """
+import asyncio
+import json
 import logging
 from datetime import datetime, timezone
-from typing import Annotated, Optional
+from typing import Annotated, AsyncIterator, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Path,
+    Response,
+    WebSocket,
+    WebSocketDisconnect,
+    status,
+)
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from sqlalchemy import select
 
-from api.routers.auth import get_current_user_or_guest
+from api.config import get_settings
+from api.routers.auth import get_current_user_or_guest, get_stream_user, user_from_access_token
 from api.schemas.analysis import (
     ProcessingStatusResponse,
     StartAnalysisRequest,
     StartAnalysisResponse,
 )
+from api.services.admission_controller import AdmissionRejectedError, analysis_run_admission
+from api.services.analysis_executor import ExecutorSaturatedError
 from api.services.database import get_db_session
+from api.services.job_queue import JobQueueError
 from api.services.processing_service import (
     AnalysisAlreadyExistsError,
     AnalysisNotFoundError,
@@ -34,11 +53,17 @@ from api.services.processing_service import (
     VideoNotFoundError,
     processing_service,
 )
+from api.services.progress_broker import TERMINAL_EVENTS, ProgressBrokerError, progress_broker
+from api.services.progress_sink import progress_sink
+from api.services.status_cache import status_cache
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["processing"])
 
+# Mounted without the /api/v1 prefix, matching StartAnalysisResponse.websocket_url
+ws_router = APIRouter(tags=["processing"])
+
 
 @router.post(
     "/analysis/start/{video_id}",
@@ -48,6 +73,7 @@ router = APIRouter(tags=["processing"])
         401: {"description": "Not authenticated"},
         404: {"description": "Video, subject, or body specs not found"},
         409: {"description": "Analysis already exists for this video"},
+        503: {"description": "Job queue unavailable, retry later"},
     },
 )
 async def start_analysis(
@@ -67,6 +93,8 @@ async def start_analysis(
     - websocket_url: URL for real-time status updates
     - estimated_minutes: Estimated processing time
 
+    The analysis runs on a background worker (python -m api.worker).
+
     AC-029: Processing progress logged and retrievable via status endpoint
     """
     user_id = UUID(current_user["id"])
@@ -95,6 +123,7 @@ async def start_analysis(
                 user_id=user_id,
                 subject_id=subject_id,
                 body_specs_id=body_specs_id,
+                is_guest=current_user.get("is_guest", False),
             )
         return StartAnalysisResponse(**result)
 
@@ -118,12 +147,18 @@ async def start_analysis(
             status_code=status.HTTP_409_CONFLICT,
             detail="Analysis already exists for this video",
         )
+    except JobQueueError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analysis queue unavailable, please retry shortly",
+        )
 
 
 @router.get(
     "/processing/status/{analysis_id}",
     response_model=ProcessingStatusResponse,
     responses={
+        304: {"description": "Status unchanged since the If-None-Match ETag"},
         401: {"description": "Not authenticated"},
         404: {"description": "Analysis not found"},
     },
@@ -131,6 +166,8 @@ async def start_analysis(
 async def get_processing_status(
     analysis_id: Annotated[UUID, Path(description="Analysis ID")],
     current_user: Annotated[dict, Depends(get_current_user_or_guest)],
+    response: Response,
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
     """Get current processing status for an analysis.
 
@@ -141,25 +178,191 @@ async def get_processing_status(
     - Estimated completion time
     - Error details if failed
 
+    Served from the status cache while the analysis is unchanged. The ETag
+    header identifies the status; polling with If-None-Match returns 304
+    until it changes.
+
     AC-029: Processing progress logged and retrievable via status endpoint
     """
     user_id = UUID(current_user["id"])
 
-    try:
+    async def load() -> dict:
         async with get_db_session() as session:
-            result = await processing_service.get_status(
+            return await processing_service.get_status(
                 session=session,
                 analysis_id=analysis_id,
                 user_id=user_id,
             )
-        return ProcessingStatusResponse(**result)
 
+    try:
+        cached = await status_cache.read_through(analysis_id, user_id, load)
     except AnalysisNotFoundError:
+        cached = None
+    if cached is None or cached.user_id != str(user_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Analysis not found",
         )
 
+    headers = {"ETag": cached.etag, "Cache-Control": "private, no-cache"}
+    if if_none_match and _etag_matches(if_none_match, cached.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+    return ProcessingStatusResponse(**cached.payload)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header lists the ETag (weak comparison)."""
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+# --- Status Streaming ---
+
+
+@router.get(
+    "/processing/status/{analysis_id}/events",
+    response_class=StreamingResponse,
+    responses={
+        401: {"description": "Not authenticated"},
+        404: {"description": "Analysis not found"},
+        503: {"description": "Streaming unavailable, poll the status endpoint"},
+    },
+)
+async def stream_processing_status(
+    analysis_id: Annotated[UUID, Path(description="Analysis ID")],
+    current_user: Annotated[dict, Depends(get_stream_user)],
+):
+    """Stream processing status as Server-Sent Events.
+
+    The first event is the current status; then progress, stage_complete and
+    finally complete or error events are pushed as the worker publishes
+    them (same payloads as the WebSocket). Idle streams get a keepalive
+    comment. The access token may be passed as ?token= for EventSource.
+
+    AC-029: Processing progress logged and retrievable via status endpoint
+    """
+    events = _progress_events(analysis_id, UUID(current_user["id"]))
+    first = await _first_event(events)
+    return StreamingResponse(
+        _sse(first, events),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@ws_router.websocket("/ws/status/{analysis_id}")
+async def status_websocket(
+    websocket: WebSocket,
+    analysis_id: UUID,
+    token: Optional[str] = None,
+):
+    """Stream processing status over a WebSocket (?token= access token).
+
+    Sends the current status, then the events of stream_processing_status,
+    and closes after complete or error.
+
+    AC-029: Processing progress logged and retrievable via status endpoint
+    """
+    try:
+        user = user_from_access_token(token or "", get_settings())
+    except ValueError:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+        return
+
+    events = _progress_events(analysis_id, UUID(user["id"]))
+    try:
+        event = await _first_event(events)
+    except HTTPException as e:
+        await websocket.close(
+            code=status.WS_1013_TRY_AGAIN_LATER
+            if e.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+            else status.WS_1008_POLICY_VIOLATION
+        )
+        return
+
+    await websocket.accept()
+    disconnected = asyncio.create_task(_wait_disconnect(websocket))
+    try:
+        while not disconnected.done():
+            if event is not None:
+                await websocket.send_json(event)
+            event = await anext(events, _END)
+            if event is _END:
+                await websocket.close()
+                return
+    except WebSocketDisconnect:
+        pass
+    finally:
+        disconnected.cancel()
+        await events.aclose()
+
+
+# Sentinel of an exhausted event stream
+_END: dict = {}
+
+
+async def _progress_events(analysis_id: UUID, user_id: UUID) -> AsyncIterator[Optional[dict]]:
+    """Current status, then live events until the analysis finishes.
+
+    Subscribes before reading the snapshot, so no event is lost in between;
+    the database is read once per stream. Yields None when no event arrived
+    within the keepalive interval.
+
+    Raises:
+        AnalysisNotFoundError: If analysis doesn't exist or user doesn't own it
+        ProgressBrokerError: If the event backend is unreachable
+    """
+    keepalive = get_settings().progress_keepalive_seconds
+    async with progress_broker.subscribe(analysis_id) as subscription:
+        async with get_db_session() as session:
+            event = await processing_service.get_progress_snapshot(
+                session, analysis_id, user_id
+            )
+        # The row may lag progress reported within the current stage
+        event = await progress_sink.current(analysis_id, event)
+        while True:
+            yield event
+            if event is not None and event["type"] in TERMINAL_EVENTS:
+                return
+            event = await subscription.get(timeout=keepalive)
+
+
+async def _first_event(events: AsyncIterator[Optional[dict]]) -> Optional[dict]:
+    """Start a progress stream, mapping its setup errors to HTTP errors."""
+    try:
+        return await anext(events)
+    except AnalysisNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Analysis not found",
+        )
+    except ProgressBrokerError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Status streaming unavailable, please poll the status endpoint",
+        )
+
+
+async def _sse(first: Optional[dict], events: AsyncIterator[Optional[dict]]) -> AsyncIterator[str]:
+    """Format a progress stream as Server-Sent Events."""
+    try:
+        event = first
+        while event is not _END:
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+            event = await anext(events, _END)
+    finally:
+        await events.aclose()
+
+
+async def _wait_disconnect(websocket: WebSocket) -> None:
+    """Return once the client disconnects (client messages are ignored)."""
+    while (await websocket.receive())["type"] != "websocket.disconnect":
+        pass
+
 
 # --- Synchronous Analysis (Free Tier) ---
 
@@ -178,7 +381,9 @@ class RunAnalysisResponse(BaseModel):
     responses={
         401: {"description": "Not authenticated"},
         404: {"description": "Video not found"},
+        429: {"description": "Too many analyses in progress, retry later"},
         500: {"description": "Analysis failed"},
+        503: {"description": "Analysis capacity exhausted, retry later"},
     },
 )
 async def run_analysis_sync(
@@ -193,7 +398,10 @@ async def run_analysis_sync(
     3. Calls GPT for boxing analysis
     4. Creates and returns a report
 
-    Note: This may take 30-60 seconds depending on video length.
+    Note: This may take 30-60 seconds depending on video length. Requests are
+    admitted by analysis_run_admission first (returns 429 with Retry-After when
+    the user or the wait queue is at its limit); the CPU-bound stages then run
+    on a bounded executor (returns 503 with Retry-After when it is full).
     """
     from api.models.analysis import Analysis, AnalysisStatus
     from api.models.body_specs import BodySpecs
@@ -202,9 +410,20 @@ async def run_analysis_sync(
     from api.models.upload import Video
     from api.services.video_processor import video_processor, VideoProcessingError
     from api.services.gpt_analyzer import gpt_analyzer
+    from api.services.dashboard_service import dashboard_service
 
     user_id = UUID(current_user["id"])
 
+    # Admit before opening a session: waiting requests hold nothing
+    try:
+        await analysis_run_admission.acquire(user_id)
+    except AdmissionRejectedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many analyses in progress, please retry shortly",
+            headers={"Retry-After": str(e.retry_after_seconds)},
+        )
+
     try:
         async with get_db_session() as session:
             # Get video
@@ -303,6 +522,7 @@ async def run_analysis_sync(
                 completion_tokens=analysis_result.get("completion_tokens"),
             )
             session.add(report)
+            await dashboard_service.adjust_report_count(session, user_id, 1)
             await session.flush()
             await session.refresh(report)
 
@@ -315,6 +535,12 @@ async def run_analysis_sync(
                 message="Analysis complete! View your report.",
             )
 
+    except ExecutorSaturatedError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Analysis capacity exhausted, please retry shortly",
+            headers={"Retry-After": str(e.retry_after_seconds)},
+        )
     except VideoProcessingError as e:
         logger.error(f"Video processing failed: {e}")
         raise HTTPException(
@@ -327,3 +553,5 @@ async def run_analysis_sync(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Analysis failed: {str(e)}",
         )
+    finally:
+        analysis_run_admission.release(user_id)
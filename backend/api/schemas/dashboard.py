@@ -46,10 +46,15 @@ class ReportListResponse(BaseModel):
         default_factory=list, description="List of reports"
     )
     total: int = Field(..., ge=0, description="Total number of reports")
-    page: int = Field(..., ge=1, description="Current page number")
+    page: Optional[int] = Field(
+        None, ge=1, description="Current page number (offset pagination only)"
+    )
     has_more: bool = Field(
         ..., description="Whether there are more reports to load"
     )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page, null on the last page"
+    )
 
 
 class DeleteReportResponse(BaseModel):
@@ -0,0 +1,211 @@
+"""Admission control for synchronous analyses.
+
+@feature F005 - Pose Estimation Processing
+
+POST /analysis/run holds decoded frames, thumbnails and a database session
+for up to a minute per request, so an unbounded burst can exhaust an
+instance's memory before the analysis executor's own limit is reached. The
+router admits each request here first:
+
+- at most ``max_concurrent`` analyses run at once per process; further
+  requests wait in FIFO order;
+- at most ``max_queued`` requests wait; more are rejected immediately;
+- one user may have at most ``max_per_user`` analyses running or waiting,
+  so a single client cannot fill the queue;
+- a request waiting longer than ``queue_timeout`` gives up.
+
+Rejections raise AdmissionRejectedError, which the router turns into 429 with
+Retry-After. Limits are per process, like the executor's.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+from uuid import UUID
+
+from api.config import get_settings
+from api.services.metrics import (
+    ADMISSION_IN_FLIGHT,
+    ADMISSION_QUEUE_LENGTH,
+    ADMISSION_REJECTIONS,
+    ADMISSION_WAIT,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionRejectedError(Exception):
+    """The request cannot be admitted now."""
+
+    def __init__(self, message: str, reason: str, retry_after_seconds: int):
+        super().__init__(message)
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+
+class AdmissionController:
+    """Semaphore with a bounded FIFO wait queue and a per-user limit.
+
+    Must be used from one event loop.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrent: Optional[int] = None,
+        max_queued: Optional[int] = None,
+        max_per_user: Optional[int] = None,
+        queue_timeout: Optional[float] = None,
+        retry_after_seconds: Optional[int] = None,
+    ):
+        """Initialize controller.
+
+        Args:
+            name: Endpoint label of the admission metrics
+            max_concurrent: Requests running at once (None = settings)
+            max_queued: Requests waiting for a slot (None = settings)
+            max_per_user: Requests one user may have running or waiting
+                (None = settings)
+            queue_timeout: Seconds a request may wait (None = settings)
+            retry_after_seconds: Retry-After sent on rejection (None = settings)
+        """
+        settings = get_settings()
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent or settings.run_admission_max_concurrent)
+        self.max_queued = max(
+            0, settings.run_admission_max_queued if max_queued is None else max_queued
+        )
+        self.max_per_user = max(1, max_per_user or settings.run_admission_max_per_user)
+        self.queue_timeout = (
+            settings.run_admission_queue_timeout_seconds if queue_timeout is None else queue_timeout
+        )
+        self.retry_after_seconds = (
+            retry_after_seconds or settings.run_admission_retry_after_seconds
+        )
+
+        self._running = 0
+        self._waiters: deque[asyncio.Future] = deque()
+        self._per_user: dict[str, int] = {}
+
+    @property
+    def running(self) -> int:
+        """Admitted requests."""
+        return self._running
+
+    @property
+    def queued(self) -> int:
+        """Requests waiting for a slot."""
+        return sum(1 for waiter in self._waiters if not waiter.done())
+
+    @asynccontextmanager
+    async def admit(self, user_id: UUID | str) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block.
+
+        Raises:
+            AdmissionRejectedError: If the user or the queue is at its limit,
+                or no slot freed up within queue_timeout
+        """
+        await self.acquire(user_id)
+        try:
+            yield
+        finally:
+            self.release(user_id)
+
+    async def acquire(self, user_id: UUID | str) -> None:
+        """Take a slot, waiting in line if all are busy; pair with release.
+
+        Raises:
+            AdmissionRejectedError: As for admit
+        """
+        user = str(user_id)
+        if self._per_user.get(user, 0) >= self.max_per_user:
+            self._reject("user_limit", user)
+        if self._running >= self.max_concurrent and self.queued >= self.max_queued:
+            self._reject("queue_full", user)
+
+        self._per_user[user] = self._per_user.get(user, 0) + 1
+        try:
+            if self._running < self.max_concurrent and not self.queued:
+                self._running += 1
+            else:
+                await self._wait(user)
+        except BaseException:
+            self._forget_user(user)
+            raise
+        self._update_gauges()
+
+    def release(self, user_id: UUID | str) -> None:
+        """Free the slot taken by acquire, handing it to the next in line."""
+        self._forget_user(str(user_id))
+        self._release_slot()
+
+    async def _wait(self, user: str) -> None:
+        """Wait in line until release hands over a slot."""
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over as the wait ended: pass it on
+                self._release_slot()
+            else:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    pass
+            self._update_gauges()
+            if isinstance(e, asyncio.TimeoutError):
+                self._reject("queue_timeout", user)
+            raise
+        finally:
+            ADMISSION_WAIT.observe(time.perf_counter() - started, endpoint=self.name)
+
+    def _release_slot(self) -> None:
+        """Give a running slot to the oldest waiter, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                break
+        else:
+            self._running -= 1
+        self._update_gauges()
+
+    def _forget_user(self, user: str) -> None:
+        """Drop one of the user's requests from the per-user count."""
+        count = self._per_user.get(user, 0) - 1
+        if count > 0:
+            self._per_user[user] = count
+        else:
+            self._per_user.pop(user, None)
+
+    def _reject(self, reason: str, user: str) -> None:
+        """Count and raise a rejection."""
+        ADMISSION_REJECTIONS.inc(endpoint=self.name, reason=reason)
+        logger.warning(
+            "admission.rejected",
+            extra={
+                "endpoint": self.name,
+                "reason": reason,
+                "user_id": user,
+                "running": self._running,
+                "queued": self.queued,
+            },
+        )
+        raise AdmissionRejectedError(
+            "Too many analyses in progress, try again later", reason, self.retry_after_seconds
+        )
+
+    def _update_gauges(self) -> None:
+        """Publish the running and waiting counts."""
+        ADMISSION_IN_FLIGHT.set(self._running, endpoint=self.name)
+        ADMISSION_QUEUE_LENGTH.set(self.queued, endpoint=self.name)
+
+
+# Singleton instance
+analysis_run_admission = AdmissionController("analysis_run")
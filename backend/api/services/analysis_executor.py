@@ -0,0 +1,132 @@
+"""Bounded executor for CPU-bound analysis work.
+
+@feature F005 - Pose Estimation Processing
+
+OpenCV decode, pose inference and thumbnail encoding block for tens of
+seconds per video. Running them on the event loop stalls every other request
+on the worker, so they are submitted here instead.
+
+The executor admits at most ``workers + queue_size`` jobs. Beyond that it
+rejects immediately with ExecutorSaturatedError rather than piling up work.
+"""
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from api.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ExecutorSaturatedError(Exception):
+    """All executor slots and queue positions are taken."""
+
+    def __init__(self, message: str, retry_after_seconds: int):
+        super().__init__(message)
+        self.retry_after_seconds = retry_after_seconds
+
+
+class AnalysisExecutor:
+    """Thread pool with a hard admission limit.
+
+    Threads are sufficient because the heavy native calls (OpenCV, the pose
+    engine's process pool) release the GIL; what matters is keeping them off
+    the event loop and bounding how many run at once.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        retry_after_seconds: Optional[int] = None,
+    ):
+        """Initialize executor limits without starting threads."""
+        settings = get_settings()
+        self.workers = max(1, workers or settings.analysis_executor_workers)
+        self.queue_size = max(
+            0,
+            queue_size if queue_size is not None else settings.analysis_executor_queue_size,
+        )
+        self.retry_after_seconds = (
+            retry_after_seconds or settings.analysis_executor_retry_after_seconds
+        )
+
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of admitted jobs (running + queued)."""
+        return self.workers + self.queue_size
+
+    @property
+    def in_flight(self) -> int:
+        """Number of admitted jobs (running + queued)."""
+        return self._in_flight
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get or create the thread pool."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers,
+                thread_name_prefix="analysis",
+            )
+        return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking function on the executor.
+
+        Args:
+            fn: Blocking callable
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Return value of fn
+
+        Raises:
+            ExecutorSaturatedError: If no slot or queue position is free
+        """
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                logger.warning(
+                    "analysis_executor.saturated",
+                    extra={"in_flight": self._in_flight, "capacity": self.capacity},
+                )
+                raise ExecutorSaturatedError(
+                    "Analysis capacity exhausted, try again later",
+                    self.retry_after_seconds,
+                )
+            self._in_flight += 1
+
+        try:
+            future = self._get_executor().submit(functools.partial(fn, *args, **kwargs))
+        except Exception:
+            self._release()
+            raise
+
+        # Release the slot when the work finishes, not when the caller stops
+        # waiting: a cancelled request leaves its thread running.
+        future.add_done_callback(lambda _: self._release())
+        return await asyncio.wrap_future(future)
+
+    def _release(self) -> None:
+        """Free one admission slot."""
+        with self._lock:
+            self._in_flight -= 1
+
+    def shutdown(self) -> None:
+        """Stop executor threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance
+analysis_executor = AnalysisExecutor()
@@ -0,0 +1,378 @@
+"""Analysis pipeline run by the background worker.
+
+@feature F005 - Pose Estimation Processing
+@feature F006 - Stamp Generation
+@feature F007 - LLM Strategic Analysis
+
+Implements:
+- AC-027: Successful pose data stored in structured JSON
+- AC-028: Over 20% frame failure marks analysis as failed with guidance
+- AC-029: Processing progress logged and retrievable via status endpoint
+
+Moves a queued analysis through pose estimation -> stamp generation -> LLM
+analysis -> report generation. Each stage commits its own transaction so the
+status endpoint sees progress while the next stage runs.
+
+A job may be delivered again after a crash or a retried failure, so it
+resumes from the first incomplete stage (runbook: "restart from last stage"):
+
+- pose data is checkpointed to storage and recorded as pose_data_key;
+- stamps are stored with the stage that starts the LLM call
+  (stamps_completed_at);
+- the LLM result is checkpointed to storage (llm_completed_at), so a report
+  stage retry neither calls the LLM nor reruns MediaPipe.
+
+An analysis already completed or failed is left alone.
+
+Progress events for WebSocket/SSE clients (see progress_broker) are
+published after the transaction recording them commits, so a client's
+catch-up snapshot is never behind an event it already received. Per-frame
+progress within pose estimation goes through progress_sink, which publishes
+it as it comes but writes the analysis row only now and then.
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+
+from api.models.analysis import Analysis, AnalysisStatus
+from api.models.body_specs import BodySpecs
+from api.models.report import Report
+from api.models.subject import Subject
+from api.services.checkpoint_store import LLM_ANALYSIS, POSE_DATA, checkpoint_store
+from api.services.dashboard_service import dashboard_service
+from api.services.database import get_db_session
+from api.services.llm_analysis_service import llm_analysis_service
+from api.services.metrics import PROCESSING_DURATION, PROCESSING_JOBS
+from api.services.pose_extraction_service import PoseExtractionError, pose_extraction_service
+from api.services.processing_service import processing_service
+from api.services.progress_broker import ProgressBrokerError, progress_broker
+from api.services.progress_sink import progress_sink
+from api.services.stamp_generation_service import stamp_generation_service
+from api.services.video_processor import VideoProcessingError, video_processor
+
+logger = logging.getLogger(__name__)
+
+# Failures a retry cannot fix, by the error code recorded on the analysis.
+# Anything else (LLM outage, saturated executor, database hiccup) is retried.
+PERMANENT_ERRORS: tuple[tuple[type[Exception], str], ...] = (
+    (VideoProcessingError, "VIDEO_UNREADABLE"),
+    (PoseExtractionError, "POSE_EXTRACTION_FAILED"),
+)
+
+# progress_percent reported when each stage starts
+STAGE_PROGRESS = {
+    "pose_estimation": 5,
+    "stamp_generation": 60,
+    "llm_analysis": 75,
+    "report_generation": 90,
+}
+
+
+class AnalysisPipelineError(Exception):
+    """Base exception for analysis pipeline errors."""
+
+    pass
+
+
+class AnalysisPipeline:
+    """Runs one analysis end to end.
+
+    AC-029: Processing progress logged and retrievable via status endpoint
+    """
+
+    async def run(
+        self,
+        analysis_id: UUID,
+        attempt: int = 1,
+        worker_id: Optional[str] = None,
+    ) -> Optional[UUID]:
+        """Run every stage for a queued analysis.
+
+        Args:
+            analysis_id: Analysis to process
+            attempt: Delivery number of the job (1 = first try)
+            worker_id: Identifier of the worker running the job
+
+        Returns:
+            Report ID, or None if the analysis failed its quality check
+
+        Raises:
+            AnalysisPipelineError: If the analysis row does not exist (yet)
+            Exception: Any stage failure; see error_code_for
+        """
+        # Progress events, published once the session that recorded them commits
+        events: list[dict] = []
+
+        # Stage 1: pose estimation
+        async with self._session(analysis_id, events) as session:
+            analysis = await self._get_analysis(session, analysis_id)
+            if analysis.status in (AnalysisStatus.COMPLETED, AnalysisStatus.FAILED):
+                # Redelivered after the work was already recorded
+                return analysis.report_id
+
+            analysis.retry_count = attempt - 1
+            analysis.worker_id = worker_id
+            context = await self._load_context(session, analysis)
+            pose_data_key = analysis.pose_data_key
+            stamps_done = analysis.stamps_completed_at is not None
+            llm_done = analysis.llm_completed_at is not None
+
+            pose_data = await checkpoint_store.load(pose_data_key)
+            if pose_data is None:
+                await self._start_stage(session, analysis_id, "pose_estimation", events)
+            else:
+                self._log_resumed(analysis_id, "pose_estimation")
+
+        if pose_data is None:
+            progress_sink.start(analysis_id, "pose_estimation", STAGE_PROGRESS["pose_estimation"])
+            try:
+                with self._measure("pose_estimation"):
+                    pose_data = await pose_extraction_service.run(
+                        context["video_path"],
+                        analysis_id,
+                        context["subject_id"],
+                        video_id=context["video_id"],
+                        initial_bbox=context["initial_bbox"],
+                        on_progress=self._frame_reporter(analysis_id),
+                    )
+                pose_data_key = await checkpoint_store.save(
+                    checkpoint_store.key_for(analysis_id, POSE_DATA), pose_data
+                )
+                async with self._session(analysis_id, events) as session:
+                    await processing_service.mark_stage_completed(
+                        session, analysis_id, "pose_estimation", pose_data_key=pose_data_key
+                    )
+            finally:
+                await progress_sink.finish(analysis_id)
+            events.append(processing_service.stage_complete_event("pose_estimation"))
+
+        # Stage 2: stamp generation
+        # AC-028: update_progress fails the analysis on too many lost frames
+        async with self._session(analysis_id, events) as session:
+            if stamps_done:
+                self._log_resumed(analysis_id, "stamp_generation")
+                stamps = [
+                    stamp.to_dict()
+                    for stamp in await stamp_generation_service.get_stamps_for_analysis(
+                        session, analysis_id
+                    )
+                ]
+            else:
+                progress = await self._start_stage(
+                    session,
+                    analysis_id,
+                    "stamp_generation",
+                    events,
+                    frames_processed=pose_data["total_frames"],
+                    frames_failed=pose_data["failed_frames"],
+                )
+                if progress["status"] == AnalysisStatus.FAILED.value:
+                    events[-1] = processing_service.error_event(
+                        progress["error_code"], progress["error_message"]
+                    )
+                    return None
+
+                with self._measure("stamp_generation"):
+                    stamps = stamp_generation_service.detect_all_actions(pose_data)
+                    await stamp_generation_service.delete_stamps_for_analysis(session, analysis_id)
+                    await stamp_generation_service.save_stamps(session, analysis_id, stamps)
+                events.append(processing_service.stage_complete_event("stamp_generation"))
+
+            analysis_result = None
+            if llm_done:
+                analysis_result = await checkpoint_store.load(
+                    checkpoint_store.key_for(analysis_id, LLM_ANALYSIS)
+                )
+            if analysis_result is None:
+                await self._start_stage(session, analysis_id, "llm_analysis", events)
+            else:
+                self._log_resumed(analysis_id, "llm_analysis")
+
+        # Stage 3: LLM analysis
+        if analysis_result is None:
+            with self._measure("llm_analysis"):
+                analysis_result = await llm_analysis_service.generate_analysis(
+                    pose_data, stamps, context["body_specs"]
+                )
+            await checkpoint_store.save(
+                checkpoint_store.key_for(analysis_id, LLM_ANALYSIS), analysis_result
+            )
+            async with self._session(analysis_id, events) as session:
+                await processing_service.mark_stage_completed(session, analysis_id, "llm_analysis")
+                events.append(processing_service.stage_complete_event("llm_analysis"))
+
+        # Stage 4: report generation
+        async with self._session(analysis_id, events) as session:
+            await self._start_stage(session, analysis_id, "report_generation", events)
+            with self._measure("report_generation"):
+                report = Report(
+                    analysis_id=analysis_id,
+                    video_id=context["video_id"],
+                    user_id=context["user_id"],
+                    performance_score=analysis_result.get("performance_score"),
+                    overall_assessment=analysis_result.get("overall_assessment", ""),
+                    strengths=analysis_result.get("strengths", []),
+                    weaknesses=analysis_result.get("weaknesses", []),
+                    recommendations=analysis_result.get("recommendations", []),
+                    metrics=analysis_result.get("metrics", {}),
+                    llm_model=analysis_result.get("llm_model"),
+                    prompt_tokens=analysis_result.get("prompt_tokens"),
+                    completion_tokens=analysis_result.get("completion_tokens"),
+                )
+                session.add(report)
+                await dashboard_service.adjust_report_count(session, context["user_id"], 1)
+                await session.flush()
+                await processing_service.mark_completed(
+                    session, analysis_id, report.id, pose_data_key=pose_data_key
+                )
+            events.append(processing_service.complete_event(report.id))
+
+        # The pose checkpoint stays as the analysis' pose data (AC-027)
+        await checkpoint_store.delete(checkpoint_store.key_for(analysis_id, LLM_ANALYSIS))
+        return report.id
+
+    async def fail(self, analysis_id: UUID, error_code: str, error_message: str) -> None:
+        """Record a final failure on the analysis, if it still exists."""
+        async with get_db_session() as session:
+            result = await session.execute(
+                select(Analysis.id).where(Analysis.id == analysis_id)
+            )
+            if result.scalar_one_or_none() is None:
+                logger.warning(
+                    "analysis_pipeline.fail_missing",
+                    extra={"analysis_id": str(analysis_id), "error_code": error_code},
+                )
+                return
+            await processing_service.mark_failed(session, analysis_id, error_code, error_message)
+        await self._publish(
+            analysis_id, [processing_service.error_event(error_code, error_message)]
+        )
+
+    @staticmethod
+    def error_code_for(error: Exception) -> Optional[str]:
+        """Error code of a permanent failure, None if the job should be retried."""
+        for error_type, code in PERMANENT_ERRORS:
+            if isinstance(error, error_type):
+                return code
+        return None
+
+    async def _get_analysis(self, session, analysis_id: UUID) -> Analysis:
+        """Get the analysis row.
+
+        The job is enqueued right after start_analysis commits, so a missing
+        row means it was deleted, or a replica has not caught up yet.
+        """
+        result = await session.execute(select(Analysis).where(Analysis.id == analysis_id))
+        analysis = result.scalar_one_or_none()
+        if analysis is None:
+            raise AnalysisPipelineError(f"Analysis not found: {analysis_id}")
+        return analysis
+
+    async def _load_context(self, session, analysis: Analysis) -> dict[str, Any]:
+        """Collect what the later stages need, so they run without a session."""
+        video_path = await video_processor._resolve_video_path(
+            session, analysis.video_id, analysis.user_id
+        )
+        subject = await session.get(Subject, analysis.subject_id)
+        body_specs = await session.get(BodySpecs, analysis.body_specs_id)
+        if subject is None or body_specs is None:
+            raise VideoProcessingError(
+                f"Subject or body specs missing for analysis {analysis.id}"
+            )
+
+        return {
+            "video_path": str(video_path),
+            "video_id": analysis.video_id,
+            "user_id": analysis.user_id,
+            "subject_id": analysis.subject_id,
+            "initial_bbox": subject.initial_bbox,
+            "body_specs": {
+                "height_cm": body_specs.height_cm,
+                "weight_kg": body_specs.weight_kg,
+                "experience_level": body_specs.experience_level,
+                "stance": body_specs.stance,
+            },
+        }
+
+    @asynccontextmanager
+    async def _session(self, analysis_id: UUID, events: list[dict]) -> AsyncIterator[Any]:
+        """Stage transaction; the events it queued are published after commit."""
+        async with get_db_session() as session:
+            yield session
+        await self._publish(analysis_id, events)
+
+    @staticmethod
+    async def _publish(analysis_id: UUID, events: list[dict]) -> None:
+        """Publish and clear queued progress events (best effort)."""
+        try:
+            for event in events:
+                await progress_broker.publish(analysis_id, event)
+        except ProgressBrokerError as e:
+            logger.warning(
+                "analysis_pipeline.progress_unpublished",
+                extra={"analysis_id": str(analysis_id), "error": str(e)},
+            )
+        events.clear()
+
+    @staticmethod
+    @contextmanager
+    def _measure(stage: str) -> Iterator[None]:
+        """Time a stage's work and count how it ended."""
+        started = time.perf_counter()
+        status = "failed"
+        try:
+            yield
+            status = "completed"
+        finally:
+            PROCESSING_DURATION.observe(time.perf_counter() - started, stage=stage)
+            PROCESSING_JOBS.inc(stage=stage, status=status)
+
+    @staticmethod
+    def _log_resumed(analysis_id: UUID, stage: str) -> None:
+        """Log a stage skipped because its checkpoint exists."""
+        logger.info(
+            "analysis_pipeline.stage_resumed",
+            extra={"analysis_id": str(analysis_id), "stage": stage},
+        )
+
+    @staticmethod
+    def _frame_reporter(analysis_id: UUID) -> Callable[[int, int, int], None]:
+        """Per-frame callback of pose extraction feeding progress_sink.
+
+        Runs on the extraction thread; maps frames walked onto the pose
+        stage's share of progress_percent.
+        """
+        loop = asyncio.get_running_loop()
+        start = STAGE_PROGRESS["pose_estimation"]
+        span = STAGE_PROGRESS["stamp_generation"] - start - 1
+
+        def report(walked: int, failed: int, expected: int) -> None:
+            percent = start + span * min(walked, expected) // expected if expected else start
+            loop.call_soon_threadsafe(
+                progress_sink.record, analysis_id, "pose_estimation", percent, walked, failed
+            )
+
+        return report
+
+    async def _start_stage(
+        self, session, analysis_id: UUID, stage: str, events: list[dict], **counts: int
+    ) -> dict:
+        """Record the start of a stage (commits with the caller's session)."""
+        logger.info(
+            "analysis_pipeline.stage",
+            extra={"analysis_id": str(analysis_id), "stage": stage},
+        )
+        progress = await processing_service.update_progress(
+            session, analysis_id, stage, STAGE_PROGRESS[stage], **counts
+        )
+        events.append(processing_service.progress_event(stage, STAGE_PROGRESS[stage]))
+        return progress
+
+
+# Singleton instance
+analysis_pipeline = AnalysisPipeline()
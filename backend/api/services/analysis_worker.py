@@ -0,0 +1,166 @@
+"""Worker loop consuming analysis jobs from the job queue.
+
+@feature F005 - Pose Estimation Processing
+
+Implements:
+- AC-029: Processing progress logged and retrievable via status endpoint
+
+Runs ``concurrency`` consumers, each reserving one job at a time and running
+AnalysisPipeline on it. While a job runs, its lease is extended every third
+of the visibility timeout, so only a dead or hung worker lets it expire.
+
+Outcome per job:
+- success, or a failure already recorded on the analysis: ack
+- permanent error (see AnalysisPipeline.error_code_for): mark failed, bury
+- other errors: retry with backoff; mark failed once attempts run out
+- delivered more than max_attempts times (leases kept expiring): mark
+  failed with PROCESSING_TIMEOUT and bury
+
+A worker whose lease expired while the job ran settles nothing: the job has
+been (or will be) delivered to another worker, which records the outcome.
+"""
+import asyncio
+import logging
+import os
+import socket
+from typing import Optional
+from uuid import UUID
+
+from api.config import get_settings
+from api.services.analysis_pipeline import AnalysisPipeline, analysis_pipeline
+from api.services.job_queue import (
+    Job,
+    JobQueue,
+    JobQueueError,
+    RetryOutcome,
+    analysis_job_queue,
+)
+from api.services.metrics import PROCESSING_JOBS
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisWorker:
+    """Consumes analysis jobs and runs the pipeline on them."""
+
+    def __init__(
+        self,
+        queue: Optional[JobQueue] = None,
+        pipeline: Optional[AnalysisPipeline] = None,
+        concurrency: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+        worker_id: Optional[str] = None,
+    ):
+        """Initialize worker.
+
+        Args:
+            queue: Job queue (None = analysis_job_queue)
+            pipeline: Pipeline run per job (None = analysis_pipeline)
+            concurrency: Jobs run at once (None = settings)
+            poll_interval: Seconds between polls of an empty queue (None = settings)
+            worker_id: Recorded on analyses this worker runs (None = host:pid)
+        """
+        settings = get_settings()
+        self.queue = queue or analysis_job_queue
+        self.pipeline = pipeline or analysis_pipeline
+        self.concurrency = max(1, concurrency or settings.worker_concurrency)
+        self.poll_interval = poll_interval or settings.worker_poll_interval_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Consume jobs until stop is set; running jobs are finished first."""
+        logger.info(
+            "worker.started",
+            extra={"worker_id": self.worker_id, "concurrency": self.concurrency},
+        )
+        await asyncio.gather(*(self._consume(stop) for _ in range(self.concurrency)))
+        logger.info("worker.stopped", extra={"worker_id": self.worker_id})
+
+    async def run_once(self) -> bool:
+        """Process the next ready job, if any.
+
+        Returns:
+            Whether a job was processed
+        """
+        job = await self.queue.reserve()
+        if job is None:
+            return False
+        await self.process(job)
+        return True
+
+    async def process(self, job: Job) -> None:
+        """Run the pipeline for a reserved job and settle it on the queue."""
+        analysis_id = UUID(job.payload["analysis_id"])
+        extra = {"job_id": job.id, "analysis_id": str(analysis_id), "attempts": job.attempts}
+
+        if job.attempts > self.queue.max_attempts:
+            logger.error("worker.job_timed_out", extra=extra)
+            PROCESSING_JOBS.inc(stage="job", status="timed_out")
+            await self.pipeline.fail(
+                analysis_id, "PROCESSING_TIMEOUT", "Processing did not finish in time"
+            )
+            await self.queue.bury(job, "visibility timeout expired")
+            return
+
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            await self.pipeline.run(analysis_id, attempt=job.attempts, worker_id=self.worker_id)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            error_code = self.pipeline.error_code_for(e)
+            if error_code is None:
+                outcome = await self.queue.retry(job, error)
+                if outcome is RetryOutcome.RETRYING:
+                    logger.warning("worker.job_retrying", extra={**extra, "error": error})
+                    PROCESSING_JOBS.inc(stage="job", status="retried")
+                    return
+                held = outcome is RetryOutcome.EXHAUSTED
+            else:
+                # Renewing the lease checks it is still ours before failing
+                held = await self.queue.extend(job)
+            if not held:
+                logger.warning("worker.job_lease_lost", extra={**extra, "error": error})
+                PROCESSING_JOBS.inc(stage="job", status="lease_lost")
+                return
+
+            logger.error("worker.job_failed", extra={**extra, "error": error})
+            PROCESSING_JOBS.inc(stage="job", status="failed")
+            await self.pipeline.fail(analysis_id, error_code or "PROCESSING_FAILED", str(e))
+            if error_code is not None:
+                await self.queue.bury(job, error)
+            return
+        finally:
+            heartbeat.cancel()
+
+        await self.queue.ack(job)
+        logger.info("worker.job_completed", extra=extra)
+        PROCESSING_JOBS.inc(stage="job", status="completed")
+
+    async def _consume(self, stop: asyncio.Event) -> None:
+        """One consumer: reserve and process jobs until stopped."""
+        while not stop.is_set():
+            try:
+                job = await self.queue.reserve(timeout=self.poll_interval)
+            except JobQueueError as e:
+                logger.error("worker.queue_unavailable", extra={"error": str(e)})
+                await asyncio.sleep(self.poll_interval)
+                continue
+            if job is None:
+                continue
+            try:
+                await self.process(job)
+            except Exception:
+                # Lease expiry redelivers the job; keep consuming
+                logger.exception("worker.job_error", extra={"job_id": job.id})
+
+    async def _heartbeat(self, job: Job) -> None:
+        """Keep extending the job's lease while it runs."""
+        interval = self.queue.visibility_timeout / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await self.queue.extend(job):
+                    logger.warning("worker.lease_lost", extra={"job_id": job.id})
+                    return
+            except JobQueueError as e:
+                logger.warning("worker.lease_extend_failed", extra={"job_id": job.id, "error": str(e)})
@@ -0,0 +1,105 @@
+"""Storage of analysis pipeline checkpoints.
+
+@feature F005 - Pose Estimation Processing
+
+Implements:
+- AC-027: Successful pose data stored in structured JSON
+
+AnalysisPipeline writes a stage's output here as soon as the stage finishes,
+so a retried job resumes from the first incomplete stage instead of running
+pose estimation again. Checkpoints are gzipped JSON under
+``analyses/<analysis_id>/<name>.json.gz``; the pose checkpoint's key is what
+Analysis.pose_data_key records.
+
+For local development checkpoints live on the filesystem next to uploads
+(UPLOAD_STORAGE_PATH); in production this would be S3/GCS. Writes go to a
+temporary file that is renamed into place, so a crash mid-write never leaves
+a truncated checkpoint behind.
+"""
+import asyncio
+import gzip
+import json
+import logging
+import os
+import shutil
+from pathlib import Path
+from typing import Any, Optional
+from uuid import UUID
+
+logger = logging.getLogger(__name__)
+
+# Checkpoint names
+POSE_DATA = "pose_data"
+LLM_ANALYSIS = "llm_analysis"
+
+
+class CheckpointStore:
+    """Reads and writes stage checkpoints by storage key."""
+
+    def __init__(self, base_path: Optional[Path] = None):
+        """Initialize store.
+
+        Args:
+            base_path: Storage root (None = UPLOAD_STORAGE_PATH)
+        """
+        self.storage_base = base_path or Path(
+            os.getenv("UPLOAD_STORAGE_PATH", "/tmp/punch_uploads")
+        )
+
+    @staticmethod
+    def key_for(analysis_id: UUID | str, name: str) -> str:
+        """Storage key of an analysis' checkpoint."""
+        return f"analyses/{analysis_id}/{name}.json.gz"
+
+    async def save(self, key: str, data: dict[str, Any]) -> str:
+        """Write a checkpoint (encoding runs off the event loop).
+
+        Returns:
+            The storage key
+        """
+        await asyncio.to_thread(self._write, self.storage_base / key, data)
+        return key
+
+    async def load(self, key: Optional[str]) -> Optional[dict[str, Any]]:
+        """Read a checkpoint.
+
+        Returns:
+            The stored data, or None if there is no readable checkpoint
+        """
+        if not key:
+            return None
+        try:
+            return await asyncio.to_thread(self._read, self.storage_base / key)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            # Corrupt or unreadable: the stage simply runs again
+            logger.warning("checkpoint.unreadable", extra={"key": key, "error": str(e)})
+            return None
+
+    async def delete(self, key: str) -> None:
+        """Remove a checkpoint, if present."""
+        (self.storage_base / key).unlink(missing_ok=True)
+
+    async def delete_for_analysis(self, analysis_id: UUID | str) -> None:
+        """Remove every checkpoint of an analysis."""
+        shutil.rmtree(self.storage_base / "analyses" / str(analysis_id), ignore_errors=True)
+
+    @staticmethod
+    def _write(path: Path, data: dict[str, Any]) -> None:
+        """Encode and atomically replace the checkpoint file (blocking)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=5) as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read(path: Path) -> dict[str, Any]:
+        """Decode a checkpoint file (blocking)."""
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+
+# Singleton instance
+checkpoint_store = CheckpointStore()
@@ -12,17 +12,21 @@ BDD Scenarios:
 - Report list item shows thumbnail, date, summary (key moments count)
 - User deletes report with confirmation dialog and undo toast (10 seconds)
 """
+import base64
+import json
 import logging
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 from uuid import UUID
 
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.models.analysis import Analysis
 from api.models.report import Report
 from api.models.stamp import Stamp
 from api.models.upload import Video
+from api.models.user import User
 
 logger = logging.getLogger(__name__)
 
@@ -54,10 +58,16 @@ class RestoreWindowExpiredError(DashboardServiceError):
     pass
 
 
+class InvalidCursorError(DashboardServiceError):
+    """Pagination cursor is malformed."""
+
+    pass
+
+
 class DashboardService:
     """Service for managing user's report history dashboard.
 
-    Provides paginated report listing and soft-delete with undo support.
+    Provides cursor-paginated report listing and soft-delete with undo support.
     """
 
     async def list_user_reports(
@@ -66,80 +76,120 @@ class DashboardService:
         user_id: UUID,
         page: int = 1,
         limit: int = 10,
+        cursor: Optional[str] = None,
     ) -> dict[str, Any]:
         """List user's reports sorted by date descending.
 
         AC-056: Dashboard lists reports sorted by date descending
         AC-057: List items show thumbnail, date, summary indicator
 
+        Pages are keyset-paginated on (created_at, id): pass the previous
+        response's next_cursor to seek past its last report along
+        idx_reports_user, however deep the history. Offset-based page is
+        kept for older clients and ignored when a cursor is given.
+
         Args:
             session: Database session
             user_id: User ID to filter reports
-            page: Page number (1-indexed)
+            page: Page number (1-indexed), offset pagination only
             limit: Number of items per page
+            cursor: Opaque next_cursor from the previous page
 
         Returns:
             Paginated report list with metadata
+
+        Raises:
+            InvalidCursorError: If the cursor cannot be decoded
         """
-        offset = (page - 1) * limit
+        after = self._decode_cursor(cursor) if cursor else None
+        offset = 0 if after else (page - 1) * limit
 
-        # Count total reports for user (excluding deleted)
-        count_query = (
+        # Stored counter, or a per-report count for analyses stamped before
+        # counters existed (COALESCE only evaluates it when the counter is NULL)
+        legacy_count = (
             select(func.count())
-            .select_from(Report)
-            .where(
-                Report.user_id == user_id,
-                Report.deleted_at.is_(None),
-            )
+            .select_from(Stamp)
+            .where(Stamp.analysis_id == Report.analysis_id)
+            .scalar_subquery()
+        )
+        key_moments_count = func.coalesce(Analysis.stamp_total, legacy_count)
+
+        # The user's report counter rides along instead of a COUNT(*)
+        report_count = (
+            select(User.report_count)
+            .where(User.id == user_id)
+            .scalar_subquery()
         )
-        count_result = await session.execute(count_query)
-        total = count_result.scalar_one()
 
-        # Get reports with video thumbnail, sorted by created_at DESC
-        # AC-056: Sorted by date descending (newest first)
+        # One statement for the page: list columns, video thumbnail, stamp
+        # count and the user's total; one extra row tells whether more follow
+        # AC-056: Sorted by date descending (newest first, id breaks ties)
         reports_query = (
-            select(Report, Video.thumbnail_key)
+            select(
+                Report.id,
+                Report.video_id,
+                Report.created_at,
+                Report.performance_score,
+                Video.thumbnail_key,
+                key_moments_count.label("key_moments_count"),
+                report_count.label("report_count"),
+            )
             .join(Video, Report.video_id == Video.id)
+            .outerjoin(Analysis, Report.analysis_id == Analysis.id)
             .where(
                 Report.user_id == user_id,
                 Report.deleted_at.is_(None),
             )
-            .order_by(Report.created_at.desc())
-            .offset(offset)
-            .limit(limit)
+            .order_by(Report.created_at.desc(), Report.id.desc())
+            .limit(limit + 1)
         )
-        reports_result = await session.execute(reports_query)
-        reports = reports_result.all()
-
-        # Get stamp counts for each report (key_moments_count)
-        items = []
-        for report, thumbnail_key in reports:
-            # Count stamps for this report's analysis
-            stamps_count_query = (
-                select(func.count())
-                .select_from(Stamp)
-                .where(Stamp.analysis_id == report.analysis_id)
+        if after is not None:
+            after_created_at, after_id = after
+            reports_query = reports_query.where(
+                or_(
+                    Report.created_at < after_created_at,
+                    and_(Report.created_at == after_created_at, Report.id < after_id),
+                )
             )
-            stamps_result = await session.execute(stamps_count_query)
-            key_moments_count = stamps_result.scalar_one()
-
-            # AC-057: Required fields for display
-            items.append({
-                "id": str(report.id),
-                "video_id": str(report.video_id),
-                "thumbnail_url": self._build_thumbnail_url(thumbnail_key),
-                "analyzed_at": report.created_at.isoformat(),
-                "key_moments_count": key_moments_count,
-                "performance_score": report.performance_score,
-            })
+        elif offset:
+            reports_query = reports_query.offset(offset)
 
-        has_more = offset + len(items) < total
+        reports_result = await session.execute(reports_query)
+        rows = reports_result.all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        if rows and rows[0].report_count is not None:
+            total = rows[0].report_count
+        elif rows or offset or after:
+            # No row to ride on (or no user row to read the counter from)
+            total = await self._get_report_count(session, user_id)
+        else:
+            total = 0
+
+        # AC-057: Required fields for display
+        items = [
+            {
+                "id": str(row.id),
+                "video_id": str(row.video_id),
+                "thumbnail_url": self._build_thumbnail_url(row.thumbnail_key),
+                "analyzed_at": row.created_at.isoformat(),
+                "key_moments_count": row.key_moments_count,
+                "performance_score": row.performance_score,
+            }
+            for row in rows
+        ]
+
+        next_cursor = (
+            self._encode_cursor(rows[-1].created_at, rows[-1].id) if has_more else None
+        )
 
         logger.info(
             "dashboard.reports_listed",
             extra={
                 "user_id": str(user_id),
-                "page": page,
+                "page": None if after else page,
+                "cursor": after is not None,
                 "limit": limit,
                 "total": total,
                 "returned": len(items),
@@ -149,10 +199,34 @@ class DashboardService:
         return {
             "items": items,
             "total": total,
-            "page": page,
+            "page": None if after else page,
             "has_more": has_more,
+            "next_cursor": next_cursor,
         }
 
+    async def adjust_report_count(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+        delta: int,
+    ) -> None:
+        """Apply a report create or restore (+1) or soft delete (-1) to the
+        user's report counter, in the caller's transaction.
+
+        The counter starts at 0 with the user row, so every change is applied
+        and the counter never needs recounting.
+
+        Args:
+            session: Database session
+            user_id: Report owner
+            delta: Change in the number of non-deleted reports
+        """
+        await session.execute(
+            update(User)
+            .where(User.id == user_id)
+            .values(report_count=User.report_count + delta)
+        )
+
     async def delete_report(
         self,
         session: AsyncSession,
@@ -199,6 +273,7 @@ class DashboardService:
         # Soft delete
         now = datetime.now(timezone.utc)
         report.deleted_at = now
+        await self.adjust_report_count(session, user_id, -1)
         await session.commit()
 
         restore_until = now + timedelta(seconds=RESTORE_WINDOW_SECONDS)
@@ -285,6 +360,7 @@ class DashboardService:
 
         # Restore
         report.deleted_at = None
+        await self.adjust_report_count(session, user_id, 1)
         await session.commit()
 
         logger.info(
@@ -324,6 +400,56 @@ class DashboardService:
         result = await session.execute(query)
         return result.scalar_one_or_none()
 
+    async def _count_user_reports(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+    ) -> int:
+        """Count the user's reports, excluding deleted ones."""
+        result = await session.execute(
+            select(func.count())
+            .select_from(Report)
+            .where(
+                Report.user_id == user_id,
+                Report.deleted_at.is_(None),
+            )
+        )
+        return result.scalar_one()
+
+    async def _get_report_count(
+        self,
+        session: AsyncSession,
+        user_id: UUID,
+    ) -> int:
+        """Read the user's report counter; count the reports if there is no user row."""
+        result = await session.execute(
+            select(User.report_count).where(User.id == user_id)
+        )
+        count = result.scalar_one_or_none()
+        if count is not None:
+            return count
+        return await self._count_user_reports(session, user_id)
+
+    @staticmethod
+    def _encode_cursor(created_at: datetime, report_id: UUID) -> str:
+        """Opaque cursor pointing just past the given report."""
+        payload = json.dumps([created_at.isoformat(), str(report_id)])
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+        """Decode a cursor from _encode_cursor.
+
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+        """
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            created_at, report_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(created_at), UUID(report_id)
+        except (ValueError, TypeError) as e:
+            raise InvalidCursorError("Invalid pagination cursor") from e
+
     def _build_thumbnail_url(self, thumbnail_key: Optional[str]) -> Optional[str]:
         """Build CDN URL for thumbnail.
 
@@ -1,10 +1,12 @@
 """Database connection and session management."""
+import time
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from api.config import get_settings
+from api.services.metrics import DB_SESSION_DURATION, DB_SESSIONS_ACTIVE
 
 # Global engine and session factory (initialized in lifespan)
 _engine = None
@@ -75,13 +77,21 @@ async def get_db_session() -> AsyncGenerator[AsyncSession, None]:
             result = await session.execute(query)
     """
     factory = get_session_factory()
-    async with factory() as session:
-        try:
-            yield session
-            await session.commit()
-        except Exception:
-            await session.rollback()
-            raise
+    started = time.perf_counter()
+    outcome = "rollback"
+    DB_SESSIONS_ACTIVE.inc(pool="default")
+    try:
+        async with factory() as session:
+            try:
+                yield session
+                await session.commit()
+                outcome = "commit"
+            except Exception:
+                await session.rollback()
+                raise
+    finally:
+        DB_SESSIONS_ACTIVE.dec(pool="default")
+        DB_SESSION_DURATION.observe(time.perf_counter() - started, outcome=outcome)
 
 
 async def init_db():
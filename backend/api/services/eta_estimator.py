@@ -0,0 +1,330 @@
+"""Processing-time estimates learned from completed analyses.
+
+@feature F005 - Pose Estimation Processing
+
+Implements:
+- AC-029: Processing progress logged and retrievable via status endpoint
+
+Every analysis that completes on its first attempt contributes its stage
+durations, taken from the row's stage timestamps:
+
+- pose_estimation: seconds per video frame (the inverse of throughput), so
+  a long video's estimate scales with its frame count;
+- stamp_generation, llm_analysis, report_generation: seconds;
+- job: seconds from the first stage starting to completion, which prices
+  the jobs ahead of a queued analysis.
+
+Each is kept as an exponentially weighted moving average: one O(1) update
+per completion (the first 1/ETA_SMOOTHING observations are averaged evenly,
+so a few early outliers do not stick). Until a stage has observations the
+previous heuristic (about 1000 frames per minute) stands in.
+
+Estimates are computed synchronously from a snapshot of the averages and the
+job queue depth, which each process reloads at most every
+ETA_REFRESH_SECONDS; refresh() is what touches Redis and the queue.
+
+With RedisEtaEstimator the worker updates the averages and every API
+process reads them; InMemoryEtaEstimator keeps them in the process, for
+tests.
+"""
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Optional
+
+import redis.asyncio as redis
+
+from api.config import get_settings
+from api.models.analysis import Analysis
+from api.services.job_queue import JobQueueError, analysis_job_queue
+from api.services.state_store import SharedRedisClient
+
+logger = logging.getLogger(__name__)
+
+# Pipeline stages in order
+STAGES = ("pose_estimation", "stamp_generation", "llm_analysis", "report_generation")
+
+# Estimates before any observation: pose in seconds per video frame
+# (~1000 frames per minute), the other stages in seconds
+DEFAULT_SECONDS = {
+    "pose_estimation": 0.06,
+    "stamp_generation": 5.0,
+    "llm_analysis": 30.0,
+    "report_generation": 2.0,
+}
+
+# Remaining time of a stage running longer than expected, as a fraction of
+# its expected duration
+OVERRUN_FLOOR = 0.1
+
+
+def ewma(mean: Optional[float], count: int, value: float, smoothing: float) -> float:
+    """Moving average after one more observation.
+
+    Args:
+        mean: Average so far (None = no observations)
+        count: Observations so far
+        value: New observation
+        smoothing: Weight of a new observation once warmed up
+
+    Returns:
+        Updated average
+    """
+    if mean is None:
+        return value
+    weight = max(smoothing, 1.0 / (count + 1))
+    return mean + weight * (value - mean)
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Timestamp as aware UTC (SQLite returns naive datetimes)."""
+    if value is not None and value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _seconds(start: Optional[datetime], end: Optional[datetime]) -> Optional[float]:
+    """Seconds between two timestamps, if both are set and ordered."""
+    if start is None or end is None:
+        return None
+    seconds = (_utc(end) - _utc(start)).total_seconds()
+    return seconds if seconds > 0 else None
+
+
+def stage_durations(analysis: Analysis) -> dict[str, float]:
+    """Observations contributed by a completed analysis.
+
+    Returns:
+        Averaged quantity by name (see module docstring); stages whose
+        timestamps are missing are left out
+    """
+    durations = {
+        "pose_estimation": _seconds(analysis.pose_started_at, analysis.pose_completed_at),
+        "stamp_generation": _seconds(analysis.stamps_started_at, analysis.stamps_completed_at),
+        "llm_analysis": _seconds(analysis.llm_started_at, analysis.llm_completed_at),
+        "report_generation": _seconds(analysis.llm_completed_at, analysis.completed_at),
+        "job": _seconds(analysis.started_at, analysis.completed_at),
+    }
+    if durations["pose_estimation"] is not None:
+        if analysis.total_frames:
+            durations["pose_estimation"] /= analysis.total_frames
+        else:
+            durations["pose_estimation"] = None
+    return {name: value for name, value in durations.items() if value is not None}
+
+
+class EtaEstimator(ABC):
+    """Backend-independent estimates from the averaged stage durations."""
+
+    def __init__(
+        self,
+        smoothing: Optional[float] = None,
+        refresh_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize estimator.
+
+        Args:
+            smoothing: Weight of a new observation (None = settings)
+            refresh_seconds: Snapshot lifetime (None = settings)
+            clock: Monotonic clock in seconds
+        """
+        settings = get_settings()
+        self.smoothing = smoothing or settings.eta_smoothing
+        self.refresh_seconds = (
+            settings.eta_refresh_seconds if refresh_seconds is None else refresh_seconds
+        )
+        self.worker_slots = max(1, settings.worker_concurrency)
+        self.clock = clock
+        # name -> (average, observations)
+        self._averages: dict[str, tuple[float, int]] = {}
+        # Jobs a newly queued analysis waits for
+        self._jobs_ahead = 0.0
+        self._refreshed_at: Optional[float] = None
+
+    async def refresh(self, force: bool = False) -> None:
+        """Reload the averages and queue depth if the snapshot is stale."""
+        now = self.clock()
+        if (
+            not force
+            and self._refreshed_at is not None
+            and now - self._refreshed_at < self.refresh_seconds
+        ):
+            return
+        # Failures keep the old snapshot until the next interval
+        self._refreshed_at = now
+        try:
+            self._averages = await self._load()
+        except redis.RedisError as e:
+            logger.warning("eta_estimator.load_failed", extra={"error": str(e)})
+        try:
+            stats = await analysis_job_queue.stats()
+            # Running jobs are half done on average
+            self._jobs_ahead = stats["ready"] + stats["in_flight"] / 2
+        except JobQueueError as e:
+            logger.warning("eta_estimator.queue_unavailable", extra={"error": str(e)})
+
+    async def observe(self, analysis: Analysis) -> None:
+        """Fold a completed analysis' stage durations into the averages.
+
+        Analyses that were retried are skipped: their timestamps span
+        attempts and skipped (resumed) stages.
+        """
+        if analysis.retry_count:
+            return
+        durations = stage_durations(analysis)
+        if not durations:
+            return
+        for name, value in durations.items():
+            mean, count = self._averages.get(name, (None, 0))
+            self._averages[name] = (ewma(mean, count, value, self.smoothing), count + 1)
+        try:
+            await self._record(durations)
+        except redis.RedisError as e:
+            logger.warning("eta_estimator.record_failed", extra={"error": str(e)})
+
+    def average(self, name: str) -> float:
+        """Averaged duration of a stage (or "job"), or its default."""
+        if name in self._averages:
+            return self._averages[name][0]
+        if name == "job":
+            return self.processing_seconds(None)
+        return DEFAULT_SECONDS[name]
+
+    def stage_seconds(self, stage: str, total_frames: Optional[int]) -> float:
+        """Expected duration of a stage for a video."""
+        if stage == "pose_estimation":
+            # Frame count unknown: a typical job's worth, like the old heuristic
+            return self.average(stage) * (total_frames or 1000)
+        return self.average(stage)
+
+    def processing_seconds(self, total_frames: Optional[int]) -> float:
+        """Expected time from the first stage starting to completion."""
+        return sum(self.stage_seconds(stage, total_frames) for stage in STAGES)
+
+    def queue_wait_seconds(self) -> float:
+        """Expected wait of a newly queued analysis for a worker slot."""
+        return self._jobs_ahead * self.average("job") / self.worker_slots
+
+    def estimated_minutes(self, total_frames: Optional[int]) -> int:
+        """Whole minutes until a newly queued analysis completes."""
+        seconds = self.queue_wait_seconds() + self.processing_seconds(total_frames)
+        return max(1, math.ceil(seconds / 60))
+
+    def remaining_seconds(self, analysis: Analysis, now: Optional[datetime] = None) -> float:
+        """Expected time until an unfinished analysis completes.
+
+        The current stage is credited with the time it has been running, but
+        never counted as more than 1 - OVERRUN_FLOOR done.
+        """
+        now = now or datetime.now(timezone.utc)
+        if analysis.current_stage not in STAGES:
+            # Still queued
+            return self.queue_wait_seconds() + self.processing_seconds(analysis.total_frames)
+
+        stage_started = {
+            "pose_estimation": analysis.pose_started_at,
+            "stamp_generation": analysis.stamps_started_at,
+            "llm_analysis": analysis.llm_started_at,
+            "report_generation": analysis.llm_completed_at,
+        }
+        index = STAGES.index(analysis.current_stage)
+        expected = self.stage_seconds(analysis.current_stage, analysis.total_frames)
+        elapsed = _seconds(stage_started[analysis.current_stage], now) or 0.0
+        remaining = max(expected - elapsed, expected * OVERRUN_FLOOR)
+        for stage in STAGES[index + 1:]:
+            remaining += self.stage_seconds(stage, analysis.total_frames)
+        return remaining
+
+    def estimated_completion(self, analysis: Analysis) -> str:
+        """ISO 8601 completion estimate of an unfinished analysis."""
+        now = datetime.now(timezone.utc).replace(microsecond=0)
+        return (now + timedelta(seconds=round(self.remaining_seconds(analysis, now)))).isoformat()
+
+    @abstractmethod
+    async def _load(self) -> dict[str, tuple[float, int]]:
+        """Read the shared averages."""
+
+    @abstractmethod
+    async def _record(self, durations: dict[str, float]) -> None:
+        """Fold observations into the shared averages."""
+
+
+class InMemoryEtaEstimator(EtaEstimator):
+    """Single-process estimator for tests; observe keeps the only copy."""
+
+    async def _load(self) -> dict[str, tuple[float, int]]:
+        return self._averages
+
+    async def _record(self, durations: dict[str, float]) -> None:
+        pass
+
+
+class RedisEtaEstimator(SharedRedisClient, EtaEstimator):
+    """Averages shared by the worker and API processes through Redis."""
+
+    # One hash: <name> = average, <name>:n = observations (see ewma)
+    # KEYS: hash; ARGV: smoothing, then name/value pairs
+    _RECORD = """
+local smoothing = tonumber(ARGV[1])
+for i = 2, #ARGV, 2 do
+  local name, value = ARGV[i], tonumber(ARGV[i + 1])
+  local mean = tonumber(redis.call('HGET', KEYS[1], name) or '')
+  local count = tonumber(redis.call('HGET', KEYS[1], name .. ':n') or '0')
+  if mean then
+    mean = mean + math.max(smoothing, 1 / (count + 1)) * (value - mean)
+  else
+    mean = value
+  end
+  redis.call('HSET', KEYS[1], name, string.format('%.17g', mean), name .. ':n', count + 1)
+end
+return 1
+"""
+
+    def __init__(self, client: Optional[redis.Redis] = None, key: str = "eta:stages", **kwargs: Any):
+        """Initialize estimator.
+
+        Args:
+            client: Redis client with decode_responses=True (None = the
+                process' client, see state_store)
+            key: Hash holding the averages
+            **kwargs: EtaEstimator options
+        """
+        super().__init__(**kwargs)
+        self._client = client
+        self.key = key
+        self._record_script: Optional[Any] = None
+
+    async def _load(self) -> dict[str, tuple[float, int]]:
+        fields = await self.client.hgetall(self.key)
+        averages = {}
+        for name, value in fields.items():
+            if name.endswith(":n"):
+                continue
+            try:
+                averages[name] = (float(value), int(fields.get(f"{name}:n", 1)))
+            except ValueError:
+                continue
+        return averages
+
+    async def _record(self, durations: dict[str, float]) -> None:
+        if self._record_script is None:
+            self._record_script = self.client.register_script(self._RECORD)
+        args: list[Any] = [self.smoothing]
+        for name, value in durations.items():
+            args += [name, repr(value)]
+        await self._record_script(keys=[self.key], args=args, client=self.client)
+
+
+def create_eta_estimator(backend: Optional[str] = None) -> EtaEstimator:
+    """Create the estimator for the configured backend."""
+    backend = backend or get_settings().eta_backend
+    if backend == "memory":
+        return InMemoryEtaEstimator()
+    return RedisEtaEstimator()
+
+
+# Singleton instance
+eta_estimator = create_eta_estimator()
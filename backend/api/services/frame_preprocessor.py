@@ -0,0 +1,90 @@
+"""Frame preprocessing ahead of pose estimation.
+
+@feature F005 - Pose Estimation Processing
+
+Uploads arrive at up to 4K, while MediaPipe Pose works on a 256px input.
+Colour conversion, inference and thumbnail encoding on the full-resolution
+frame waste time and memory, so each decoded frame is reduced once to a
+model-sized RGB frame that every later stage shares.
+"""
+import logging
+from typing import Optional
+
+import cv2
+import numpy as np
+
+from api.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+class FramePreprocessor:
+    """Downscale BGR frames to model input size and convert them to RGB.
+
+    Output frames are written into a ring of reusable buffers. A returned
+    frame stays valid until ``pool_size`` further frames have been prepared,
+    so the pool must cover every frame a caller holds at once (e.g. queued
+    frames in a pipeline). ``pool_size=0`` allocates a new frame per call.
+    """
+
+    def __init__(self, max_side: Optional[int] = None, pool_size: int = 1):
+        """Initialize preprocessor.
+
+        Args:
+            max_side: Longest output side in pixels (None = settings, 0 = keep size)
+            pool_size: Number of output buffers to cycle through
+        """
+        settings = get_settings()
+        self.max_side = max_side if max_side is not None else settings.pose_input_max_side
+        self.pool_size = pool_size
+
+        self._pool: list[np.ndarray] = []
+        self._next = 0
+        self._scratch: Optional[np.ndarray] = None
+
+    def target_size(self, width: int, height: int) -> tuple[int, int]:
+        """Output (width, height) for a frame, preserving aspect ratio."""
+        longest = max(width, height)
+        if self.max_side <= 0 or longest <= self.max_side:
+            return width, height
+        scale = self.max_side / longest
+        return max(1, round(width * scale)), max(1, round(height * scale))
+
+    def prepare(self, image: np.ndarray) -> np.ndarray:
+        """Downscale a BGR frame with INTER_AREA and convert it to RGB.
+
+        Converting after resizing touches far fewer pixels than converting
+        the full frame.
+
+        Args:
+            image: OpenCV image (BGR)
+
+        Returns:
+            RGB image of at most max_side pixels on its longer side
+        """
+        height, width = image.shape[:2]
+        target_w, target_h = self.target_size(width, height)
+        out = self._output_buffer((target_h, target_w, 3))
+
+        if (target_w, target_h) == (width, height):
+            return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=out)
+
+        if self._scratch is None or self._scratch.shape != out.shape:
+            self._scratch = np.empty(out.shape, dtype=np.uint8)
+        cv2.resize(image, (target_w, target_h), dst=self._scratch, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(self._scratch, cv2.COLOR_BGR2RGB, dst=out)
+
+    def _output_buffer(self, shape: tuple[int, int, int]) -> np.ndarray:
+        """Next buffer in the ring, (re)allocated if the frame size changed."""
+        if self.pool_size <= 0:
+            return np.empty(shape, dtype=np.uint8)
+
+        if len(self._pool) < self.pool_size:
+            self._pool.append(np.empty(shape, dtype=np.uint8))
+            return self._pool[-1]
+
+        buffer = self._pool[self._next]
+        if buffer.shape != shape:
+            buffer = self._pool[self._next] = np.empty(shape, dtype=np.uint8)
+        self._next = (self._next + 1) % self.pool_size
+        return buffer
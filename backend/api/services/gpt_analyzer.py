@@ -3,11 +3,13 @@
 Uses OpenAI's GPT API to generate strategic boxing feedback from pose data.
 """
 import json
+import time
 from typing import Any, Optional
 
 from openai import AsyncOpenAI
 
 from api.config import get_settings
+from api.services.metrics import LLM_REQUEST_DURATION, LLM_TOKENS_USED
 
 
 BOXING_ANALYSIS_SYSTEM_PROMPT = """당신은 수십 년 경력의 전문 복싱 코치입니다.
@@ -74,6 +76,7 @@ class GPTAnalyzer:
         # Build the analysis prompt
         user_prompt = self._build_analysis_prompt(pose_data, body_specs)
 
+        started = time.perf_counter()
         try:
             response = await self.client.chat.completions.create(
                 model=self.model,
@@ -85,6 +88,15 @@ class GPTAnalyzer:
                 temperature=0.7,
                 max_tokens=2000,
             )
+            LLM_REQUEST_DURATION.observe(
+                time.perf_counter() - started, service="gpt_analyzer", outcome="success"
+            )
+            LLM_TOKENS_USED.inc(
+                response.usage.prompt_tokens, service="gpt_analyzer", direction="prompt"
+            )
+            LLM_TOKENS_USED.inc(
+                response.usage.completion_tokens, service="gpt_analyzer", direction="completion"
+            )
 
             # Parse response
             content = response.choices[0].message.content
@@ -101,6 +113,9 @@ class GPTAnalyzer:
             # Return a default response if JSON parsing fails
             return self._get_fallback_analysis(str(e))
         except Exception as e:
+            LLM_REQUEST_DURATION.observe(
+                time.perf_counter() - started, service="gpt_analyzer", outcome="error"
+            )
             return self._get_fallback_analysis(str(e))
 
     def _build_analysis_prompt(
@@ -0,0 +1,633 @@
+"""Background job queue for the analysis pipeline.
+
+@feature F005 - Pose Estimation Processing
+
+Implements:
+- AC-029: Processing progress logged and retrievable via status endpoint
+
+ProcessingService.start_analysis enqueues one job per analysis; the worker
+process (``python -m api.worker``) reserves jobs and runs the pipeline.
+Delivery is at-least-once:
+
+- reserve() leases a job for the visibility timeout. A job that is neither
+  acked nor extended in time (worker crashed or hung) is delivered again.
+- retry() releases a failed job for another attempt after an exponential
+  backoff; bury() moves it to the dead-letter list for inspection.
+  retry() tells "attempts exhausted" apart from "lease lost" (RetryOutcome),
+  so only the worker still holding a job records its final failure.
+- Every delivery increments Job.attempts, so the worker can give up on a job
+  that keeps timing out.
+
+Leases carry a receipt: ack/extend/retry from a worker whose lease already
+expired (and was handed to another worker) are ignored.
+
+Ready jobs are not served FIFO: each has a priority class and an owner, and
+the next job is chosen by priority, aging and per-user fair share (see
+job_scheduler). Retried and redelivered jobs keep their fair-share tag.
+
+JobQueue is the abstract interface. RedisJobQueue serves deployments;
+InMemoryJobQueue is for tests, where it works within one process only.
+"""
+import asyncio
+import json
+import logging
+import secrets
+import time
+from abc import ABC, abstractmethod
+from enum import Enum
+from typing import Any, Callable, Optional
+
+import redis.asyncio as redis
+
+from api.config import get_settings
+from api.services.job_scheduler import (
+    PRIORITY_CLASSES,
+    WAIT_SAMPLES,
+    FairShareScheduler,
+    priority_rank,
+    wait_stats,
+)
+from api.services.metrics import PROCESSING_QUEUE_SIZE
+from api.services.state_store import SharedRedisClient
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueError(Exception):
+    """Base exception for job queue errors."""
+
+    pass
+
+
+class RetryOutcome(str, Enum):
+    """Result of JobQueue.retry."""
+
+    RETRYING = "retrying"  # released for another attempt
+    EXHAUSTED = "exhausted"  # out of attempts, buried
+    LEASE_LOST = "lease_lost"  # another worker holds the job; nothing changed
+
+
+class Job:
+    """A reserved job.
+
+    Attributes:
+        id: Job identifier (the analysis ID for analysis jobs)
+        payload: JSON-serializable job arguments
+        attempts: Deliveries so far, including this one
+        receipt: Lease token of this delivery
+    """
+
+    def __init__(self, id: str, payload: dict[str, Any], attempts: int, receipt: str):
+        self.id = id
+        self.payload = payload
+        self.attempts = attempts
+        self.receipt = receipt
+
+    def __repr__(self) -> str:
+        return f"Job(id={self.id!r}, attempts={self.attempts})"
+
+
+class JobQueue(ABC):
+    """Interface and shared settings of the queue backends."""
+
+    def __init__(
+        self,
+        visibility_timeout: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        retry_backoff: Optional[float] = None,
+        aging_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize queue limits.
+
+        Args:
+            visibility_timeout: Lease length in seconds (None = settings)
+            max_attempts: Deliveries before retry() gives up (None = settings)
+            retry_backoff: Base retry delay in seconds (None = settings)
+            aging_seconds: Wait that promotes a job's priority class one
+                level (None = settings)
+            clock: Wall clock in seconds (shared across worker processes)
+        """
+        settings = get_settings()
+        self.visibility_timeout = (
+            visibility_timeout
+            if visibility_timeout is not None
+            else settings.job_visibility_timeout_seconds
+        )
+        self.max_attempts = max_attempts or settings.job_max_attempts
+        self.retry_backoff = (
+            retry_backoff if retry_backoff is not None else settings.job_retry_backoff_seconds
+        )
+        self.aging_seconds = aging_seconds or settings.scheduler_aging_seconds
+        self.clock = clock
+
+    def retry_delay(self, attempts: int) -> float:
+        """Backoff before the attempt after `attempts` deliveries."""
+        return self.retry_backoff * 2 ** max(0, attempts - 1)
+
+    @abstractmethod
+    async def enqueue(
+        self,
+        payload: dict[str, Any],
+        job_id: Optional[str] = None,
+        priority: str = "pose",
+        user_id: Optional[str] = None,
+        weight: float = 1.0,
+        cost: float = 1.0,
+    ) -> str:
+        """Add a job; a job_id already queued or running is not added twice.
+
+        Args:
+            payload: JSON-serializable job arguments
+            job_id: Job identifier (None = random)
+            priority: Priority class, one of PRIORITY_CLASSES
+            user_id: Owner for fair share (None = the job is its own owner)
+            weight: Owner's fair-share weight
+            cost: Expected work of the job, in any consistent unit
+
+        Returns:
+            The job ID
+
+        Raises:
+            JobSchedulerError: If the priority class is unknown
+        """
+
+    async def reserve(self, timeout: float = 0.0, poll_interval: float = 0.1) -> Optional[Job]:
+        """Lease the next ready job, waiting up to timeout seconds for one.
+
+        Returns:
+            The job, or None if none became ready in time
+        """
+        deadline = self.clock() + timeout
+        while True:
+            job = await self._reserve_now()
+            if job is not None or self.clock() >= deadline:
+                return job
+            await asyncio.sleep(min(poll_interval, max(0.0, deadline - self.clock())))
+
+    @abstractmethod
+    async def extend(self, job: Job) -> bool:
+        """Renew the job's lease for another visibility timeout.
+
+        Returns:
+            False if the lease was lost
+        """
+
+    @abstractmethod
+    async def ack(self, job: Job) -> bool:
+        """Remove a finished job.
+
+        Returns:
+            False if the lease was lost (the job may run again elsewhere)
+        """
+
+    async def retry(self, job: Job, error: str) -> RetryOutcome:
+        """Release a failed job for another attempt after the backoff delay.
+
+        Buries the job instead once it has used max_attempts deliveries.
+
+        Returns:
+            RETRYING if the job will run again, EXHAUSTED if it was buried,
+            LEASE_LOST if the lease expired (the job is left to its new holder)
+        """
+        if job.attempts >= self.max_attempts:
+            if await self.bury(job, error):
+                return RetryOutcome.EXHAUSTED
+            return RetryOutcome.LEASE_LOST
+        if await self._release(job, error, self.retry_delay(job.attempts)):
+            return RetryOutcome.RETRYING
+        return RetryOutcome.LEASE_LOST
+
+    @abstractmethod
+    async def bury(self, job: Job, error: str) -> bool:
+        """Move a job to the dead-letter list.
+
+        Returns:
+            False if the lease was lost
+        """
+
+    @abstractmethod
+    async def stats(self) -> dict[str, Any]:
+        """Queue depth and wait times.
+
+        Returns:
+            Counts (ready, in_flight, delayed, dead), ready_by_priority,
+            oldest_wait_seconds per class, and wait_seconds (count, p50, p95,
+            max) over the last dispatched jobs
+        """
+
+    async def export_metrics(self) -> None:
+        """Set processing_queue_size from stats (a metrics collector)."""
+        stats = await self.stats()
+        for queue in ("ready", "in_flight", "delayed", "dead"):
+            PROCESSING_QUEUE_SIZE.set(stats[queue], queue=queue)
+
+    @abstractmethod
+    async def _reserve_now(self) -> Optional[Job]:
+        """Lease the next ready job without waiting."""
+
+    @abstractmethod
+    async def _release(self, job: Job, error: str, delay: float) -> bool:
+        """Return a leased job to the queue after delay seconds."""
+
+
+class InMemoryJobQueue(JobQueue):
+    """Single-process queue for tests."""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._scheduler = FairShareScheduler(self.aging_seconds, self.clock)
+        self._payloads: dict[str, dict[str, Any]] = {}
+        self._attempts: dict[str, int] = {}
+        self._receipts: dict[str, str] = {}
+        self._errors: dict[str, str] = {}
+        # job_id -> (priority, tag, user_id)
+        self._schedule: dict[str, tuple[str, float, str]] = {}
+        self._in_flight: dict[str, float] = {}
+        self._delayed: dict[str, float] = {}
+        self._dead: list[str] = []
+
+    async def enqueue(
+        self,
+        payload: dict[str, Any],
+        job_id: Optional[str] = None,
+        priority: str = "pose",
+        user_id: Optional[str] = None,
+        weight: float = 1.0,
+        cost: float = 1.0,
+    ) -> str:
+        priority_rank(priority)
+        job_id = job_id or secrets.token_hex(16)
+        if job_id in self._payloads:
+            return job_id
+        user_id = user_id or job_id
+        self._payloads[job_id] = payload
+        self._attempts[job_id] = 0
+        self._schedule[job_id] = (priority, self._scheduler.tag(user_id, weight, cost), user_id)
+        self._make_ready(job_id)
+        return job_id
+
+    async def extend(self, job: Job) -> bool:
+        if not self._holds(job):
+            return False
+        self._in_flight[job.id] = self.clock() + self.visibility_timeout
+        return True
+
+    async def ack(self, job: Job) -> bool:
+        if not self._holds(job):
+            return False
+        del self._in_flight[job.id]
+        for store in (self._payloads, self._attempts, self._receipts, self._errors, self._schedule):
+            store.pop(job.id, None)
+        return True
+
+    async def bury(self, job: Job, error: str) -> bool:
+        if not self._holds(job):
+            return False
+        del self._in_flight[job.id]
+        self._errors[job.id] = error
+        self._dead.append(job.id)
+        return True
+
+    async def stats(self) -> dict[str, Any]:
+        return {
+            "ready": len(self._scheduler),
+            "in_flight": len(self._in_flight),
+            "delayed": len(self._delayed),
+            "dead": len(self._dead),
+            **self._scheduler.stats(),
+        }
+
+    def dead_jobs(self) -> list[tuple[str, str]]:
+        """Dead-lettered (job ID, last error) pairs."""
+        return [(job_id, self._errors.get(job_id, "")) for job_id in self._dead]
+
+    async def _reserve_now(self) -> Optional[Job]:
+        now = self.clock()
+        for job_id, due in list(self._delayed.items()):
+            if due <= now:
+                del self._delayed[job_id]
+                self._make_ready(job_id)
+        for job_id, deadline in list(self._in_flight.items()):
+            if deadline <= now:
+                # Lease expired: the worker died or hung
+                del self._in_flight[job_id]
+                self._make_ready(job_id)
+
+        job_id = self._scheduler.pop()
+        if job_id is None:
+            return None
+        self._attempts[job_id] += 1
+        self._receipts[job_id] = secrets.token_hex(8)
+        self._in_flight[job_id] = now + self.visibility_timeout
+        return Job(job_id, self._payloads[job_id], self._attempts[job_id], self._receipts[job_id])
+
+    async def _release(self, job: Job, error: str, delay: float) -> bool:
+        if not self._holds(job):
+            return False
+        del self._in_flight[job.id]
+        self._errors[job.id] = error
+        self._delayed[job.id] = self.clock() + delay
+        return True
+
+    def _make_ready(self, job_id: str) -> None:
+        """Hand a job to the scheduler under its original tag."""
+        priority, tag, user_id = self._schedule[job_id]
+        self._scheduler.push(job_id, priority, tag, user_id)
+
+    def _holds(self, job: Job) -> bool:
+        """Whether the job's lease is still current."""
+        return job.id in self._in_flight and self._receipts.get(job.id) == job.receipt
+
+
+# Keys: per priority class a ready zset (score = fair-share tag) and an aged
+# zset (score = time the job became ready, for stats); in-flight zset
+# (score = lease deadline), delayed zset (score = due time), dead list; the
+# scheduler's virtual time, last tag per user and recent dispatch waits; one
+# hash per job under the job prefix. Tags are stored as %.17g strings so the per-user
+# "last tag" check compares exactly.
+
+# KEYS: ready zset, aged zset, virtual time, user tags
+# ARGV[3] = payload, [4] = priority, [5] = user, [6] = now, [7] = cost / weight
+_ENQUEUE = """
+local job = ARGV[1] .. ARGV[2]
+if redis.call('HSETNX', job, 'payload', ARGV[3]) == 0 then
+  return 0
+end
+local vtime = tonumber(redis.call('GET', KEYS[3]) or '0')
+local last = tonumber(redis.call('HGET', KEYS[4], ARGV[5]) or '0')
+local tag = string.format('%.17g', math.max(last, vtime) + tonumber(ARGV[7]))
+redis.call('HSET', KEYS[4], ARGV[5], tag)
+redis.call('HSET', job, 'attempts', 0, 'priority', ARGV[4], 'user', ARGV[5],
+  'tag', tag, 'ready_at', ARGV[6])
+redis.call('ZADD', KEYS[1], tag, ARGV[2])
+redis.call('ZADD', KEYS[2], ARGV[6], ARGV[2])
+return 1
+"""
+
+# KEYS: in-flight, delayed, virtual time, user tags, waits, then the ready
+# zsets and the aged zsets in PRIORITY_CLASSES order
+# ARGV[2] = now, [3] = visibility timeout, [4] = receipt, [5] = aging seconds,
+# [6] = wait samples kept, [7..] = PRIORITY_CLASSES
+_RESERVE = """
+local inflight, delayed, vtime_key, user_tags, waits = KEYS[1], KEYS[2], KEYS[3], KEYS[4], KEYS[5]
+local prefix, now, aging = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[5])
+local n = #ARGV - 6
+local rank = {}
+for i = 1, n do
+  rank[ARGV[6 + i]] = i
+end
+
+-- Retried and redelivered jobs keep their tag but wait afresh
+local function make_ready(id)
+  local job = prefix .. id
+  local fields = redis.call('HMGET', job, 'priority', 'tag')
+  local i = rank[fields[1]]
+  redis.call('HSET', job, 'ready_at', ARGV[2])
+  redis.call('ZADD', KEYS[5 + i], fields[2], id)
+  redis.call('ZADD', KEYS[5 + n + i], ARGV[2], id)
+end
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', delayed, '-inf', now)) do
+  redis.call('ZREM', delayed, id)
+  make_ready(id)
+end
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', inflight, '-inf', now)) do
+  redis.call('ZREM', inflight, id)
+  make_ready(id)
+end
+
+-- Each class competes with its lowest-tag job, one level higher per aging
+-- interval that job has waited; a tie goes to the natively higher class
+local best, best_rank, id
+for i = 1, n do
+  local head = redis.call('ZRANGE', KEYS[5 + i], 0, 0)[1]
+  if head then
+    local ready_at = tonumber(redis.call('HGET', prefix .. head, 'ready_at'))
+    local effective = (i - 1) - math.floor((now - ready_at) / aging)
+    if best == nil or effective < best then
+      best, best_rank, id = effective, i, head
+    end
+  end
+end
+if best == nil then
+  return nil
+end
+redis.call('ZREM', KEYS[5 + best_rank], id)
+redis.call('ZREM', KEYS[5 + n + best_rank], id)
+
+local job = prefix .. id
+local fields = redis.call('HMGET', job, 'tag', 'ready_at', 'user')
+if tonumber(fields[1]) > tonumber(redis.call('GET', vtime_key) or '0') then
+  redis.call('SET', vtime_key, fields[1])
+end
+if redis.call('HGET', user_tags, fields[3]) == fields[1] then
+  redis.call('HDEL', user_tags, fields[3])
+end
+redis.call('LPUSH', waits, now - tonumber(fields[2]))
+redis.call('LTRIM', waits, 0, tonumber(ARGV[6]) - 1)
+
+local attempts = redis.call('HINCRBY', job, 'attempts', 1)
+redis.call('HSET', job, 'receipt', ARGV[4])
+redis.call('ZADD', inflight, now + tonumber(ARGV[3]), id)
+return {id, redis.call('HGET', job, 'payload'), attempts}
+"""
+
+# Shared lease check: the job is in flight under this receipt
+_HOLDS = """
+local job = ARGV[1] .. ARGV[2]
+if not redis.call('ZSCORE', KEYS[1], ARGV[2])
+    or redis.call('HGET', job, 'receipt') ~= ARGV[3] then
+  return 0
+end
+"""
+
+_EXTEND = _HOLDS + """
+redis.call('ZADD', KEYS[1], 'XX', ARGV[4], ARGV[2])
+return 1
+"""
+
+_ACK = _HOLDS + """
+redis.call('ZREM', KEYS[1], ARGV[2])
+redis.call('DEL', job)
+return 1
+"""
+
+# ARGV[4] = error, ARGV[5] = due time; KEYS[2] = delayed zset or dead list
+_RELEASE = _HOLDS + """
+redis.call('ZREM', KEYS[1], ARGV[2])
+redis.call('HSET', job, 'error', ARGV[4])
+if ARGV[5] == '' then
+  redis.call('RPUSH', KEYS[2], ARGV[2])
+else
+  redis.call('ZADD', KEYS[2], ARGV[5], ARGV[2])
+end
+return 1
+"""
+
+
+class RedisJobQueue(SharedRedisClient, JobQueue):
+    """Queue shared by the API and worker processes through Redis.
+
+    Each operation is a single Lua script, so reserving, acking and
+    redelivering expired leases are atomic across workers.
+    """
+
+    def __init__(
+        self,
+        name: Optional[str] = None,
+        client: Optional[redis.Redis] = None,
+        **kwargs: Any,
+    ):
+        """Initialize queue.
+
+        Args:
+            name: Key namespace (None = settings.job_queue_name)
+            client: Redis client with decode_responses=True (None = the
+                process' client, see state_store)
+            **kwargs: JobQueue limits
+        """
+        super().__init__(**kwargs)
+        name = name or get_settings().job_queue_name
+        self._client = client
+        self._ready = {priority: f"jobs:{name}:ready:{priority}" for priority in PRIORITY_CLASSES}
+        self._aged = {priority: f"jobs:{name}:aged:{priority}" for priority in PRIORITY_CLASSES}
+        self._virtual_time = f"jobs:{name}:vtime"
+        self._user_tags = f"jobs:{name}:user_tags"
+        self._waits = f"jobs:{name}:waits"
+        self._in_flight = f"jobs:{name}:in_flight"
+        self._delayed = f"jobs:{name}:delayed"
+        self._dead = f"jobs:{name}:dead"
+        self._job_prefix = f"jobs:{name}:job:"
+        self._scripts: dict[str, Any] = {}
+
+    async def enqueue(
+        self,
+        payload: dict[str, Any],
+        job_id: Optional[str] = None,
+        priority: str = "pose",
+        user_id: Optional[str] = None,
+        weight: float = 1.0,
+        cost: float = 1.0,
+    ) -> str:
+        priority_rank(priority)
+        job_id = job_id or secrets.token_hex(16)
+        await self._run(
+            "enqueue",
+            _ENQUEUE,
+            [self._ready[priority], self._aged[priority], self._virtual_time, self._user_tags],
+            [
+                job_id,
+                json.dumps(payload),
+                priority,
+                user_id or job_id,
+                self.clock(),
+                cost / max(weight, 1e-9),
+            ],
+        )
+        return job_id
+
+    async def extend(self, job: Job) -> bool:
+        deadline = self.clock() + self.visibility_timeout
+        return bool(await self._run_leased("extend", _EXTEND, [self._in_flight], job, deadline))
+
+    async def ack(self, job: Job) -> bool:
+        return bool(await self._run_leased("ack", _ACK, [self._in_flight], job))
+
+    async def bury(self, job: Job, error: str) -> bool:
+        return bool(await self._run_leased(
+            "release", _RELEASE, [self._in_flight, self._dead], job, error, ""
+        ))
+
+    async def stats(self) -> dict[str, Any]:
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for priority in PRIORITY_CLASSES:
+                    pipe.zcard(self._ready[priority])
+                    pipe.zrange(self._aged[priority], 0, 0, withscores=True)
+                pipe.zcard(self._in_flight)
+                pipe.zcard(self._delayed)
+                pipe.llen(self._dead)
+                pipe.lrange(self._waits, 0, -1)
+                results = await pipe.execute()
+        except redis.RedisError as e:
+            raise JobQueueError(f"Job queue unavailable: {e}") from e
+
+        now = self.clock()
+        depth, oldest = {}, {}
+        for i, priority in enumerate(PRIORITY_CLASSES):
+            depth[priority] = results[2 * i]
+            head = results[2 * i + 1]
+            oldest[priority] = round(now - head[0][1], 3) if head else None
+        in_flight, delayed, dead, waits = results[2 * len(PRIORITY_CLASSES):]
+        return {
+            "ready": sum(depth.values()),
+            "in_flight": in_flight,
+            "delayed": delayed,
+            "dead": dead,
+            "ready_by_priority": depth,
+            "oldest_wait_seconds": oldest,
+            "wait_seconds": wait_stats([float(wait) for wait in waits]),
+        }
+
+    async def _reserve_now(self) -> Optional[Job]:
+        receipt = secrets.token_hex(8)
+        result = await self._run(
+            "reserve",
+            _RESERVE,
+            [
+                self._in_flight,
+                self._delayed,
+                self._virtual_time,
+                self._user_tags,
+                self._waits,
+                *(self._ready[priority] for priority in PRIORITY_CLASSES),
+                *(self._aged[priority] for priority in PRIORITY_CLASSES),
+            ],
+            [
+                self.clock(),
+                self.visibility_timeout,
+                receipt,
+                self.aging_seconds,
+                WAIT_SAMPLES,
+                *PRIORITY_CLASSES,
+            ],
+        )
+        if not result:
+            return None
+        job_id, payload, attempts = result
+        return Job(job_id, json.loads(payload), int(attempts), receipt)
+
+    async def _release(self, job: Job, error: str, delay: float) -> bool:
+        return bool(await self._run_leased(
+            "release", _RELEASE, [self._in_flight, self._delayed], job, error, self.clock() + delay
+        ))
+
+    async def _run_leased(self, name: str, source: str, keys: list[str], job: Job, *args: Any) -> Any:
+        """Run a script that checks the job's lease first."""
+        return await self._run(name, source, keys, [job.id, job.receipt, *args])
+
+    async def _run(self, name: str, source: str, keys: list[str], args: list[Any]) -> Any:
+        """Run a Lua script; ARGV[1] is always the job key prefix.
+
+        Raises:
+            JobQueueError: If Redis is unreachable or the script fails
+        """
+        script = self._scripts.get(name)
+        if script is None:
+            script = self._scripts[name] = self.client.register_script(source)
+        try:
+            return await script(keys=keys, args=[self._job_prefix, *args], client=self.client)
+        except redis.RedisError as e:
+            raise JobQueueError(f"Job queue unavailable: {e}") from e
+
+
+def create_job_queue(backend: Optional[str] = None) -> JobQueue:
+    """Create the analysis job queue for the configured backend."""
+    backend = backend or get_settings().job_queue_backend
+    if backend == "memory":
+        return InMemoryJobQueue()
+    return RedisJobQueue()
+
+
+# Singleton instance
+analysis_job_queue = create_job_queue()
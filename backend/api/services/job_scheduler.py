@@ -0,0 +1,189 @@
+"""Priority and fair-share ordering of ready analysis jobs.
+
+@feature F005 - Pose Estimation Processing
+
+Implements the worker policy from ARCHITECTURE.md (priority queues:
+thumbnail high, pose medium, llm low) plus per-user fairness:
+
+- Priority classes: a worker takes the highest non-empty class first.
+- Aging: each class competes with its next job; after that job has waited
+  ``aging_seconds`` the class counts one level higher, and so on, so
+  low-priority work cannot starve behind a steady stream of high-priority
+  jobs. On a tie the natively higher class wins.
+- Weighted fair share within a class (self-clocked fair queueing): each job
+  gets a virtual finish tag ``max(user's last tag, virtual time) + cost /
+  weight`` when queued, and the lowest tag runs first. A guest queueing 50
+  videos gets tags 1..50; a user arriving later starts at the current virtual
+  time, so their job runs after at most one more of the guest's. Virtual time
+  is the tag of the last dispatched job, so idle users bank no credit.
+
+FairShareScheduler is the in-process implementation (InMemoryJobQueue and
+the benchmark use it); RedisJobQueue's Lua scripts apply the same rules to
+the same tags.
+"""
+import heapq
+import math
+import time
+from collections import deque
+from typing import Any, Callable, Optional
+
+from api.config import get_settings
+
+# Highest priority first
+PRIORITY_CLASSES = ("thumbnail", "pose", "llm")
+
+# Dispatched-job wait times kept for stats
+WAIT_SAMPLES = 1000
+
+
+class JobSchedulerError(Exception):
+    """Base exception for job scheduling errors."""
+
+    pass
+
+
+def priority_rank(priority: str) -> int:
+    """Index of a priority class (0 = highest).
+
+    Raises:
+        JobSchedulerError: If the class is unknown
+    """
+    try:
+        return PRIORITY_CLASSES.index(priority)
+    except ValueError:
+        raise JobSchedulerError(f"Unknown priority class: {priority}") from None
+
+
+def wait_stats(waits: list[float]) -> dict[str, Optional[float]]:
+    """Count, p50, p95 and max of wait times in seconds."""
+    if not waits:
+        return {"count": 0, "p50": None, "p95": None, "max": None}
+    ordered = sorted(waits)
+
+    def percentile(q: float) -> float:
+        # Nearest-rank percentile
+        return round(ordered[max(0, math.ceil(q * len(ordered)) - 1)], 3)
+
+    return {
+        "count": len(ordered),
+        "p50": percentile(0.50),
+        "p95": percentile(0.95),
+        "max": round(ordered[-1], 3),
+    }
+
+
+class FairShareScheduler:
+    """Ready-job ordering by priority class, aging and per-user fair share.
+
+    Not thread-safe; InMemoryJobQueue runs on one event loop.
+    """
+
+    def __init__(
+        self,
+        aging_seconds: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Initialize scheduler.
+
+        Args:
+            aging_seconds: Wait that promotes a class one level (None = settings)
+            clock: Wall clock in seconds
+        """
+        self.aging_seconds = aging_seconds or get_settings().scheduler_aging_seconds
+        self.clock = clock
+        self.virtual_time = 0.0
+        self._user_tags: dict[str, float] = {}
+
+        # Per class: heap by tag, with lazy deletion
+        self._by_tag: list[list[tuple[float, str]]] = [[] for _ in PRIORITY_CLASSES]
+        # job_id -> (class rank, tag, ready_at, user_id)
+        self._ready: dict[str, tuple[int, float, float, str]] = {}
+        self._waits: deque[float] = deque(maxlen=WAIT_SAMPLES)
+
+    def __len__(self) -> int:
+        """Number of ready jobs."""
+        return len(self._ready)
+
+    def tag(self, user_id: str, weight: float = 1.0, cost: float = 1.0) -> float:
+        """Assign the virtual finish tag of a newly queued job.
+
+        Args:
+            user_id: Job owner (the fairness unit)
+            weight: Owner's share relative to other users
+            cost: Expected work of the job (e.g. minutes of processing)
+
+        Returns:
+            Tag to push the job with
+        """
+        start = max(self._user_tags.get(user_id, 0.0), self.virtual_time)
+        tag = start + cost / max(weight, 1e-9)
+        self._user_tags[user_id] = tag
+        return tag
+
+    def push(
+        self,
+        job_id: str,
+        priority: str,
+        tag: float,
+        user_id: str,
+        ready_at: Optional[float] = None,
+    ) -> None:
+        """Make a job ready (new, retried or redelivered) under its tag."""
+        rank = priority_rank(priority)
+        ready_at = self.clock() if ready_at is None else ready_at
+        self._ready[job_id] = (rank, tag, ready_at, user_id)
+        heapq.heappush(self._by_tag[rank], (tag, job_id))
+
+    def pop(self) -> Optional[str]:
+        """Take the next job to run, or None if nothing is ready."""
+        now = self.clock()
+        best: Optional[tuple[int, str]] = None
+        for rank in range(len(PRIORITY_CLASSES)):
+            head = self._head(self._by_tag[rank])
+            if head is None:
+                continue
+            job_id = head[1]
+            waited = now - self._ready[job_id][2]
+            effective = rank - int(waited // self.aging_seconds)
+            if best is None or effective < best[0]:
+                best = (effective, job_id)
+        if best is None:
+            return None
+
+        job_id = best[1]
+        _, tag, ready_at, user_id = self._ready.pop(job_id)
+        self.virtual_time = max(self.virtual_time, tag)
+        if self._user_tags.get(user_id) == tag:
+            # User's last queued job: nothing left to be fair about
+            del self._user_tags[user_id]
+        self._waits.append(now - ready_at)
+        return job_id
+
+    def stats(self) -> dict[str, Any]:
+        """Ready depth and oldest wait per class, and recent dispatch waits."""
+        now = self.clock()
+        depth = {priority: 0 for priority in PRIORITY_CLASSES}
+        oldest: dict[str, Optional[float]] = {priority: None for priority in PRIORITY_CLASSES}
+        for rank, _, ready_at, _ in self._ready.values():
+            priority = PRIORITY_CLASSES[rank]
+            depth[priority] += 1
+            wait = round(now - ready_at, 3)
+            oldest[priority] = max(oldest[priority] or 0.0, wait)
+        return {
+            "ready_by_priority": depth,
+            "oldest_wait_seconds": oldest,
+            "wait_seconds": wait_stats(list(self._waits)),
+        }
+
+    def _head(self, heap: list[tuple[float, str]]) -> Optional[tuple[float, str]]:
+        """Lowest live tag of a class heap.
+
+        Entries of jobs popped or pushed again since are dropped on the way.
+        """
+        while heap:
+            tag, job_id = heap[0]
+            entry = self._ready.get(job_id)
+            if entry is not None and entry[1] == tag:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
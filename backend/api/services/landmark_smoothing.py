@@ -0,0 +1,263 @@
+"""Landmark trajectory smoothing ahead of stamp detection.
+
+@feature F006 - Stamp Generation
+
+Implements:
+- AC-030: Strikes detected by arm velocity and trajectory patterns
+
+Strike velocity is a two-frame difference, so MediaPipe's frame-to-frame
+jitter alone can cross the jab threshold and produce spurious stamps. The
+filters here smooth whole ``(frames, joints, 3)`` coordinate arrays:
+
+- One-Euro: causal and adaptive (little smoothing while a joint moves fast,
+  a lot while it is still). Recursive in time, vectorized across joints, and
+  usable frame by frame (OneEuroFilter), so the streaming detector applies
+  the exact same filter.
+- Savitzky-Golay: centered least-squares polynomial fit, fully vectorized.
+  Preserves peak shape better but needs future frames, so batch only.
+
+Missing joints (NaN) are never filled in: One-Euro restarts a joint after a
+gap, and Savitzky-Golay keeps the raw value where its window has a gap.
+"""
+import logging
+import math
+from typing import Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from api.config import get_settings
+from api.services.pose_sequence import VISIBILITY, PoseSequence
+
+logger = logging.getLogger(__name__)
+
+SMOOTHING_METHODS = ("none", "one_euro", "savgol")
+
+
+class LandmarkSmoothingError(Exception):
+    """Base exception for landmark smoothing errors."""
+
+    pass
+
+
+class OneEuroFilter:
+    """Vectorized One-Euro filter, fed one frame of values at a time.
+
+    Every element of the value array is filtered independently; NaN elements
+    are passed through and restart that element's filter.
+    """
+
+    def __init__(self, min_cutoff: float, beta: float, d_cutoff: float = 1.0):
+        """Initialize filter.
+
+        Args:
+            min_cutoff: Cutoff frequency (Hz) while the value is still
+            beta: Cutoff increase per unit/s of speed
+            d_cutoff: Cutoff frequency (Hz) for the speed estimate
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all filter state."""
+        self._value: Optional[np.ndarray] = None
+        self._speed: Optional[np.ndarray] = None
+        self._timestamp: Optional[float] = None
+
+    @staticmethod
+    def _alpha(cutoff, dt: float):
+        """Smoothing factor of a first-order low-pass at cutoff Hz."""
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, values: np.ndarray, timestamp: float, dt: float) -> np.ndarray:
+        """Filter one frame.
+
+        Args:
+            values: Raw values (any shape, constant between calls)
+            timestamp: Frame timestamp in seconds
+            dt: Fallback frame interval when timestamps do not advance
+
+        Returns:
+            Filtered values as float64
+        """
+        values = values.astype(np.float64)
+        if self._value is None:
+            self._value = values
+            self._speed = np.zeros_like(values)
+            self._timestamp = timestamp
+            return values.copy()
+
+        if timestamp > self._timestamp:
+            dt = timestamp - self._timestamp
+        self._timestamp = timestamp
+
+        delta = values - self._value
+        speed = self._speed + self._alpha(self.d_cutoff, dt) * (delta / dt - self._speed)
+        alpha = self._alpha(self.min_cutoff + self.beta * np.abs(speed), dt)
+        filtered = self._value + alpha * delta
+
+        # NaN in the input or the state marks a gap; skip the masking otherwise
+        if np.isnan(delta).any():
+            present = ~np.isnan(values)
+            restart = present & np.isnan(self._value)
+            filtered[restart] = values[restart]
+            speed[restart] = 0.0
+            # Missing elements stay missing and restart once they reappear
+            speed[~present] = 0.0
+
+        self._value = filtered
+        self._speed = speed
+        return filtered.copy()
+
+
+def one_euro_smooth(
+    coords: np.ndarray,
+    timestamps: np.ndarray,
+    fps: float,
+    min_cutoff: float,
+    beta: float,
+    d_cutoff: float = 1.0,
+) -> np.ndarray:
+    """One-Euro filter along axis 0 of a (frames, ...) array.
+
+    Args:
+        coords: (frames, joints, 3) coordinates, NaN where missing
+        timestamps: (frames,) timestamps in seconds
+        fps: Frame rate, used when timestamps do not advance
+        min_cutoff: Cutoff frequency (Hz) while a joint is still
+        beta: Cutoff increase per unit/s of joint speed
+        d_cutoff: Cutoff frequency (Hz) for the speed estimate
+
+    Returns:
+        Smoothed float64 array of the same shape
+    """
+    smoother = OneEuroFilter(min_cutoff, beta, d_cutoff)
+    out = np.empty(coords.shape, dtype=np.float64)
+    dt = 1.0 / fps
+    for i in range(len(coords)):
+        out[i] = smoother(coords[i], float(timestamps[i]), dt)
+    return out
+
+
+def savgol_smooth(coords: np.ndarray, window: int, polyorder: int) -> np.ndarray:
+    """Savitzky-Golay filter along axis 0 of a (frames, ...) array.
+
+    Each value is replaced by a least-squares polynomial fit over the window
+    centered on it. The first and last window // 2 frames are evaluated on
+    the fit of the first and last full window. Values whose window has a
+    NaN keep their raw value.
+
+    Args:
+        coords: (frames, joints, 3) coordinates, NaN where missing
+        window: Odd window length in frames
+        polyorder: Polynomial order, less than window
+
+    Returns:
+        Smoothed float64 array of the same shape
+
+    Raises:
+        LandmarkSmoothingError: If window or polyorder is invalid
+    """
+    if window % 2 == 0 or window < 3 or not 0 <= polyorder < window:
+        raise LandmarkSmoothingError(
+            f"Invalid Savitzky-Golay window {window} / polyorder {polyorder}"
+        )
+
+    raw = coords.astype(np.float64)
+    if len(raw) < window:
+        return raw
+
+    # projection[k] evaluates the window's polynomial fit at position k
+    half = window // 2
+    vander = np.vander(np.arange(-half, half + 1), polyorder + 1, increasing=True)
+    projection = vander @ np.linalg.pinv(vander)
+
+    # (frames - window + 1, ..., window) views, no copy
+    windows = sliding_window_view(raw, window, axis=0)
+    out = np.empty_like(raw)
+    out[half:len(raw) - half] = windows @ projection[half]
+    out[:half] = np.moveaxis(windows[0] @ projection[:half].T, -1, 0)
+    out[len(raw) - half:] = np.moveaxis(windows[-1] @ projection[half + 1:].T, -1, 0)
+
+    return np.where(np.isnan(out), raw, out)
+
+
+class LandmarkSmoother:
+    """Smooth the x, y, z trajectories of a PoseSequence.
+
+    AC-030: Strikes detected by arm velocity and trajectory patterns
+    """
+
+    def __init__(self, method: Optional[str] = None):
+        """Initialize smoother.
+
+        Args:
+            method: "one_euro", "savgol" or "none" (None = settings)
+
+        Raises:
+            LandmarkSmoothingError: If the method is unknown
+        """
+        self.settings = get_settings()
+        self.method = method or self.settings.stamp_smoothing
+        if self.method not in SMOOTHING_METHODS:
+            raise LandmarkSmoothingError(f"Unknown smoothing method: {self.method}")
+
+    def new_filter(self) -> Optional[OneEuroFilter]:
+        """Per-frame filter equivalent to smooth() (None = no smoothing).
+
+        Raises:
+            LandmarkSmoothingError: If the method needs future frames
+        """
+        if self.method == "none":
+            return None
+        if self.method != "one_euro":
+            raise LandmarkSmoothingError(f"Smoothing method {self.method} cannot run frame by frame")
+        return OneEuroFilter(
+            self.settings.stamp_one_euro_min_cutoff,
+            self.settings.stamp_one_euro_beta,
+        )
+
+    def smooth(self, sequence: PoseSequence) -> PoseSequence:
+        """Return a copy of the sequence with smoothed coordinates.
+
+        Visibility, confidence and timing are shared with the input.
+
+        Args:
+            sequence: Pose sequence
+
+        Returns:
+            Smoothed PoseSequence (the input itself if method is "none")
+        """
+        if self.method == "none" or len(sequence) == 0:
+            return sequence
+
+        coords = sequence.landmarks[..., :VISIBILITY]
+        if self.method == "one_euro":
+            smoothed = one_euro_smooth(
+                coords,
+                sequence.timestamps,
+                sequence.fps,
+                self.settings.stamp_one_euro_min_cutoff,
+                self.settings.stamp_one_euro_beta,
+            )
+        else:
+            smoothed = savgol_smooth(
+                coords,
+                self.settings.stamp_savgol_window,
+                self.settings.stamp_savgol_polyorder,
+            )
+
+        landmarks = sequence.landmarks.copy()
+        landmarks[..., :VISIBILITY] = smoothed
+        return PoseSequence(
+            landmarks,
+            sequence.confidence,
+            sequence.timestamps,
+            sequence.frame_numbers,
+            sequence.bounding_boxes,
+            fps=sequence.fps,
+            header=sequence.header,
+        )
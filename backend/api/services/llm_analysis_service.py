@@ -14,11 +14,13 @@ import asyncio
 import json
 import logging
 import os
+import time
 from datetime import datetime, timezone
 from typing import Any, Optional
 from uuid import UUID
 
 from api.models.report import DEFAULT_DISCLAIMER
+from api.services.metrics import LLM_REQUEST_DURATION, LLM_TOKENS_USED
 
 logger = logging.getLogger(__name__)
 
@@ -423,6 +425,7 @@ IMPORTANT:
         last_error = None
 
         for attempt in range(self._max_retries):
+            started = time.perf_counter()
             try:
                 logger.info(
                     "llm.call_attempt",
@@ -445,6 +448,15 @@ IMPORTANT:
                     max_tokens=2000,
                     response_format={"type": "json_object"},
                 )
+                LLM_REQUEST_DURATION.observe(
+                    time.perf_counter() - started, service="llm_analysis", outcome="success"
+                )
+                LLM_TOKENS_USED.inc(
+                    response.usage.prompt_tokens, service="llm_analysis", direction="prompt"
+                )
+                LLM_TOKENS_USED.inc(
+                    response.usage.completion_tokens, service="llm_analysis", direction="completion"
+                )
 
                 return {
                     "content": response.choices[0].message.content,
@@ -455,6 +467,9 @@ IMPORTANT:
 
             except Exception as e:
                 last_error = e
+                LLM_REQUEST_DURATION.observe(
+                    time.perf_counter() - started, service="llm_analysis", outcome="error"
+                )
                 logger.warning(
                     "llm.call_failed",
                     extra={
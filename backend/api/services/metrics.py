@@ -0,0 +1,480 @@
+"""In-process metrics exposed in the Prometheus text format.
+
+Implements the request and processing metrics of ARCHITECTURE.md
+(Observability -> Metrics). GET /metrics on the API, and on
+WORKER_METRICS_PORT for each worker, renders every metric of the process.
+
+Metrics are plain counters, gauges and histograms kept in memory: recording
+one takes a lock and a dict lookup, cheap enough for hot paths, though
+per-frame loops still accumulate locally and record once per video. Label
+names are fixed when a metric is created; values are passed as keyword
+arguments. Gauges that are cheaper to read than to maintain (queue depth)
+are set by collectors run just before each render.
+
+Every process keeps its own values; Prometheus scrapes each API and worker
+process and aggregates across them.
+"""
+import asyncio
+import bisect
+import logging
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, from a fast request to a long analysis stage
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0,
+)
+
+# Bytes, from a JSON body to a video upload chunk
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216, 67108864)
+
+
+class MetricsError(Exception):
+    """Raised when a metric is declared or labelled inconsistently."""
+
+    pass
+
+
+def _format_value(value: float) -> str:
+    """Sample value in the exposition format."""
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    """Label value with backslashes, quotes and newlines escaped."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    """Rendered label set, e.g. {method="GET",path="/health"}."""
+    if not names:
+        return ""
+    pairs = ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values))
+    return "{" + pairs + "}"
+
+
+class Metric:
+    """A named metric family with fixed label names."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()):
+        """Initialize metric.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Label names every sample must set
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], object] = {}
+
+    def _key(self, labels: dict[str, object]) -> tuple[str, ...]:
+        """Label values in label-name order."""
+        if len(labels) != len(self.labelnames):
+            raise MetricsError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError:
+            raise MetricsError(
+                f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}"
+            ) from None
+
+    def clear(self) -> None:
+        """Drop every sample."""
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> list[str]:
+        """HELP, TYPE and sample lines."""
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        with self._lock:
+            samples = sorted(self._values.items())
+        for key, value in samples:
+            lines.extend(self._render_sample(key, value))
+        return lines
+
+    def _render_sample(self, key: tuple[str, ...], value: object) -> list[str]:
+        return [f"{self.name}{_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        """Add to the count of a label set."""
+        if amount < 0:
+            raise MetricsError(f"{self.name}: counters only go up")
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: object) -> float:
+        """Current count of a label set."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(Metric):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: object) -> None:
+        """Set the value of a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: object) -> None:
+        """Add to the value of a label set."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: object) -> None:
+        """Subtract from the value of a label set."""
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: object) -> float:
+        """Current value of a label set."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class _HistogramValue:
+    """Per-bucket (non-cumulative) counts, sum and count of one label set."""
+
+    __slots__ = ("buckets", "sum", "count")
+
+    def __init__(self, size: int):
+        self.buckets = [0] * size
+        self.sum = 0.0
+        self.count = 0
+
+
+class Histogram(Metric):
+    """Distribution of observations over fixed upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        """Initialize histogram.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Label names every sample must set
+            buckets: Increasing upper bounds (+Inf is implied)
+        """
+        super().__init__(name, documentation, labelnames)
+        if list(buckets) != sorted(set(buckets)):
+            raise MetricsError(f"{name}: buckets must be strictly increasing")
+        self.buckets = tuple(float(bound) for bound in buckets)
+
+    def observe(self, value: float, **labels: object) -> None:
+        """Record one observation for a label set."""
+        key = self._key(labels)
+        # First bucket whose upper bound is >= value; len(buckets) = +Inf
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            sample = self._values.get(key)
+            if sample is None:
+                sample = self._values[key] = _HistogramValue(len(self.buckets) + 1)
+            sample.buckets[index] += 1
+            sample.sum += value
+            sample.count += 1
+
+    @contextmanager
+    def time(self, **labels: object) -> Iterator[None]:
+        """Observe the seconds spent in the block (also when it raises)."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels: object) -> int:
+        """Observations of a label set."""
+        with self._lock:
+            sample = self._values.get(self._key(labels))
+            return sample.count if sample is not None else 0
+
+    def sum(self, **labels: object) -> float:
+        """Sum of the observations of a label set."""
+        with self._lock:
+            sample = self._values.get(self._key(labels))
+            return sample.sum if sample is not None else 0.0
+
+    def _render_sample(self, key: tuple[str, ...], value: object) -> list[str]:
+        names = self.labelnames + ("le",)
+        lines = []
+        cumulative = 0
+        for bound, observed in zip(self.buckets + (math.inf,), value.buckets):
+            cumulative += observed
+            labels = _labels(names, key + (_format_value(bound),))
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(value.sum)}")
+        lines.append(f"{self.name}_count{labels} {value.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """The metrics of one process and the collectors refreshing them."""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: list[Callable[[], Awaitable[None]]] = []
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        """Get or create a counter."""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: tuple[str, ...] = ()) -> Gauge:
+        """Get or create a gauge."""
+        return self._register(Gauge, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """Get or create a histogram."""
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[Metric]:
+        """Registered metric by name."""
+        return self._metrics.get(name)
+
+    def add_collector(self, collector: Callable[[], Awaitable[None]]) -> None:
+        """Run a coroutine function before every render (once per function)."""
+        if collector not in self._collectors:
+            self._collectors.append(collector)
+
+    async def collect(self) -> None:
+        """Run the collectors; a failing one leaves its metrics as they were."""
+        for collector in self._collectors:
+            try:
+                await collector()
+            except Exception as e:
+                name = getattr(collector, "__qualname__", repr(collector))
+                logger.warning(
+                    "metrics.collector_failed", extra={"collector": name, "error": str(e)}
+                )
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text format."""
+        lines: list[str] = []
+        for metric in sorted(self._metrics.values(), key=lambda metric: metric.name):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    async def exposition(self) -> str:
+        """Collect, then render."""
+        await self.collect()
+        return self.render()
+
+    async def serve(self, host: str, port: int) -> asyncio.AbstractServer:
+        """Serve GET /metrics over plain HTTP (for processes without FastAPI).
+
+        Returns:
+            The listening server; close it to stop
+        """
+        return await asyncio.start_server(self._handle, host, port)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer one HTTP/1.0-style request and close the connection."""
+        try:
+            request_line = await reader.readline()
+            # Skip the headers; there is no body to read
+            while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                body = (await self.exposition()).encode()
+                status, content_type = "200 OK", CONTENT_TYPE
+            else:
+                body = b"Not Found\n"
+                status, content_type = "404 Not Found", "text/plain"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        except (ConnectionError, UnicodeDecodeError):
+            pass
+        finally:
+            writer.close()
+
+    def _register(
+        self, cls: type, name: str, documentation: str, labelnames: tuple[str, ...], **kwargs
+    ):
+        """Return the metric of that name, creating it on first use."""
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif type(metric) is not cls or metric.labelnames != tuple(labelnames):
+                raise MetricsError(f"{name} is already registered as a different metric")
+            return metric
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording the request metrics.
+
+    Requests are labelled with their route template (/api/v1/reports/{report_id}),
+    not the raw path, so label sets stay bounded; unmatched paths share one
+    label. WebSocket connections are not counted.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method=method, path=path, status=status)
+            HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, method=method, path=path)
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    try:
+                        HTTP_REQUEST_SIZE.observe(int(value), method=method, path=path)
+                    except ValueError:
+                        pass
+                    break
+
+
+# Singleton instance
+metrics = MetricsRegistry()
+
+# Metrics of ARCHITECTURE.md (Observability -> Metrics) and their neighbours
+HTTP_REQUESTS = metrics.counter(
+    "http_requests_total", "HTTP requests handled", ("method", "path", "status")
+)
+HTTP_REQUEST_DURATION = metrics.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency until the response completed",
+    ("method", "path"),
+)
+HTTP_REQUEST_SIZE = metrics.histogram(
+    "http_request_size_bytes",
+    "HTTP request body size (Content-Length)",
+    ("method", "path"),
+    buckets=SIZE_BUCKETS,
+)
+PROCESSING_JOBS = metrics.counter(
+    "processing_jobs_total",
+    "Analysis stages and jobs finished, by outcome",
+    ("stage", "status"),
+)
+PROCESSING_DURATION = metrics.histogram(
+    "processing_duration_seconds",
+    "Time spent in each analysis pipeline stage",
+    ("stage",),
+)
+PROCESSING_QUEUE_SIZE = metrics.gauge(
+    "processing_queue_size",
+    "Analysis jobs in the job queue, by state",
+    ("queue",),
+)
+POSE_STEP_DURATION = metrics.histogram(
+    "pose_step_duration_seconds",
+    "Time one video spent decoding frames and running pose inference",
+    ("mode", "step"),
+)
+STAMP_DETECTION_DURATION = metrics.histogram(
+    "stamp_detection_duration_seconds",
+    "Time to detect the actions of one analysis",
+)
+STAMPS_DETECTED = metrics.counter(
+    "stamps_detected_total",
+    "Action stamps detected",
+    ("type",),
+)
+LLM_REQUEST_DURATION = metrics.histogram(
+    "llm_request_duration_seconds",
+    "Latency of LLM completion calls",
+    ("service", "outcome"),
+)
+LLM_TOKENS_USED = metrics.counter(
+    "llm_tokens_used_total",
+    "LLM tokens billed",
+    ("service", "direction"),
+)
+DB_SESSION_DURATION = metrics.histogram(
+    "db_session_duration_seconds",
+    "Lifetime of database sessions, by how they ended",
+    ("outcome",),
+)
+DB_SESSIONS_ACTIVE = metrics.gauge(
+    "db_connections_active",
+    "Database sessions currently open",
+    ("pool",),
+)
+ADMISSION_IN_FLIGHT = metrics.gauge(
+    "admission_in_flight",
+    "Requests admitted by an admission controller and still running",
+    ("endpoint",),
+)
+ADMISSION_QUEUE_LENGTH = metrics.gauge(
+    "admission_queue_length",
+    "Requests waiting for an admission slot",
+    ("endpoint",),
+)
+ADMISSION_REJECTIONS = metrics.counter(
+    "admission_rejections_total",
+    "Requests rejected with 429, by reason",
+    ("endpoint", "reason"),
+)
+ADMISSION_WAIT = metrics.histogram(
+    "admission_wait_seconds",
+    "Time requests spent waiting for an admission slot",
+    ("endpoint",),
+)
@@ -0,0 +1,289 @@
+"""Process-pool pose estimation engine.
+
+@feature F005 - Pose Estimation Processing
+
+Runs MediaPipe Pose in a pool of worker processes so inference is not bound
+to a single interpreter. Each worker holds its own warmed-up ``Pose`` graph.
+Frames are handed to workers in batches through shared memory; only the
+block name and array shape are pickled.
+
+When MediaPipe cannot be loaded in the workers the engine falls back to the
+in-process ``VideoProcessor.estimate_pose_rgb`` path. The startup probe
+reaches one worker only, so a worker whose graph failed to load hands its
+batches back to be run in-process too. A frame MediaPipe fails on is a
+failed frame (None), not a failed batch.
+"""
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Optional
+
+import numpy as np
+
+from api.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Side length of the blank frame used to warm up each worker's graph
+WARMUP_FRAME_SIZE = 256
+
+
+class PoseEngineError(Exception):
+    """Base exception for pose engine errors."""
+
+    pass
+
+
+# --- Worker process side ---
+
+# One MediaPipe Pose graph per worker process (set by _init_worker)
+_worker_pose = None
+
+
+def _init_worker(model_complexity: int) -> None:
+    """Create and warm up the worker's MediaPipe Pose graph."""
+    global _worker_pose
+    try:
+        import mediapipe as mp
+
+        _worker_pose = mp.solutions.pose.Pose(
+            static_image_mode=True,
+            model_complexity=model_complexity,
+            enable_segmentation=False,
+            min_detection_confidence=0.5,
+        )
+        # First call loads the TFLite model; pay it before real work arrives
+        _worker_pose.process(
+            np.zeros((WARMUP_FRAME_SIZE, WARMUP_FRAME_SIZE, 3), dtype=np.uint8)
+        )
+    except Exception as e:
+        logger.warning(f"Pose worker could not load MediaPipe: {e}")
+        _worker_pose = None
+
+
+def _worker_ready() -> bool:
+    """Report whether the worker loaded MediaPipe."""
+    return _worker_pose is not None
+
+
+def _estimate_batch_worker(
+    shm_name: str,
+    shape: tuple[int, ...],
+    dtype: str,
+) -> Optional[list[Optional[dict[str, Any]]]]:
+    """Run pose estimation on a batch of RGB frames stored in shared memory.
+
+    Returns:
+        Pose data per frame (None where no pose was detected or estimation
+        failed), or None if this worker has no graph
+    """
+    from api.services.video_processor import VideoProcessor
+
+    if _worker_pose is None:
+        return None
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        batch = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+        results = []
+        for rgb_image in batch:
+            try:
+                output = _worker_pose.process(rgb_image)
+                results.append(VideoProcessor.landmarks_to_pose_data(output.pose_landmarks))
+            except Exception as e:
+                logger.warning(f"Pose estimation failed: {e}")
+                results.append(None)
+        # Drop the view before closing, shared memory refuses to close with exports
+        del batch
+        return results
+    finally:
+        shm.close()
+
+
+# --- Parent process side ---
+
+
+def write_shared_batch(frames: list[np.ndarray]) -> shared_memory.SharedMemory:
+    """Copy same-shaped frames into a new shared memory block.
+
+    The caller owns the block and must ``close()`` and ``unlink()`` it.
+    """
+    shape = (len(frames),) + frames[0].shape
+    nbytes = int(np.prod(shape)) * frames[0].dtype.itemsize
+    shm = shared_memory.SharedMemory(create=True, size=nbytes)
+    batch = np.ndarray(shape, dtype=frames[0].dtype, buffer=shm.buf)
+    for i, frame in enumerate(frames):
+        batch[i] = frame
+    del batch
+    return shm
+
+
+class PoseEstimationEngine:
+    """Pose estimation backed by a pool of MediaPipe worker processes.
+
+    The pool is started lazily on first use and probed once; if workers
+    cannot load MediaPipe, estimation runs in-process instead. Batches
+    returned unprocessed by a worker without a graph run in-process as well.
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        batch_size: Optional[int] = None,
+    ):
+        """Initialize engine without starting worker processes."""
+        settings = get_settings()
+        self.workers = workers or settings.pose_workers or os.cpu_count() or 1
+        self.batch_size = max(1, batch_size or settings.pose_batch_size)
+        self.model_complexity = 1
+
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_available: Optional[bool] = None
+        self._lock = threading.Lock()
+
+    def _ensure_pool(self) -> bool:
+        """Start and probe the worker pool once."""
+        if self._pool_available is not None:
+            return self._pool_available
+
+        with self._lock:
+            if self._pool_available is not None:
+                return self._pool_available
+
+            try:
+                pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_worker,
+                    initargs=(self.model_complexity,),
+                )
+                ready = pool.submit(_worker_ready).result()
+            except Exception as e:
+                logger.warning(f"Pose worker pool failed to start: {e}")
+                pool, ready = None, False
+
+            if ready:
+                self._pool = pool
+                logger.info(
+                    "pose_engine.started",
+                    extra={"workers": self.workers, "batch_size": self.batch_size},
+                )
+            else:
+                if pool is not None:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                logger.warning("MediaPipe not available in pose workers. Using in-process fallback.")
+
+            self._pool_available = ready
+            return ready
+
+    def estimate_batch(self, images: list[np.ndarray]) -> list[Optional[dict[str, Any]]]:
+        """Estimate pose for a list of RGB frames.
+
+        Args:
+            images: RGB images (see FramePreprocessor), typically from one video
+
+        Returns:
+            Pose data per frame (None where no pose was detected), in input order
+        """
+        if not images:
+            return []
+
+        if not self._ensure_pool():
+            from api.services.video_processor import video_processor
+
+            return [video_processor.estimate_pose_rgb(image) for image in images]
+
+        # Keep a bounded number of batches in flight to cap shared memory use
+        max_in_flight = self.workers * 2
+        pending: list[tuple[Future, shared_memory.SharedMemory, list[np.ndarray]]] = []
+        results: list[Optional[dict[str, Any]]] = []
+
+        try:
+            for batch in self._split_batches(images):
+                if len(pending) >= max_in_flight:
+                    results.extend(self._collect(*pending.pop(0)))
+
+                shm = write_shared_batch(batch)
+                try:
+                    future = self._pool.submit(
+                        _estimate_batch_worker,
+                        shm.name,
+                        (len(batch),) + batch[0].shape,
+                        batch[0].dtype.str,
+                    )
+                except Exception:
+                    self._release(shm)
+                    raise
+                pending.append((future, shm, batch))
+
+            while pending:
+                results.extend(self._collect(*pending.pop(0)))
+        finally:
+            for future, shm, _ in pending:
+                future.cancel()
+                self._release(shm)
+
+        return results
+
+    def _split_batches(self, images: list[np.ndarray]) -> list[list[np.ndarray]]:
+        """Group consecutive same-shaped frames into batches of batch_size."""
+        batches: list[list[np.ndarray]] = []
+        for image in images:
+            if (
+                batches
+                and len(batches[-1]) < self.batch_size
+                and batches[-1][0].shape == image.shape
+                and batches[-1][0].dtype == image.dtype
+            ):
+                batches[-1].append(image)
+            else:
+                batches.append([image])
+        return batches
+
+    def _collect(
+        self,
+        future: Future,
+        shm: shared_memory.SharedMemory,
+        batch: list[np.ndarray],
+    ) -> list[Optional[dict[str, Any]]]:
+        """Wait for a batch result and free its shared memory block.
+
+        A batch the worker returned unprocessed is run in-process.
+        """
+        try:
+            results = future.result()
+        except Exception as e:
+            raise PoseEngineError(f"Pose worker failed: {e}") from e
+        finally:
+            self._release(shm)
+
+        if results is None:
+            from api.services.video_processor import video_processor
+
+            logger.warning("pose_engine.worker_unavailable", extra={"frames": len(batch)})
+            return [video_processor.estimate_pose_rgb(image) for image in batch]
+        return results
+
+    @staticmethod
+    def _release(shm: shared_memory.SharedMemory) -> None:
+        """Close and unlink a shared memory block."""
+        shm.close()
+        try:
+            shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def shutdown(self) -> None:
+        """Stop worker processes."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+            self._pool_available = None
+
+
+# Singleton instance
+pose_engine = PoseEstimationEngine()
@@ -0,0 +1,417 @@
+"""Dense pose extraction producing the PoseData schema.
+
+@feature F005 - Pose Estimation Processing
+
+Implements:
+- AC-025: Video processed with 33-joint XYZ coordinate extraction
+- AC-026: Selected subject tracked across frames via bounding box
+- AC-027: Successful pose data stored in structured JSON
+
+Walks every frame (or every Nth frame at a target fps) and emits
+``schemas.analysis.PoseFrame``-compatible dicts, which is the input
+``StampDetectionService`` expects. The work is split into three pipelined
+stages connected by bounded queues:
+
+    decode thread ──▶ inference (caller thread) ──▶ serialize thread
+
+The decode stage downscales each frame to model input size (FramePreprocessor)
+so queued frames stay small. Decoding and JSON-shaping overlap with MediaPipe
+inference, which runs on a crop around the selected subject (SubjectROI) when
+its bounding box is known. An optional StreamingStampDetector is fed from the
+serialize stage, so stamp detection overlaps with extraction too.
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+import numpy as np
+
+from api.config import get_settings
+from api.services.analysis_executor import analysis_executor
+from api.services.frame_preprocessor import FramePreprocessor
+from api.services.metrics import POSE_STEP_DURATION
+from api.services.pose_sequence import POSE_LANDMARK_NAMES
+from api.services.pose_tracker import FULL_FRAME, SUBJECT_CROP, PoseTracker, SubjectROI
+from api.services.streaming_stamp_detector import StreamingStampDetector
+from api.services.video_processor import VideoProcessingError, video_processor
+
+logger = logging.getLogger(__name__)
+
+# Joints that define frame confidence: head, arms and torso. Legs are often
+# out of shot in sparring footage and would drag every frame's score down.
+CONFIDENCE_JOINTS = (0, 11, 12, 13, 14, 15, 16, 23, 24)
+
+# Joints must be at least this visible to count toward the bounding box
+BBOX_VISIBILITY_THRESHOLD = 0.5
+
+# Queue end marker between pipeline stages
+_END = object()
+
+
+class PoseExtractionError(Exception):
+    """Base exception for dense pose extraction errors."""
+
+    pass
+
+
+def _clamp(value: float, low: float = 0.0, high: float = 1.0) -> float:
+    """Clamp value into [low, high]."""
+    return low if value < low else high if value > high else value
+
+
+class PoseExtractionService:
+    """Service producing full per-frame pose data for an analysis.
+
+    AC-025: Video processed with 33-joint XYZ coordinate extraction
+    AC-027: Successful pose data stored in structured JSON
+    """
+
+    def __init__(self, queue_size: int = 32):
+        """Initialize service.
+
+        Args:
+            queue_size: Capacity of each inter-stage queue (bounds decoded
+                frames held in memory)
+        """
+        self.settings = get_settings()
+        self.queue_size = queue_size
+
+    async def run(
+        self,
+        video_path: str,
+        analysis_id: UUID | str,
+        subject_id: UUID | str,
+        video_id: Optional[UUID | str] = None,
+        target_fps: Optional[float] = None,
+        initial_bbox: Optional[dict[str, int]] = None,
+        detector: Optional[StreamingStampDetector] = None,
+        on_progress: Optional[Callable[[int, int, int], None]] = None,
+    ) -> dict[str, Any]:
+        """Run extract_pose_data on the analysis executor.
+
+        Raises:
+            ExecutorSaturatedError: If no analysis executor slot is free
+        """
+        return await analysis_executor.run(
+            self.extract_pose_data,
+            video_path,
+            analysis_id,
+            subject_id,
+            video_id=video_id,
+            target_fps=target_fps,
+            initial_bbox=initial_bbox,
+            detector=detector,
+            on_progress=on_progress,
+        )
+
+    def extract_pose_data(
+        self,
+        video_path: str,
+        analysis_id: UUID | str,
+        subject_id: UUID | str,
+        video_id: Optional[UUID | str] = None,
+        target_fps: Optional[float] = None,
+        initial_bbox: Optional[dict[str, int]] = None,
+        detector: Optional[StreamingStampDetector] = None,
+        on_progress: Optional[Callable[[int, int, int], None]] = None,
+    ) -> dict[str, Any]:
+        """Extract dense pose data for a video (blocking).
+
+        Args:
+            video_path: Path to video file
+            analysis_id: Analysis identifier
+            subject_id: Subject identifier
+            video_id: Video identifier
+            target_fps: Sampling rate (None = settings, 0 = every frame)
+            initial_bbox: Subject.initial_bbox in pixels; seeds the ROI
+            detector: Streaming stamp detector fed every pose frame; finished
+                when extraction completes (its fps defaults to the output fps)
+            on_progress: Called from the extraction thread after every frame
+                with (frames walked, frames failed, frames expected)
+
+        Returns:
+            PoseData-compatible dict
+        """
+        info = video_processor.probe_video(video_path)
+        if target_fps is None:
+            target_fps = self.settings.pose_target_fps
+        stride = video_processor._frame_stride(info["fps"], target_fps)
+        fps = info["fps"] / stride if info["fps"] > 0 else None
+        if detector is not None and detector.fps is None:
+            detector.fps = fps
+        expected_frames = -(-info["total_frames"] // stride)
+
+        decoded: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        inferred: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        errors: list[BaseException] = []
+        pose_frames: list[dict[str, Any]] = []
+        counts = {"walked": 0, "failed": 0}
+        # Seconds summed over the video, recorded once at the end
+        timings = {"decode": 0.0, "inference": 0.0}
+
+        # Frames in flight: both queues plus one held by each stage
+        preprocessor = FramePreprocessor(pool_size=self.queue_size + 2)
+
+        def decode() -> None:
+            try:
+                mark = time.perf_counter()
+                for frame_data in video_processor.iter_frames(video_path, stride=stride):
+                    image = frame_data.pop("image")
+                    frame_data["source_size"] = (image.shape[1], image.shape[0])
+                    frame_data["rgb"] = preprocessor.prepare(image)
+                    del image
+                    # Time spent waiting on a full queue is not decoding
+                    timings["decode"] += time.perf_counter() - mark
+                    if not self._put(decoded, frame_data, stop):
+                        return
+                    mark = time.perf_counter()
+            except BaseException as e:
+                errors.append(e)
+            finally:
+                self._put(decoded, _END, stop)
+
+        def serialize() -> None:
+            try:
+                while True:
+                    item = inferred.get()
+                    if item is _END:
+                        return
+                    pose_frame = self.build_pose_frame(*item)
+                    pose_frames.append(pose_frame)
+                    if detector is not None:
+                        detector.push(pose_frame)
+            except BaseException as e:
+                errors.append(e)
+                stop.set()
+
+        started = time.perf_counter()
+        tracker = PoseTracker()
+        roi = (
+            SubjectROI(initial_bbox, bbox_frame_size=(info["width"], info["height"]))
+            if self.settings.pose_roi_enabled
+            else None
+        )
+        decoder = threading.Thread(target=decode, name="pose-decode", daemon=True)
+        serializer = threading.Thread(target=serialize, name="pose-serialize", daemon=True)
+        decoder.start()
+        serializer.start()
+
+        try:
+            if not tracker.available:
+                logger.warning("pose_extraction.mediapipe_unavailable", extra={"video_path": video_path})
+
+            while not stop.is_set():
+                frame_data = decoded.get()
+                if frame_data is _END:
+                    break
+
+                counts["walked"] += 1
+                width, height = frame_data["source_size"]
+                rgb_image = frame_data.pop("rgb")
+                inference_started = time.perf_counter()
+                landmarks = self._infer(tracker, roi, rgb_image) if tracker.available else None
+                timings["inference"] += time.perf_counter() - inference_started
+                del rgb_image
+
+                if landmarks is None:
+                    counts["failed"] += 1
+                if on_progress is not None:
+                    on_progress(counts["walked"], counts["failed"], expected_frames)
+                if landmarks is None:
+                    continue
+
+                self._put(
+                    inferred,
+                    (
+                        frame_data["frame_index"],
+                        frame_data["timestamp_seconds"],
+                        landmarks,
+                        width,
+                        height,
+                    ),
+                    stop,
+                )
+        finally:
+            stop.set()
+            # Unblock the decoder if it is waiting on a full queue
+            while decoder.is_alive():
+                try:
+                    decoded.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            # The serializer drains until _END unless it already died
+            while serializer.is_alive():
+                try:
+                    inferred.put(_END, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            serializer.join()
+            decoder.join()
+            tracker.close()
+            for step, seconds in timings.items():
+                POSE_STEP_DURATION.observe(seconds, mode="dense", step=step)
+
+        if errors:
+            if isinstance(errors[0], VideoProcessingError):
+                raise errors[0]
+            raise PoseExtractionError(f"Pose extraction failed: {errors[0]}") from errors[0]
+        if counts["walked"] == 0:
+            raise VideoProcessingError("No frames extracted from video")
+        if detector is not None:
+            detector.finish()
+
+        elapsed = time.perf_counter() - started
+        logger.info(
+            "pose_extraction.complete",
+            extra={
+                "analysis_id": str(analysis_id),
+                "frames_walked": counts["walked"],
+                "frames_failed": counts["failed"],
+                "duration_seconds": round(elapsed, 2),
+                "frames_per_second": round(counts["walked"] / elapsed, 1) if elapsed else None,
+            },
+        )
+
+        return {
+            "analysis_id": str(analysis_id),
+            "subject_id": str(subject_id),
+            "video_id": str(video_id) if video_id else None,
+            "total_frames": counts["walked"],
+            "successful_frames": len(pose_frames),
+            "failed_frames": counts["failed"],
+            "fps": fps,
+            "tracking": tracker.stats(),
+            "frames": pose_frames,
+        }
+
+    @staticmethod
+    def _infer(
+        tracker: PoseTracker,
+        roi: Optional[SubjectROI],
+        image,
+    ) -> Optional[list[Any]]:
+        """Track the subject in one frame, cropping to the ROI if enabled.
+
+        AC-026: Selected subject tracked across frames via bounding box
+
+        Args:
+            tracker: Pose tracker bound to this video
+            roi: Subject ROI (None = always full frame)
+            image: Downscaled RGB frame
+
+        Returns:
+            Landmarks in full-frame normalized coordinates, or None
+        """
+        if roi is None:
+            result = tracker.process_rgb(image)
+            return list(result.landmark) if result else None
+
+        height, width = image.shape[:2]
+        region = roi.region(width, height)
+        x0, y0, x1, y1 = region
+        # MediaPipe needs a contiguous buffer; the crop copy is small
+        if roi.is_full_frame:
+            result = tracker.process_rgb(image, FULL_FRAME)
+        else:
+            # Crop and full frame each keep their own graph, so neither a crop
+            # move nor a fallback reloads the model
+            result = tracker.process_rgb(np.ascontiguousarray(image[y0:y1, x0:x1]), SUBJECT_CROP)
+            if result is None:
+                # Subject left the crop: retry this frame on the full frame
+                roi.lose()
+                region = (0, 0, width, height)
+                result = tracker.process_rgb(image, FULL_FRAME)
+
+        if result is None:
+            return None
+
+        landmarks = SubjectROI.to_full_frame(result.landmark, region, width, height)
+        roi.update(landmarks, width, height)
+        return landmarks
+
+    def build_pose_frame(
+        self,
+        frame_number: int,
+        timestamp_seconds: float,
+        landmarks: Any,
+        width: int,
+        height: int,
+    ) -> dict[str, Any]:
+        """Build a PoseFrame-compatible dict from MediaPipe landmarks.
+
+        AC-025: 33 joints with normalized XYZ and visibility
+        AC-026: Subject bounding box in pixel coordinates
+
+        Args:
+            frame_number: Frame index in the video
+            timestamp_seconds: Frame timestamp
+            landmarks: 33 full-frame landmarks (x, y, z, visibility)
+            width: Frame width in pixels
+            height: Frame height in pixels
+
+        Returns:
+            PoseFrame dict
+        """
+        joints = []
+        for joint_id, lm in enumerate(landmarks):
+            joints.append({
+                "joint_id": joint_id,
+                "name": POSE_LANDMARK_NAMES[joint_id],
+                "x": round(_clamp(lm.x), 4),
+                "y": round(_clamp(lm.y), 4),
+                "z": round(lm.z, 4),
+                "visibility": round(_clamp(lm.visibility), 4),
+            })
+
+        confidence = sum(joints[i]["visibility"] for i in CONFIDENCE_JOINTS) / len(CONFIDENCE_JOINTS)
+
+        return {
+            "frame_number": frame_number,
+            "timestamp_seconds": timestamp_seconds,
+            "joints": joints,
+            "confidence": round(confidence, 4),
+            "bounding_box": self._bounding_box(joints, width, height),
+        }
+
+    @staticmethod
+    def _bounding_box(
+        joints: list[dict[str, Any]],
+        width: int,
+        height: int,
+    ) -> Optional[dict[str, int]]:
+        """Pixel bounding box around visible joints (None if too few)."""
+        visible = [j for j in joints if j["visibility"] >= BBOX_VISIBILITY_THRESHOLD]
+        if len(visible) < 2:
+            return None
+
+        min_x = min(j["x"] for j in visible) * width
+        max_x = max(j["x"] for j in visible) * width
+        min_y = min(j["y"] for j in visible) * height
+        max_y = max(j["y"] for j in visible) * height
+
+        return {
+            "x": int(min_x),
+            "y": int(min_y),
+            "width": max(1, int(round(max_x - min_x))),
+            "height": max(1, int(round(max_y - min_y))),
+        }
+
+    @staticmethod
+    def _put(q: queue.Queue, item: Any, stop: threading.Event) -> bool:
+        """Put into a bounded queue, giving up once stop is set."""
+        while True:
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                if stop.is_set():
+                    return False
+
+
+# Singleton instance
+pose_extraction_service = PoseExtractionService()
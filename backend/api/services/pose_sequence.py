@@ -0,0 +1,242 @@
+"""Array-backed pose sequence.
+
+@feature F005 - Pose Estimation Processing
+
+Implements:
+- AC-027: Successful pose data stored in structured JSON
+
+The PoseData JSON holds one dict per joint per frame, about 20x the memory
+of the coordinates themselves, and every consumer rebuilds
+``{joint_id: joint}`` maps to read it. PoseSequence keeps the same data in a
+``(frames, 33, 4)`` float32 array so detectors can index joints directly and
+operate on whole trajectories.
+
+PoseData coordinates carry COORDINATE_DECIMALS decimals (see
+VideoProcessor.landmarks_to_pose_data), so pose_data_values recovers them
+exactly from the float32 array and the dict round trip is lossless.
+Arithmetic on the raw float32 values is not: a difference tested against a
+threshold can land on the other side of a tie. Detectors that must match the
+PoseData numbers read coordinates through pose_data_values.
+"""
+from typing import Any, Optional
+
+import numpy as np
+
+# MediaPipe Pose landmark names, indexed by joint_id (AC-025)
+POSE_LANDMARK_NAMES = (
+    "nose",
+    "left_eye_inner",
+    "left_eye",
+    "left_eye_outer",
+    "right_eye_inner",
+    "right_eye",
+    "right_eye_outer",
+    "left_ear",
+    "right_ear",
+    "mouth_left",
+    "mouth_right",
+    "left_shoulder",
+    "right_shoulder",
+    "left_elbow",
+    "right_elbow",
+    "left_wrist",
+    "right_wrist",
+    "left_pinky",
+    "right_pinky",
+    "left_index",
+    "right_index",
+    "left_thumb",
+    "right_thumb",
+    "left_hip",
+    "right_hip",
+    "left_knee",
+    "right_knee",
+    "left_ankle",
+    "right_ankle",
+    "left_heel",
+    "right_heel",
+    "left_foot_index",
+    "right_foot_index",
+)
+
+JOINT_COUNT = len(POSE_LANDMARK_NAMES)
+
+# Column layout of PoseSequence.landmarks[..., column]
+X, Y, Z, VISIBILITY = range(4)
+
+# Decimal places of landmark values in PoseData
+COORDINATE_DECIMALS = 4
+
+# PoseData keys that describe the whole sequence rather than frames
+_HEADER_KEYS = ("analysis_id", "subject_id", "video_id", "total_frames",
+                "successful_frames", "failed_frames", "tracking")
+
+
+def pose_data_values(values: np.ndarray) -> np.ndarray:
+    """float64 landmark values as PoseData holds them.
+
+    Args:
+        values: Slice of PoseSequence.landmarks (NaN stays NaN)
+
+    Returns:
+        The values rounded to COORDINATE_DECIMALS, equal to the PoseData
+        numbers they were stored from
+    """
+    return np.round(np.asarray(values, dtype=np.float64), COORDINATE_DECIMALS)
+
+
+class PoseSequence:
+    """Pose frames stored as NumPy arrays.
+
+    Attributes:
+        landmarks: (frames, 33, 4) float32 of x, y, z, visibility; joints
+            missing from a frame are NaN
+        confidence: (frames,) float64 pose confidence
+        timestamps: (frames,) float64 timestamps in seconds
+        frame_numbers: (frames,) int64 video frame numbers
+        bounding_boxes: (frames, 4) float32 x, y, width, height; NaN if none
+        fps: Frame rate used for velocities
+        header: Remaining PoseData fields (analysis_id, tracking, ...)
+    """
+
+    __slots__ = ("landmarks", "confidence", "timestamps", "frame_numbers",
+                 "bounding_boxes", "fps", "header")
+
+    def __init__(
+        self,
+        landmarks: np.ndarray,
+        confidence: np.ndarray,
+        timestamps: np.ndarray,
+        frame_numbers: np.ndarray,
+        bounding_boxes: Optional[np.ndarray] = None,
+        fps: float = 30.0,
+        header: Optional[dict[str, Any]] = None,
+    ):
+        """Initialize from arrays (see class attributes for shapes)."""
+        self.landmarks = landmarks
+        self.confidence = confidence
+        self.timestamps = timestamps
+        self.frame_numbers = frame_numbers
+        self.bounding_boxes = (
+            bounding_boxes
+            if bounding_boxes is not None
+            else np.full((len(landmarks), 4), np.nan, dtype=np.float32)
+        )
+        self.fps = fps
+        self.header = header or {}
+
+    def __len__(self) -> int:
+        return len(self.landmarks)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the frame arrays."""
+        return sum(
+            a.nbytes for a in (self.landmarks, self.confidence, self.timestamps,
+                               self.frame_numbers, self.bounding_boxes)
+        )
+
+    def joint(self, joint_id: int) -> np.ndarray:
+        """(frames, 4) view of one joint's trajectory."""
+        return self.landmarks[:, joint_id]
+
+    def present(self, joint_id: int) -> np.ndarray:
+        """(frames,) mask of frames where the joint was reported."""
+        return ~np.isnan(self.landmarks[:, joint_id, X])
+
+    @classmethod
+    def from_pose_data(cls, pose_data: dict[str, Any]) -> "PoseSequence":
+        """Build a sequence from a PoseData dict.
+
+        Args:
+            pose_data: PoseData dict (``frames`` and ``fps``, plus header)
+
+        Returns:
+            PoseSequence
+        """
+        header = {k: pose_data[k] for k in _HEADER_KEYS if k in pose_data}
+        return cls.from_frames(
+            pose_data.get("frames", []),
+            fps=pose_data.get("fps") or 30.0,
+            header=header,
+        )
+
+    @classmethod
+    def from_frames(
+        cls,
+        frames: list[dict[str, Any]],
+        fps: float = 30.0,
+        header: Optional[dict[str, Any]] = None,
+    ) -> "PoseSequence":
+        """Build a sequence from a list of PoseFrame dicts (see write_frame)."""
+        count = len(frames)
+        landmarks = np.full((count, JOINT_COUNT, 4), np.nan, dtype=np.float32)
+        confidence = np.zeros(count, dtype=np.float64)
+        timestamps = np.zeros(count, dtype=np.float64)
+        frame_numbers = np.zeros(count, dtype=np.int64)
+        bounding_boxes = np.full((count, 4), np.nan, dtype=np.float32)
+
+        sequence = cls(landmarks, confidence, timestamps, frame_numbers,
+                       bounding_boxes, fps=fps, header=header)
+        for i, frame in enumerate(frames):
+            sequence.write_frame(i, frame)
+        return sequence
+
+    def write_frame(self, index: int, frame: dict[str, Any]) -> None:
+        """Overwrite row index with a PoseFrame dict.
+
+        Joints missing from the frame become NaN; missing ``z`` and
+        ``visibility`` default to 0, as the detectors always treated them.
+        """
+        self.landmarks[index] = np.nan
+        for joint in frame.get("joints", []):
+            self.landmarks[index, joint["joint_id"]] = (
+                joint["x"],
+                joint["y"],
+                joint.get("z", 0),
+                joint.get("visibility", 0),
+            )
+        self.confidence[index] = frame.get("confidence", 0)
+        self.timestamps[index] = frame["timestamp_seconds"]
+        self.frame_numbers[index] = frame["frame_number"]
+        bbox = frame.get("bounding_box")
+        self.bounding_boxes[index] = (
+            (bbox["x"], bbox["y"], bbox["width"], bbox["height"]) if bbox else np.nan
+        )
+
+    def to_pose_data(self) -> dict[str, Any]:
+        """Convert back to a PoseData dict.
+
+        Returns:
+            PoseData dict with the header fields this sequence was built from
+        """
+        frames = []
+        landmarks = pose_data_values(self.landmarks)
+        for i in range(len(self)):
+            joints = [
+                {
+                    "joint_id": joint_id,
+                    "name": POSE_LANDMARK_NAMES[joint_id],
+                    "x": float(values[X]),
+                    "y": float(values[Y]),
+                    "z": float(values[Z]),
+                    "visibility": float(values[VISIBILITY]),
+                }
+                for joint_id, values in enumerate(landmarks[i])
+                if not np.isnan(values[X])
+            ]
+            bbox = self.bounding_boxes[i]
+            frames.append({
+                "frame_number": int(self.frame_numbers[i]),
+                "timestamp_seconds": float(self.timestamps[i]),
+                "joints": joints,
+                "confidence": float(self.confidence[i]),
+                "bounding_box": None if np.isnan(bbox[0]) else {
+                    "x": int(bbox[0]),
+                    "y": int(bbox[1]),
+                    "width": int(bbox[2]),
+                    "height": int(bbox[3]),
+                },
+            })
+
+        return {**self.header, "fps": self.fps, "frames": frames}
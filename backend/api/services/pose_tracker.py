@@ -0,0 +1,389 @@
+"""Temporal pose tracking for dense frame sequences.
+
+@feature F005 - Pose Estimation Processing
+
+Implements:
+- AC-026: Selected subject tracked across frames via bounding box
+
+``Pose(static_image_mode=True)`` runs the person detector on every frame.
+For consecutive frames MediaPipe's video mode (``static_image_mode=False``)
+detects once and then tracks landmarks from the previous frame, which is far
+cheaper. A PoseTracker owns such graphs for one video stream, one per view
+of it (the subject crop, the full frame), each created on first use and kept
+until the stream ends. When tracking confidence drops, the frame is also run
+through an equally long-lived ``static_image_mode=True`` graph, and the fresh
+detection is kept if it is more confident. No graph is ever rebuilt
+mid-stream: loading the model costs far more than the frames it would save.
+
+SubjectROI narrows inference to a padded crop around the selected subject,
+which is cheaper on high-resolution footage and keeps the detector off the
+sparring partner. The crop only moves when the subject nears its edge; its
+graph keeps running across a move (MediaPipe re-detects by itself if the
+shift loses the track), and falling back to the full frame switches to the
+full-frame graph instead of disturbing the crop's.
+"""
+import logging
+from typing import Any, NamedTuple, Optional, Sequence
+
+import cv2
+
+from api.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Pose estimation modes selectable on VideoProcessor
+POSE_MODES = ("sparse", "tracking")
+
+# Views of a stream, each tracked by its own graph (see PoseTracker.process_rgb)
+FULL_FRAME = "full"
+SUBJECT_CROP = "crop"
+
+# Landmarks whose visibility defines tracking confidence (shoulders, hips)
+TRACKING_LANDMARKS = (11, 12, 23, 24)
+
+# Landmarks must be at least this visible to place the ROI
+ROI_VISIBILITY_THRESHOLD = 0.5
+
+# Re-centre the ROI when the subject comes this close to its edge
+# (fraction of the ROI size)
+ROI_EDGE_MARGIN = 0.05
+
+# Re-tighten the ROI when the subject fills less than this share of it
+ROI_MIN_FILL = 0.25
+
+
+class Landmark(NamedTuple):
+    """Landmark in full-frame normalized coordinates."""
+
+    x: float
+    y: float
+    z: float
+    visibility: float
+
+
+class PoseTracker:
+    """MediaPipe video-mode pose graph bound to a single video stream.
+
+    Not thread-safe and not shareable across streams: the graph carries
+    landmark state from one frame to the next.
+    """
+
+    def __init__(
+        self,
+        model_complexity: int = 1,
+        min_detection_confidence: float = 0.5,
+        min_tracking_confidence: float = 0.5,
+        redetect_confidence: Optional[float] = None,
+    ):
+        """Initialize tracker; the graph is created on the first frame."""
+        settings = get_settings()
+        self.model_complexity = model_complexity
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.redetect_confidence = (
+            redetect_confidence
+            if redetect_confidence is not None
+            else settings.pose_redetect_confidence
+        )
+
+        # Video-mode graph per view; the one probed by available is handed
+        # to the first view used
+        self._graphs: dict[str, Any] = {}
+        self._spare = None
+        # Static-image graph for re-detection, created on first use
+        self._detector = None
+        self._available: Optional[bool] = None
+
+        # Tracking statistics (AC-026)
+        self.frames_tracked = 0
+        self.frames_lost = 0
+        self.redetections = 0
+        self._confidence_sum = 0.0
+
+    @property
+    def available(self) -> bool:
+        """Whether MediaPipe could be loaded."""
+        if self._available is None:
+            self._spare = self._create_graph()
+            self._available = self._spare is not None
+        return self._available
+
+    def _create_graph(self):
+        """Create a video-mode MediaPipe Pose graph (None if unavailable)."""
+        try:
+            import mediapipe as mp
+
+            return mp.solutions.pose.Pose(
+                static_image_mode=False,
+                model_complexity=self.model_complexity,
+                smooth_landmarks=True,
+                enable_segmentation=False,
+                min_detection_confidence=self.min_detection_confidence,
+                min_tracking_confidence=self.min_tracking_confidence,
+            )
+        except Exception as e:
+            logger.warning(f"MediaPipe tracking mode not available: {e}")
+            return None
+
+    def _create_detector(self):
+        """Create a static-image MediaPipe Pose graph (None if unavailable)."""
+        try:
+            import mediapipe as mp
+
+            return mp.solutions.pose.Pose(
+                static_image_mode=True,
+                model_complexity=self.model_complexity,
+                enable_segmentation=False,
+                min_detection_confidence=self.min_detection_confidence,
+            )
+        except Exception as e:
+            logger.warning(f"MediaPipe detection graph not available: {e}")
+            return None
+
+    def process(self, frame_image) -> Optional[Any]:
+        """Track the pose in the next frame of the stream.
+
+        Args:
+            frame_image: OpenCV image (BGR)
+
+        Returns:
+            MediaPipe ``pose_landmarks`` or None if no pose was found
+        """
+        return self.process_rgb(cv2.cvtColor(frame_image, cv2.COLOR_BGR2RGB))
+
+    def process_rgb(self, rgb_image, view: str = FULL_FRAME) -> Optional[Any]:
+        """Track the pose in an RGB frame (see process).
+
+        Args:
+            rgb_image: RGB image of the view
+            view: Which view of the stream the image is (FULL_FRAME or
+                SUBJECT_CROP); each keeps its own tracking state
+        """
+        if not self.available:
+            return None
+
+        graph = self._graph_for(view)
+        if graph is None:
+            return None
+        landmarks = graph.process(rgb_image).pose_landmarks
+        if not landmarks:
+            self.frames_lost += 1
+            return None
+
+        confidence = self.tracking_confidence(landmarks)
+        if confidence < self.redetect_confidence:
+            # Tracker is drifting: detect afresh on this frame, same graphs
+            landmarks, confidence = self._redetect(rgb_image, landmarks, confidence)
+
+        self.frames_tracked += 1
+        self._confidence_sum += confidence
+        return landmarks
+
+    def _graph_for(self, view: str):
+        """The view's video-mode graph, created on its first frame."""
+        graph = self._graphs.get(view)
+        if graph is None:
+            graph, self._spare = self._spare, None
+            if graph is None:
+                graph = self._create_graph()
+            self._graphs[view] = graph
+        return graph
+
+    def _redetect(self, rgb_image, landmarks, confidence: float) -> tuple[Any, float]:
+        """Run full detection on a frame; keep whichever result is more confident."""
+        self.redetections += 1
+        if self._detector is None:
+            self._detector = self._create_detector()
+            if self._detector is None:
+                return landmarks, confidence
+
+        detected = self._detector.process(rgb_image).pose_landmarks
+        if detected:
+            detected_confidence = self.tracking_confidence(detected)
+            if detected_confidence > confidence:
+                return detected, detected_confidence
+        return landmarks, confidence
+
+    @staticmethod
+    def tracking_confidence(pose_landmarks) -> float:
+        """Mean visibility of the torso landmarks."""
+        points = pose_landmarks.landmark
+        values = [points[idx].visibility for idx in TRACKING_LANDMARKS if idx < len(points)]
+        return sum(values) / len(values) if values else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        """Tracking statistics in the TrackingStats shape."""
+        return {
+            "frames_tracked": self.frames_tracked,
+            "frames_lost": self.frames_lost,
+            "average_confidence": round(
+                self._confidence_sum / self.frames_tracked, 4
+            ) if self.frames_tracked else 0.0,
+        }
+
+    def close(self) -> None:
+        """Release the MediaPipe graphs at the end of the stream."""
+        for graph in (*self._graphs.values(), self._spare, self._detector):
+            if graph is not None:
+                graph.close()
+        self._graphs = {}
+        self._spare = None
+        self._detector = None
+
+
+class SubjectROI:
+    """Region of interest following the selected subject.
+
+    The ROI starts at the subject's selection bounding box, then follows the
+    landmarks of the previous frame. It only moves when the subject nears its
+    edge or shrinks well inside it, so consecutive frames mostly share a crop
+    and the tracking graph keeps its state. With no subject in sight the ROI
+    is the full frame.
+    """
+
+    def __init__(
+        self,
+        initial_bbox: Optional[dict[str, int]] = None,
+        padding: Optional[float] = None,
+        bbox_frame_size: Optional[tuple[int, int]] = None,
+    ):
+        """Initialize ROI.
+
+        Args:
+            initial_bbox: Subject bounding box in pixels (x, y, width, height)
+            padding: Fraction of the subject size added on each side
+            bbox_frame_size: (width, height) initial_bbox was measured on, if
+                different from the frames passed to region()
+        """
+        settings = get_settings()
+        self.padding = padding if padding is not None else settings.pose_roi_padding
+        self._initial_bbox = initial_bbox
+        self._bbox_frame_size = bbox_frame_size
+        self._region: Optional[tuple[int, int, int, int]] = None
+
+    def region(self, width: int, height: int) -> tuple[int, int, int, int]:
+        """Current crop as pixel (x0, y0, x1, y1), full frame if none.
+
+        Args:
+            width: Frame width in pixels
+            height: Frame height in pixels
+        """
+        if self._region is None and self._initial_bbox:
+            box = self._initial_bbox
+            scale_x = scale_y = 1.0
+            if self._bbox_frame_size and all(self._bbox_frame_size):
+                scale_x = width / self._bbox_frame_size[0]
+                scale_y = height / self._bbox_frame_size[1]
+            self._region = self._pad(
+                (
+                    box["x"] * scale_x,
+                    box["y"] * scale_y,
+                    (box["x"] + box["width"]) * scale_x,
+                    (box["y"] + box["height"]) * scale_y,
+                ),
+                width,
+                height,
+            )
+            self._initial_bbox = None
+        return self._region or (0, 0, width, height)
+
+    @property
+    def is_full_frame(self) -> bool:
+        """Whether inference currently runs on the whole frame."""
+        return self._region is None and not self._initial_bbox
+
+    def lose(self) -> None:
+        """Subject lost: fall back to the full frame."""
+        self._region = None
+        self._initial_bbox = None
+
+    def update(self, landmarks: Sequence[Landmark], width: int, height: int) -> bool:
+        """Follow the subject to its latest full-frame landmarks.
+
+        Args:
+            landmarks: Landmarks in full-frame normalized coordinates
+            width: Frame width in pixels
+            height: Frame height in pixels
+
+        Returns:
+            True if the crop moved
+        """
+        visible = [lm for lm in landmarks if lm.visibility >= ROI_VISIBILITY_THRESHOLD]
+        if len(visible) < 2:
+            return False
+
+        box = (
+            min(lm.x for lm in visible) * width,
+            min(lm.y for lm in visible) * height,
+            max(lm.x for lm in visible) * width,
+            max(lm.y for lm in visible) * height,
+        )
+        x0, y0, x1, y1 = self.region(width, height)
+        margin_x = (x1 - x0) * ROI_EDGE_MARGIN
+        margin_y = (y1 - y0) * ROI_EDGE_MARGIN
+        inside = (
+            box[0] >= x0 + margin_x
+            and box[1] >= y0 + margin_y
+            and box[2] <= x1 - margin_x
+            and box[3] <= y1 - margin_y
+        )
+        fill = ((box[2] - box[0]) * (box[3] - box[1])) / max(1, (x1 - x0) * (y1 - y0))
+        if inside and fill >= ROI_MIN_FILL:
+            return False
+
+        new_region = self._pad(box, width, height)
+        if new_region == (x0, y0, x1, y1):
+            return False
+        self._region = new_region
+        return True
+
+    def _pad(
+        self,
+        box: tuple[float, float, float, float],
+        width: int,
+        height: int,
+    ) -> tuple[int, int, int, int]:
+        """Pad a pixel box by self.padding and clip it to the frame."""
+        pad_x = (box[2] - box[0]) * self.padding
+        pad_y = (box[3] - box[1]) * self.padding
+        x0 = max(0, int(box[0] - pad_x))
+        y0 = max(0, int(box[1] - pad_y))
+        x1 = min(width, int(box[2] + pad_x + 0.5))
+        y1 = min(height, int(box[3] + pad_y + 0.5))
+        if x1 - x0 < 2 or y1 - y0 < 2:
+            return (0, 0, width, height)
+        return (x0, y0, x1, y1)
+
+    @staticmethod
+    def to_full_frame(
+        landmarks: Sequence[Any],
+        region: tuple[int, int, int, int],
+        width: int,
+        height: int,
+    ) -> list[Landmark]:
+        """Map crop-normalized landmarks into full-frame normalized space.
+
+        Args:
+            landmarks: MediaPipe landmarks normalized to the crop
+            region: Crop as pixel (x0, y0, x1, y1)
+            width: Frame width in pixels
+            height: Frame height in pixels
+
+        Returns:
+            Landmarks normalized to the full frame
+        """
+        x0, y0, x1, y1 = region
+        scale_x = (x1 - x0) / width
+        scale_y = (y1 - y0) / height
+        offset_x = x0 / width
+        offset_y = y0 / height
+        # MediaPipe z shares the scale of x
+        return [
+            Landmark(
+                offset_x + lm.x * scale_x,
+                offset_y + lm.y * scale_y,
+                lm.z * scale_x,
+                lm.visibility,
+            )
+            for lm in landmarks
+        ]
@@ -15,7 +15,7 @@ from datetime import datetime, timezone
 from typing import Optional
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from api.config import get_settings
@@ -23,6 +23,16 @@ from api.models.analysis import Analysis, AnalysisStatus
 from api.models.body_specs import BodySpecs
 from api.models.subject import Subject
 from api.models.upload import Video
+from api.schemas.analysis import (
+    WSCompleteMessage,
+    WSErrorMessage,
+    WSProgressMessage,
+    WSStageCompleteMessage,
+)
+from api.services.checkpoint_store import checkpoint_store
+from api.services.eta_estimator import eta_estimator
+from api.services.job_queue import JobQueueError, analysis_job_queue
+from api.services.status_cache import status_cache
 
 logger = logging.getLogger(__name__)
 
@@ -92,6 +102,14 @@ ERROR_CODES = {
 # Failure threshold for pose estimation
 POSE_FAILURE_THRESHOLD = 0.20  # 20%
 
+# Pipeline stages in order, with the message of their progress events
+STAGE_MESSAGES = {
+    "pose_estimation": "Tracking body movement",
+    "stamp_generation": "Detecting punches and defense",
+    "llm_analysis": "Generating coaching feedback",
+    "report_generation": "Building your report",
+}
+
 
 class ProcessingService:
     """Service for managing the analysis processing pipeline.
@@ -106,6 +124,7 @@ class ProcessingService:
     def __init__(self):
         """Initialize processing service."""
         self.settings = get_settings()
+        self.job_queue = analysis_job_queue
         self.websocket_base_url = os.getenv(
             "WEBSOCKET_BASE_URL", "wss://api.punchanalytics.com"
         )
@@ -117,6 +136,7 @@ class ProcessingService:
         user_id: UUID,
         subject_id: UUID,
         body_specs_id: UUID,
+        is_guest: bool = False,
     ) -> dict:
         """Start analysis pipeline for a video.
 
@@ -128,6 +148,7 @@ class ProcessingService:
             user_id: User ID for ownership verification
             subject_id: Selected subject ID
             body_specs_id: Body specs ID
+            is_guest: Whether the user is a guest (smaller fair-share weight)
 
         Returns:
             Analysis start response with analysis_id and websocket_url
@@ -137,6 +158,8 @@ class ProcessingService:
             SubjectNotFoundError: If subject doesn't exist or isn't for this video
             BodySpecsNotFoundError: If body specs don't exist
             AnalysisAlreadyExistsError: If analysis already exists for video
+            JobQueueError: If the job could not be queued (the analysis is
+                left failed so it can be started again)
         """
         # Verify video ownership
         video = await self._get_video(session, video_id, user_id)
@@ -154,10 +177,12 @@ class ProcessingService:
                 f"Analysis already exists for video {video_id}"
             )
 
-        # Delete failed analysis if exists
+        # Delete failed analysis (and its stage checkpoints) if exists
         if existing and existing.status == AnalysisStatus.FAILED:
             await session.delete(existing)
+            status_cache.invalidate_on_commit(session, existing.id)
             await session.flush()
+            await checkpoint_store.delete_for_analysis(existing.id)
 
         # Create new analysis
         analysis = Analysis(
@@ -173,6 +198,29 @@ class ProcessingService:
         await session.flush()
         await session.refresh(analysis)
 
+        # Commit before queueing so the worker finds the row
+        await session.commit()
+        await eta_estimator.refresh()
+        try:
+            # The pipeline runs as one job, scheduled in the pose class and
+            # charged its estimated minutes against the user's fair share
+            await self.job_queue.enqueue(
+                {"analysis_id": str(analysis.id)},
+                job_id=str(analysis.id),
+                priority="pose",
+                user_id=str(user_id),
+                weight=(
+                    self.settings.scheduler_guest_weight
+                    if is_guest
+                    else self.settings.scheduler_user_weight
+                ),
+                cost=eta_estimator.processing_seconds(video.total_frames) / 60,
+            )
+        except JobQueueError as e:
+            await self.mark_failed(session, analysis.id, "QUEUE_UNAVAILABLE", str(e))
+            await session.commit()
+            raise
+
         logger.info(
             "analysis.started",
             extra={
@@ -186,7 +234,7 @@ class ProcessingService:
             "analysis_id": str(analysis.id),
             "video_id": str(video_id),
             "status": "queued",
-            "estimated_minutes": self._estimate_processing_time(video.total_frames),
+            "estimated_minutes": eta_estimator.estimated_minutes(video.total_frames),
             "websocket_url": f"{self.websocket_base_url}/ws/status/{analysis.id}",
         }
 
@@ -236,21 +284,10 @@ class ProcessingService:
             )
 
         elif analysis.status == AnalysisStatus.FAILED:
-            error_info = ERROR_CODES.get(
-                analysis.error_code or "",
-                {
-                    "message": analysis.error_message or "Unknown error",
-                    "user_action": "Please try again or contact support",
-                },
-            )
             response.update(
                 {
                     "failed_stage": analysis.current_stage,
-                    "error": {
-                        "code": analysis.error_code or "UNKNOWN_ERROR",
-                        "message": error_info["message"],
-                        "user_action": error_info["user_action"],
-                    },
+                    "error": self.error_details(analysis.error_code, analysis.error_message),
                     "failed_at": analysis.failed_at.isoformat()
                     if analysis.failed_at
                     else None,
@@ -259,16 +296,96 @@ class ProcessingService:
 
         else:
             # In progress
+            await eta_estimator.refresh()
             response.update(
                 {
                     "current_stage": analysis.current_stage,
                     "stages": self._build_stages_status(analysis),
-                    "estimated_completion": self._estimate_completion(analysis),
+                    "estimated_completion": eta_estimator.estimated_completion(analysis),
                 }
             )
 
         return response
 
+    async def get_progress_snapshot(
+        self,
+        session: AsyncSession,
+        analysis_id: UUID,
+        user_id: UUID,
+    ) -> dict:
+        """Get the current status as a progress stream event.
+
+        Sent first to WebSocket/SSE clients, so they catch up on progress
+        published before they connected.
+
+        Args:
+            session: Database session
+            analysis_id: Analysis ID
+            user_id: User ID for ownership verification
+
+        Returns:
+            complete, error or progress event dict
+
+        Raises:
+            AnalysisNotFoundError: If analysis doesn't exist or user doesn't own it
+        """
+        analysis = await self._get_analysis(session, analysis_id, user_id)
+
+        if analysis.status == AnalysisStatus.COMPLETED:
+            return self.complete_event(analysis.report_id)
+        if analysis.status == AnalysisStatus.FAILED:
+            return self.error_event(analysis.error_code, analysis.error_message)
+        if analysis.current_stage is None:
+            return WSProgressMessage(
+                stage="queued", progress_percent=0, message="Waiting to start"
+            ).model_dump()
+        return self.progress_event(analysis.current_stage, analysis.progress_percent or 0)
+
+    @staticmethod
+    def progress_event(stage: str, progress_percent: int) -> dict:
+        """Progress stream event for a stage."""
+        return WSProgressMessage(
+            stage=stage,
+            progress_percent=progress_percent,
+            message=STAGE_MESSAGES.get(stage, "Processing"),
+        ).model_dump()
+
+    @staticmethod
+    def stage_complete_event(stage: str) -> dict:
+        """Progress stream event for a finished stage."""
+        stages = list(STAGE_MESSAGES)
+        index = stages.index(stage)
+        next_stage = stages[index + 1] if index + 1 < len(stages) else None
+        return WSStageCompleteMessage(stage=stage, next_stage=next_stage).model_dump()
+
+    @staticmethod
+    def complete_event(report_id: UUID) -> dict:
+        """Progress stream event for a completed analysis."""
+        return WSCompleteMessage(report_id=str(report_id)).model_dump()
+
+    def error_event(self, error_code: Optional[str], error_message: Optional[str]) -> dict:
+        """Progress stream event for a failed analysis."""
+        return WSErrorMessage(**self.error_details(error_code, error_message)).model_dump()
+
+    @staticmethod
+    def error_details(error_code: Optional[str], error_message: Optional[str]) -> dict:
+        """User-facing code, message and suggested action of a failure.
+
+        AC-028: Over 20% frame failure marks analysis as failed with guidance
+        """
+        error_info = ERROR_CODES.get(
+            error_code or "",
+            {
+                "message": error_message or "Unknown error",
+                "user_action": "Please try again or contact support",
+            },
+        )
+        return {
+            "code": error_code or "UNKNOWN_ERROR",
+            "message": error_info["message"],
+            "user_action": error_info["user_action"],
+        }
+
     async def update_progress(
         self,
         session: AsyncSession,
@@ -291,7 +408,7 @@ class ProcessingService:
             frames_failed: Frames that failed processing
 
         Returns:
-            Updated analysis dict
+            Updated analysis dict (unchanged if already completed or failed)
 
         Raises:
             AnalysisNotFoundError: If analysis doesn't exist
@@ -304,6 +421,19 @@ class ProcessingService:
         if analysis is None:
             raise AnalysisNotFoundError(f"Analysis not found: {analysis_id}")
 
+        # A finished analysis stays finished, e.g. against a worker that
+        # lost its lease and is still running the job
+        if analysis.status in (AnalysisStatus.COMPLETED, AnalysisStatus.FAILED):
+            logger.warning(
+                "analysis.progress_ignored",
+                extra={
+                    "analysis_id": str(analysis_id),
+                    "stage": stage,
+                    "status": analysis.status.value,
+                },
+            )
+            return analysis.to_dict()
+
         # Update status based on stage
         stage_status_map = {
             "pose_estimation": AnalysisStatus.POSE_ESTIMATION,
@@ -339,6 +469,7 @@ class ProcessingService:
                 analysis.stamps_completed_at = now
 
         await session.flush()
+        status_cache.invalidate_on_commit(session, analysis_id)
 
         # Check for failure threshold
         # AC-028: Over 20% frame failure marks analysis as failed with guidance
@@ -361,6 +492,56 @@ class ProcessingService:
 
         return analysis.to_dict()
 
+    async def record_progress(
+        self,
+        session: AsyncSession,
+        analysis_id: UUID,
+        stage: str,
+        progress_percent: int,
+        frames_processed: Optional[int] = None,
+        frames_failed: Optional[int] = None,
+    ) -> bool:
+        """Write progress within a stage already started by update_progress.
+
+        A single UPDATE with no read. The failure threshold is left to the
+        next update_progress, when the stage's frame counts are final.
+
+        AC-029: Processing progress logged and retrievable via status endpoint
+
+        Args:
+            session: Database session
+            analysis_id: Analysis ID
+            stage: Stage the progress belongs to
+            progress_percent: Progress percentage (0-100)
+            frames_processed: Frames processed so far
+            frames_failed: Frames that failed processing
+
+        Returns:
+            False if the analysis has moved on from the stage (or is gone)
+        """
+        values: dict = {"progress_percent": progress_percent}
+        if frames_processed is not None:
+            values["frames_processed"] = frames_processed
+        if frames_failed is not None:
+            values["frames_failed"] = frames_failed
+
+        result = await session.execute(
+            update(Analysis)
+            .where(
+                Analysis.id == analysis_id,
+                Analysis.current_stage == stage,
+                Analysis._status.notin_(
+                    (AnalysisStatus.COMPLETED.value, AnalysisStatus.FAILED.value)
+                ),
+            )
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            return False
+        status_cache.invalidate_on_commit(session, analysis_id)
+        return True
+
     async def mark_completed(
         self,
         session: AsyncSession,
@@ -374,7 +555,8 @@ class ProcessingService:
             session: Database session
             analysis_id: Analysis ID
             report_id: Generated report ID
-            pose_data_key: S3 key for stored pose data
+            pose_data_key: S3 key for stored pose data (None = keep the
+                key recorded with the pose checkpoint)
 
         Returns:
             Updated analysis dict
@@ -395,13 +577,15 @@ class ProcessingService:
         analysis.status = AnalysisStatus.COMPLETED
         analysis.completed_at = now
         analysis.report_id = report_id
-        analysis.pose_data_key = pose_data_key
+        analysis.pose_data_key = pose_data_key or analysis.pose_data_key
         analysis.progress_percent = 100
 
         # Set any missing timestamps
         analysis.llm_completed_at = analysis.llm_completed_at or now
 
         await session.flush()
+        status_cache.invalidate_on_commit(session, analysis_id)
+        await eta_estimator.observe(analysis)
 
         logger.info(
             "analysis.completed",
@@ -416,6 +600,54 @@ class ProcessingService:
 
         return analysis.to_dict()
 
+    async def mark_stage_completed(
+        self,
+        session: AsyncSession,
+        analysis_id: UUID,
+        stage: str,
+        pose_data_key: Optional[str] = None,
+    ) -> dict:
+        """Record that a stage's output is checkpointed.
+
+        A retried job resumes after the last stage recorded here.
+
+        Args:
+            session: Database session
+            analysis_id: Analysis ID
+            stage: Finished stage (pose_estimation or llm_analysis)
+            pose_data_key: Storage key of the pose checkpoint
+
+        Returns:
+            Updated analysis dict
+
+        Raises:
+            AnalysisNotFoundError: If analysis doesn't exist
+        """
+        result = await session.execute(
+            select(Analysis).where(Analysis.id == analysis_id)
+        )
+        analysis = result.scalar_one_or_none()
+
+        if analysis is None:
+            raise AnalysisNotFoundError(f"Analysis not found: {analysis_id}")
+
+        now = datetime.now(timezone.utc)
+        if stage == "pose_estimation":
+            analysis.pose_data_key = pose_data_key
+            analysis.pose_completed_at = now
+        elif stage == "llm_analysis":
+            analysis.llm_completed_at = now
+
+        await session.flush()
+        status_cache.invalidate_on_commit(session, analysis_id)
+
+        logger.info(
+            "analysis.checkpoint",
+            extra={"analysis_id": str(analysis_id), "stage": stage},
+        )
+
+        return analysis.to_dict()
+
     async def mark_failed(
         self,
         session: AsyncSession,
@@ -453,6 +685,7 @@ class ProcessingService:
         analysis.error_message = error_message
 
         await session.flush()
+        status_cache.invalidate_on_commit(session, analysis_id)
 
         logger.error(
             "analysis.failed",
@@ -550,15 +783,6 @@ class ProcessingService:
 
         return analysis
 
-    def _estimate_processing_time(self, total_frames: Optional[int]) -> int:
-        """Estimate processing time in minutes."""
-        if not total_frames:
-            return 3  # Default estimate
-
-        # Rough estimate: ~1000 frames per minute
-        minutes = max(1, min(10, total_frames // 1000 + 1))
-        return minutes
-
     def _calculate_duration(
         self,
         start: Optional[datetime],
@@ -643,23 +867,6 @@ class ProcessingService:
 
         return stages
 
-    def _estimate_completion(self, analysis: Analysis) -> Optional[str]:
-        """Estimate completion time."""
-        if not analysis.started_at or not analysis.total_frames:
-            return None
-
-        # Estimate based on current progress
-        if analysis.progress_percent > 0:
-            elapsed = (datetime.now(timezone.utc) - analysis.started_at).total_seconds()
-            estimated_total = elapsed / (analysis.progress_percent / 100)
-            remaining = estimated_total - elapsed
-            completion = datetime.now(timezone.utc).replace(
-                microsecond=0
-            ) + __import__("datetime").timedelta(seconds=int(remaining))
-            return completion.isoformat()
-
-        return None
-
 
 # Singleton instance
 processing_service = ProcessingService()
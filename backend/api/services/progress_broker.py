@@ -0,0 +1,299 @@
+"""Fan-out of analysis progress events to WebSocket and SSE clients.
+
+@feature F005 - Pose Estimation Processing
+
+Implements:
+- AC-029: Processing progress logged and retrievable via status endpoint
+
+The worker publishes each event (the WS*Message schemas of
+api.schemas.analysis, as dicts) to the analysis' Redis channel
+``analysis:<id>:progress``. Every API process holds one pub/sub connection,
+subscribed to the channels its connected clients watch, and hands each event
+to those clients. Clients get progress pushed instead of polling, so the
+database is read once per connection (the catch-up snapshot) rather than
+once per poll.
+
+Each client has a bounded buffer. When a slow client's buffer is full its
+oldest event is dropped: a later event supersedes it, and the terminal
+complete/error event is never the one lost.
+
+An event published with retain=True is also kept as the analysis' latest
+event (see progress_sink), so a client connecting mid-stage catches up on
+progress newer than the analysis row.
+
+RedisProgressBroker is the deployed backend; with InMemoryProgressBroker,
+used by tests, events only reach the publishing process.
+"""
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from api.config import get_settings
+from api.services.state_store import SharedRedisClient
+
+logger = logging.getLogger(__name__)
+
+# Events after which the analysis produces no more
+TERMINAL_EVENTS = ("complete", "error")
+
+# Events buffered per client
+SUBSCRIBER_BUFFER = 64
+
+# Retained latest events expire after this long (Redis backend)
+RETAIN_SECONDS = 3600
+
+
+class ProgressBrokerError(Exception):
+    """Base exception for progress broker errors."""
+
+    pass
+
+
+class Subscription:
+    """Buffered progress events of one analysis for one client."""
+
+    def __init__(self, analysis_id: str, buffer_size: int = SUBSCRIBER_BUFFER):
+        self.analysis_id = analysis_id
+        self.dropped = 0
+        self._events: asyncio.Queue[dict[str, Any]] = asyncio.Queue(maxsize=buffer_size)
+
+    def put(self, event: dict[str, Any]) -> None:
+        """Buffer an event, dropping the oldest one if the client lags."""
+        if self._events.full():
+            self._events.get_nowait()
+            self.dropped += 1
+        self._events.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[dict[str, Any]]:
+        """Next event, or None if none arrived within timeout seconds."""
+        if not self._events.empty():
+            return self._events.get_nowait()
+        try:
+            return await asyncio.wait_for(self._events.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ProgressBroker(ABC):
+    """Local subscriber registry shared by the backends."""
+
+    def __init__(self, buffer_size: int = SUBSCRIBER_BUFFER):
+        """Initialize broker.
+
+        Args:
+            buffer_size: Events buffered per client
+        """
+        self.buffer_size = buffer_size
+        self._subscribers: dict[str, set[Subscription]] = {}
+
+    @abstractmethod
+    async def publish(
+        self, analysis_id: UUID | str, event: dict[str, Any], retain: bool = False
+    ) -> None:
+        """Send an event to every client watching the analysis.
+
+        Args:
+            analysis_id: Analysis the event belongs to
+            event: Progress stream event
+            retain: Also keep it as the analysis' latest event
+
+        Raises:
+            ProgressBrokerError: If the backend is unreachable
+        """
+
+    @abstractmethod
+    async def latest(self, analysis_id: UUID | str) -> Optional[dict[str, Any]]:
+        """Latest retained event of the analysis, if any.
+
+        Raises:
+            ProgressBrokerError: If the backend is unreachable
+        """
+
+    @abstractmethod
+    async def forget(self, analysis_id: UUID | str) -> None:
+        """Drop the analysis' retained event."""
+
+    @asynccontextmanager
+    async def subscribe(self, analysis_id: UUID | str) -> AsyncIterator[Subscription]:
+        """Receive the analysis' events published while the context is open."""
+        key = str(analysis_id)
+        subscription = Subscription(key, self.buffer_size)
+        subscribers = self._subscribers.setdefault(key, set())
+        first = not subscribers
+        subscribers.add(subscription)
+        try:
+            if first:
+                await self._watch(key)
+            yield subscription
+        finally:
+            subscribers.discard(subscription)
+            if not subscribers and self._subscribers.get(key) is subscribers:
+                del self._subscribers[key]
+                await self._unwatch(key)
+
+    def subscriber_count(self, analysis_id: UUID | str) -> int:
+        """Clients of this process watching the analysis."""
+        return len(self._subscribers.get(str(analysis_id), ()))
+
+    async def close(self) -> None:
+        """Stop listening for published events."""
+
+    def _dispatch(self, key: str, event: dict[str, Any]) -> None:
+        """Hand an event to this process' clients of the analysis."""
+        for subscription in self._subscribers.get(key, ()):
+            subscription.put(event)
+
+    async def _watch(self, key: str) -> None:
+        """Start receiving the analysis' events (first local client)."""
+
+    async def _unwatch(self, key: str) -> None:
+        """Stop receiving the analysis' events (last local client left)."""
+
+
+class InMemoryProgressBroker(ProgressBroker):
+    """Single-process broker for tests."""
+
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self._retained: dict[str, dict[str, Any]] = {}
+
+    async def publish(
+        self, analysis_id: UUID | str, event: dict[str, Any], retain: bool = False
+    ) -> None:
+        if retain:
+            self._retained[str(analysis_id)] = event
+        self._dispatch(str(analysis_id), event)
+
+    async def latest(self, analysis_id: UUID | str) -> Optional[dict[str, Any]]:
+        return self._retained.get(str(analysis_id))
+
+    async def forget(self, analysis_id: UUID | str) -> None:
+        self._retained.pop(str(analysis_id), None)
+
+
+class RedisProgressBroker(SharedRedisClient, ProgressBroker):
+    """Broker shared by the API and worker processes through Redis pub/sub."""
+
+    def __init__(self, client: Optional[redis.Redis] = None, **kwargs: Any):
+        """Initialize broker.
+
+        Args:
+            client: Redis client with decode_responses=True (None = the
+                process' client, see state_store)
+            **kwargs: ProgressBroker options
+        """
+        super().__init__(**kwargs)
+        self._client = client
+        self._pubsub: Optional[Any] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def channel(key: str) -> str:
+        """Pub/sub channel of an analysis."""
+        return f"analysis:{key}:progress"
+
+    @staticmethod
+    def latest_key(key: str) -> str:
+        """Key of an analysis' retained event."""
+        return f"analysis:{key}:progress:latest"
+
+    async def publish(
+        self, analysis_id: UUID | str, event: dict[str, Any], retain: bool = False
+    ) -> None:
+        key = str(analysis_id)
+        data = json.dumps(event)
+        try:
+            if retain:
+                # One round trip for both
+                async with self.client.pipeline(transaction=False) as pipe:
+                    pipe.set(self.latest_key(key), data, ex=RETAIN_SECONDS)
+                    pipe.publish(self.channel(key), data)
+                    await pipe.execute()
+            else:
+                await self.client.publish(self.channel(key), data)
+        except redis.RedisError as e:
+            raise ProgressBrokerError(f"Progress broker unavailable: {e}") from e
+
+    async def latest(self, analysis_id: UUID | str) -> Optional[dict[str, Any]]:
+        try:
+            data = await self.client.get(self.latest_key(str(analysis_id)))
+        except redis.RedisError as e:
+            raise ProgressBrokerError(f"Progress broker unavailable: {e}") from e
+        try:
+            return json.loads(data) if data else None
+        except ValueError:
+            return None
+
+    async def forget(self, analysis_id: UUID | str) -> None:
+        try:
+            await self.client.delete(self.latest_key(str(analysis_id)))
+        except redis.RedisError as e:
+            logger.warning("progress.forget_failed", extra={"error": str(e)})
+
+    async def close(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        if self._pubsub is not None:
+            await self._pubsub.aclose()
+            self._pubsub = None
+
+    async def _watch(self, key: str) -> None:
+        async with self._lock:
+            if self._pubsub is None:
+                self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await self._pubsub.subscribe(self.channel(key))
+            except redis.RedisError as e:
+                raise ProgressBrokerError(f"Progress broker unavailable: {e}") from e
+            if self._listener is None or self._listener.done():
+                self._listener = asyncio.create_task(self._listen())
+
+    async def _unwatch(self, key: str) -> None:
+        async with self._lock:
+            # A client may have subscribed again while we waited for the lock
+            if key in self._subscribers or self._pubsub is None:
+                return
+            try:
+                await self._pubsub.unsubscribe(self.channel(key))
+            except redis.RedisError as e:
+                logger.warning("progress.unsubscribe_failed", extra={"error": str(e)})
+
+    async def _listen(self) -> None:
+        """Dispatch messages of all watched channels to local clients."""
+        while True:
+            try:
+                message = await self._pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=1.0
+                )
+            except redis.RedisError as e:
+                # The pub/sub connection resubscribes when it reconnects
+                logger.warning("progress.listen_failed", extra={"error": str(e)})
+                await asyncio.sleep(1.0)
+                continue
+            if message is None:
+                continue
+            key = message["channel"].split(":")[1]
+            try:
+                self._dispatch(key, json.loads(message["data"]))
+            except ValueError:
+                logger.warning("progress.bad_event", extra={"channel": message["channel"]})
+
+
+def create_progress_broker(backend: Optional[str] = None) -> ProgressBroker:
+    """Create the progress broker for the configured backend."""
+    backend = backend or get_settings().progress_backend
+    if backend == "memory":
+        return InMemoryProgressBroker()
+    return RedisProgressBroker()
+
+
+# Singleton instance
+progress_broker = create_progress_broker()
@@ -0,0 +1,240 @@
+"""Coalesced reporting of fine-grained analysis progress.
+
+@feature F005 - Pose Estimation Processing
+
+Implements:
+- AC-029: Processing progress logged and retrievable via status endpoint
+
+Pose estimation can report progress after every frame: thousands of updates
+per minute per worker. Writing each one to the analyses row (what
+ProcessingService.update_progress does) would turn the hot loop into
+database load, so updates go through ProgressSink instead:
+
+- every update replaces the analysis' latest progress in memory;
+- a changed stage or percentage is published to WebSocket/SSE clients and
+  retained in the progress broker (Redis), where a newly connecting client's
+  snapshot picks it up;
+- the analyses row is written on a stage transition, otherwise at most once
+  per PROGRESS_PERSIST_INTERVAL_SECONDS, with a single UPDATE
+  (ProcessingService.record_progress).
+
+Updates arriving while a publish or write is in flight are coalesced: only
+the newest is sent next. Publishing and writing are best effort; the stage
+transitions recorded by AnalysisPipeline remain the source of truth.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Optional
+from uuid import UUID
+
+from api.config import get_settings
+from api.services.database import get_db_session
+from api.services.processing_service import processing_service
+from api.services.progress_broker import ProgressBroker, ProgressBrokerError, progress_broker
+
+logger = logging.getLogger(__name__)
+
+
+class _Progress:
+    """Latest progress of one analysis and what was last sent and written."""
+
+    __slots__ = (
+        "analysis_id", "stage", "progress_percent", "frames_processed", "frames_failed",
+        "published", "persisted_stage", "persisted_at", "dirty", "task",
+    )
+
+    def __init__(self, analysis_id: UUID, stage: str, progress_percent: int, now: float):
+        self.analysis_id = analysis_id
+        self.stage = stage
+        self.progress_percent = progress_percent
+        self.frames_processed: Optional[int] = None
+        self.frames_failed: Optional[int] = None
+        self.published = (stage, progress_percent)
+        self.persisted_stage = stage
+        self.persisted_at = now
+        self.dirty = False
+        self.task: Optional[asyncio.Task] = None
+
+
+class ProgressSink:
+    """Publishes every progress update and persists a coalesced subset."""
+
+    def __init__(
+        self,
+        broker: Optional[ProgressBroker] = None,
+        persist_interval: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize sink.
+
+        Args:
+            broker: Progress broker (None = the progress_broker singleton)
+            persist_interval: Minimum seconds between row writes within a
+                stage (None = settings)
+            clock: Monotonic clock in seconds
+        """
+        self.broker = broker or progress_broker
+        self.persist_interval = (
+            get_settings().progress_persist_interval_seconds
+            if persist_interval is None
+            else persist_interval
+        )
+        self.clock = clock
+        self._progress: dict[str, _Progress] = {}
+        self.writes = 0
+
+    def start(self, analysis_id: UUID, stage: str, progress_percent: int) -> None:
+        """Track an analysis whose stage start was just persisted and published."""
+        self._progress[str(analysis_id)] = _Progress(
+            analysis_id, stage, progress_percent, self.clock()
+        )
+
+    def record(
+        self,
+        analysis_id: UUID,
+        stage: str,
+        progress_percent: int,
+        frames_processed: Optional[int] = None,
+        frames_failed: Optional[int] = None,
+    ) -> None:
+        """Take a progress update without waiting for it to be sent.
+
+        Cheap enough to call per frame; must run on the event loop (use
+        loop.call_soon_threadsafe from other threads). Updates of analyses
+        not started (or already finished) are ignored.
+        """
+        progress = self._progress.get(str(analysis_id))
+        if progress is None:
+            return
+        progress.stage = stage
+        progress.progress_percent = progress_percent
+        if frames_processed is not None:
+            progress.frames_processed = frames_processed
+        if frames_failed is not None:
+            progress.frames_failed = frames_failed
+        progress.dirty = True
+        if progress.task is None or progress.task.done():
+            progress.task = asyncio.create_task(self._drain(progress))
+
+    async def report(
+        self,
+        analysis_id: UUID,
+        stage: str,
+        progress_percent: int,
+        frames_processed: Optional[int] = None,
+        frames_failed: Optional[int] = None,
+    ) -> None:
+        """Take a progress update and wait until whatever it triggers is sent."""
+        self.record(analysis_id, stage, progress_percent, frames_processed, frames_failed)
+        await self._settle(str(analysis_id))
+
+    async def finish(self, analysis_id: UUID) -> None:
+        """Stop tracking an analysis (its stage ended or the job failed)."""
+        key = str(analysis_id)
+        await self._settle(key)
+        if self._progress.pop(key, None) is not None:
+            try:
+                await self.broker.forget(analysis_id)
+            except ProgressBrokerError as e:
+                logger.warning("progress_sink.forget_failed", extra={"error": str(e)})
+
+    async def current(self, analysis_id: UUID, snapshot: dict[str, Any]) -> dict[str, Any]:
+        """A status snapshot, or the retained update if it is further along.
+
+        The analyses row may lag the published progress by up to the persist
+        interval; a retained update of the same stage supersedes it.
+
+        Raises:
+            ProgressBrokerError: If the broker is unreachable
+        """
+        if snapshot["type"] != "progress":
+            return snapshot
+        latest = await self.broker.latest(analysis_id)
+        if (
+            latest is not None
+            and latest.get("type") == "progress"
+            and latest.get("stage") == snapshot["stage"]
+            and latest.get("progress_percent", 0) > snapshot["progress_percent"]
+        ):
+            return latest
+        return snapshot
+
+    async def _settle(self, key: str) -> None:
+        """Wait for an analysis' in-flight publish/write, if any."""
+        progress = self._progress.get(key)
+        if progress is not None and progress.task is not None:
+            await asyncio.shield(progress.task)
+
+    async def _drain(self, progress: _Progress) -> None:
+        """Publish and write the latest update until nothing more is due."""
+        while True:
+            now = self.clock()
+            publish = (progress.stage, progress.progress_percent) != progress.published
+            persist = progress.dirty and (
+                progress.stage != progress.persisted_stage
+                or now - progress.persisted_at >= self.persist_interval
+            )
+            if not publish and not persist:
+                return
+
+            stage, percent = progress.stage, progress.progress_percent
+            if publish:
+                progress.published = (stage, percent)
+                await self._publish(progress.analysis_id, stage, percent)
+            if persist:
+                transition = stage != progress.persisted_stage
+                progress.persisted_stage = stage
+                progress.persisted_at = now
+                progress.dirty = False
+                await self._persist(
+                    progress.analysis_id, stage, percent,
+                    progress.frames_processed, progress.frames_failed, transition,
+                )
+
+    async def _publish(self, analysis_id: UUID, stage: str, progress_percent: int) -> None:
+        """Send and retain a progress event (best effort)."""
+        try:
+            await self.broker.publish(
+                analysis_id,
+                processing_service.progress_event(stage, progress_percent),
+                retain=True,
+            )
+        except ProgressBrokerError as e:
+            logger.warning(
+                "progress_sink.unpublished",
+                extra={"analysis_id": str(analysis_id), "error": str(e)},
+            )
+
+    async def _persist(
+        self,
+        analysis_id: UUID,
+        stage: str,
+        progress_percent: int,
+        frames_processed: Optional[int],
+        frames_failed: Optional[int],
+        transition: bool,
+    ) -> None:
+        """Write progress to the analyses row (best effort)."""
+        self.writes += 1
+        try:
+            async with get_db_session() as session:
+                if transition:
+                    await processing_service.update_progress(
+                        session, analysis_id, stage, progress_percent,
+                        frames_processed, frames_failed,
+                    )
+                else:
+                    await processing_service.record_progress(
+                        session, analysis_id, stage, progress_percent,
+                        frames_processed, frames_failed,
+                    )
+        except Exception as e:
+            logger.warning(
+                "progress_sink.unpersisted",
+                extra={"analysis_id": str(analysis_id), "stage": stage, "error": str(e)},
+            )
+
+
+# Singleton instance
+progress_sink = ProgressSink()
@@ -7,12 +7,19 @@ Implements:
 - AC-031: Defensive actions detected by torso and arm positioning
 
 This service analyzes pose data frames to detect boxing actions using
-velocity thresholds, trajectory patterns, and body positioning.
+velocity thresholds, trajectory patterns, and body positioning. Frames are
+read from a PoseSequence; PoseData dicts are converted on entry. Joint
+trajectories are smoothed (LandmarkSmoother) before any velocity is taken.
 """
 import logging
 import math
 from typing import Any
 
+import numpy as np
+
+from api.services.landmark_smoothing import LandmarkSmoother
+from api.services.pose_sequence import X, Y, Z, PoseSequence, pose_data_values
+
 logger = logging.getLogger(__name__)
 
 # MediaPipe landmark indices
@@ -37,6 +44,21 @@ DUCK_HEIGHT_THRESHOLD = 0.55  # Y position threshold for duck
 SLIP_LATERAL_THRESHOLD = 0.05  # Lateral movement threshold for slip
 MIN_ACTION_FRAMES = 3  # Minimum frames for action duration
 
+# Strike type codes used by the vectorized detector, and arm sides
+STRIKE_TYPES = ("jab", "straight", "hook", "uppercut")
+STRIKE_SIDES = ("left", "right")
+
+# Joints read by the defense detector, in the order _detect_defense unpacks them
+DEFENSE_JOINTS = ("nose", "left_shoulder", "right_shoulder", "left_wrist", "right_wrist")
+
+# Strikes of the same type and side closer than this are merged (seconds)
+MERGE_TIME_THRESHOLD = 0.3
+
+# Raw coordinates are float32; compare them against float32 thresholds so a
+# value equal to a threshold is treated as it was in float64
+GUARD_HEIGHT_THRESHOLD_F32 = np.float32(GUARD_HEIGHT_THRESHOLD)
+DUCK_HEIGHT_THRESHOLD_F32 = np.float32(DUCK_HEIGHT_THRESHOLD)
+
 
 class StampDetectionService:
     """Service for detecting strikes and defensive actions from pose data.
@@ -48,11 +70,45 @@ class StampDetectionService:
     boxing techniques.
     """
 
-    def __init__(self):
-        """Initialize detection service."""
+    def __init__(self, smoothing: str | None = None):
+        """Initialize detection service.
+
+        Args:
+            smoothing: Landmark smoothing method (None = settings)
+        """
         self.min_action_frames = MIN_ACTION_FRAMES
+        self.smoother = LandmarkSmoother(smoothing)
+
+    def detect_actions(
+        self, pose_data: dict[str, Any] | PoseSequence
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Detect strikes and defensive actions in one pass over the pose data.
+
+        AC-030: Strikes detected by arm velocity and trajectory patterns
+        AC-031: Defensive actions detected by torso and arm positioning
+
+        The pose data is parsed and the confident-frame mask computed once
+        and shared by both detectors. Output is identical to calling
+        detect_strikes and detect_defense separately.
+
+        Args:
+            pose_data: PoseSequence, or pose data dict with frames and fps
+
+        Returns:
+            Tuple of (strike stamps, defense stamps)
+        """
+        sequence = self._prepare(pose_data)
+
+        if len(sequence) < self.min_action_frames:
+            return [], []
 
-    def detect_strikes(self, pose_data: dict[str, Any]) -> list[dict[str, Any]]:
+        confident = sequence.confidence >= CONFIDENCE_THRESHOLD
+        return (
+            self._detect_strikes(sequence, confident),
+            self._detect_defense(sequence, confident),
+        )
+
+    def detect_strikes(self, pose_data: dict[str, Any] | PoseSequence) -> list[dict[str, Any]]:
         """Detect strike actions from pose data.
 
         AC-030: Strikes detected by arm velocity and trajectory patterns
@@ -63,48 +119,138 @@ class StampDetectionService:
         - Hook: Circular trajectory targeting sides
         - Uppercut: Upward trajectory targeting chin
 
+        Vectorized over the whole sequence; produces the same stamps as
+        applying _detect_arm_strike to every frame and merging the results.
+
         Args:
-            pose_data: Pose data with frames and fps
+            pose_data: PoseSequence, or pose data dict with frames and fps
 
         Returns:
             List of detected strike stamps
         """
-        frames = pose_data.get("frames", [])
-        fps = pose_data.get("fps", 30.0)
-        strikes = []
+        sequence = self._prepare(pose_data)
 
-        if len(frames) < self.min_action_frames:
-            return strikes
+        if len(sequence) < self.min_action_frames:
+            return []
 
-        # Calculate velocities for each frame
-        for i in range(2, len(frames)):
-            prev_frame = frames[i - 2]
-            curr_frame = frames[i]
+        return self._detect_strikes(sequence, sequence.confidence >= CONFIDENCE_THRESHOLD)
 
-            # Skip low confidence frames
-            if curr_frame.get("confidence", 0) < CONFIDENCE_THRESHOLD:
-                continue
+    def _detect_strikes(
+        self,
+        sequence: PoseSequence,
+        confident: np.ndarray,
+    ) -> list[dict[str, Any]]:
+        """Vectorized strike detection (see detect_strikes).
 
-            # Check left arm strikes
-            left_strike = self._detect_arm_strike(
-                prev_frame, curr_frame, fps, "left"
-            )
-            if left_strike:
-                strikes.append(left_strike)
+        Args:
+            sequence: Pose sequence of at least min_action_frames frames
+            confident: (frames,) mask of frames above CONFIDENCE_THRESHOLD
+        """
+        # Candidate strikes for both arms over the whole sequence at once
+        per_side = [
+            self._strike_candidates(sequence, confident, side)
+            for side in range(len(STRIKE_SIDES))
+        ]
+        index, side, strike_type, confidence, velocity = (
+            np.concatenate(columns) for columns in zip(*per_side)
+        )
 
-            # Check right arm strikes
-            right_strike = self._detect_arm_strike(
-                prev_frame, curr_frame, fps, "right"
-            )
-            if right_strike:
-                strikes.append(right_strike)
+        # Same order as a frame-by-frame scan (left before right) sorted by time
+        timestamps = sequence.timestamps[index]
+        order = np.lexsort((side, index, timestamps))
+        index, side, strike_type, velocity = index[order], side[order], strike_type[order], velocity[order]
+        timestamps = timestamps[order]
+        # Rounded as in the emitted stamps, since merging compares those values
+        confidence = [round(c, 2) for c in confidence[order].tolist()]
 
         # Merge nearby detections of same type
-        strikes = self._merge_nearby_stamps(strikes, fps)
+        kept = self._merge_indices(
+            timestamps,
+            strike_type * len(STRIKE_SIDES) + side,
+            np.asarray(confidence),
+            MERGE_TIME_THRESHOLD,
+        )
+
+        return [
+            {
+                "frame_number": int(sequence.frame_numbers[index[k]]),
+                "timestamp_seconds": float(timestamps[k]),
+                "action_type": STRIKE_TYPES[strike_type[k]],
+                "side": STRIKE_SIDES[side[k]],
+                "confidence": confidence[k],
+                "velocity_vector": {
+                    axis: round(float(v), 4) for axis, v in zip("xyz", velocity[k])
+                },
+            }
+            for k in kept
+        ]
+
+    def _strike_candidates(
+        self,
+        sequence: PoseSequence,
+        confident: np.ndarray,
+        side: int,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Vectorized _detect_arm_strike over every frame pair (i - 2, i).
+
+        AC-030: Strikes detected by arm velocity and trajectory patterns
+
+        Args:
+            sequence: Pose sequence
+            confident: (frames,) mask of frames above CONFIDENCE_THRESHOLD
+            side: Index into STRIKE_SIDES
 
-        return strikes
+        Returns:
+            Frame indices, side codes, STRIKE_TYPES codes, unrounded
+            confidences and (n, 3) velocity vectors of candidate strikes
+        """
+        name = STRIKE_SIDES[side]
+        # PoseData values, so deltas and threshold ties match the dict input
+        wrist = pose_data_values(sequence.landmarks[:, LANDMARKS[f"{name}_wrist"]])
+        elbow = pose_data_values(sequence.landmarks[:, LANDMARKS[f"{name}_elbow"]])
+
+        # Wrist displacement over 2 frames
+        delta = wrist[2:, :3] - wrist[:-2, :3]
+        dx, dy, dz = delta[:, 0], delta[:, 1], delta[:, 2]
+        distance = np.sqrt(dx * dx + dy * dy + dz * dz)
+        time_delta = 2.0 / sequence.fps
+        velocity = distance / time_delta
+
+        present = ~(
+            np.isnan(wrist[2:, X]) | np.isnan(wrist[:-2, X])
+            | np.isnan(elbow[2:, X]) | np.isnan(elbow[:-2, X])
+        )
+        mask = (
+            confident[2:]
+            & present
+            & (velocity >= VELOCITY_THRESHOLD_JAB)
+        )
 
-    def detect_defense(self, pose_data: dict[str, Any]) -> list[dict[str, Any]]:
+        # Trajectory classification, mirroring _classify_strike
+        abs_dx, abs_dy, abs_dz = np.abs(dx), np.abs(dy), np.abs(dz)
+        is_extended = np.abs(wrist[2:, Z]) > np.abs(elbow[2:, Z])
+        uppercut = (dy < -0.05) & (abs_dy > abs_dx) & (abs_dy > abs_dz)
+        hook = ~uppercut & (abs_dx > 0.1) & (abs_dx > abs_dz * 0.8)
+        straight = (
+            ~uppercut & ~hook
+            & ((dz < -0.05) | is_extended)
+            & (distance >= VELOCITY_THRESHOLD_STRIKE)
+        )
+        strike_type = np.select([uppercut, hook, straight], [3, 2, 1], default=0)
+
+        # Calculate confidence based on velocity and arm extension
+        confidence = np.minimum(0.95, 0.5 + velocity * 2.0)
+
+        (hits,) = np.nonzero(mask)
+        return (
+            hits + 2,
+            np.full(len(hits), side),
+            strike_type[hits],
+            confidence[hits],
+            delta[hits] / time_delta,
+        )
+
+    def detect_defense(self, pose_data: dict[str, Any] | PoseSequence) -> list[dict[str, Any]]:
         """Detect defensive actions from pose data.
 
         AC-031: Defensive actions detected by torso and arm positioning
@@ -117,114 +263,127 @@ class StampDetectionService:
         - Bob and weave: Combined movement
 
         Args:
-            pose_data: Pose data with frames and fps
+            pose_data: PoseSequence, or pose data dict with frames and fps
 
         Returns:
             List of detected defense stamps
         """
-        frames = pose_data.get("frames", [])
-        fps = pose_data.get("fps", 30.0)
-        defense = []
+        sequence = self._prepare(pose_data)
 
-        if len(frames) < self.min_action_frames:
-            return defense
+        if len(sequence) < self.min_action_frames:
+            return []
 
-        # State tracking for defense actions
-        guard_up_start = None
-        slip_start = None
-        duck_start = None
-        prev_positions = None
+        return self._detect_defense(sequence, sequence.confidence >= CONFIDENCE_THRESHOLD)
 
-        for i, frame in enumerate(frames):
-            if frame.get("confidence", 0) < CONFIDENCE_THRESHOLD:
-                continue
+    def _detect_defense(
+        self,
+        sequence: PoseSequence,
+        confident: np.ndarray,
+    ) -> list[dict[str, Any]]:
+        """Vectorized defense detection (see detect_defense).
+
+        Low-confidence frames are skipped entirely: they neither end an
+        action nor serve as the previous frame for slip detection. Action
+        durations still count every frame between start and end. Guard,
+        slip and duck predicates (_is_guard_up, _is_slip, _is_duck) are
+        evaluated for all confident frames at once; only the start and end
+        of each run are visited in Python.
 
-            joints = {j["joint_id"]: j for j in frame.get("joints", [])}
-            curr_positions = self._extract_positions(joints)
+        Args:
+            sequence: Pose sequence of at least min_action_frames frames
+            confident: (frames,) mask of frames above CONFIDENCE_THRESHOLD
+        """
+        frames = np.flatnonzero(confident)
+        if len(frames) == 0:
+            return []
+
+        # Positions of the defense joints on confident frames, extracted once
+        joints = [LANDMARKS[name] for name in DEFENSE_JOINTS]
+        positions = sequence.landmarks[frames[:, None], joints]
+        nose, left_shoulder, right_shoulder, left_wrist, right_wrist = (
+            positions[:, k] for k in range(len(DEFENSE_JOINTS))
+        )
 
-            # Detect guard up
-            if self._is_guard_up(curr_positions):
-                if guard_up_start is None:
-                    guard_up_start = i
+        # Presence is judged on x, as in _has_joints
+        has_nose = ~np.isnan(nose[:, X])
+        guard_up = (
+            has_nose
+            & ~np.isnan(left_wrist[:, X])
+            & ~np.isnan(right_wrist[:, X])
+            & (left_wrist[:, Y] < GUARD_HEIGHT_THRESHOLD_F32)
+            & (right_wrist[:, Y] < GUARD_HEIGHT_THRESHOLD_F32)
+        )
+        duck = has_nose & (nose[:, Y] > DUCK_HEIGHT_THRESHOLD_F32)
+        # NaN (missing shoulder) fails every comparison, as in _is_slip
+        center_x = (
+            left_shoulder[:, X].astype(np.float64) + right_shoulder[:, X].astype(np.float64)
+        ) / 2
+        shift = center_x[1:] - center_x[:-1]
+        slip = np.abs(shift) > SLIP_LATERAL_THRESHOLD
+
+        # (position of the frame that emits it, order within a frame, stamp)
+        events: list[tuple[int, int, dict[str, Any]]] = []
+
+        for start, end in zip(*self._runs(guard_up)):
+            if end == len(frames):
+                # Guard held to the end of the video
+                duration = len(sequence) - frames[start]
+                end_position = len(frames)
             else:
-                if guard_up_start is not None:
-                    duration = i - guard_up_start
-                    if duration >= self.min_action_frames:
-                        defense.append(
-                            self._create_defense_stamp(
-                                frames[guard_up_start],
-                                "guard_up",
-                                "both",
-                                min(0.95, 0.7 + duration * 0.02),
-                                fps,
-                            )
-                        )
-                    guard_up_start = None
-
-            # Detect slip (lateral movement)
-            if prev_positions is not None:
-                if self._is_slip(prev_positions, curr_positions):
-                    if slip_start is None:
-                        slip_start = i
+                duration = frames[end] - frames[start]
+                end_position = end
+            if duration >= self.min_action_frames:
+                events.append((end_position, 0, self._create_defense_stamp(
+                    sequence, frames[start], "guard_up", "both",
+                    min(0.95, 0.7 + int(duration) * 0.02),
+                )))
+
+        # Slip compares consecutive confident frames: pair k ends at frame k + 1
+        for start, end in zip(*self._runs(slip)):
+            if end == len(slip):
+                continue  # Unfinished slips are not emitted
+            duration = frames[end + 1] - frames[start + 1]
+            if duration >= self.min_action_frames:
+                if np.isnan(shift[end]):
+                    side = "both"
                 else:
-                    if slip_start is not None:
-                        duration = i - slip_start
-                        if duration >= self.min_action_frames:
-                            side = self._get_slip_side(
-                                prev_positions, curr_positions
-                            )
-                            defense.append(
-                                self._create_defense_stamp(
-                                    frames[slip_start],
-                                    "slip",
-                                    side,
-                                    min(0.9, 0.65 + duration * 0.02),
-                                    fps,
-                                )
-                            )
-                        slip_start = None
-
-            # Detect duck (lowering)
-            if self._is_duck(curr_positions):
-                if duck_start is None:
-                    duck_start = i
-            else:
-                if duck_start is not None:
-                    duration = i - duck_start
-                    if duration >= self.min_action_frames:
-                        defense.append(
-                            self._create_defense_stamp(
-                                frames[duck_start],
-                                "duck",
-                                "both",
-                                min(0.9, 0.65 + duration * 0.02),
-                                fps,
-                            )
-                        )
-                    duck_start = None
-
-            prev_positions = curr_positions
-
-        # Handle actions that extend to end of video
-        if guard_up_start is not None:
-            duration = len(frames) - guard_up_start
+                    side = "left" if shift[end] < 0 else "right"
+                events.append((end + 1, 1, self._create_defense_stamp(
+                    sequence, frames[start + 1], "slip", side,
+                    min(0.9, 0.65 + int(duration) * 0.02),
+                )))
+
+        for start, end in zip(*self._runs(duck)):
+            if end == len(frames):
+                continue  # Unfinished ducks are not emitted
+            duration = frames[end] - frames[start]
             if duration >= self.min_action_frames:
-                defense.append(
-                    self._create_defense_stamp(
-                        frames[guard_up_start],
-                        "guard_up",
-                        "both",
-                        min(0.95, 0.7 + duration * 0.02),
-                        fps,
-                    )
-                )
-
-        return defense
+                events.append((end, 2, self._create_defense_stamp(
+                    sequence, frames[start], "duck", "both",
+                    min(0.9, 0.65 + int(duration) * 0.02),
+                )))
+
+        # Emit in the order a frame-by-frame scan would
+        events.sort(key=lambda event: event[:2])
+        return [stamp for _, _, stamp in events]
+
+    @staticmethod
+    def _runs(flags: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Start positions and exclusive end positions of runs of True."""
+        edges = np.diff(np.concatenate(([0], flags.astype(np.int8), [0])))
+        return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+    def _prepare(self, pose_data: dict[str, Any] | PoseSequence) -> PoseSequence:
+        """Accept either a PoseSequence or a PoseData dict and smooth it."""
+        if not isinstance(pose_data, PoseSequence):
+            pose_data = PoseSequence.from_pose_data(pose_data)
+        return self.smoother.smooth(pose_data)
 
     def _detect_arm_strike(
         self,
-        prev_frame: dict,
-        curr_frame: dict,
+        sequence: PoseSequence,
+        prev_index: int,
+        curr_index: int,
         fps: float,
         side: str,
     ) -> dict[str, Any] | None:
@@ -232,30 +391,26 @@ class StampDetectionService:
 
         AC-030: Strikes detected by arm velocity and trajectory patterns
         """
-        prev_joints = {j["joint_id"]: j for j in prev_frame.get("joints", [])}
-        curr_joints = {j["joint_id"]: j for j in curr_frame.get("joints", [])}
-
         # Get wrist and elbow landmarks
         wrist_idx = LANDMARKS["left_wrist"] if side == "left" else LANDMARKS["right_wrist"]
         elbow_idx = LANDMARKS["left_elbow"] if side == "left" else LANDMARKS["right_elbow"]
-        shoulder_idx = (
-            LANDMARKS["left_shoulder"] if side == "left" else LANDMARKS["right_shoulder"]
+
+        # PoseData values, so deltas and threshold ties match the dict input
+        (prev_wrist, prev_elbow), (curr_wrist, curr_elbow) = pose_data_values(
+            sequence.landmarks[[prev_index, curr_index]][:, [wrist_idx, elbow_idx]]
         )
 
-        if wrist_idx not in curr_joints or wrist_idx not in prev_joints:
+        # NaN marks a joint missing from the frame
+        if np.isnan(curr_wrist[X]) or np.isnan(prev_wrist[X]):
             return None
-        if elbow_idx not in curr_joints or elbow_idx not in prev_joints:
+        if np.isnan(curr_elbow[X]) or np.isnan(prev_elbow[X]):
             return None
 
-        prev_wrist = prev_joints[wrist_idx]
-        curr_wrist = curr_joints[wrist_idx]
-        curr_elbow = curr_joints[elbow_idx]
-
         # Calculate wrist velocity
         time_delta = 2.0 / fps  # 2 frames time
-        dx = curr_wrist["x"] - prev_wrist["x"]
-        dy = curr_wrist["y"] - prev_wrist["y"]
-        dz = curr_wrist.get("z", 0) - prev_wrist.get("z", 0)
+        dx = float(curr_wrist[X]) - float(prev_wrist[X])
+        dy = float(curr_wrist[Y]) - float(prev_wrist[Y])
+        dz = float(curr_wrist[Z]) - float(prev_wrist[Z])
 
         velocity = math.sqrt(dx * dx + dy * dy + dz * dz) / time_delta
         velocity_vector = {"x": dx / time_delta, "y": dy / time_delta, "z": dz / time_delta}
@@ -266,7 +421,7 @@ class StampDetectionService:
 
         # Classify strike type based on trajectory
         strike_type = self._classify_strike(
-            dx, dy, dz, curr_wrist, curr_elbow, side
+            dx, dy, dz, float(curr_wrist[Z]), float(curr_elbow[Z])
         )
 
         if strike_type is None:
@@ -276,8 +431,8 @@ class StampDetectionService:
         confidence = min(0.95, 0.5 + velocity * 2.0)
 
         return {
-            "frame_number": curr_frame["frame_number"],
-            "timestamp_seconds": curr_frame["timestamp_seconds"],
+            "frame_number": int(sequence.frame_numbers[curr_index]),
+            "timestamp_seconds": float(sequence.timestamps[curr_index]),
             "action_type": strike_type,
             "side": side,
             "confidence": round(confidence, 2),
@@ -291,9 +446,8 @@ class StampDetectionService:
         dx: float,
         dy: float,
         dz: float,
-        wrist: dict,
-        elbow: dict,
-        side: str,
+        wrist_z: float,
+        elbow_z: float,
     ) -> str | None:
         """Classify strike type based on trajectory and position.
 
@@ -314,7 +468,7 @@ class StampDetectionService:
         is_lateral = abs_dx > 0.1
 
         # Arm extension check (wrist further from body than elbow)
-        is_extended = abs(wrist.get("z", 0)) > abs(elbow.get("z", 0))
+        is_extended = abs(wrist_z) > abs(elbow_z)
 
         # Classify based on patterns
         if is_upward and abs_dy > abs_dx and abs_dy > abs_dz:
@@ -331,111 +485,87 @@ class StampDetectionService:
 
         return "jab"  # Default to jab for forward punches
 
-    def _extract_positions(self, joints: dict) -> dict[str, dict]:
-        """Extract key body positions from joints."""
-        positions = {}
-
-        for name, idx in LANDMARKS.items():
-            if idx in joints:
-                positions[name] = {
-                    "x": joints[idx]["x"],
-                    "y": joints[idx]["y"],
-                    "z": joints[idx].get("z", 0),
-                }
+    @staticmethod
+    def _has_joints(positions: np.ndarray, *names: str) -> bool:
+        """Whether all named joints are present in a (33, 4) frame row."""
+        return not any(np.isnan(positions[LANDMARKS[name], X]) for name in names)
 
-        return positions
-
-    def _is_guard_up(self, positions: dict) -> bool:
+    def _is_guard_up(self, positions: np.ndarray) -> bool:
         """Check if guard is up (hands near face level).
 
         AC-031: Defensive actions detected by torso and arm positioning
         """
-        left_wrist = positions.get("left_wrist")
-        right_wrist = positions.get("right_wrist")
-        nose = positions.get("nose")
-
-        if not all([left_wrist, right_wrist, nose]):
+        if not self._has_joints(positions, "left_wrist", "right_wrist", "nose"):
             return False
 
         # Guard up if both wrists are above shoulder level (lower y value)
         # and near face horizontally
-        left_up = left_wrist["y"] < GUARD_HEIGHT_THRESHOLD
-        right_up = right_wrist["y"] < GUARD_HEIGHT_THRESHOLD
+        left_up = positions[LANDMARKS["left_wrist"], Y] < GUARD_HEIGHT_THRESHOLD_F32
+        right_up = positions[LANDMARKS["right_wrist"], Y] < GUARD_HEIGHT_THRESHOLD_F32
 
-        return left_up and right_up
+        return bool(left_up and right_up)
 
-    def _is_slip(self, prev_pos: dict, curr_pos: dict) -> bool:
+    def _shoulder_center_x(self, positions: np.ndarray) -> float | None:
+        """Horizontal midpoint of the shoulders (None if either is missing)."""
+        if not self._has_joints(positions, "left_shoulder", "right_shoulder"):
+            return None
+        return (
+            float(positions[LANDMARKS["left_shoulder"], X])
+            + float(positions[LANDMARKS["right_shoulder"], X])
+        ) / 2
+
+    def _is_slip(self, prev_pos: np.ndarray, curr_pos: np.ndarray) -> bool:
         """Check for slip (lateral torso movement).
 
         AC-031: Defensive actions detected by torso and arm positioning
         """
-        prev_shoulders = (
-            prev_pos.get("left_shoulder"),
-            prev_pos.get("right_shoulder"),
-        )
-        curr_shoulders = (
-            curr_pos.get("left_shoulder"),
-            curr_pos.get("right_shoulder"),
-        )
+        prev_center_x = self._shoulder_center_x(prev_pos)
+        curr_center_x = self._shoulder_center_x(curr_pos)
 
-        if not all(prev_shoulders) or not all(curr_shoulders):
+        if prev_center_x is None or curr_center_x is None:
             return False
 
         # Calculate shoulder center movement
-        prev_center_x = (prev_shoulders[0]["x"] + prev_shoulders[1]["x"]) / 2
-        curr_center_x = (curr_shoulders[0]["x"] + curr_shoulders[1]["x"]) / 2
-
         lateral_movement = abs(curr_center_x - prev_center_x)
 
         return lateral_movement > SLIP_LATERAL_THRESHOLD
 
-    def _get_slip_side(self, prev_pos: dict, curr_pos: dict) -> str:
+    def _get_slip_side(self, prev_pos: np.ndarray, curr_pos: np.ndarray) -> str:
         """Determine which side the slip is moving towards."""
-        prev_shoulders = (
-            prev_pos.get("left_shoulder"),
-            prev_pos.get("right_shoulder"),
-        )
-        curr_shoulders = (
-            curr_pos.get("left_shoulder"),
-            curr_pos.get("right_shoulder"),
-        )
+        prev_center_x = self._shoulder_center_x(prev_pos)
+        curr_center_x = self._shoulder_center_x(curr_pos)
 
-        if not all(prev_shoulders) or not all(curr_shoulders):
+        if prev_center_x is None or curr_center_x is None:
             return "both"
 
-        prev_center_x = (prev_shoulders[0]["x"] + prev_shoulders[1]["x"]) / 2
-        curr_center_x = (curr_shoulders[0]["x"] + curr_shoulders[1]["x"]) / 2
-
         if curr_center_x < prev_center_x:
             return "left"
         else:
             return "right"
 
-    def _is_duck(self, positions: dict) -> bool:
+    def _is_duck(self, positions: np.ndarray) -> bool:
         """Check for duck (lowered head/torso).
 
         AC-031: Defensive actions detected by torso and arm positioning
         """
-        nose = positions.get("nose")
-
-        if not nose:
+        if not self._has_joints(positions, "nose"):
             return False
 
         # Duck if nose is below threshold (higher y value = lower position)
-        return nose["y"] > DUCK_HEIGHT_THRESHOLD
+        return bool(positions[LANDMARKS["nose"], Y] > DUCK_HEIGHT_THRESHOLD_F32)
 
     def _create_defense_stamp(
         self,
-        frame: dict,
+        sequence: PoseSequence,
+        index: int,
         action_type: str,
         side: str,
         confidence: float,
-        fps: float,
     ) -> dict[str, Any]:
-        """Create a defense stamp dict."""
+        """Create a defense stamp dict for the frame at index."""
         return {
-            "frame_number": frame["frame_number"],
-            "timestamp_seconds": frame["timestamp_seconds"],
+            "frame_number": int(sequence.frame_numbers[index]),
+            "timestamp_seconds": float(sequence.timestamps[index]),
             "action_type": action_type,
             "side": side,
             "confidence": round(confidence, 2),
@@ -445,7 +575,7 @@ class StampDetectionService:
         self,
         stamps: list[dict],
         fps: float,
-        time_threshold: float = 0.3,
+        time_threshold: float = MERGE_TIME_THRESHOLD,
     ) -> list[dict]:
         """Merge stamps that are close together in time.
 
@@ -457,23 +587,72 @@ class StampDetectionService:
         # Sort by timestamp
         stamps.sort(key=lambda s: s["timestamp_seconds"])
 
-        merged = [stamps[0]]
-        for stamp in stamps[1:]:
-            last = merged[-1]
-
-            # Same action type and within time threshold
-            if (
-                stamp["action_type"] == last["action_type"]
-                and stamp["side"] == last["side"]
-                and stamp["timestamp_seconds"] - last["timestamp_seconds"] < time_threshold
-            ):
-                # Keep the higher confidence one
-                if stamp["confidence"] > last["confidence"]:
-                    merged[-1] = stamp
-            else:
-                merged.append(stamp)
+        keys = {}
+        kept = self._merge_indices(
+            np.array([s["timestamp_seconds"] for s in stamps], dtype=np.float64),
+            np.array([keys.setdefault((s["action_type"], s["side"]), len(keys)) for s in stamps]),
+            np.array([s["confidence"] for s in stamps], dtype=np.float64),
+            time_threshold,
+        )
+        return [stamps[k] for k in kept]
+
+    @staticmethod
+    def _merge_indices(
+        timestamps: np.ndarray,
+        keys: np.ndarray,
+        confidence: np.ndarray,
+        time_threshold: float,
+    ) -> list[int]:
+        """Indices of the stamps kept by merging, in order.
+
+        Stamps must be sorted by time. Walking them in order, a stamp joins
+        the previous kept stamp if it has the same key (type and side) and is
+        less than time_threshold after it, replacing it if more confident.
+
+        A stamp can only join a group if it follows a stamp with the same key
+        less than time_threshold earlier, so those breaks split the sequence
+        into segments. A segment shorter than time_threshold is one group
+        kept at its first most-confident stamp; only longer segments need the
+        stamp-by-stamp walk.
+        """
+        count = len(timestamps)
+        if count == 0:
+            return []
 
-        return merged
+        starts_segment = np.ones(count, dtype=bool)
+        starts_segment[1:] = (keys[1:] != keys[:-1]) | (
+            timestamps[1:] - timestamps[:-1] >= time_threshold
+        )
+        starts = np.flatnonzero(starts_segment)
+        ends = np.append(starts[1:], count)
+
+        # First index of each segment's maximum confidence
+        segment_max = np.maximum.reduceat(confidence, starts)
+        segment_id = np.cumsum(starts_segment) - 1
+        positions = np.where(
+            confidence == segment_max[segment_id], np.arange(count), count
+        )
+        best = np.minimum.reduceat(positions, starts)
+
+        short = timestamps[ends - 1] - timestamps[starts] < time_threshold
+        if short.all():
+            return best.tolist()
+
+        kept: list[int] = []
+        for start, end, is_short, best_idx in zip(starts, ends, short, best):
+            if is_short:
+                kept.append(int(best_idx))
+                continue
+            kept.append(int(start))
+            for k in range(start + 1, end):
+                last = kept[-1]
+                if timestamps[k] - timestamps[last] < time_threshold:
+                    # Keep the higher confidence one
+                    if confidence[k] > confidence[last]:
+                        kept[-1] = k
+                else:
+                    kept.append(k)
+        return kept
 
 
 # Singleton instance
@@ -9,21 +9,32 @@ Implements:
 - AC-033: Stamps stored with type, timestamp, side, and confidence
 - AC-034: No actions detected proceeds with generic feedback
 
-This service coordinates detection algorithms and database storage.
+This service coordinates detection algorithms and database storage. Stamps
+are written with one bulk INSERT rather than one ORM object each, and their
+per-action counts are stored on the analysis at the same time so summaries
+never scan the stamps table.
 """
 import logging
+from collections import Counter
 from typing import Any, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from api.models.analysis import Analysis
 from api.models.stamp import ActionType, Side, Stamp
 from api.schemas.stamp import StampCreate, StampSummary
+from api.services.metrics import STAMP_DETECTION_DURATION, STAMPS_DETECTED
+from api.services.pose_sequence import PoseSequence
 from api.services.stamp_detection_service import stamp_detection_service
 
 logger = logging.getLogger(__name__)
 
+# Action types reported in StampSummary
+STRIKE_SUMMARY_TYPES = ("jab", "straight", "hook", "uppercut")
+DEFENSE_SUMMARY_TYPES = ("guard_up", "guard_down", "slip", "duck", "bob_weave")
+
 
 class StampGenerationError(Exception):
     """Base exception for stamp generation errors."""
@@ -46,7 +57,9 @@ class StampGenerationService:
         """Initialize stamp generation service."""
         self.detection_service = stamp_detection_service
 
-    def detect_all_actions(self, pose_data: dict[str, Any]) -> list[dict[str, Any]]:
+    def detect_all_actions(
+        self, pose_data: dict[str, Any] | PoseSequence
+    ) -> list[dict[str, Any]]:
         """Detect all actions (strikes and defense) from pose data.
 
         AC-030: Strikes detected by arm velocity and trajectory patterns
@@ -54,23 +67,23 @@ class StampGenerationService:
         AC-034: No actions detected proceeds with generic feedback
 
         Args:
-            pose_data: Pose data with frames and fps
+            pose_data: PoseSequence, or pose data dict with frames and fps
 
         Returns:
             List of detected action stamps (may be empty for AC-034)
         """
         all_stamps = []
 
-        # Detect strikes
-        strikes = self.detection_service.detect_strikes(pose_data)
+        # Detect strikes and defensive actions in one pass
+        with STAMP_DETECTION_DURATION.time():
+            strikes, defense = self.detection_service.detect_actions(pose_data)
         all_stamps.extend(strikes)
-
-        # Detect defensive actions
-        defense = self.detection_service.detect_defense(pose_data)
         all_stamps.extend(defense)
 
         # Sort by timestamp
         all_stamps.sort(key=lambda s: s["timestamp_seconds"])
+        for action_type, count in Counter(s["action_type"] for s in all_stamps).items():
+            STAMPS_DETECTED.inc(count, type=action_type)
 
         logger.info(
             "stamp_detection.complete",
@@ -87,8 +100,8 @@ class StampGenerationService:
         self,
         session: AsyncSession,
         analysis_id: UUID,
-        pose_data: dict[str, Any],
-    ) -> list[Stamp]:
+        pose_data: dict[str, Any] | PoseSequence,
+    ) -> list[UUID]:
         """Generate and store stamps for an analysis.
 
         AC-032: Each action timestamped with frame number and confidence
@@ -98,13 +111,41 @@ class StampGenerationService:
         Args:
             session: Database session
             analysis_id: Analysis ID
-            pose_data: Pose data with frames and fps
+            pose_data: PoseSequence, or pose data dict with frames and fps
+
+        The analysis' stamp counters are set from the detections, so the
+        analysis is expected to have no stamps yet (see
+        delete_stamps_for_analysis for reprocessing).
+
+        Returns:
+            IDs of the created stamps, in detection order
+        """
+        return await self.save_stamps(
+            session, analysis_id, self.detect_all_actions(pose_data)
+        )
+
+    async def save_stamps(
+        self,
+        session: AsyncSession,
+        analysis_id: UUID,
+        detected_stamps: list[dict[str, Any]],
+    ) -> list[UUID]:
+        """Store detected stamps and the analysis' stamp counters.
+
+        AC-033: Stamps stored with type, timestamp, side, and confidence
+        AC-034: No actions detected proceeds with generic feedback
+
+        Args:
+            session: Database session
+            analysis_id: Analysis ID
+            detected_stamps: Stamp dicts from detect_all_actions
 
         Returns:
-            List of created Stamp models
+            IDs of the created stamps, in detection order
         """
-        # Detect all actions
-        detected_stamps = self.detect_all_actions(pose_data)
+        await self.store_stamp_counters(
+            session, analysis_id, self.compute_stamp_counters(detected_stamps)
+        )
 
         # AC-034: No actions is valid - proceed with empty list
         if not detected_stamps:
@@ -117,33 +158,59 @@ class StampGenerationService:
             )
             return []
 
-        # Create stamp records
-        stamps = []
-        for stamp_data in detected_stamps:
-            stamp = Stamp(
-                analysis_id=analysis_id,
-                timestamp_seconds=stamp_data["timestamp_seconds"],
-                frame_number=stamp_data["frame_number"],
-                action_type=stamp_data["action_type"],
-                side=stamp_data["side"],
-                confidence=stamp_data["confidence"],
-                velocity_vector=stamp_data.get("velocity_vector"),
-                trajectory_data=stamp_data.get("trajectory_data"),
-            )
-            session.add(stamp)
-            stamps.append(stamp)
-
-        await session.flush()
+        stamp_ids = await self.insert_stamps(session, analysis_id, detected_stamps)
 
         logger.info(
             "stamp_generation.complete",
             extra={
                 "analysis_id": str(analysis_id),
-                "stamps_created": len(stamps),
+                "stamps_created": len(stamp_ids),
             },
         )
 
-        return stamps
+        return stamp_ids
+
+    async def insert_stamps(
+        self,
+        session: AsyncSession,
+        analysis_id: UUID,
+        detected_stamps: list[dict[str, Any]],
+    ) -> list[UUID]:
+        """Bulk-insert detected stamps without building ORM objects.
+
+        AC-033: Stamps stored with type, timestamp, side, and confidence
+
+        One INSERT statement is compiled once and executed with all rows
+        (executemany; SQLAlchemy batches it into multi-row VALUES where the
+        driver supports it). IDs are generated client-side, so no RETURNING
+        is needed.
+
+        Args:
+            session: Database session
+            analysis_id: Analysis ID
+            detected_stamps: Stamp dicts from detect_all_actions
+
+        Returns:
+            IDs of the inserted stamps, in input order
+        """
+        rows = [
+            {
+                "id": uuid4(),
+                "analysis_id": analysis_id,
+                "timestamp_seconds": stamp_data["timestamp_seconds"],
+                "frame_number": stamp_data["frame_number"],
+                "action_type": stamp_data["action_type"],
+                "side": stamp_data["side"],
+                "confidence": stamp_data["confidence"],
+                "velocity_vector": stamp_data.get("velocity_vector"),
+                "trajectory_data": stamp_data.get("trajectory_data"),
+            }
+            for stamp_data in detected_stamps
+        ]
+
+        await session.execute(insert(Stamp.__table__), rows)
+
+        return [row["id"] for row in rows]
 
     async def get_stamps_for_analysis(
         self,
@@ -166,6 +233,77 @@ class StampGenerationService:
         )
         return list(result.scalars().all())
 
+    @staticmethod
+    def compute_stamp_counters(stamps: list[dict[str, Any]]) -> dict[str, Any]:
+        """Counters for a set of stamp dicts, as stored on the analysis.
+
+        Args:
+            stamps: Stamp dicts (action_type, confidence)
+
+        Returns:
+            Dict of stamp_total, stamp_counts ({action_type: count}) and
+            stamp_avg_confidence
+        """
+        counts: dict[str, int] = {}
+        for stamp_data in stamps:
+            counts[stamp_data["action_type"]] = counts.get(stamp_data["action_type"], 0) + 1
+        total = len(stamps)
+
+        return {
+            "stamp_total": total,
+            "stamp_counts": counts,
+            "stamp_avg_confidence": (
+                sum(s["confidence"] for s in stamps) / total if total else 0.0
+            ),
+        }
+
+    async def store_stamp_counters(
+        self,
+        session: AsyncSession,
+        analysis_id: UUID,
+        counters: dict[str, Any],
+    ) -> None:
+        """Write stamp counters onto the analysis row.
+
+        Args:
+            session: Database session
+            analysis_id: Analysis ID
+            counters: Output of compute_stamp_counters
+        """
+        await session.execute(
+            update(Analysis).where(Analysis.id == analysis_id).values(**counters)
+        )
+
+    async def count_stamps(
+        self,
+        session: AsyncSession,
+        analysis_id: UUID,
+    ) -> dict[str, Any]:
+        """Compute stamp counters with GROUP BY (legacy analyses).
+
+        Args:
+            session: Database session
+            analysis_id: Analysis ID
+
+        Returns:
+            Counters in the compute_stamp_counters format
+        """
+        result = await session.execute(
+            select(Stamp._action_type, func.count(), func.sum(Stamp.confidence))
+            .where(Stamp.analysis_id == analysis_id)
+            .group_by(Stamp._action_type)
+        )
+        rows = result.all()
+        total = sum(count for _, count, _ in rows)
+
+        return {
+            "stamp_total": total,
+            "stamp_counts": {action_type: count for action_type, count, _ in rows},
+            "stamp_avg_confidence": (
+                sum(confidence_sum for _, _, confidence_sum in rows) / total if total else 0.0
+            ),
+        }
+
     async def get_stamp_summary(
         self,
         session: AsyncSession,
@@ -173,6 +311,9 @@ class StampGenerationService:
     ) -> StampSummary:
         """Get summary statistics for stamps.
 
+        Reads the counters stored on the analysis; analyses stamped before
+        counters existed are counted with one GROUP BY query instead.
+
         Args:
             session: Database session
             analysis_id: Analysis ID
@@ -180,40 +321,28 @@ class StampGenerationService:
         Returns:
             StampSummary with counts and statistics
         """
-        stamps = await self.get_stamps_for_analysis(session, analysis_id)
-
-        # Calculate counts by type
-        strike_counts = {
-            "jab": 0,
-            "straight": 0,
-            "hook": 0,
-            "uppercut": 0,
-        }
-        defense_counts = {
-            "guard_up": 0,
-            "guard_down": 0,
-            "slip": 0,
-            "duck": 0,
-            "bob_weave": 0,
-        }
-
-        total_confidence = 0.0
-        for stamp in stamps:
-            action_type = stamp._action_type
-            if action_type in strike_counts:
-                strike_counts[action_type] += 1
-            elif action_type in defense_counts:
-                defense_counts[action_type] += 1
-            total_confidence += stamp.confidence
+        result = await session.execute(
+            select(
+                Analysis.stamp_total,
+                Analysis.stamp_counts,
+                Analysis.stamp_avg_confidence,
+            ).where(Analysis.id == analysis_id)
+        )
+        row = result.one_or_none()
+        if row is None or row.stamp_total is None:
+            counters = await self.count_stamps(session, analysis_id)
+        else:
+            counters = row._asdict()
 
-        avg_confidence = total_confidence / len(stamps) if stamps else 0.0
+        counts = counters["stamp_counts"] or {}
+        total = counters["stamp_total"]
 
         return StampSummary(
-            total_stamps=len(stamps),
-            strikes=strike_counts,
-            defense=defense_counts,
-            avg_confidence=round(avg_confidence, 2),
-            no_actions_detected=len(stamps) == 0,
+            total_stamps=total,
+            strikes={t: counts.get(t, 0) for t in STRIKE_SUMMARY_TYPES},
+            defense={t: counts.get(t, 0) for t in DEFENSE_SUMMARY_TYPES},
+            avg_confidence=round(counters["stamp_avg_confidence"] or 0.0, 2),
+            no_actions_detected=total == 0,
         )
 
     async def delete_stamps_for_analysis(
@@ -233,15 +362,12 @@ class StampGenerationService:
             Number of stamps deleted
         """
         result = await session.execute(
-            select(Stamp).where(Stamp.analysis_id == analysis_id)
+            delete(Stamp).where(Stamp.analysis_id == analysis_id)
+        )
+        count = result.rowcount
+        await self.store_stamp_counters(
+            session, analysis_id, self.compute_stamp_counters([])
         )
-        stamps = list(result.scalars().all())
-        count = len(stamps)
-
-        for stamp in stamps:
-            await session.delete(stamp)
-
-        await session.flush()
 
         logger.info(
             "stamp_generation.deleted",
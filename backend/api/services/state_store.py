@@ -2,6 +2,10 @@
 
 This module provides server-side state validation for OAuth flows,
 addressing the CSRF protection requirement (B1 from code review).
+
+It also owns the process' Redis client. Redis-backed services use it through
+SharedRedisClient, so a process holds one connection pool; close_redis
+closes it on shutdown.
 """
 import secrets
 from datetime import datetime, timedelta, timezone
@@ -17,35 +21,58 @@ _memory_store: dict[str, tuple[datetime, Optional[str]]] = {}
 # Global Redis client
 _redis_client: Optional[redis.Redis] = None
 
+# Whether a ping through _redis_client has succeeded
+_redis_reachable = False
+
+
+def get_redis_client() -> redis.Redis:
+    """Get or create the process' Redis client (connects lazily)."""
+    global _redis_client
+    if _redis_client is None:
+        _redis_client = redis.from_url(get_settings().redis_url, decode_responses=True)
+    return _redis_client
+
 
 async def get_redis() -> Optional[redis.Redis]:
-    """Get or create Redis client.
+    """Get the Redis client once Redis has answered a ping.
 
     Returns None if Redis is unavailable (falls back to memory store).
     """
-    global _redis_client
-    settings = get_settings()
+    global _redis_reachable
+    client = get_redis_client()
 
-    if _redis_client is None:
+    if not _redis_reachable:
         try:
-            _redis_client = redis.from_url(
-                settings.redis_url,
-                decode_responses=True,
-            )
-            # Test connection
-            await _redis_client.ping()
+            await client.ping()
         except Exception:
-            _redis_client = None
+            return None
+        _redis_reachable = True
 
-    return _redis_client
+    return client
 
 
 async def close_redis():
     """Close Redis connection."""
-    global _redis_client
+    global _redis_client, _redis_reachable
     if _redis_client:
-        await _redis_client.close()
+        await _redis_client.aclose()
         _redis_client = None
+        _redis_reachable = False
+
+
+class SharedRedisClient:
+    """Mixin giving a Redis backend the process' client.
+
+    A client passed to the backend's constructor (stored as _client) is used
+    instead. Neither is closed by the backend.
+    """
+
+    _client: Optional[redis.Redis] = None
+
+    @property
+    def client(self) -> redis.Redis:
+        """The injected client, else the process' client."""
+        return self._client or get_redis_client()
 
 
 async def store_state(redirect_path: Optional[str] = None, ttl_seconds: int = 600) -> str:
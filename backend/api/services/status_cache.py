@@ -0,0 +1,324 @@
+"""Read-through cache of processing status payloads.
+
+@feature F005 - Pose Estimation Processing
+
+Implements:
+- AC-029: Processing progress logged and retrievable via status endpoint
+
+Clients poll GET /processing/status/{id} every second or two while an
+analysis runs, but its row changes only a handful of times per stage. The
+endpoint serves the ProcessingService.get_status payload from here, keyed by
+analysis_id, together with its owner and ETag; the row is read only on a
+miss. A poll whose If-None-Match still matches gets a 304 without touching
+the database.
+
+ProcessingService invalidates the entry from every method that writes the
+row (invalidate_on_commit); the entry is dropped once that transaction
+commits, because a poll before the commit must still see the old status.
+Every invalidation also bumps the analysis' generation, and a fill only
+lands if the generation is the one read before the row was: a poll that read
+the row just before a commit cannot store the old status after it.
+
+Right after an invalidation every poller misses at once; read_through lets
+concurrent misses of an analysis in one process share a single read.
+
+RedisStatusCache is shared by the API and worker processes; with
+InMemoryStatusCache, used by tests, invalidations only reach the writing
+process. Entries also expire after STATUS_CACHE_TTL_SECONDS. The cache is an
+optimization: when Redis is unreachable polls read the database as before.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+from uuid import UUID
+
+import redis.asyncio as redis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from api.config import get_settings
+from api.services.state_store import SharedRedisClient
+
+logger = logging.getLogger(__name__)
+
+# session.info key of the analyses to invalidate on commit
+_PENDING = "status_cache_invalidations"
+
+
+class CachedStatus(NamedTuple):
+    """Cached status payload of one analysis."""
+
+    user_id: str
+    etag: str
+    payload: dict[str, Any]
+
+
+class StatusCache(ABC):
+    """Backend-independent part of the status cache."""
+
+    def __init__(self, ttl_seconds: Optional[float] = None):
+        """Initialize cache.
+
+        Args:
+            ttl_seconds: Entry lifetime (None = settings)
+        """
+        self.ttl_seconds = ttl_seconds or get_settings().status_cache_ttl_seconds
+        self._tasks: set[asyncio.Task] = set()
+        self._loading: dict[str, asyncio.Future] = {}
+
+    @staticmethod
+    def etag_for(payload: dict[str, Any]) -> str:
+        """Strong ETag of a status payload."""
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+        return f'"{hashlib.sha1(encoded.encode()).hexdigest()[:20]}"'
+
+    @abstractmethod
+    async def get(self, analysis_id: UUID | str) -> tuple[Optional[CachedStatus], str]:
+        """Cached status of an analysis.
+
+        Returns:
+            The entry (None on a miss) and the generation to pass to fill
+        """
+
+    @abstractmethod
+    async def fill(
+        self,
+        analysis_id: UUID | str,
+        generation: str,
+        user_id: UUID | str,
+        payload: dict[str, Any],
+    ) -> CachedStatus:
+        """Cache a status read from the database.
+
+        Not stored if the analysis was invalidated since get returned
+        generation.
+
+        Returns:
+            The entry for the payload
+        """
+
+    @abstractmethod
+    async def invalidate(self, analysis_id: UUID | str) -> None:
+        """Drop the analysis' entry now."""
+
+    async def read_through(
+        self,
+        analysis_id: UUID | str,
+        user_id: UUID | str,
+        load: Callable[[], Awaitable[dict[str, Any]]],
+    ) -> CachedStatus:
+        """Cached status, loaded and cached on a miss.
+
+        A miss while another poll of this process is loading the analysis
+        waits for that load instead of reading the row again. The entry may
+        then belong to another user; callers compare CachedStatus.user_id.
+
+        Args:
+            analysis_id: Analysis ID
+            user_id: User the status is loaded for
+            load: Reads the status payload for user_id (get_status)
+
+        Returns:
+            The cached or loaded entry
+
+        Raises:
+            Exception: Whatever load raises
+        """
+        key = str(analysis_id)
+        cached, generation = await self.get(key)
+        if cached is not None:
+            return cached
+
+        pending = self._loading.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except Exception:
+                # The other poll's load failed (not its analysis, say): load our own
+                return await self.fill(key, generation, user_id, await load())
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            entry = await self.fill(key, generation, user_id, await load())
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # retrieved, even if nobody waited
+            raise
+        else:
+            future.set_result(entry)
+            return entry
+        finally:
+            if self._loading.get(key) is future:
+                del self._loading[key]
+
+    def invalidate_on_commit(self, session: AsyncSession, analysis_id: UUID | str) -> None:
+        """Drop the analysis' entry once the session's transaction commits."""
+        pending = session.info.setdefault(_PENDING, set())
+        if not pending:
+            event.listen(session.sync_session, "after_commit", self._after_commit, once=True)
+        pending.add(str(analysis_id))
+
+    async def close(self) -> None:
+        """Finish pending invalidations."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def _after_commit(self, sync_session: Any) -> None:
+        """Invalidate what the committed transaction changed."""
+        keys = sync_session.info.pop(_PENDING, set())
+        if keys:
+            self._invalidate_committed(keys)
+
+    def _invalidate_committed(self, keys: set[str]) -> None:
+        """Invalidate from the synchronous after_commit hook."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            logger.warning("status_cache.invalidate_skipped", extra={"analysis_ids": sorted(keys)})
+            return
+        for key in keys:
+            task = loop.create_task(self.invalidate(key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+
+class InMemoryStatusCache(StatusCache):
+    """Single-process cache for tests."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.clock = clock
+        # analysis_id -> (expires_at, entry)
+        self._entries: dict[str, tuple[float, CachedStatus]] = {}
+        self._generations: dict[str, int] = {}
+
+    async def get(self, analysis_id: UUID | str) -> tuple[Optional[CachedStatus], str]:
+        key = str(analysis_id)
+        generation = str(self._generations.get(key, 0))
+        cached = self._entries.get(key)
+        if cached is None or cached[0] <= self.clock():
+            return None, generation
+        return cached[1], generation
+
+    async def fill(
+        self,
+        analysis_id: UUID | str,
+        generation: str,
+        user_id: UUID | str,
+        payload: dict[str, Any],
+    ) -> CachedStatus:
+        key = str(analysis_id)
+        entry = CachedStatus(str(user_id), self.etag_for(payload), payload)
+        if str(self._generations.get(key, 0)) == generation:
+            self._entries[key] = (self.clock() + self.ttl_seconds, entry)
+        return entry
+
+    async def invalidate(self, analysis_id: UUID | str) -> None:
+        key = str(analysis_id)
+        self._generations[key] = self._generations.get(key, 0) + 1
+        self._entries.pop(key, None)
+
+    def _invalidate_committed(self, keys: set[str]) -> None:
+        # Nothing to await: drop the entries before commit() returns
+        for key in keys:
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._entries.pop(key, None)
+
+
+class RedisStatusCache(SharedRedisClient, StatusCache):
+    """Cache shared by the API and worker processes through Redis."""
+
+    # KEYS: entry, generation; ARGV: generation read before the row, entry, ttl
+    _FILL = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+  return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'PX', ARGV[3])
+return 1
+"""
+
+    def __init__(self, client: Optional[redis.Redis] = None, **kwargs: Any):
+        """Initialize cache.
+
+        Args:
+            client: Redis client with decode_responses=True (None = the
+                process' client, see state_store)
+            **kwargs: StatusCache options
+        """
+        super().__init__(**kwargs)
+        self._client = client
+        self._fill_script: Optional[Any] = None
+
+    @staticmethod
+    def keys(key: str) -> list[str]:
+        """Entry and generation keys of an analysis."""
+        return [f"analysis:{key}:status", f"analysis:{key}:status:generation"]
+
+    async def get(self, analysis_id: UUID | str) -> tuple[Optional[CachedStatus], str]:
+        try:
+            data, generation = await self.client.mget(self.keys(str(analysis_id)))
+        except redis.RedisError as e:
+            logger.warning("status_cache.unavailable", extra={"error": str(e)})
+            return None, ""
+        generation = generation or "0"
+        if not data:
+            return None, generation
+        try:
+            return CachedStatus(*json.loads(data)), generation
+        except (ValueError, TypeError):
+            return None, generation
+
+    async def fill(
+        self,
+        analysis_id: UUID | str,
+        generation: str,
+        user_id: UUID | str,
+        payload: dict[str, Any],
+    ) -> CachedStatus:
+        entry = CachedStatus(str(user_id), self.etag_for(payload), payload)
+        if not generation:
+            # get could not reach Redis
+            return entry
+        if self._fill_script is None:
+            self._fill_script = self.client.register_script(self._FILL)
+        try:
+            await self._fill_script(
+                keys=self.keys(str(analysis_id)),
+                args=[generation, json.dumps(entry, default=str), int(self.ttl_seconds * 1000)],
+                client=self.client,
+            )
+        except redis.RedisError as e:
+            logger.warning("status_cache.unavailable", extra={"error": str(e)})
+        return entry
+
+    async def invalidate(self, analysis_id: UUID | str) -> None:
+        entry_key, generation_key = self.keys(str(analysis_id))
+        try:
+            async with self.client.pipeline(transaction=True) as pipe:
+                pipe.incr(generation_key)
+                # Outlives any entry filled under the previous generation
+                pipe.pexpire(generation_key, int(self.ttl_seconds * 2000))
+                pipe.delete(entry_key)
+                await pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(
+                "status_cache.invalidate_failed",
+                extra={"analysis_id": str(analysis_id), "error": str(e)},
+            )
+
+
+def create_status_cache(backend: Optional[str] = None) -> StatusCache:
+    """Create the status cache for the configured backend."""
+    backend = backend or get_settings().status_cache_backend
+    if backend == "memory":
+        return InMemoryStatusCache()
+    return RedisStatusCache()
+
+
+# Singleton instance
+status_cache = create_status_cache()
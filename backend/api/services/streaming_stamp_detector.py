@@ -0,0 +1,286 @@
+"""Incremental stamp detection over a stream of pose frames.
+
+@feature F006 - Stamp Generation
+
+Implements:
+- AC-030: Strikes detected by arm velocity and trajectory patterns
+- AC-031: Defensive actions detected by torso and arm positioning
+
+StampDetectionService needs the whole PoseData up front. StreamingStampDetector
+accepts frames one at a time and emits each stamp as soon as it is final, so
+detection can run alongside pose extraction or on a live session. It keeps
+only a ring buffer of the last few frames plus the guard/slip/duck state
+machines, and emits exactly the stamps StampDetectionService.detect_actions
+returns for the same frames (landmarks pass through the same One-Euro filter;
+Savitzky-Golay smoothing needs future frames and is not supported):
+
+- a strike is final once no later detection can merge into it, i.e. a
+  different strike was detected or MERGE_TIME_THRESHOLD has passed;
+- a defense action is final when its run ends (guard up also at finish()).
+"""
+import logging
+from typing import Any, Optional
+
+import numpy as np
+
+from api.services.pose_sequence import JOINT_COUNT, VISIBILITY, PoseSequence
+from api.services.stamp_detection_service import (
+    CONFIDENCE_THRESHOLD,
+    MERGE_TIME_THRESHOLD,
+    STRIKE_SIDES,
+    StampDetectionService,
+    stamp_detection_service,
+)
+
+logger = logging.getLogger(__name__)
+
+# Strikes compare the wrist between frame i - 2 and frame i
+STRIKE_FRAME_GAP = 2
+
+
+class StreamingStampDetectorError(Exception):
+    """Base exception for streaming stamp detection errors."""
+
+    pass
+
+
+class StreamingStampDetector:
+    """Stamp detector fed one pose frame at a time.
+
+    AC-030: Strikes detected by arm velocity and trajectory patterns
+    AC-031: Defensive actions detected by torso and arm positioning
+
+    Frames must be pushed in timestamp order. Not thread-safe: push from a
+    single thread.
+
+    Attributes:
+        fps: Frame rate used for strike velocities; may be assigned until
+            the first frame is pushed
+        stamps: Every stamp emitted so far, in emission order
+    """
+
+    def __init__(
+        self,
+        fps: Optional[float] = None,
+        service: Optional[StampDetectionService] = None,
+    ):
+        """Initialize detector.
+
+        Args:
+            fps: Frame rate of the pushed frames (None = set later, default 30)
+            service: Detection service supplying the per-frame predicates
+                and landmark smoothing
+
+        Raises:
+            LandmarkSmoothingError: If the service smooths with Savitzky-Golay
+        """
+        self.fps = fps
+        self.service = service or stamp_detection_service
+        self.stamps: list[dict[str, Any]] = []
+        self._filter = self.service.smoother.new_filter()
+
+        # Ring buffer of the most recent frames, indexed by frame count modulo size
+        size = STRIKE_FRAME_GAP + 1
+        self._ring = PoseSequence(
+            landmarks=np.full((size, JOINT_COUNT, 4), np.nan, dtype=np.float32),
+            confidence=np.zeros(size, dtype=np.float64),
+            timestamps=np.zeros(size, dtype=np.float64),
+            frame_numbers=np.zeros(size, dtype=np.int64),
+        )
+        self._count = 0
+        self._finished = False
+
+        # Strike waiting for later detections that could merge into it
+        self._pending_strike: Optional[dict[str, Any]] = None
+
+        # Defense state machines: start as (frame index, frame_number, timestamp)
+        self._prev_positions: Optional[np.ndarray] = None
+        self._guard_start: Optional[tuple[int, int, float]] = None
+        self._slip_start: Optional[tuple[int, int, float]] = None
+        self._duck_start: Optional[tuple[int, int, float]] = None
+
+    def __len__(self) -> int:
+        """Number of frames pushed so far."""
+        return self._count
+
+    def push(self, frame: dict[str, Any]) -> list[dict[str, Any]]:
+        """Add the next pose frame.
+
+        Args:
+            frame: PoseFrame dict (frame_number, timestamp_seconds, joints, confidence)
+
+        Returns:
+            Stamps that became final with this frame, strikes first
+
+        Raises:
+            StreamingStampDetectorError: If called after finish()
+        """
+        if self._finished:
+            raise StreamingStampDetectorError("Detector already finished")
+        if self.fps is None:
+            self.fps = 30.0
+
+        index = self._count
+        slot = index % len(self._ring)
+        self._ring.write_frame(slot, frame)
+        self._count += 1
+        if self._filter is not None:
+            coords = self._ring.landmarks[slot, :, :VISIBILITY]
+            coords[:] = self._filter(coords, float(self._ring.timestamps[slot]), 1.0 / self.fps)
+
+        timestamp = float(self._ring.timestamps[slot])
+        confident = self._ring.confidence[slot] >= CONFIDENCE_THRESHOLD
+
+        strikes: list[dict[str, Any]] = []
+        pending = self._pending_strike
+        if pending is not None and timestamp - pending["timestamp_seconds"] >= MERGE_TIME_THRESHOLD:
+            # Nothing from this frame on can merge into it
+            strikes.append(pending)
+            self._pending_strike = None
+
+        if confident and index >= STRIKE_FRAME_GAP:
+            prev_slot = (index - STRIKE_FRAME_GAP) % len(self._ring)
+            for side in STRIKE_SIDES:
+                strike = self.service._detect_arm_strike(self._ring, prev_slot, slot, self.fps, side)
+                if strike is not None:
+                    strikes.extend(self._merge_strike(strike))
+
+        defense = (
+            self._update_defense(index, slot, self._ring.landmarks[slot].copy())
+            if confident
+            else []
+        )
+
+        emitted = strikes + defense
+        self.stamps.extend(emitted)
+        return emitted
+
+    def finish(self) -> list[dict[str, Any]]:
+        """End the stream and flush stamps still open.
+
+        Emits the pending strike and a guard still up on the last frame.
+        Unfinished slips and ducks are dropped, as in detect_defense.
+
+        Returns:
+            Stamps that became final, strikes first
+        """
+        if self._finished:
+            return []
+        self._finished = True
+
+        emitted: list[dict[str, Any]] = []
+        if self._pending_strike is not None:
+            emitted.append(self._pending_strike)
+            self._pending_strike = None
+
+        if self._guard_start is not None:
+            # Guard held to the end of the video
+            duration = self._count - self._guard_start[0]
+            if duration >= self.service.min_action_frames:
+                emitted.append(self._defense_stamp(
+                    self._guard_start, "guard_up", "both", min(0.95, 0.7 + duration * 0.02)
+                ))
+        self._guard_start = self._slip_start = self._duck_start = None
+
+        self.stamps.extend(emitted)
+        return emitted
+
+    def split_stamps(self) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Emitted stamps as (strikes, defense), like detect_actions returns."""
+        strikes = [s for s in self.stamps if "velocity_vector" in s]
+        defense = [s for s in self.stamps if "velocity_vector" not in s]
+        return strikes, defense
+
+    def _merge_strike(self, strike: dict[str, Any]) -> list[dict[str, Any]]:
+        """Merge a new strike into the pending one; return stamps made final.
+
+        Same rule as StampDetectionService._merge_indices: a strike joins the
+        previous kept strike if it has the same type and side and is less than
+        MERGE_TIME_THRESHOLD after it, replacing it if more confident.
+        """
+        pending = self._pending_strike
+        if (
+            pending is not None
+            and strike["action_type"] == pending["action_type"]
+            and strike["side"] == pending["side"]
+            and strike["timestamp_seconds"] - pending["timestamp_seconds"] < MERGE_TIME_THRESHOLD
+        ):
+            if strike["confidence"] > pending["confidence"]:
+                self._pending_strike = strike
+            return []
+
+        self._pending_strike = strike
+        return [pending] if pending is not None else []
+
+    def _update_defense(
+        self,
+        index: int,
+        slot: int,
+        positions: np.ndarray,
+    ) -> list[dict[str, Any]]:
+        """Advance the guard/slip/duck state machines by one confident frame.
+
+        AC-031: Defensive actions detected by torso and arm positioning
+
+        Low-confidence frames never reach this: they neither end an action nor
+        serve as the previous frame for slips. Durations count every frame.
+        """
+        service = self.service
+        start = (index, int(self._ring.frame_numbers[slot]), float(self._ring.timestamps[slot]))
+        emitted: list[dict[str, Any]] = []
+
+        if service._is_guard_up(positions):
+            if self._guard_start is None:
+                self._guard_start = start
+        elif self._guard_start is not None:
+            duration = index - self._guard_start[0]
+            if duration >= service.min_action_frames:
+                emitted.append(self._defense_stamp(
+                    self._guard_start, "guard_up", "both", min(0.95, 0.7 + duration * 0.02)
+                ))
+            self._guard_start = None
+
+        prev = self._prev_positions
+        if prev is not None:
+            if service._is_slip(prev, positions):
+                if self._slip_start is None:
+                    self._slip_start = start
+            elif self._slip_start is not None:
+                duration = index - self._slip_start[0]
+                if duration >= service.min_action_frames:
+                    emitted.append(self._defense_stamp(
+                        self._slip_start, "slip", service._get_slip_side(prev, positions),
+                        min(0.9, 0.65 + duration * 0.02),
+                    ))
+                self._slip_start = None
+
+        if service._is_duck(positions):
+            if self._duck_start is None:
+                self._duck_start = start
+        elif self._duck_start is not None:
+            duration = index - self._duck_start[0]
+            if duration >= service.min_action_frames:
+                emitted.append(self._defense_stamp(
+                    self._duck_start, "duck", "both", min(0.9, 0.65 + duration * 0.02)
+                ))
+            self._duck_start = None
+
+        self._prev_positions = positions
+        return emitted
+
+    @staticmethod
+    def _defense_stamp(
+        start: tuple[int, int, float],
+        action_type: str,
+        side: str,
+        confidence: float,
+    ) -> dict[str, Any]:
+        """Create a defense stamp dated at the run's first frame."""
+        _, frame_number, timestamp = start
+        return {
+            "frame_number": frame_number,
+            "timestamp_seconds": timestamp,
+            "action_type": action_type,
+            "side": side,
+            "confidence": round(confidence, 2),
+        }
@@ -5,9 +5,10 @@ Uses OpenCV for frame extraction and MediaPipe for pose detection.
 import base64
 import logging
 import os
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Iterator, Optional
 from uuid import UUID
 
 import cv2
@@ -17,9 +18,23 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from api.config import get_settings
 from api.models.analysis import Analysis, AnalysisStatus
 from api.models.upload import Video
+from api.services.analysis_executor import analysis_executor
+from api.services.frame_preprocessor import FramePreprocessor
+from api.services.metrics import POSE_STEP_DURATION
+from api.services.pose_engine import pose_engine
+from api.services.pose_tracker import POSE_MODES, PoseTracker
 
 logger = logging.getLogger(__name__)
 
+# Frame extraction strategies (see VideoProcessor.extract_frames)
+EXTRACTION_MODES = ("auto", "seek", "linear")
+
+# Frames sampled per video in sparse pose mode
+SPARSE_FRAME_COUNT = 12
+
+# Fixed cost of a seek (decoder flush + demuxer reposition), in decoded frames
+SEEK_OVERHEAD_FRAMES = 2
+
 
 class VideoProcessingError(Exception):
     """Base exception for video processing errors."""
@@ -93,17 +108,30 @@ class VideoProcessor:
     def extract_frames(
         self,
         video_path: str,
-        num_frames: int = 12,
+        num_frames: int = SPARSE_FRAME_COUNT,
+        mode: Optional[str] = None,
     ) -> list[dict[str, Any]]:
         """Extract frames from video at regular intervals.
 
+        Two read strategies are supported:
+        - seek: ``cap.set(CAP_PROP_POS_FRAMES)`` before each read. Each seek
+          decodes forward from the previous keyframe, so it only pays off when
+          samples are far apart relative to the keyframe interval.
+        - linear: a single in-order pass using ``grab()`` for every frame and
+          ``retrieve()`` only for the wanted indices.
+
         Args:
             video_path: Path to video file
             num_frames: Number of frames to extract
+            mode: "seek", "linear" or "auto" (defaults to settings)
 
         Returns:
             List of frame data with timestamps and images
         """
+        mode = mode or self.settings.frame_extraction_mode
+        if mode not in EXTRACTION_MODES:
+            raise VideoProcessingError(f"Unknown frame extraction mode: {mode}")
+
         cap = cv2.VideoCapture(video_path)
         if not cap.isOpened():
             raise VideoProcessingError(f"Cannot open video: {video_path}")
@@ -111,7 +139,6 @@ class VideoProcessor:
         try:
             total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
             fps = cap.get(cv2.CAP_PROP_FPS)
-            duration = total_frames / fps if fps > 0 else 0
 
             # Calculate frame intervals
             if total_frames <= num_frames:
@@ -120,23 +147,107 @@ class VideoProcessor:
                 step = total_frames // num_frames
                 frame_indices = [i * step for i in range(num_frames)]
 
-            frames = []
-            for idx in frame_indices:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
-                ret, frame = cap.read()
-                if ret:
-                    timestamp = idx / fps if fps > 0 else 0
-                    frames.append({
-                        "frame_index": idx,
-                        "timestamp_seconds": round(timestamp, 2),
-                        "image": frame,
-                    })
+            if mode == "auto":
+                mode = self.select_extraction_mode(
+                    frame_indices, self._estimate_keyframe_interval(fps)
+                )
+
+            logger.debug(
+                "video.extract_frames",
+                extra={"mode": mode, "frames": len(frame_indices), "total_frames": total_frames},
+            )
 
-            return frames
+            if mode == "linear":
+                return self._read_frames_linear(cap, frame_indices, fps)
+            return self._read_frames_seek(cap, frame_indices, fps)
 
         finally:
             cap.release()
 
+    def select_extraction_mode(
+        self,
+        frame_indices: list[int],
+        keyframe_interval: int,
+    ) -> str:
+        """Pick the cheaper read strategy for a set of sampled frame indices.
+
+        Costs are expressed in decoded frames. A linear pass decodes every
+        frame up to the last wanted index. A seek lands on the preceding
+        keyframe and decodes forward, on average half a GOP, plus a fixed
+        overhead for flushing the decoder.
+
+        Args:
+            frame_indices: Sorted frame indices to extract
+            keyframe_interval: Estimated keyframe spacing in frames
+
+        Returns:
+            "linear" or "seek"
+        """
+        if not frame_indices:
+            return "seek"
+
+        linear_cost = frame_indices[-1] + 1
+        seek_cost = len(frame_indices) * (keyframe_interval / 2 + SEEK_OVERHEAD_FRAMES)
+
+        return "linear" if linear_cost <= seek_cost else "seek"
+
+    def _estimate_keyframe_interval(self, fps: float) -> int:
+        """Estimate keyframe spacing in frames.
+
+        OpenCV does not expose the GOP size of the decoded stream, so the
+        interval is derived from the configured keyframe period.
+        """
+        fps = fps if fps > 0 else 30.0
+        return max(1, int(round(fps * self.settings.video_keyframe_interval_seconds)))
+
+    def _read_frames_seek(
+        self,
+        cap: "cv2.VideoCapture",
+        frame_indices: list[int],
+        fps: float,
+    ) -> list[dict[str, Any]]:
+        """Read frames by seeking to each index."""
+        frames = []
+        for idx in frame_indices:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, idx)
+            ret, frame = cap.read()
+            if ret:
+                frames.append(self._build_frame_data(idx, fps, frame))
+
+        return frames
+
+    def _read_frames_linear(
+        self,
+        cap: "cv2.VideoCapture",
+        frame_indices: list[int],
+        fps: float,
+    ) -> list[dict[str, Any]]:
+        """Read frames in a single sequential decode pass."""
+        frames = []
+        wanted = set(frame_indices)
+        last_index = frame_indices[-1] if frame_indices else -1
+
+        idx = 0
+        while idx <= last_index:
+            if not cap.grab():
+                break
+            if idx in wanted:
+                ret, frame = cap.retrieve()
+                if ret:
+                    frames.append(self._build_frame_data(idx, fps, frame))
+            idx += 1
+
+        return frames
+
+    def _build_frame_data(self, idx: int, fps: float, image) -> dict[str, Any]:
+        """Build the frame dict returned by extract_frames."""
+        timestamp = idx / fps if fps > 0 else 0
+        return {
+            "frame_index": idx,
+            "timestamp_seconds": round(timestamp, 2),
+            "image": image,
+        }
+
     def estimate_pose(self, frame_image) -> Optional[dict[str, Any]]:
         """Run MediaPipe pose estimation on a frame.
 
@@ -146,40 +257,56 @@ class VideoProcessor:
         Returns:
             Pose data with landmarks or None if no pose detected
         """
+        # Convert BGR to RGB for MediaPipe
+        return self.estimate_pose_rgb(cv2.cvtColor(frame_image, cv2.COLOR_BGR2RGB))
+
+    def estimate_pose_rgb(self, rgb_image) -> Optional[dict[str, Any]]:
+        """Run MediaPipe pose estimation on an RGB frame (see estimate_pose)."""
         # Check if MediaPipe is available
         if not self._init_mediapipe():
             # Return simulated pose data when MediaPipe is not available
             return self._get_fallback_pose_data()
 
         try:
-            # Convert BGR to RGB for MediaPipe
-            rgb_image = cv2.cvtColor(frame_image, cv2.COLOR_BGR2RGB)
-
             results = self.pose.process(rgb_image)
 
-            if not results.pose_landmarks:
-                return None
-
-            # Extract landmark coordinates
-            landmarks = {}
-            for idx, name in self.BOXING_LANDMARKS.items():
-                if idx < len(results.pose_landmarks.landmark):
-                    lm = results.pose_landmarks.landmark[idx]
-                    landmarks[name] = {
-                        "x": round(lm.x, 4),
-                        "y": round(lm.y, 4),
-                        "z": round(lm.z, 4),
-                        "visibility": round(lm.visibility, 4),
-                    }
-
-            return {
-                "landmarks": landmarks,
-                "has_full_body": self._check_full_body(landmarks),
-            }
+            return self.landmarks_to_pose_data(results.pose_landmarks)
         except Exception as e:
             logger.warning(f"Pose estimation failed: {e}")
             return self._get_fallback_pose_data()
 
+    @classmethod
+    def landmarks_to_pose_data(cls, pose_landmarks) -> Optional[dict[str, Any]]:
+        """Convert MediaPipe pose landmarks to the boxing pose dict.
+
+        Shared by in-process estimation and the pose engine workers.
+
+        Args:
+            pose_landmarks: ``results.pose_landmarks`` from MediaPipe (may be None)
+
+        Returns:
+            Pose data with landmarks or None if no pose detected
+        """
+        if not pose_landmarks:
+            return None
+
+        # Extract landmark coordinates
+        landmarks = {}
+        for idx, name in cls.BOXING_LANDMARKS.items():
+            if idx < len(pose_landmarks.landmark):
+                lm = pose_landmarks.landmark[idx]
+                landmarks[name] = {
+                    "x": round(lm.x, 4),
+                    "y": round(lm.y, 4),
+                    "z": round(lm.z, 4),
+                    "visibility": round(lm.visibility, 4),
+                }
+
+        return {
+            "landmarks": landmarks,
+            "has_full_body": cls._check_full_body(landmarks),
+        }
+
     def _get_fallback_pose_data(self) -> dict[str, Any]:
         """Return fallback pose data when MediaPipe is unavailable."""
         # Generate reasonable default values for boxing stance
@@ -198,7 +325,8 @@ class VideoProcessor:
             "fallback_mode": True,
         }
 
-    def _check_full_body(self, landmarks: dict) -> bool:
+    @staticmethod
+    def _check_full_body(landmarks: dict) -> bool:
         """Check if full body is visible (sufficient landmarks detected)."""
         required = ["left_shoulder", "right_shoulder", "left_hip", "right_hip"]
         return all(
@@ -266,6 +394,7 @@ class VideoProcessor:
         session: AsyncSession,
         video_id: UUID,
         user_id: UUID,
+        pose_mode: Optional[str] = None,
     ) -> dict[str, Any]:
         """Process a video for boxing analysis.
 
@@ -273,10 +402,30 @@ class VideoProcessor:
             session: Database session
             video_id: Video ID
             user_id: User ID
+            pose_mode: "sparse" (12 sampled frames) or "tracking" (dense,
+                temporal tracking); defaults to settings
 
         Returns:
             Processing result with pose data and metrics
+
+        Raises:
+            VideoProcessingError: If the video or its file cannot be found
+            ExecutorSaturatedError: If no analysis executor slot is free
         """
+        video_path = await self._resolve_video_path(session, video_id, user_id)
+
+        # Decode, inference and encoding block; keep them off the event loop
+        return await analysis_executor.run(
+            self.analyze_video_file, str(video_path), video_id, pose_mode=pose_mode
+        )
+
+    async def _resolve_video_path(
+        self,
+        session: AsyncSession,
+        video_id: UUID,
+        user_id: UUID,
+    ) -> Path:
+        """Look up the video and resolve its file on local storage."""
         # Get video
         result = await session.execute(
             select(Video).where(Video.id == video_id, Video.user_id == user_id)
@@ -295,38 +444,41 @@ class VideoProcessor:
         if not video_path.exists():
             raise VideoProcessingError(f"Video file not found: {video_path}")
 
-        # Extract frames
-        frames = self.extract_frames(str(video_path))
+        return video_path
 
-        if not frames:
-            raise VideoProcessingError("No frames extracted from video")
+    def analyze_video_file(
+        self,
+        video_path: str,
+        video_id: UUID,
+        pose_mode: Optional[str] = None,
+    ) -> dict[str, Any]:
+        """Run the CPU-bound analysis stages for a video file.
 
-        # Process each frame
-        frame_results = []
-        successful_poses = 0
+        Blocking; called on the analysis executor by process_video.
 
-        for frame_data in frames:
-            pose_data = self.estimate_pose(frame_data["image"])
+        Args:
+            video_path: Path to video file
+            video_id: Video ID (echoed in the result)
+            pose_mode: "sparse" or "tracking" (defaults to settings)
 
-            frame_result = {
-                "frame_index": frame_data["frame_index"],
-                "timestamp_seconds": frame_data["timestamp_seconds"],
-                "pose_detected": pose_data is not None,
-            }
+        Returns:
+            Processing result with pose data and metrics
+        """
+        pose_mode = pose_mode or self.settings.pose_mode
+        if pose_mode not in POSE_MODES:
+            raise VideoProcessingError(f"Unknown pose mode: {pose_mode}")
 
-            if pose_data:
-                successful_poses += 1
-                frame_result["pose"] = pose_data
-                frame_result["boxing_metrics"] = self.analyze_boxing_pose(pose_data)
+        if pose_mode == "tracking":
+            frame_results = self._analyze_tracked(video_path)
+        else:
+            frame_results = self._analyze_sparse(video_path)
 
-                # Encode thumbnail for potential display
-                _, buffer = cv2.imencode('.jpg', frame_data["image"], [cv2.IMWRITE_JPEG_QUALITY, 70])
-                frame_result["thumbnail_base64"] = base64.b64encode(buffer).decode('utf-8')
-
-            frame_results.append(frame_result)
+        if not frame_results:
+            raise VideoProcessingError("No frames extracted from video")
 
         # Calculate overall metrics
-        total_frames = len(frames)
+        total_frames = len(frame_results)
+        successful_poses = sum(1 for f in frame_results if f["pose_detected"])
         detection_rate = successful_poses / total_frames if total_frames > 0 else 0
 
         # Aggregate boxing metrics
@@ -334,6 +486,7 @@ class VideoProcessor:
 
         return {
             "video_id": str(video_id),
+            "pose_mode": pose_mode,
             "total_frames_analyzed": total_frames,
             "successful_detections": successful_poses,
             "detection_rate": round(detection_rate, 2),
@@ -342,6 +495,147 @@ class VideoProcessor:
             "processed_at": datetime.now(timezone.utc).isoformat(),
         }
 
+    def _analyze_sparse(self, video_path: str) -> list[dict[str, Any]]:
+        """Estimate pose independently on 12 sampled frames."""
+        with POSE_STEP_DURATION.time(mode="sparse", step="decode"):
+            frames = self.extract_frames(video_path)
+            if not frames:
+                return []
+
+            # Downscale once; the full-resolution frames are released here
+            preprocessor = FramePreprocessor(pool_size=0)
+            for frame_data in frames:
+                frame_data["rgb"] = preprocessor.prepare(frame_data.pop("image"))
+
+        # Run pose estimation for all frames on the worker pool
+        with POSE_STEP_DURATION.time(mode="sparse", step="inference"):
+            poses = pose_engine.estimate_batch([frame_data["rgb"] for frame_data in frames])
+
+        return [
+            self._build_frame_result(frame_data, pose_data, with_thumbnail=True)
+            for frame_data, pose_data in zip(frames, poses)
+        ]
+
+    def _analyze_tracked(self, video_path: str) -> list[dict[str, Any]]:
+        """Track pose across consecutive frames with one video-mode graph.
+
+        Tracking is sequential, so the stream stays on one PoseTracker in this
+        thread rather than fanning out to the pose engine. Frames are dropped
+        as soon as they are processed; thumbnails are kept only for about as
+        many frames as sparse mode returns.
+        """
+        info = self.probe_video(video_path)
+        stride = self._frame_stride(info["fps"], self.settings.pose_target_fps)
+        sampled = max(1, info["total_frames"] // stride)
+        thumbnail_every = max(1, -(-sampled // SPARSE_FRAME_COUNT))
+
+        tracker = PoseTracker()
+        # One output buffer: each frame is fully handled before the next
+        preprocessor = FramePreprocessor(pool_size=1)
+        frame_results = []
+        # Per-video totals: decode covers everything but inference (decoding,
+        # preprocessing, building results)
+        started = time.perf_counter()
+        inference_seconds = 0.0
+        try:
+            for i, frame_data in enumerate(self.iter_frames(video_path, stride=stride)):
+                frame_data["rgb"] = preprocessor.prepare(frame_data.pop("image"))
+                inference_started = time.perf_counter()
+                if tracker.available:
+                    pose_data = self.landmarks_to_pose_data(tracker.process_rgb(frame_data["rgb"]))
+                else:
+                    pose_data = self._get_fallback_pose_data()
+                inference_seconds += time.perf_counter() - inference_started
+
+                frame_results.append(
+                    self._build_frame_result(
+                        frame_data, pose_data, with_thumbnail=i % thumbnail_every == 0
+                    )
+                )
+        finally:
+            tracker.close()
+            elapsed = time.perf_counter() - started
+            POSE_STEP_DURATION.observe(elapsed - inference_seconds, mode="tracking", step="decode")
+            POSE_STEP_DURATION.observe(inference_seconds, mode="tracking", step="inference")
+
+        logger.info("video.pose_tracked", extra={"video_path": video_path, **tracker.stats()})
+
+        return frame_results
+
+    def _build_frame_result(
+        self,
+        frame_data: dict[str, Any],
+        pose_data: Optional[dict[str, Any]],
+        with_thumbnail: bool,
+    ) -> dict[str, Any]:
+        """Build one entry of process_video's frame_results."""
+        frame_result = {
+            "frame_index": frame_data["frame_index"],
+            "timestamp_seconds": frame_data["timestamp_seconds"],
+            "pose_detected": pose_data is not None,
+        }
+
+        if pose_data:
+            frame_result["pose"] = pose_data
+            frame_result["boxing_metrics"] = self.analyze_boxing_pose(pose_data)
+
+            if with_thumbnail:
+                # Encode thumbnail for potential display from the downscaled frame
+                bgr_image = cv2.cvtColor(frame_data["rgb"], cv2.COLOR_RGB2BGR)
+                _, buffer = cv2.imencode('.jpg', bgr_image, [cv2.IMWRITE_JPEG_QUALITY, 70])
+                frame_result["thumbnail_base64"] = base64.b64encode(buffer).decode('utf-8')
+
+        return frame_result
+
+    def probe_video(self, video_path: str) -> dict[str, Any]:
+        """Read frame count, fps and dimensions without decoding frames."""
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise VideoProcessingError(f"Cannot open video: {video_path}")
+
+        try:
+            return {
+                "total_frames": int(cap.get(cv2.CAP_PROP_FRAME_COUNT)),
+                "fps": cap.get(cv2.CAP_PROP_FPS),
+                "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            }
+        finally:
+            cap.release()
+
+    def iter_frames(self, video_path: str, stride: int = 1) -> Iterator[dict[str, Any]]:
+        """Yield every ``stride``-th frame in one sequential decode pass.
+
+        Args:
+            video_path: Path to video file
+            stride: Keep one frame out of every ``stride``
+
+        Yields:
+            Frame data with index, timestamp and image
+        """
+        cap = cv2.VideoCapture(video_path)
+        if not cap.isOpened():
+            raise VideoProcessingError(f"Cannot open video: {video_path}")
+
+        try:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            idx = 0
+            while cap.grab():
+                if idx % stride == 0:
+                    ret, frame = cap.retrieve()
+                    if ret:
+                        yield self._build_frame_data(idx, fps, frame)
+                idx += 1
+        finally:
+            cap.release()
+
+    @staticmethod
+    def _frame_stride(fps: float, target_fps: float) -> int:
+        """Frames to advance per sample to approximate target_fps (0 = every frame)."""
+        if target_fps <= 0 or fps <= 0 or target_fps >= fps:
+            return 1
+        return max(1, int(round(fps / target_fps)))
+
     def _aggregate_metrics(self, frame_results: list[dict]) -> dict[str, Any]:
         """Aggregate metrics across all frames.
 
@@ -0,0 +1,62 @@
+"""Background worker entry point.
+
+@feature F005 - Pose Estimation Processing
+
+Usage (from backend/):
+    python -m api.worker
+
+Consumes analysis jobs enqueued by POST /analysis/start until SIGINT or
+SIGTERM, then finishes the jobs in progress and exits. Run one or more of
+these next to the API processes; they share the Redis job queue. Each
+worker serves its metrics on WORKER_METRICS_PORT.
+"""
+import asyncio
+import logging
+import signal
+
+from api.config import get_settings
+from api.services.analysis_executor import analysis_executor
+from api.services.analysis_worker import AnalysisWorker
+from api.services.database import close_db
+from api.services.job_queue import analysis_job_queue
+from api.services.metrics import metrics
+from api.services.pose_engine import pose_engine
+from api.services.progress_broker import progress_broker
+from api.services.state_store import close_redis
+from api.services.status_cache import status_cache
+
+
+async def run_worker() -> None:
+    """Run the worker until a shutdown signal arrives."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    metrics_server = None
+    port = get_settings().worker_metrics_port
+    if port:
+        metrics.add_collector(analysis_job_queue.export_metrics)
+        metrics_server = await metrics.serve("0.0.0.0", port)
+
+    try:
+        await AnalysisWorker().run(stop)
+    finally:
+        if metrics_server is not None:
+            metrics_server.close()
+            await metrics_server.wait_closed()
+        await progress_broker.close()
+        await status_cache.close()
+        await close_redis()
+        await close_db()
+        analysis_executor.shutdown()
+        pose_engine.shutdown()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    asyncio.run(run_worker())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark seek vs linear frame extraction on synthetic clips.
+
+Usage (from backend/):
+    python -m benchmarks.bench_frame_extraction [--seconds 30 60 180] [--samples 12 60 300]
+
+Each clip is encoded with OpenCV's mp4v writer so the benchmark runs without
+external assets. Reported times are wall-clock seconds per extract_frames call.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from api.services.video_processor import VideoProcessor
+
+
+def write_synthetic_clip(path: str, seconds: int, fps: int = 30, size=(640, 360)) -> None:
+    """Write a clip with a moving gradient so frames are not trivially compressible."""
+    width, height = size
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))
+    base = np.tile(np.linspace(0, 255, width, dtype=np.uint8), (height, 1))
+    for i in range(seconds * fps):
+        shifted = np.roll(base, i * 4, axis=1)
+        frame = cv2.merge([shifted, np.flipud(shifted), np.full_like(shifted, i % 256)])
+        writer.write(frame)
+    writer.release()
+
+
+def time_mode(processor: VideoProcessor, path: str, samples: int, mode: str, repeat: int) -> float:
+    """Return the best-of-N wall time for one extraction mode."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        processor.extract_frames(path, num_frames=samples, mode=mode)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=int, nargs="+", default=[30, 60, 180])
+    parser.add_argument("--samples", type=int, nargs="+", default=[12, 60, 300])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    processor = VideoProcessor()
+
+    print(f"{'clip_s':>7} {'samples':>8} {'seek_s':>8} {'linear_s':>9} {'auto':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for seconds in args.seconds:
+            path = os.path.join(tmp, f"clip_{seconds}s.mp4")
+            write_synthetic_clip(path, seconds)
+
+            cap = cv2.VideoCapture(path)
+            total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            cap.release()
+
+            for samples in args.samples:
+                step = max(1, total // samples)
+                indices = list(range(total))[::step][:samples]
+                auto = processor.select_extraction_mode(
+                    indices, processor._estimate_keyframe_interval(fps)
+                )
+                seek = time_mode(processor, path, samples, "seek", args.repeat)
+                linear = time_mode(processor, path, samples, "linear", args.repeat)
+                print(f"{seconds:>7} {samples:>8} {seek:>8.3f} {linear:>9.3f} {auto:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark landmark smoothing cost and its effect on strike false positives.
+
+Usage (from backend/):
+    python -m benchmarks.bench_landmark_smoothing [--frames 5000 50000] [--repeat 3]
+
+Two 30fps sequences per size, with MediaPipe-like jitter (sigma 0.003) on
+every coordinate: "still" has no movement at all, so every strike detected
+on it is a false positive; "punches" adds one punch (extension and
+retraction) per second. Timings are for smoothing all 33 joints.
+"""
+import argparse
+import time
+
+import numpy as np
+
+from api.services.pose_sequence import PoseSequence
+from api.services.stamp_detection_service import StampDetectionService
+
+METHODS = ("none", "one_euro", "savgol")
+
+
+def jitter_sequence(count: int, punches: bool, seed: int = 0) -> PoseSequence:
+    """Still stance with coordinate jitter, optionally one punch per second."""
+    rng = np.random.default_rng(seed)
+    coords = 0.5 + rng.normal(0, 0.003, size=(count, 33, 3))
+    if punches:
+        for start in range(15, count - 12, 30):
+            wrist = 15 if (start // 30) % 2 else 16
+            coords[start:start + 6, wrist, 2] -= np.linspace(0, 0.4, 6)
+            coords[start + 6:start + 12, wrist, 2] -= np.linspace(0.4, 0, 6)
+    landmarks = np.concatenate([coords, np.full((count, 33, 1), 0.9)], axis=2)
+    return PoseSequence(
+        landmarks=np.round(landmarks, 4).astype(np.float32),
+        confidence=np.full(count, 0.9),
+        timestamps=np.arange(count) / 30.0,
+        frame_numbers=np.arange(count),
+        fps=30.0,
+    )
+
+
+def best_time(fn, repeat: int) -> float:
+    """Best-of-N wall time of fn()."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, nargs="+", default=[5000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'frames':>7} {'method':>9} {'smooth_s':>9} {'still_strikes':>13} {'punch_strikes':>13} {'punches':>7}")
+    for count in args.frames:
+        still = jitter_sequence(count, punches=False)
+        punches = jitter_sequence(count, punches=True)
+        for method in METHODS:
+            service = StampDetectionService(smoothing=method)
+            elapsed = best_time(lambda: service.smoother.smooth(punches), args.repeat)
+            print(
+                f"{count:>7} {method:>9} {elapsed:>9.3f}"
+                f" {len(service.detect_strikes(still)):>13}"
+                f" {len(service.detect_strikes(punches)):>13} {len(range(15, count - 12, 30)):>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()
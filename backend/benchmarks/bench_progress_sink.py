@@ -0,0 +1,90 @@
+"""Measure row writes and throughput of per-frame progress through ProgressSink.
+
+Usage (from backend/):
+    python -m benchmarks.bench_progress_sink [--analyses 8] [--fps 30] [--seconds 60] [--interval 5]
+
+Simulates --analyses pose extractions running concurrently, each reporting
+progress after every frame at --fps frames per second of (simulated) time,
+as AnalysisPipeline's frame reporter does. The broker is in-memory and row
+writes are counted instead of executed, so the figures isolate the sink:
+updates taken, events published and rows written, against the one write per
+update of calling update_progress directly.
+"""
+import argparse
+import asyncio
+import time
+from uuid import uuid4
+
+from api.config import get_settings
+from api.services.progress_broker import InMemoryProgressBroker
+from api.services.progress_sink import ProgressSink
+
+
+class CountingSink(ProgressSink):
+    """ProgressSink that counts row writes instead of executing them."""
+
+    async def _persist(self, *args, **kwargs) -> None:
+        self.writes += 1
+
+
+async def run(analyses: int, fps: int, seconds: int, interval: float) -> dict[str, float]:
+    now = [0.0]
+    broker = InMemoryProgressBroker()
+    sink = CountingSink(broker, persist_interval=interval, clock=lambda: now[0])
+    published = [0]
+    original_publish = broker.publish
+
+    async def counting_publish(*args, **kwargs):
+        published[0] += 1
+        await original_publish(*args, **kwargs)
+
+    broker.publish = counting_publish
+
+    ids = [uuid4() for _ in range(analyses)]
+    for analysis_id in ids:
+        sink.start(analysis_id, "pose_estimation", 5)
+
+    frames = fps * seconds
+    started = time.perf_counter()
+    for frame in range(1, frames + 1):
+        now[0] = frame / fps
+        for analysis_id in ids:
+            sink.record(analysis_id, "pose_estimation", 5 + 54 * frame // frames, frame, 0)
+        # Let the drains run, as the event loop does between frames
+        await asyncio.sleep(0)
+    for analysis_id in ids:
+        await sink.finish(analysis_id)
+    elapsed = time.perf_counter() - started
+
+    updates = frames * analyses
+    return {
+        "updates": updates,
+        "updates_per_minute": updates / seconds * 60,
+        "published": published[0],
+        "row_writes": sink.writes,
+        "direct_writes": updates,
+        "wall_seconds": elapsed,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--analyses", type=int, default=8)
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument(
+        "--interval", type=float, default=get_settings().progress_persist_interval_seconds
+    )
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.analyses, args.fps, args.seconds, args.interval))
+    print(
+        f"{result['updates']} updates ({result['updates_per_minute']:.0f}/min) "
+        f"in {result['wall_seconds']:.2f}s wall"
+    )
+    print(f"published events: {result['published']}")
+    print(f"row writes:       {result['row_writes']} (direct update_progress: {result['direct_writes']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""Benchmark vectorized vs frame-by-frame stamp detection.
+
+Usage (from backend/):
+    python -m benchmarks.bench_stamp_detection [--frames 5000 50000] [--repeat 3]
+
+Sequences are a jittery stance with one fast punch per second and guard,
+duck and slip phases. "scalar" columns run the pre-vectorization detectors
+frame by frame (strikes: _detect_arm_strike plus the list merge; all: that
+plus the defense state machine in a second pass). "vector" columns run
+detect_strikes and the fused detect_actions. Landmark smoothing is off so
+both sides see the same coordinates (see bench_landmark_smoothing).
+"""
+import argparse
+import time
+
+import numpy as np
+
+from api.services.pose_sequence import PoseSequence
+from api.services.stamp_detection_service import CONFIDENCE_THRESHOLD, StampDetectionService
+
+
+def synthetic_sequence(count: int, seed: int = 0) -> PoseSequence:
+    """Jittery stance at 30fps with punches, guard, duck and slip phases."""
+    rng = np.random.default_rng(seed)
+    coords = 0.5 + rng.normal(0, 0.003, size=(count, 33, 3))
+    for start in range(15, count - 6, 30):
+        wrist = 15 if (start // 30) % 2 else 16
+        coords[start:start + 6, wrist, 2] -= np.linspace(0, 0.4, 6)
+    for start in range(0, count - 65, 90):
+        coords[start:start + 20, 15:17, 1] = 0.3          # guard up
+        coords[start + 40:start + 50, 0, 1] = 0.6         # duck
+        shift = 0.06 * np.arange(1, 6)
+        coords[start + 60:start + 65, 11:13, 0] -= shift[:, None]  # slip
+    landmarks = np.concatenate([coords, np.full((count, 33, 1), 0.9)], axis=2)
+    return PoseSequence(
+        landmarks=np.round(landmarks, 4).astype(np.float32),
+        confidence=np.round(rng.uniform(0.6, 1.0, count), 2),
+        timestamps=np.arange(count) / 30.0,
+        frame_numbers=np.arange(count),
+        fps=30.0,
+    )
+
+
+def scalar_detect_strikes(service: StampDetectionService, sequence: PoseSequence) -> list[dict]:
+    """Frame-by-frame detection with the list-based merge."""
+    strikes = []
+    for i in range(2, len(sequence)):
+        if sequence.confidence[i] < CONFIDENCE_THRESHOLD:
+            continue
+        for side in ("left", "right"):
+            strike = service._detect_arm_strike(sequence, i - 2, i, sequence.fps, side)
+            if strike:
+                strikes.append(strike)
+
+    strikes.sort(key=lambda s: s["timestamp_seconds"])
+    merged = strikes[:1]
+    for stamp in strikes[1:]:
+        last = merged[-1]
+        if (
+            stamp["action_type"] == last["action_type"]
+            and stamp["side"] == last["side"]
+            and stamp["timestamp_seconds"] - last["timestamp_seconds"] < 0.3
+        ):
+            if stamp["confidence"] > last["confidence"]:
+                merged[-1] = stamp
+        else:
+            merged.append(stamp)
+    return merged
+
+
+def scalar_detect_defense(service: StampDetectionService, sequence: PoseSequence) -> list[dict]:
+    """Frame-by-frame defense state machine."""
+    defense = []
+    guard_start = slip_start = duck_start = None
+    prev = None
+
+    def stamp(index, action_type, side, confidence):
+        return service._create_defense_stamp(sequence, index, action_type, side, confidence)
+
+    for i in range(len(sequence)):
+        if sequence.confidence[i] < CONFIDENCE_THRESHOLD:
+            continue
+        curr = sequence.landmarks[i]
+        if service._is_guard_up(curr):
+            guard_start = i if guard_start is None else guard_start
+        elif guard_start is not None:
+            if i - guard_start >= 3:
+                defense.append(stamp(guard_start, "guard_up", "both", min(0.95, 0.7 + (i - guard_start) * 0.02)))
+            guard_start = None
+        if prev is not None:
+            if service._is_slip(prev, curr):
+                slip_start = i if slip_start is None else slip_start
+            elif slip_start is not None:
+                if i - slip_start >= 3:
+                    side = service._get_slip_side(prev, curr)
+                    defense.append(stamp(slip_start, "slip", side, min(0.9, 0.65 + (i - slip_start) * 0.02)))
+                slip_start = None
+        if service._is_duck(curr):
+            duck_start = i if duck_start is None else duck_start
+        elif duck_start is not None:
+            if i - duck_start >= 3:
+                defense.append(stamp(duck_start, "duck", "both", min(0.9, 0.65 + (i - duck_start) * 0.02)))
+            duck_start = None
+        prev = curr
+
+    if guard_start is not None and len(sequence) - guard_start >= 3:
+        duration = len(sequence) - guard_start
+        defense.append(stamp(guard_start, "guard_up", "both", min(0.95, 0.7 + duration * 0.02)))
+    return defense
+
+
+def best_time(fn, repeat: int) -> float:
+    """Best-of-N wall time of fn()."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, nargs="+", default=[5000, 50000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    service = StampDetectionService(smoothing="none")
+
+    def scalar_all(sequence):
+        return scalar_detect_strikes(service, sequence), scalar_detect_defense(service, sequence)
+
+    print(
+        f"{'frames':>7} {'stamps':>7} {'strikes_scalar_s':>16} {'strikes_vector_s':>16}"
+        f" {'all_scalar_s':>12} {'all_fused_s':>11}"
+    )
+    for count in args.frames:
+        sequence = synthetic_sequence(count)
+        strikes, defense = service.detect_actions(sequence)
+        assert (strikes, defense) == scalar_all(sequence), "parity check failed"
+
+        timings = [
+            best_time(lambda: scalar_detect_strikes(service, sequence), args.repeat),
+            best_time(lambda: service.detect_strikes(sequence), args.repeat),
+            best_time(lambda: scalar_all(sequence), args.repeat),
+            best_time(lambda: service.detect_actions(sequence), args.repeat),
+        ]
+        print(
+            f"{count:>7} {len(strikes) + len(defense):>7} {timings[0]:>16.3f} {timings[1]:>16.3f}"
+            f" {timings[2]:>12.3f} {timings[3]:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Load-test GET /processing/status: database queries as pollers scale.
+
+Usage (from backend/):
+    python -m benchmarks.bench_status_polling [--pollers 1,10,50,100] [--seconds 60]
+        [--write-every 5]
+
+Runs the API in-process (httpx ASGITransport) on a temporary SQLite file.
+One analysis is in pose estimation; every --write-every simulated seconds the
+"worker" writes its progress (record_progress, committed), as the progress
+sink does. Each simulated second every poller requests the status once,
+sending the ETag of its previous response as If-None-Match. Database
+statements issued by the polls are counted at the engine.
+
+"cached" is the status cache (in-memory backend); "uncached" reads the row
+on every poll, as the endpoint did before. With the cache, poll queries stay
+at one per status change whatever the number of pollers.
+"""
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any
+from uuid import uuid4
+
+os.environ.setdefault("STATUS_CACHE_BACKEND", "memory")
+os.environ.setdefault("PROGRESS_BACKEND", "memory")
+os.environ.setdefault("JOB_QUEUE_BACKEND", "memory")
+
+import httpx  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine  # noqa: E402
+
+from api.config import get_settings  # noqa: E402
+from api.main import app  # noqa: E402
+from api.models import analysis, body_specs, report, stamp, subject, upload  # noqa: E402,F401
+from api.models.analysis import Analysis, AnalysisStatus  # noqa: E402
+from api.models.user import Base  # noqa: E402
+from api.routers import processing as processing_router  # noqa: E402
+from api.services import database  # noqa: E402
+from api.services import processing_service as processing_module  # noqa: E402
+from api.services.oauth_service import OAuthService  # noqa: E402
+from api.services.status_cache import CachedStatus, InMemoryStatusCache  # noqa: E402
+
+
+class UncachedStatus(InMemoryStatusCache):
+    """Every poll reads the row, as before the status cache."""
+
+    async def read_through(self, analysis_id, user_id, load):
+        payload = await load()
+        return CachedStatus(str(user_id), self.etag_for(payload), payload)
+
+
+async def seed(session_factory) -> tuple[Any, str]:
+    """One analysis in pose estimation; returns its ID and its owner's token."""
+    user_id = uuid4()
+    analysis = Analysis(
+        id=uuid4(), video_id=uuid4(), user_id=user_id, subject_id=uuid4(),
+        body_specs_id=uuid4(), status=AnalysisStatus.POSE_ESTIMATION,
+        current_stage="pose_estimation", progress_percent=5, total_frames=5400,
+        queued_at=datetime.now(timezone.utc), pose_started_at=datetime.now(timezone.utc),
+    )
+    async with session_factory() as session:
+        session.add(analysis)
+        await session.commit()
+    token = OAuthService(get_settings()).create_access_token(str(user_id), "bench@example.com")
+    return analysis.id, token
+
+
+async def run(cache, pollers: int, seconds: int, write_every: int, counter: list) -> dict:
+    """Poll for the simulated duration; return poll outcomes and query counts."""
+    processing_router.status_cache = cache
+    processing_module.status_cache = cache
+    analysis_id, token = await seed(database.get_session_factory())
+    url = f"/api/v1/processing/status/{analysis_id}"
+    etags: list[str] = [""] * pollers
+    outcomes = {"200": 0, "304": 0}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def poll(i: int) -> None:
+            headers = {"Authorization": f"Bearer {token}"}
+            if etags[i]:
+                headers["If-None-Match"] = etags[i]
+            response = await client.get(url, headers=headers)
+            outcomes[str(response.status_code)] += 1
+            etags[i] = response.headers.get("etag", "")
+
+        counter[0] = 0
+        started = time.perf_counter()
+        poll_queries = 0
+        for second in range(seconds):
+            if second and second % write_every == 0:
+                async with database.get_db_session() as session:
+                    await processing_module.processing_service.record_progress(
+                        session, analysis_id, "pose_estimation", 5 + second * 54 // seconds,
+                        frames_processed=second * 30,
+                    )
+            before = counter[0]
+            await asyncio.gather(*(poll(i) for i in range(pollers)))
+            poll_queries += counter[0] - before
+        elapsed = time.perf_counter() - started
+
+    return {
+        "polls": pollers * seconds,
+        "not_modified": outcomes["304"],
+        "poll_queries": poll_queries,
+        "db_qps": poll_queries / seconds,
+        "wall_seconds": elapsed,
+    }
+
+
+async def main_async(args) -> None:
+    pollers = [int(value) for value in args.pollers.split(",")]
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        database._engine = engine
+        database._async_session_factory = async_sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        counter = [0]
+
+        def count(*args: Any) -> None:
+            counter[0] += 1
+
+        event.listen(engine.sync_engine, "before_cursor_execute", count)
+
+        print(f"{'cache':>9} {'pollers':>8} {'polls':>7} {'304s':>7} {'queries':>8} {'db_qps':>8} {'wall_s':>7}")
+        try:
+            for name, cache_type in (("uncached", UncachedStatus), ("cached", InMemoryStatusCache)):
+                for count_pollers in pollers:
+                    result = await run(
+                        cache_type(), count_pollers, args.seconds, args.write_every, counter
+                    )
+                    print(
+                        f"{name:>9} {count_pollers:>8} {result['polls']:>7} "
+                        f"{result['not_modified']:>7} {result['poll_queries']:>8} "
+                        f"{result['db_qps']:>8.2f} {result['wall_seconds']:>7.2f}"
+                    )
+        finally:
+            await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pollers", default="1,10,50,100")
+    parser.add_argument("--seconds", type=int, default=60)
+    parser.add_argument("--write-every", type=int, default=5)
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -16,11 +16,37 @@ os.environ.setdefault("ENVIRONMENT", "test")
 os.environ.setdefault("SECRET_KEY", "test-secret-key-do-not-use-in-production")
 os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
 os.environ.setdefault("REDIS_URL", "redis://localhost:6379/0")
+os.environ.setdefault("JOB_QUEUE_BACKEND", "memory")
+os.environ.setdefault("PROGRESS_BACKEND", "memory")
+os.environ.setdefault("STATUS_CACHE_BACKEND", "memory")
+os.environ.setdefault("ETA_BACKEND", "memory")
 os.environ.setdefault("KAKAO_CLIENT_ID", "test-kakao-client-id")
 os.environ.setdefault("KAKAO_CLIENT_SECRET", "test-kakao-secret")
 os.environ.setdefault("GOOGLE_CLIENT_ID", "test-google-client-id")
 os.environ.setdefault("GOOGLE_CLIENT_SECRET", "test-google-secret")
 os.environ.setdefault("FRONTEND_URL", "http://localhost:3000")
+os.environ.setdefault("OPENAI_API_KEY", "test-openai-key")
+
+
+@pytest.fixture
+async def db_session():
+    """AsyncSession on a fresh in-memory SQLite database with all tables.
+
+    SQLite does not enforce foreign keys here, so rows can reference
+    parents that were never created.
+    """
+    from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+    from api.models import analysis, body_specs, report, stamp, subject, upload  # noqa: F401
+    from api.models.user import Base
+
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+    await engine.dispose()
 
 
 # Mock classes for testing
@@ -19,7 +19,7 @@ BDD Scenarios:
 """
 from datetime import datetime, timedelta, timezone
 from unittest.mock import AsyncMock, patch
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 import pytest
 from fastapi import status
@@ -452,3 +452,225 @@ class TestDashboardService:
         # Verify soft delete was performed
         assert mock_report.deleted_at is not None
         assert result["deleted"] is True
+
+    async def test_list_user_reports_uses_stored_stamp_counts(self, db_session):
+        """Key moment counts come from analysis counters, legacy rows from stamps."""
+        from api.models.analysis import Analysis
+        from api.models.report import Report
+        from api.models.stamp import Stamp
+        from api.models.upload import Video
+        from api.services.dashboard_service import DashboardService
+
+        user_id = uuid4()
+        now = datetime.now(timezone.utc)
+        video = Video(
+            id=uuid4(), user_id=user_id, filename="a.mp4", content_type="video/mp4", file_size=1,
+            duration_seconds=60, storage_key="videos/a.mp4", thumbnail_key="thumbs/a.jpg",
+        )
+        counted = Analysis(
+            video_id=video.id, user_id=user_id, subject_id=uuid4(), body_specs_id=uuid4(),
+            stamp_total=7, stamp_counts={"jab": 7}, stamp_avg_confidence=0.8,
+        )
+        legacy = Analysis(
+            video_id=video.id, user_id=user_id, subject_id=uuid4(), body_specs_id=uuid4(),
+        )
+        db_session.add_all([video, counted, legacy])
+        await db_session.flush()
+        db_session.add_all([
+            Report(analysis_id=counted.id, video_id=video.id, user_id=user_id,
+                   overall_assessment="a", created_at=now),
+            Report(analysis_id=legacy.id, video_id=video.id, user_id=user_id,
+                   overall_assessment="b", created_at=now - timedelta(days=1)),
+        ] + [
+            Stamp(analysis_id=legacy.id, timestamp_seconds=i, frame_number=i,
+                  action_type="duck", side="both", confidence=0.7)
+            for i in range(3)
+        ])
+        await db_session.flush()
+
+        result = await DashboardService().list_user_reports(db_session, user_id)
+
+        assert [item["key_moments_count"] for item in result["items"]] == [7, 3]
+        assert result["items"][0]["thumbnail_url"] == "https://cdn.example.com/thumbs/a.jpg"
+        assert result["total"] == 2
+
+    async def test_list_user_reports_single_query(self, db_session):
+        """A 50-item page is one SQL statement, whatever the stamp counters."""
+        from sqlalchemy import event
+
+        from api.services.dashboard_service import DashboardService
+
+        user_id = uuid4()
+        await _seed_reports(db_session, user_id, 60)
+
+        statements = []
+        event.listen(
+            db_session.bind.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        result = await DashboardService().list_user_reports(db_session, user_id, page=1, limit=50)
+
+        assert len(statements) == 1
+        assert len(result["items"]) == 50
+        assert result["total"] == 60
+        assert result["has_more"] is True
+        # Newest first; even-numbered reports have counters, odd ones are legacy
+        assert [item["key_moments_count"] for item in result["items"][:4]] == [0, 1, 2, 1]
+
+    async def test_list_user_reports_page_past_end(self, db_session):
+        """An empty page past the end still reports the user's total."""
+        from api.services.dashboard_service import DashboardService
+
+        user_id = uuid4()
+        await _seed_reports(db_session, user_id, 3)
+
+        result = await DashboardService().list_user_reports(db_session, user_id, page=3, limit=2)
+
+        assert result["items"] == []
+        assert result["total"] == 3
+        assert result["has_more"] is False
+
+    @pytest.mark.parametrize("tied", [False, True])
+    async def test_list_user_reports_cursor_walk(self, db_session, tied):
+        """Following next_cursor visits every report once, newest first."""
+        from api.services.dashboard_service import DashboardService
+
+        service = DashboardService()
+        user_id = uuid4()
+        await _seed_reports(db_session, user_id, 7, tied=tied)
+
+        offset_ids = [
+            item["id"]
+            for page in range(1, 5)
+            for item in (await service.list_user_reports(db_session, user_id, page=page, limit=2))["items"]
+        ]
+
+        seen, cursor, pages = [], None, 0
+        while True:
+            result = await service.list_user_reports(db_session, user_id, limit=2, cursor=cursor)
+            pages += 1
+            seen.extend(item["id"] for item in result["items"])
+            assert result["total"] == 7
+            assert result["page"] is None if cursor else result["page"] == 1
+            cursor = result["next_cursor"]
+            assert result["has_more"] is (cursor is not None)
+            if cursor is None:
+                break
+
+        assert pages == 4
+        assert len(set(seen)) == 7
+        assert seen == offset_ids
+
+    async def test_list_user_reports_cursor_page_is_one_query(self, db_session):
+        """A cursor page seeks instead of counting: one SQL statement."""
+        from sqlalchemy import event
+
+        from api.services.dashboard_service import DashboardService
+
+        service = DashboardService()
+        user_id = uuid4()
+        await _seed_reports(db_session, user_id, 30)
+        first = await service.list_user_reports(db_session, user_id, limit=10)
+
+        statements = []
+        event.listen(
+            db_session.bind.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        result = await service.list_user_reports(db_session, user_id, limit=10, cursor=first["next_cursor"])
+
+        assert len(statements) == 1
+        assert "reports.created_at <" in statements[0]
+        assert len(result["items"]) == 10
+        assert result["total"] == 30
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "W10", "WyJ4IiwgInkiXQ"])
+    async def test_list_user_reports_invalid_cursor(self, db_session, cursor):
+        """Malformed cursors raise InvalidCursorError."""
+        from api.services.dashboard_service import DashboardService, InvalidCursorError
+
+        with pytest.raises(InvalidCursorError):
+            await DashboardService().list_user_reports(db_session, uuid4(), cursor=cursor)
+
+    async def test_report_counter_starts_at_zero_with_the_user(self, db_session):
+        """A new user's counter is 0, so their first report is counted."""
+        from api.models.user import User
+        from api.services.dashboard_service import DashboardService
+
+        user_id = uuid4()
+        db_session.add(User(
+            id=user_id, email=f"{user_id}@example.com", provider="google",
+            provider_id=str(user_id),
+        ))
+        await db_session.flush()
+
+        await DashboardService().adjust_report_count(db_session, user_id, 1)
+
+        user = await db_session.get(User, user_id)
+        await db_session.refresh(user)
+        assert user.report_count == 1
+
+    async def test_report_counter_follows_delete_and_restore(self, db_session):
+        """Soft delete and restore move the counter; the listing total follows."""
+        from api.models.report import Report
+        from api.models.user import User
+        from api.services.dashboard_service import DashboardService
+
+        service = DashboardService()
+        user_id = uuid4()
+        await _seed_reports(db_session, user_id, 4)
+        report_id = (await service.list_user_reports(db_session, user_id))["items"][0]["id"]
+        # Held so deleted_at keeps its timezone (SQLite would reload it naive)
+        report = await db_session.get(Report, UUID(report_id))  # noqa: F841
+
+        await service.delete_report(db_session, UUID(report_id), user_id)
+        user = await db_session.get(User, user_id)
+        await db_session.refresh(user)
+        assert user.report_count == 3
+        assert (await service.list_user_reports(db_session, user_id))["total"] == 3
+
+        await service.restore_report(db_session, UUID(report_id), user_id)
+        await db_session.refresh(user)
+        assert user.report_count == 4
+        assert (await service.list_user_reports(db_session, user_id))["total"] == 4
+
+
+async def _seed_reports(session, user_id, count: int, tied: bool = False) -> None:
+    """Create a user with count reports, newest first by index.
+
+    Even-indexed analyses store stamp_total = index; odd-indexed ones are
+    legacy (no counters) with one stamp row. The user's report counter is
+    set to count; tied gives every report the same created_at.
+    """
+    from api.models.analysis import Analysis
+    from api.models.report import Report
+    from api.models.stamp import Stamp
+    from api.models.upload import Video
+    from api.models.user import User
+
+    now = datetime.now(timezone.utc)
+    session.add(User(
+        id=user_id, email=f"{user_id}@example.com", provider="google", provider_id=str(user_id),
+        report_count=count,
+    ))
+    video = Video(
+        id=uuid4(), user_id=user_id, filename="a.mp4", content_type="video/mp4",
+        file_size=1, duration_seconds=60, storage_key=f"videos/{uuid4()}.mp4",
+    )
+    session.add(video)
+    for i in range(count):
+        analysis = Analysis(
+            id=uuid4(), video_id=video.id, user_id=user_id, subject_id=uuid4(),
+            body_specs_id=uuid4(), stamp_total=None if i % 2 else i,
+        )
+        session.add(analysis)
+        session.add(Report(
+            analysis_id=analysis.id, video_id=video.id, user_id=user_id,
+            overall_assessment="ok", created_at=now if tied else now - timedelta(minutes=i),
+        ))
+        if i % 2:
+            session.add(Stamp(
+                analysis_id=analysis.id, timestamp_seconds=1.0, frame_number=30,
+                action_type="jab", side="left", confidence=0.8,
+            ))
+    await session.flush()
@@ -16,10 +16,16 @@ BDD Scenarios from specs/bdd/processing.feature:
 - Pose estimation fails with poor video quality (>20% frame failure)
 - Processing takes longer than expected (show message, continue)
 """
-import pytest
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
+import pytest
+
 from api.models.analysis import Analysis, AnalysisStatus
 
 
@@ -359,6 +365,74 @@ class TestProcessingRouter:
         routes = [r.path for r in router.routes]
         assert "/processing/status/{analysis_id}" in routes
 
+    def test_run_analysis_returns_503_when_executor_saturated(self, app, client):
+        """Saturated analysis executor maps to 503 with Retry-After."""
+        from api.routers.auth import get_current_user_or_guest
+        from api.services.analysis_executor import ExecutorSaturatedError
+        from api.services.video_processor import video_processor
+
+        user_id = str(uuid4())
+        app.dependency_overrides[get_current_user_or_guest] = lambda: {
+            "id": user_id,
+            "email": "boxer@example.com",
+        }
+
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = MagicMock()
+        session = AsyncMock()
+        session.execute.return_value = result
+
+        @asynccontextmanager
+        async def mock_db_session():
+            yield session
+
+        try:
+            with patch("api.routers.processing.get_db_session", mock_db_session), \
+                 patch.object(
+                     video_processor,
+                     "process_video",
+                     AsyncMock(side_effect=ExecutorSaturatedError("full", 12)),
+                 ):
+                response = client.post(f"/api/v1/analysis/run/{uuid4()}")
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "12"
+        # The admission slot is released whatever the outcome
+        from api.services.admission_controller import analysis_run_admission
+
+        assert analysis_run_admission.running == 0
+
+    def test_run_analysis_returns_429_when_not_admitted(self, app, client):
+        """A full admission queue maps to 429 with Retry-After, before any DB work."""
+        from api.routers.auth import get_current_user_or_guest
+        from api.services.admission_controller import (
+            AdmissionRejectedError,
+            analysis_run_admission,
+        )
+
+        app.dependency_overrides[get_current_user_or_guest] = lambda: {
+            "id": str(uuid4()),
+            "email": "boxer@example.com",
+        }
+        session_factory = MagicMock()
+        try:
+            with patch("api.routers.processing.get_db_session", session_factory), \
+                 patch.object(
+                     analysis_run_admission,
+                     "acquire",
+                     AsyncMock(side_effect=AdmissionRejectedError("full", "queue_full", 9)),
+                 ):
+                response = client.post(f"/api/v1/analysis/run/{uuid4()}")
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 429
+        assert response.headers["Retry-After"] == "9"
+        session_factory.assert_not_called()
+        assert analysis_run_admission.running == 0
+
     def test_start_analysis_request_schema(self):
         """Test StartAnalysisRequest schema validation."""
         from api.schemas.analysis import StartAnalysisRequest
@@ -398,3 +472,1476 @@ class TestProcessingRouter:
             failed_stage="pose_estimation",
         )
         assert response.status == "failed"
+
+
+class TestAnalysisExecutor:
+    """Tests for offloading CPU-bound analysis work off the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_run_returns_result(self):
+        """Blocking work runs on the executor and its result is returned."""
+        from api.services.analysis_executor import AnalysisExecutor
+
+        executor = AnalysisExecutor(workers=1, queue_size=0)
+        try:
+            result = await executor.run(lambda a, b: a + b, 2, 3)
+        finally:
+            executor.shutdown()
+
+        assert result == 5
+        assert executor.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_saturated(self):
+        """Work beyond workers + queue_size is rejected, not queued."""
+        from api.services.analysis_executor import (
+            AnalysisExecutor,
+            ExecutorSaturatedError,
+        )
+
+        executor = AnalysisExecutor(workers=1, queue_size=1, retry_after_seconds=7)
+        release = threading.Event()
+        try:
+            running = [
+                asyncio.create_task(executor.run(release.wait)) for _ in range(2)
+            ]
+            await asyncio.sleep(0)
+
+            with pytest.raises(ExecutorSaturatedError) as exc_info:
+                await executor.run(release.wait)
+            assert exc_info.value.retry_after_seconds == 7
+
+            release.set()
+            await asyncio.gather(*running)
+        finally:
+            release.set()
+            executor.shutdown()
+
+        assert executor.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_health_latency_flat_during_analysis(self, async_client):
+        """/health stays responsive while process_video runs blocking work."""
+        from api.services.video_processor import video_processor
+
+        async def probe_health() -> float:
+            start = time.perf_counter()
+            response = await async_client.get("/health")
+            assert response.status_code == 200
+            return time.perf_counter() - start
+
+        baseline = max([await probe_health() for _ in range(5)])
+
+        def blocking_analysis(video_path, video_id, **kwargs):
+            # Stand-in for decode + inference: holds a thread for 1s
+            time.sleep(1.0)
+            return {"video_id": str(video_id)}
+
+        with patch.object(
+            video_processor, "_resolve_video_path", AsyncMock(return_value="/tmp/clip.mp4")
+        ), patch.object(video_processor, "analyze_video_file", blocking_analysis):
+            analysis = asyncio.create_task(
+                video_processor.process_video(MagicMock(), uuid4(), uuid4())
+            )
+            await asyncio.sleep(0.05)
+
+            during = []
+            while not analysis.done():
+                during.append(await probe_health())
+                await asyncio.sleep(0.05)
+            await analysis
+
+        assert len(during) >= 5
+        assert max(during) < max(baseline * 5, 0.25)
+
+
+
+class TestAdmissionController:
+    """Tests for admission control of synchronous analyses."""
+
+    @pytest.mark.asyncio
+    async def test_waiters_get_slots_in_order(self):
+        """Requests beyond max_concurrent wait and are admitted first come, first served."""
+        from api.services.admission_controller import AdmissionController
+
+        controller = AdmissionController(
+            "test", max_concurrent=1, max_queued=2, max_per_user=1, queue_timeout=5
+        )
+        admitted = []
+
+        async def run(user: str, hold: asyncio.Event) -> None:
+            async with controller.admit(user):
+                admitted.append(user)
+                await hold.wait()
+
+        holds = {user: asyncio.Event() for user in ("a", "b", "c")}
+        tasks = [asyncio.create_task(run(user, hold)) for user, hold in holds.items()]
+        await asyncio.sleep(0)
+        assert admitted == ["a"]
+        assert (controller.running, controller.queued) == (1, 2)
+
+        holds["a"].set()
+        holds["b"].set()
+        await asyncio.sleep(0.01)
+        assert admitted == ["a", "b", "c"]
+        holds["c"].set()
+        await asyncio.gather(*tasks)
+        assert (controller.running, controller.queued) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_rejects_beyond_queue_and_user_limits(self):
+        """A full queue, a user at their limit and an expired wait are rejected."""
+        from api.services.admission_controller import (
+            AdmissionController,
+            AdmissionRejectedError,
+        )
+        from api.services.metrics import ADMISSION_REJECTIONS
+
+        controller = AdmissionController(
+            "test_limits", max_concurrent=1, max_queued=1, max_per_user=1,
+            queue_timeout=0.05, retry_after_seconds=7,
+        )
+        await controller.acquire("a")
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            await controller.acquire("a")
+        assert exc_info.value.reason == "user_limit"
+        assert exc_info.value.retry_after_seconds == 7
+
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            await controller.acquire("c")
+        assert exc_info.value.reason == "queue_full"
+
+        with pytest.raises(AdmissionRejectedError) as exc_info:
+            await waiting
+        assert exc_info.value.reason == "queue_timeout"
+
+        controller.release("a")
+        assert (controller.running, controller.queued) == (0, 0)
+        for reason in ("user_limit", "queue_full", "queue_timeout"):
+            assert ADMISSION_REJECTIONS.value(endpoint="test_limits", reason=reason) == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        """A client that disconnects while waiting frees its place and user count."""
+        from api.services.admission_controller import AdmissionController
+
+        controller = AdmissionController(
+            "test", max_concurrent=1, max_queued=1, max_per_user=1, queue_timeout=5
+        )
+        await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+
+        assert controller.queued == 0
+        # "b" may queue again, and gets the slot when "a" is done
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        controller.release("a")
+        await waiting
+        assert controller.running == 1
+        controller.release("b")
+        assert controller.running == 0
+
+class FakeClock:
+    """Settable wall clock for queue lease and backoff tests."""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestJobQueue:
+    """Tests for the in-memory job queue backend (lease/retry semantics)."""
+
+    @pytest.mark.asyncio
+    async def test_reserve_ack_removes_job(self):
+        """A reserved and acked job is gone; duplicate job IDs are queued once."""
+        from api.services.job_queue import InMemoryJobQueue
+
+        queue = InMemoryJobQueue(visibility_timeout=60, max_attempts=3, retry_backoff=1)
+        await queue.enqueue({"analysis_id": "a"}, job_id="a")
+        await queue.enqueue({"analysis_id": "a"}, job_id="a")
+
+        job = await queue.reserve()
+        assert job.id == "a"
+        assert job.payload == {"analysis_id": "a"}
+        assert job.attempts == 1
+        assert await queue.reserve() is None
+
+        assert await queue.ack(job) is True
+        counts = {"ready": 0, "in_flight": 0, "delayed": 0, "dead": 0}
+        assert counts.items() <= (await queue.stats()).items()
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_is_redelivered(self):
+        """A job not acked within the visibility timeout runs again; the stale lease is void."""
+        from api.services.job_queue import InMemoryJobQueue
+
+        clock = FakeClock()
+        queue = InMemoryJobQueue(visibility_timeout=60, max_attempts=3, retry_backoff=1, clock=clock)
+        await queue.enqueue({}, job_id="a")
+        first = await queue.reserve()
+
+        clock.now += 30
+        assert await queue.reserve() is None
+        assert await queue.extend(first) is True
+        clock.now += 59
+        assert await queue.reserve() is None
+
+        clock.now += 2
+        second = await queue.reserve()
+        assert second.id == "a"
+        assert second.attempts == 2
+        assert await queue.ack(first) is False
+        assert await queue.ack(second) is True
+
+    @pytest.mark.asyncio
+    async def test_retry_backs_off_then_buries(self):
+        """Retries wait an exponential backoff; the last attempt goes to dead letters."""
+        from api.services.job_queue import InMemoryJobQueue, RetryOutcome
+
+        clock = FakeClock()
+        queue = InMemoryJobQueue(visibility_timeout=60, max_attempts=3, retry_backoff=5, clock=clock)
+        await queue.enqueue({}, job_id="a")
+
+        for delay in (5, 10):
+            job = await queue.reserve()
+            assert await queue.retry(job, "boom") is RetryOutcome.RETRYING
+            clock.now += delay - 0.1
+            assert await queue.reserve() is None
+            clock.now += 0.1
+
+        job = await queue.reserve()
+        assert job.attempts == 3
+        assert await queue.retry(job, "still broken") is RetryOutcome.EXHAUSTED
+        assert queue.dead_jobs() == [("a", "still broken")]
+        assert (await queue.stats())["dead"] == 1
+
+    @pytest.mark.asyncio
+    async def test_retry_after_lease_expired_reports_lease_lost(self):
+        """An expired lease is neither retried nor buried, even on the last attempt."""
+        from api.services.job_queue import InMemoryJobQueue, RetryOutcome
+
+        clock = FakeClock()
+        queue = InMemoryJobQueue(visibility_timeout=60, max_attempts=2, clock=clock)
+        await queue.enqueue({}, job_id="a")
+
+        first = await queue.reserve()
+        clock.now += 61
+        second = await queue.reserve()
+        assert await queue.retry(first, "boom") is RetryOutcome.LEASE_LOST
+        clock.now += 61
+        third = await queue.reserve()
+        assert await queue.retry(second, "boom") is RetryOutcome.LEASE_LOST
+        assert queue.dead_jobs() == []
+        assert await queue.ack(third) is True
+
+    @pytest.mark.asyncio
+    async def test_redis_backends_share_one_client(self):
+        """The Redis backends use the process' client until close_redis releases it."""
+        from api.services import state_store
+        from api.services.eta_estimator import EtaEstimator, RedisEtaEstimator
+        from api.services.job_queue import JobQueue, RedisJobQueue
+        from api.services.progress_broker import ProgressBroker, RedisProgressBroker
+        from api.services.status_cache import RedisStatusCache, StatusCache
+
+        backends = [RedisJobQueue(), RedisProgressBroker(), RedisStatusCache(), RedisEtaEstimator()]
+        try:
+            shared = state_store.get_redis_client()
+            assert all(backend.client is shared for backend in backends)
+        finally:
+            await state_store.close_redis()
+        assert all(backend.client is not shared for backend in backends)
+        await state_store.close_redis()
+
+        for base in (JobQueue, ProgressBroker, StatusCache, EtaEstimator):
+            with pytest.raises(TypeError):
+                base()
+
+    @pytest.mark.asyncio
+    async def test_reserve_waits_for_timeout(self):
+        """reserve(timeout) polls until a job arrives or the timeout passes."""
+        from api.services.job_queue import InMemoryJobQueue
+
+        queue = InMemoryJobQueue()
+        start = time.perf_counter()
+        assert await queue.reserve(timeout=0.1, poll_interval=0.02) is None
+        assert time.perf_counter() - start >= 0.09
+
+        async def enqueue_later():
+            await asyncio.sleep(0.05)
+            await queue.enqueue({}, job_id="late")
+
+        producer = asyncio.create_task(enqueue_later())
+        job = await queue.reserve(timeout=1.0, poll_interval=0.01)
+        await producer
+        assert job.id == "late"
+
+    @pytest.mark.asyncio
+    async def test_bulk_user_does_not_block_others(self):
+        """A user queueing many jobs shares workers with a user arriving later."""
+        from api.services.job_queue import InMemoryJobQueue
+
+        queue = InMemoryJobQueue()
+        for i in range(10):
+            await queue.enqueue({}, job_id=f"guest-{i}", user_id="guest")
+        first = await queue.reserve()
+        await queue.enqueue({}, job_id="user-0", user_id="user")
+
+        order = [first.id] + [(await queue.reserve()).id for _ in range(3)]
+        assert order[:2] == ["guest-0", "guest-1"]
+        assert "user-0" in order[2:]
+
+    @pytest.mark.asyncio
+    async def test_retried_job_keeps_fair_share_tag(self):
+        """A retried job is not sent behind the jobs queued while it ran."""
+        from api.services.job_queue import InMemoryJobQueue
+
+        clock = FakeClock()
+        queue = InMemoryJobQueue(max_attempts=3, retry_backoff=1, clock=clock)
+        await queue.enqueue({}, job_id="a", user_id="alice")
+        job = await queue.reserve()
+        await queue.enqueue({}, job_id="b", user_id="bob")
+        await queue.enqueue({}, job_id="c", user_id="bob")
+
+        await queue.retry(job, "boom")
+        clock.now += 1
+        assert (await queue.reserve()).id == "a"
+
+    @pytest.mark.asyncio
+    async def test_stats_report_depth_and_waits(self):
+        """stats() adds ready depth per class and dispatch wait percentiles."""
+        from api.services.job_queue import InMemoryJobQueue
+
+        clock = FakeClock()
+        queue = InMemoryJobQueue(clock=clock)
+        await queue.enqueue({}, job_id="a", priority="llm")
+        await queue.enqueue({}, job_id="b", priority="llm")
+        clock.now += 4
+        await queue.reserve()
+
+        stats = await queue.stats()
+        assert stats["ready"] == 1
+        assert stats["ready_by_priority"] == {"thumbnail": 0, "pose": 0, "llm": 1}
+        assert stats["oldest_wait_seconds"]["llm"] == 4
+        assert stats["wait_seconds"] == {"count": 1, "p50": 4, "p95": 4, "max": 4}
+
+
+class TestJobScheduler:
+    """Tests for priority, aging and fair-share ordering of ready jobs."""
+
+    def test_higher_priority_class_runs_first(self):
+        """thumbnail jobs run before pose jobs, pose before llm."""
+        from api.services.job_scheduler import FairShareScheduler
+
+        scheduler = FairShareScheduler(aging_seconds=60, clock=FakeClock())
+        for job_id, priority in [("l", "llm"), ("p", "pose"), ("t", "thumbnail")]:
+            scheduler.push(job_id, priority, scheduler.tag(job_id), job_id)
+
+        assert [scheduler.pop() for _ in range(4)] == ["t", "p", "l", None]
+
+    def test_unknown_priority_rejected(self):
+        """Pushing into an unknown class raises JobSchedulerError."""
+        from api.services.job_scheduler import FairShareScheduler, JobSchedulerError
+
+        scheduler = FairShareScheduler(aging_seconds=60, clock=FakeClock())
+        with pytest.raises(JobSchedulerError):
+            scheduler.push("x", "urgent", 1.0, "u")
+
+    def test_weights_split_dispatches(self):
+        """Two backlogged users get dispatches in proportion to their weights."""
+        from api.services.job_scheduler import FairShareScheduler
+
+        scheduler = FairShareScheduler(aging_seconds=60, clock=FakeClock())
+        for i in range(30):
+            scheduler.push(f"guest-{i}", "pose", scheduler.tag("guest", weight=1), "guest")
+            scheduler.push(f"user-{i}", "pose", scheduler.tag("user", weight=2), "user")
+
+        first = [scheduler.pop() for _ in range(30)]
+        assert sum(job_id.startswith("user") for job_id in first) == 20
+
+    def test_cost_charged_against_share(self):
+        """A user running long jobs gets fewer dispatches than one running short jobs."""
+        from api.services.job_scheduler import FairShareScheduler
+
+        scheduler = FairShareScheduler(aging_seconds=60, clock=FakeClock())
+        for i in range(10):
+            scheduler.push(f"long-{i}", "pose", scheduler.tag("a", cost=5), "a")
+            scheduler.push(f"short-{i}", "pose", scheduler.tag("b", cost=1), "b")
+
+        first = [scheduler.pop() for _ in range(6)]
+        assert first.count("long-0") == 1
+        assert sum(job_id.startswith("short") for job_id in first) == 5
+
+    def test_aging_promotes_starved_class(self):
+        """An llm job moves up a class per aging interval until it beats new thumbnails."""
+        from api.services.job_scheduler import FairShareScheduler
+
+        clock = FakeClock()
+        scheduler = FairShareScheduler(aging_seconds=10, clock=clock)
+        scheduler.push("llm", "llm", scheduler.tag("u"), "u")
+        for thumbnail in ("t1", "t2"):
+            clock.now += 10
+            scheduler.push(thumbnail, "thumbnail", scheduler.tag("v"), "v")
+            # Promoted to pose, then level with thumbnail: still loses
+            assert scheduler.pop() == thumbnail
+
+        clock.now += 10
+        scheduler.push("t3", "thumbnail", scheduler.tag("v"), "v")
+        assert scheduler.pop() == "llm"
+        assert scheduler.pop() == "t3"
+
+    def test_idle_user_banks_no_credit(self):
+        """A user returning after others ran starts at the current virtual time."""
+        from api.services.job_scheduler import FairShareScheduler
+
+        scheduler = FairShareScheduler(aging_seconds=60, clock=FakeClock())
+        for i in range(5):
+            scheduler.push(f"a-{i}", "pose", scheduler.tag("a"), "a")
+        for _ in range(3):
+            scheduler.pop()
+
+        assert scheduler.tag("b") == scheduler.virtual_time + 1
+        assert scheduler.virtual_time == 3
+
+    def test_wait_stats_percentiles(self):
+        """wait_stats uses nearest-rank percentiles."""
+        from api.services.job_scheduler import wait_stats
+
+        stats = wait_stats([float(i) for i in range(1, 101)])
+        assert stats == {"count": 100, "p50": 50.0, "p95": 95.0, "max": 100.0}
+        assert wait_stats([])["p95"] is None
+
+
+class StubPipeline:
+    """Pipeline stand-in recording runs and failures."""
+
+    def __init__(self, error=None, permanent=False, delay=0.0, during_run=None):
+        self.error = error
+        self.permanent = permanent
+        self.delay = delay
+        self.during_run = during_run
+        self.runs = []
+        self.failures = []
+
+    async def run(self, analysis_id, attempt=1, worker_id=None):
+        self.runs.append((analysis_id, attempt))
+        await asyncio.sleep(self.delay)
+        if self.during_run is not None:
+            await self.during_run()
+        if self.error is not None:
+            raise self.error
+
+    async def fail(self, analysis_id, error_code, error_message):
+        self.failures.append((analysis_id, error_code))
+
+    def error_code_for(self, error):
+        return "VIDEO_UNREADABLE" if self.permanent else None
+
+
+class TestAnalysisWorker:
+    """Tests for the worker's handling of job outcomes."""
+
+    async def _worker(self, pipeline, clock=None, visibility_timeout=60):
+        from api.services.analysis_worker import AnalysisWorker
+        from api.services.job_queue import InMemoryJobQueue
+
+        queue = InMemoryJobQueue(
+            visibility_timeout=visibility_timeout, max_attempts=2, retry_backoff=0,
+            clock=clock or time.time,
+        )
+        analysis_id = uuid4()
+        await queue.enqueue({"analysis_id": str(analysis_id)}, job_id=str(analysis_id))
+        return AnalysisWorker(queue=queue, pipeline=pipeline, worker_id="test"), queue, analysis_id
+
+    @pytest.mark.asyncio
+    async def test_success_acks(self):
+        """A successful run is acked and not delivered again."""
+        pipeline = StubPipeline()
+        worker, queue, analysis_id = await self._worker(pipeline)
+
+        assert await worker.run_once() is True
+        assert await worker.run_once() is False
+        assert pipeline.runs == [(analysis_id, 1)]
+        assert pipeline.failures == []
+        counts = {"ready": 0, "in_flight": 0, "delayed": 0, "dead": 0}
+        assert counts.items() <= (await queue.stats()).items()
+
+    @pytest.mark.asyncio
+    async def test_transient_error_retried_then_failed(self):
+        """Transient errors are retried; the analysis fails once attempts run out."""
+        pipeline = StubPipeline(error=RuntimeError("LLM unavailable"))
+        worker, queue, analysis_id = await self._worker(pipeline)
+
+        await worker.run_once()
+        assert pipeline.failures == []
+        await worker.run_once()
+
+        assert pipeline.runs == [(analysis_id, 1), (analysis_id, 2)]
+        assert pipeline.failures == [(analysis_id, "PROCESSING_FAILED")]
+        assert (await queue.stats())["dead"] == 1
+
+    @pytest.mark.asyncio
+    async def test_permanent_error_fails_immediately(self):
+        """Permanent errors are recorded with their code and not retried."""
+        pipeline = StubPipeline(error=RuntimeError("no such file"), permanent=True)
+        worker, queue, analysis_id = await self._worker(pipeline)
+
+        await worker.run_once()
+
+        assert await worker.run_once() is False
+        assert pipeline.failures == [(analysis_id, "VIDEO_UNREADABLE")]
+        assert (await queue.stats())["dead"] == 1
+
+    @pytest.mark.asyncio
+    async def test_repeatedly_expired_job_times_out(self):
+        """A job whose lease keeps expiring is failed with PROCESSING_TIMEOUT."""
+        clock = FakeClock()
+        pipeline = StubPipeline()
+        worker, queue, analysis_id = await self._worker(pipeline, clock=clock)
+
+        for _ in range(2):
+            assert await queue.reserve() is not None
+            clock.now += 61
+
+        await worker.run_once()
+
+        assert pipeline.runs == []
+        assert pipeline.failures == [(analysis_id, "PROCESSING_TIMEOUT")]
+
+    async def _lose_lease(self, permanent):
+        """Fail a run after its lease expired and went to another worker."""
+        clock = FakeClock()
+        pipeline = StubPipeline(error=RuntimeError("stalled"), permanent=permanent)
+        worker, queue, analysis_id = await self._worker(pipeline, clock=clock)
+        taken = []
+
+        async def expire_lease():
+            clock.now += 61
+            taken.append(await queue.reserve())
+
+        pipeline.during_run = expire_lease
+        # Deliver twice so the stale worker fails on its last attempt
+        await queue.retry(await queue.reserve(), "boom")
+        await worker.run_once()
+        return pipeline, queue, taken[0]
+
+    @pytest.mark.asyncio
+    async def test_transient_error_after_lease_lost_leaves_job(self):
+        """A worker that lost its lease does not fail the analysis or bury the job."""
+        pipeline, queue, current = await self._lose_lease(permanent=False)
+
+        assert current is not None
+        assert pipeline.failures == []
+        stats = await queue.stats()
+        assert (stats["in_flight"], stats["dead"]) == (1, 0)
+        assert await queue.ack(current) is True
+
+    @pytest.mark.asyncio
+    async def test_permanent_error_after_lease_lost_leaves_job(self):
+        """A permanent error is only recorded by the worker holding the job."""
+        pipeline, queue, current = await self._lose_lease(permanent=True)
+
+        assert pipeline.failures == []
+        assert (await queue.stats())["dead"] == 0
+        assert await queue.ack(current) is True
+
+    @pytest.mark.asyncio
+    async def test_heartbeat_keeps_long_job_leased(self):
+        """A job running past the visibility timeout is not redelivered."""
+        pipeline = StubPipeline(delay=0.3)
+        worker, queue, _ = await self._worker(pipeline, visibility_timeout=0.1)
+
+        running = asyncio.create_task(worker.run_once())
+        await asyncio.sleep(0.2)
+        assert await queue.reserve() is None
+        await running
+
+        assert len(pipeline.runs) == 1
+        counts = {"ready": 0, "in_flight": 0, "delayed": 0, "dead": 0}
+        assert counts.items() <= (await queue.stats()).items()
+
+
+async def _seed_queued_analysis(session):
+    """Video, subject, body specs and a queued analysis; returns the analysis."""
+    from api.models.body_specs import BodySpecs
+    from api.models.subject import Subject, Thumbnail
+    from api.models.upload import Video
+
+    user_id = uuid4()
+    video = Video(
+        id=uuid4(), user_id=user_id, filename="a.mp4", content_type="video/mp4",
+        file_size=1, duration_seconds=10, storage_key="videos/a.mp4", total_frames=300,
+    )
+    thumbnail = Thumbnail(
+        id=uuid4(), video_id=video.id, frame_number=0, timestamp_seconds=0.0,
+        storage_key="thumbs/a.jpg", detected_persons=[],
+    )
+    subject = Subject(
+        id=uuid4(), video_id=video.id, thumbnail_id=thumbnail.id, person_id="person_0",
+        initial_bbox={"x": 0, "y": 0, "width": 100, "height": 200},
+    )
+    body_specs = BodySpecs(
+        id=uuid4(), user_id=user_id, video_id=video.id, height_cm=175, weight_kg=70,
+        experience_level="beginner", stance="orthodox",
+    )
+    analysis = Analysis(
+        id=uuid4(), video_id=video.id, user_id=user_id, subject_id=subject.id,
+        body_specs_id=body_specs.id, status=AnalysisStatus.QUEUED, progress_percent=0,
+        total_frames=300, queued_at=datetime.now(timezone.utc),
+    )
+    session.add_all([video, thumbnail, subject, body_specs, analysis])
+    await session.flush()
+    return analysis
+
+
+class TestAnalysisPipeline:
+    """Tests for the background pipeline stages (AC-028, AC-029)."""
+
+    def _patches(self, db_session, tmp_path, failed_frames=0):
+        """Route the pipeline's sessions to db_session and stub the heavy stages."""
+        from api.services import analysis_pipeline
+        from api.services.checkpoint_store import checkpoint_store
+        from api.services.llm_analysis_service import llm_analysis_service
+        from api.services.pose_extraction_service import pose_extraction_service
+        from api.services.video_processor import video_processor
+
+        @asynccontextmanager
+        async def session_scope():
+            yield db_session
+            await db_session.commit()
+
+        pose_data = {"total_frames": 300, "successful_frames": 300 - failed_frames,
+                     "failed_frames": failed_frames, "fps": 30.0, "frames": []}
+        llm_result = {"overall_assessment": "Solid", "performance_score": 71, "strengths": [],
+                      "weaknesses": [], "recommendations": [], "metrics": {"jab_count": 0},
+                      "llm_model": "gpt-4"}
+        return [
+            patch.object(analysis_pipeline, "get_db_session", session_scope),
+            patch.object(checkpoint_store, "storage_base", tmp_path),
+            patch.object(video_processor, "_resolve_video_path", AsyncMock(return_value="/tmp/a.mp4")),
+            patch.object(pose_extraction_service, "run", AsyncMock(return_value=pose_data)),
+            patch.object(llm_analysis_service, "generate_analysis", AsyncMock(return_value=llm_result)),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_run_completes_analysis(self, db_session, tmp_path):
+        """All stages run and the analysis completes with a report."""
+        from contextlib import ExitStack
+
+        from api.models.report import Report
+        from api.services.analysis_pipeline import AnalysisPipeline
+        from api.services.pose_extraction_service import pose_extraction_service
+
+        analysis = await _seed_queued_analysis(db_session)
+        with ExitStack() as stack:
+            for p in self._patches(db_session, tmp_path):
+                stack.enter_context(p)
+            report_id = await AnalysisPipeline().run(analysis.id, attempt=2, worker_id="w1")
+            # Redelivery of a completed job does not redo the work
+            assert await AnalysisPipeline().run(analysis.id) == report_id
+            assert pose_extraction_service.run.await_count == 1
+
+        await db_session.refresh(analysis)
+        report = await db_session.get(Report, report_id)
+        assert analysis.status == AnalysisStatus.COMPLETED
+        assert analysis.report_id == report_id
+        assert analysis.progress_percent == 100
+        assert analysis.retry_count == 1
+        assert analysis.worker_id == "w1"
+        assert analysis.stamp_total == 0
+        assert report.performance_score == 71
+
+    @pytest.mark.asyncio
+    async def test_run_stops_on_frame_failure(self, db_session, tmp_path):
+        """AC-028: Over 20% lost frames fails the analysis before stamps and LLM."""
+        from contextlib import ExitStack
+
+        from api.services.analysis_pipeline import AnalysisPipeline
+        from api.services.llm_analysis_service import llm_analysis_service
+
+        analysis = await _seed_queued_analysis(db_session)
+        with ExitStack() as stack:
+            for p in self._patches(db_session, tmp_path, failed_frames=100):
+                stack.enter_context(p)
+            assert await AnalysisPipeline().run(analysis.id) is None
+            llm_analysis_service.generate_analysis.assert_not_called()
+
+        await db_session.refresh(analysis)
+        assert analysis.status == AnalysisStatus.FAILED
+        assert analysis.error_code == "POSE_QUALITY_LOW"
+
+    @pytest.mark.asyncio
+    async def test_run_publishes_progress_events(self, db_session, tmp_path):
+        """Stage starts, stage completions and the completion reach subscribers."""
+        from contextlib import ExitStack
+
+        from api.services.analysis_pipeline import AnalysisPipeline
+        from api.services.progress_broker import progress_broker
+
+        analysis = await _seed_queued_analysis(db_session)
+        with ExitStack() as stack:
+            for p in self._patches(db_session, tmp_path):
+                stack.enter_context(p)
+            async with progress_broker.subscribe(analysis.id) as subscription:
+                report_id = await AnalysisPipeline().run(analysis.id)
+                events = []
+                while (event := await subscription.get(timeout=0)) is not None:
+                    events.append(event)
+
+        assert [(e["type"], e.get("stage")) for e in events] == [
+            ("progress", "pose_estimation"),
+            ("stage_complete", "pose_estimation"),
+            ("progress", "stamp_generation"),
+            ("stage_complete", "stamp_generation"),
+            ("progress", "llm_analysis"),
+            ("stage_complete", "llm_analysis"),
+            ("progress", "report_generation"),
+            ("complete", None),
+        ]
+        assert events[1]["next_stage"] == "stamp_generation"
+        assert events[-1]["report_id"] == str(report_id)
+
+    @pytest.mark.asyncio
+    async def test_quality_failure_publishes_error(self, db_session, tmp_path):
+        """AC-028: A quality failure ends the stream with an error event and guidance."""
+        from contextlib import ExitStack
+
+        from api.services.analysis_pipeline import AnalysisPipeline
+        from api.services.progress_broker import progress_broker
+
+        analysis = await _seed_queued_analysis(db_session)
+        with ExitStack() as stack:
+            for p in self._patches(db_session, tmp_path, failed_frames=100):
+                stack.enter_context(p)
+            async with progress_broker.subscribe(analysis.id) as subscription:
+                await AnalysisPipeline().run(analysis.id)
+                events = []
+                while (event := await subscription.get(timeout=0)) is not None:
+                    events.append(event)
+
+        assert events[-1]["type"] == "error"
+        assert events[-1]["code"] == "POSE_QUALITY_LOW"
+        assert events[-1]["user_action"]
+
+    @pytest.mark.asyncio
+    async def test_llm_retry_resumes_from_checkpoint(self, db_session, tmp_path):
+        """A retry after an LLM failure reuses the pose checkpoint and stored stamps."""
+        from contextlib import ExitStack
+
+        from api.services.analysis_pipeline import AnalysisPipeline
+        from api.services.checkpoint_store import POSE_DATA, CheckpointStore
+        from api.services.llm_analysis_service import llm_analysis_service
+        from api.services.pose_extraction_service import pose_extraction_service
+        from api.services.stamp_generation_service import stamp_generation_service
+
+        analysis = await _seed_queued_analysis(db_session)
+        with ExitStack() as stack:
+            for p in self._patches(db_session, tmp_path):
+                stack.enter_context(p)
+            llm_result = llm_analysis_service.generate_analysis.return_value
+            llm_analysis_service.generate_analysis.side_effect = [
+                RuntimeError("LLM unavailable"), llm_result,
+            ]
+            with pytest.raises(RuntimeError):
+                await AnalysisPipeline().run(analysis.id, attempt=1)
+
+            detect = stack.enter_context(
+                patch.object(stamp_generation_service, "detect_all_actions")
+            )
+            report_id = await AnalysisPipeline().run(analysis.id, attempt=2)
+
+            assert pose_extraction_service.run.await_count == 1
+            detect.assert_not_called()
+            assert llm_analysis_service.generate_analysis.await_count == 2
+
+        await db_session.refresh(analysis)
+        assert analysis.status == AnalysisStatus.COMPLETED
+        assert analysis.report_id == report_id
+        assert analysis.pose_data_key == CheckpointStore.key_for(analysis.id, POSE_DATA)
+        assert (tmp_path / analysis.pose_data_key).exists()
+        # Only the pose checkpoint outlives the run
+        assert sorted(p.name for p in (tmp_path / "analyses" / str(analysis.id)).iterdir()) == [
+            "pose_data.json.gz"
+        ]
+
+    @pytest.mark.asyncio
+    async def test_report_retry_skips_llm(self, db_session, tmp_path):
+        """A retry after a report-stage failure does not call the LLM again."""
+        from contextlib import ExitStack
+
+        from api.services.analysis_pipeline import AnalysisPipeline
+        from api.services.dashboard_service import dashboard_service
+        from api.services.llm_analysis_service import llm_analysis_service
+        from api.services.pose_extraction_service import pose_extraction_service
+
+        analysis = await _seed_queued_analysis(db_session)
+        analysis_id = analysis.id
+        with ExitStack() as stack:
+            for p in self._patches(db_session, tmp_path):
+                stack.enter_context(p)
+            with patch.object(
+                dashboard_service, "adjust_report_count",
+                AsyncMock(side_effect=RuntimeError("db hiccup")),
+            ), pytest.raises(RuntimeError):
+                await AnalysisPipeline().run(analysis_id, attempt=1)
+            # The failed stage's session is rolled back by get_db_session;
+            # SQLite reloads queued_at naive, so make it aware again
+            await db_session.rollback()
+            reloaded = await db_session.get(Analysis, analysis_id)
+            reloaded.queued_at = datetime.now(timezone.utc)
+
+            report_id = await AnalysisPipeline().run(analysis_id, attempt=2)
+
+            assert pose_extraction_service.run.await_count == 1
+            assert llm_analysis_service.generate_analysis.await_count == 1
+
+        analysis = await db_session.get(Analysis, analysis_id)
+        assert analysis.status == AnalysisStatus.COMPLETED
+        assert analysis.report_id == report_id
+
+    @pytest.mark.asyncio
+    async def test_start_analysis_enqueues_job(self, db_session):
+        """start_analysis commits the queued analysis and enqueues its job."""
+        from api.services.job_queue import InMemoryJobQueue
+        from api.services.processing_service import ProcessingService
+
+        seeded = await _seed_queued_analysis(db_session)
+        await db_session.delete(seeded)
+        await db_session.flush()
+
+        service = ProcessingService()
+        service.job_queue = InMemoryJobQueue()
+        result = await service.start_analysis(
+            db_session, seeded.video_id, seeded.user_id, seeded.subject_id, seeded.body_specs_id
+        )
+
+        job = await service.job_queue.reserve()
+        assert job.id == result["analysis_id"]
+        assert job.payload == {"analysis_id": result["analysis_id"]}
+
+    @pytest.mark.asyncio
+    async def test_start_analysis_queue_down_fails_analysis(self, db_session):
+        """If the job cannot be queued the analysis is failed, so it can be restarted."""
+        from sqlalchemy import select
+
+        from api.services.job_queue import InMemoryJobQueue, JobQueueError
+        from api.services.processing_service import ProcessingService
+
+        seeded = await _seed_queued_analysis(db_session)
+        await db_session.delete(seeded)
+        await db_session.flush()
+
+        service = ProcessingService()
+        service.job_queue = InMemoryJobQueue()
+        service.job_queue.enqueue = AsyncMock(side_effect=JobQueueError("down"))
+        with pytest.raises(JobQueueError):
+            await service.start_analysis(
+                db_session, seeded.video_id, seeded.user_id, seeded.subject_id, seeded.body_specs_id
+            )
+
+        result = await db_session.execute(select(Analysis).where(Analysis.video_id == seeded.video_id))
+        analysis = result.scalar_one()
+        assert analysis.status == AnalysisStatus.FAILED
+        assert analysis.error_code == "QUEUE_UNAVAILABLE"
+
+
+
+class TestCheckpointStore:
+    """Tests for stage checkpoint storage."""
+
+    @pytest.mark.asyncio
+    async def test_save_load_round_trip(self, tmp_path):
+        """A saved checkpoint loads back unchanged."""
+        from api.services.checkpoint_store import POSE_DATA, CheckpointStore
+
+        store = CheckpointStore(tmp_path)
+        key = store.key_for("a1", POSE_DATA)
+        data = {"total_frames": 2, "frames": [{"frame_number": 0, "joints": []}]}
+
+        assert await store.save(key, data) == "analyses/a1/pose_data.json.gz"
+        assert await store.load(key) == data
+
+    @pytest.mark.asyncio
+    async def test_missing_or_corrupt_checkpoint_loads_none(self, tmp_path):
+        """Missing and unreadable checkpoints load as None so the stage reruns."""
+        from api.services.checkpoint_store import LLM_ANALYSIS, CheckpointStore
+
+        store = CheckpointStore(tmp_path)
+        key = store.key_for("a1", LLM_ANALYSIS)
+        assert await store.load(None) is None
+        assert await store.load(key) is None
+
+        (tmp_path / key).parent.mkdir(parents=True)
+        (tmp_path / key).write_bytes(b"not gzip")
+        assert await store.load(key) is None
+
+        await store.delete_for_analysis("a1")
+        assert not (tmp_path / "analyses" / "a1").exists()
+
+
+class TestProgressStreaming:
+    """Tests for pushed progress events (broker, SSE and WebSocket endpoints)."""
+
+    @pytest.mark.asyncio
+    async def test_broker_delivers_to_current_subscribers(self):
+        """Subscribers get events published while subscribed, and only those."""
+        from api.services.progress_broker import InMemoryProgressBroker
+
+        broker = InMemoryProgressBroker()
+        await broker.publish("a1", {"type": "progress"})
+        async with broker.subscribe("a1") as first, broker.subscribe("a1") as second:
+            assert broker.subscriber_count("a1") == 2
+            await broker.publish("a1", {"type": "complete"})
+            await broker.publish("a2", {"type": "progress"})
+            assert await first.get(timeout=0) == {"type": "complete"}
+            assert await second.get(timeout=0) == {"type": "complete"}
+            assert await first.get(timeout=0) is None
+        assert broker.subscriber_count("a1") == 0
+
+    @pytest.mark.asyncio
+    async def test_slow_subscriber_drops_oldest(self):
+        """A full client buffer drops its oldest event, keeping the terminal one."""
+        from api.services.progress_broker import InMemoryProgressBroker
+
+        broker = InMemoryProgressBroker(buffer_size=2)
+        async with broker.subscribe("a1") as subscription:
+            for percent in (10, 20):
+                await broker.publish("a1", {"type": "progress", "progress_percent": percent})
+            await broker.publish("a1", {"type": "complete"})
+
+            assert (await subscription.get(timeout=0))["progress_percent"] == 20
+            assert (await subscription.get(timeout=0))["type"] == "complete"
+            assert subscription.dropped == 1
+
+    @pytest.mark.asyncio
+    async def test_progress_events_snapshot_then_live(self):
+        """A stream starts with the current status and ends after the terminal event."""
+        from api.routers import processing as processing_router
+        from api.services.processing_service import processing_service
+        from api.services.progress_broker import progress_broker
+
+        analysis_id = uuid4()
+        snapshot = processing_service.progress_event("llm_analysis", 75)
+
+        @asynccontextmanager
+        async def mock_db_session():
+            yield AsyncMock()
+
+        with patch.object(processing_router, "get_db_session", mock_db_session), \
+             patch.object(
+                 processing_service, "get_progress_snapshot", AsyncMock(return_value=snapshot)
+             ):
+            events = processing_router._progress_events(analysis_id, uuid4())
+            assert await anext(events) == snapshot
+
+            next_event = asyncio.ensure_future(anext(events))
+            await asyncio.sleep(0)
+            await progress_broker.publish(analysis_id, processing_service.complete_event(uuid4()))
+            assert (await next_event)["type"] == "complete"
+            assert await anext(events, None) is None
+
+        assert progress_broker.subscriber_count(analysis_id) == 0
+
+    def test_sse_streams_until_complete(self, client):
+        """GET .../events returns an event stream starting with the snapshot."""
+        from api.config import get_settings
+        from api.services.oauth_service import OAuthService
+        from api.services.processing_service import processing_service
+
+        token = OAuthService(get_settings()).create_access_token(str(uuid4()), "a@example.com")
+        report_id = uuid4()
+
+        @asynccontextmanager
+        async def mock_db_session():
+            yield AsyncMock()
+
+        with patch("api.routers.processing.get_db_session", mock_db_session), \
+             patch.object(
+                 processing_service,
+                 "get_progress_snapshot",
+                 AsyncMock(return_value=processing_service.complete_event(report_id)),
+             ):
+            response = client.get(
+                f"/api/v1/processing/status/{uuid4()}/events", params={"token": token}
+            )
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        assert response.text == (
+            f'event: complete\ndata: {{"type": "complete", "report_id": "{report_id}"}}\n\n'
+        )
+
+    def test_sse_unknown_analysis_is_404(self, client):
+        """Streaming someone else's or a missing analysis is a 404, not an empty stream."""
+        from api.config import get_settings
+        from api.services.oauth_service import OAuthService
+        from api.services.processing_service import AnalysisNotFoundError, processing_service
+
+        token = OAuthService(get_settings()).create_access_token(str(uuid4()), "a@example.com")
+
+        @asynccontextmanager
+        async def mock_db_session():
+            yield AsyncMock()
+
+        with patch("api.routers.processing.get_db_session", mock_db_session), \
+             patch.object(
+                 processing_service,
+                 "get_progress_snapshot",
+                 AsyncMock(side_effect=AnalysisNotFoundError("missing")),
+             ):
+            response = client.get(
+                f"/api/v1/processing/status/{uuid4()}/events",
+                headers={"Authorization": f"Bearer {token}"},
+            )
+
+        assert response.status_code == 404
+
+    def test_websocket_sends_snapshot_and_closes_when_done(self, client):
+        """/ws/status/{id} sends the current status and closes after a terminal event."""
+        from starlette.websockets import WebSocketDisconnect
+
+        from api.config import get_settings
+        from api.services.oauth_service import OAuthService
+        from api.services.processing_service import processing_service
+
+        token = OAuthService(get_settings()).create_access_token(str(uuid4()), "a@example.com")
+        snapshot = processing_service.error_event("POSE_QUALITY_LOW", None)
+
+        @asynccontextmanager
+        async def mock_db_session():
+            yield AsyncMock()
+
+        with patch("api.routers.processing.get_db_session", mock_db_session), \
+             patch.object(
+                 processing_service, "get_progress_snapshot", AsyncMock(return_value=snapshot)
+             ):
+            with client.websocket_connect(f"/ws/status/{uuid4()}?token={token}") as ws:
+                assert ws.receive_json() == snapshot
+                with pytest.raises(WebSocketDisconnect):
+                    ws.receive_json()
+
+    def test_websocket_rejects_invalid_token(self, client):
+        """A WebSocket without a valid token is refused."""
+        from starlette.websockets import WebSocketDisconnect
+
+        with pytest.raises(WebSocketDisconnect):
+            with client.websocket_connect(f"/ws/status/{uuid4()}?token=bad") as ws:
+                ws.receive_json()
+
+
+class TestProgressSink:
+    """Tests for coalesced fine-grained progress (AC-029)."""
+
+    def _sink(self, db_session, clock, persist_interval=5.0):
+        from api.services import progress_sink as progress_sink_module
+        from api.services.progress_broker import InMemoryProgressBroker
+
+        @asynccontextmanager
+        async def session_scope():
+            yield db_session
+            await db_session.commit()
+
+        sink = progress_sink_module.ProgressSink(
+            InMemoryProgressBroker(), persist_interval=persist_interval, clock=clock
+        )
+        return sink, patch.object(progress_sink_module, "get_db_session", session_scope)
+
+    async def _pose_stage(self, db_session):
+        analysis = await _seed_queued_analysis(db_session)
+        analysis.status = AnalysisStatus.POSE_ESTIMATION
+        analysis.current_stage = "pose_estimation"
+        analysis.progress_percent = 5
+        await db_session.commit()
+        return analysis
+
+    @pytest.mark.asyncio
+    async def test_dense_updates_publish_all_and_write_few(self, db_session):
+        """Per-frame updates reach subscribers; the row is written once per interval."""
+        clock = FakeClock(0.0)
+        analysis = await self._pose_stage(db_session)
+        analysis_id = analysis.id
+        sink, sessions = self._sink(db_session, clock)
+
+        with sessions:
+            sink.start(analysis_id, "pose_estimation", 5)
+            async with sink.broker.subscribe(analysis_id) as subscription:
+                # 3000 frames over 30 seconds
+                for frame in range(1, 3001):
+                    clock.now = frame / 100
+                    await sink.report(analysis_id, "pose_estimation", 5 + frame * 54 // 3000,
+                                      frames_processed=frame, frames_failed=frame // 10)
+                percents = []
+                while (event := await subscription.get(timeout=0)) is not None:
+                    percents.append(event["progress_percent"])
+
+            assert percents == list(range(6, 60))
+            assert (await sink.broker.latest(analysis_id))["progress_percent"] == 59
+            assert sink.writes == 6
+
+            await db_session.refresh(analysis)
+            assert analysis.progress_percent == 59
+            assert analysis.frames_processed == 3000
+            assert analysis.status == AnalysisStatus.POSE_ESTIMATION
+
+            await sink.finish(analysis_id)
+            assert await sink.broker.latest(analysis_id) is None
+            sink.record(analysis_id, "pose_estimation", 60)
+            assert sink.writes == 6
+
+    @pytest.mark.asyncio
+    async def test_stage_transition_is_written_immediately(self, db_session):
+        """A new stage goes through update_progress regardless of the interval."""
+        clock = FakeClock(0.0)
+        analysis = await self._pose_stage(db_session)
+        sink, sessions = self._sink(db_session, clock)
+
+        with sessions:
+            sink.start(analysis.id, "pose_estimation", 5)
+            await sink.report(analysis.id, "stamp_generation", 60,
+                              frames_processed=300, frames_failed=0)
+
+        await db_session.refresh(analysis)
+        assert sink.writes == 1
+        assert analysis.status == AnalysisStatus.STAMP_GENERATION
+        assert analysis.progress_percent == 60
+
+    @pytest.mark.asyncio
+    async def test_record_progress_leaves_finished_analysis_alone(self, db_session):
+        """An interim write never reopens an analysis that moved on or failed."""
+        from api.services.processing_service import processing_service
+
+        analysis = await self._pose_stage(db_session)
+        await processing_service.mark_failed(db_session, analysis.id, "VIDEO_UNREADABLE", "x")
+        assert not await processing_service.record_progress(
+            db_session, analysis.id, "pose_estimation", 40, frames_processed=100
+        )
+        await db_session.refresh(analysis)
+        assert analysis.status == AnalysisStatus.FAILED
+
+    @pytest.mark.asyncio
+    async def test_update_progress_leaves_failed_analysis_alone(self, db_session):
+        """A stage start from a stale worker does not reopen a failed analysis."""
+        from api.services.processing_service import processing_service
+
+        analysis = await self._pose_stage(db_session)
+        await processing_service.mark_failed(db_session, analysis.id, "PROCESSING_FAILED", "x")
+        progress = await processing_service.update_progress(
+            db_session, analysis.id, "stamp_generation", 60
+        )
+
+        assert progress["status"] == AnalysisStatus.FAILED.value
+        await db_session.refresh(analysis)
+        assert analysis.status == AnalysisStatus.FAILED
+        assert analysis.current_stage == "pose_estimation"
+
+    @pytest.mark.asyncio
+    async def test_current_prefers_newer_progress_of_same_stage(self):
+        """A stream snapshot is superseded by retained progress of the same stage."""
+        from api.services.processing_service import processing_service
+        from api.services.progress_broker import InMemoryProgressBroker
+        from api.services.progress_sink import ProgressSink
+
+        sink = ProgressSink(InMemoryProgressBroker(), persist_interval=5.0)
+        snapshot = processing_service.progress_event("pose_estimation", 20)
+        assert await sink.current("a1", snapshot) == snapshot
+
+        await sink.broker.publish("a1", processing_service.progress_event("pose_estimation", 41),
+                                  retain=True)
+        assert (await sink.current("a1", snapshot))["progress_percent"] == 41
+        later = processing_service.progress_event("stamp_generation", 60)
+        assert await sink.current("a1", later) == later
+
+
+class TestStatusCache:
+    """Tests for cached status polls and ETags (AC-029)."""
+
+    def test_unchanged_status_is_304_without_db(self, client):
+        """A repeat poll with the ETag gets 304; only the first reads the row."""
+        from api.config import get_settings
+        from api.services.oauth_service import OAuthService
+        from api.services.processing_service import processing_service
+
+        user_id = str(uuid4())
+        token = OAuthService(get_settings()).create_access_token(user_id, "a@example.com")
+        analysis_id = uuid4()
+        payload = {"analysis_id": str(analysis_id), "status": "queued", "current_stage": None,
+                   "stages": [], "estimated_completion": None}
+        get_status = AsyncMock(return_value=payload)
+
+        @asynccontextmanager
+        async def mock_db_session():
+            yield AsyncMock()
+
+        url = f"/api/v1/processing/status/{analysis_id}"
+        with patch("api.routers.processing.get_db_session", mock_db_session), \
+             patch.object(processing_service, "get_status", get_status):
+            first = client.get(url, headers={"Authorization": f"Bearer {token}"})
+            etag = first.headers["etag"]
+            second = client.get(
+                url, headers={"Authorization": f"Bearer {token}", "If-None-Match": etag}
+            )
+            other = OAuthService(get_settings()).create_access_token(str(uuid4()), "b@example.com")
+            foreign = client.get(url, headers={"Authorization": f"Bearer {other}"})
+
+        assert first.status_code == 200
+        assert first.json()["status"] == "queued"
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        assert foreign.status_code == 404
+        assert get_status.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_write_invalidates_on_commit(self, db_session):
+        """update_progress drops the cached status once its transaction commits."""
+        from api.services.processing_service import processing_service
+        from api.services.status_cache import status_cache
+
+        analysis = await _seed_queued_analysis(db_session)
+        await db_session.commit()
+        analysis_id, user_id = analysis.id, analysis.user_id
+
+        async def load():
+            return await processing_service.get_status(db_session, analysis_id, user_id)
+
+        cached = await status_cache.read_through(analysis_id, user_id, load)
+        assert cached.payload["status"] == "queued"
+
+        await processing_service.update_progress(db_session, analysis_id, "pose_estimation", 5)
+        # Pollers keep the committed status until the write commits
+        assert (await status_cache.get(analysis_id))[0] == cached
+        await db_session.commit()
+        assert (await status_cache.get(analysis_id))[0] is None
+
+    @pytest.mark.asyncio
+    async def test_fill_after_invalidation_is_dropped(self):
+        """A status read before an invalidation is not cached after it."""
+        from api.services.status_cache import InMemoryStatusCache
+
+        cache = InMemoryStatusCache()
+        _, generation = await cache.get("a1")
+        await cache.invalidate("a1")
+        entry = await cache.fill("a1", generation, "u1", {"status": "queued"})
+
+        assert entry.etag == cache.etag_for({"status": "queued"})
+        assert (await cache.get("a1"))[0] is None
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_load(self):
+        """Pollers missing together read the row once."""
+        from api.services.status_cache import InMemoryStatusCache
+
+        cache = InMemoryStatusCache()
+        loads = 0
+
+        async def load():
+            nonlocal loads
+            loads += 1
+            await asyncio.sleep(0.01)
+            return {"status": "queued"}
+
+        entries = await asyncio.gather(
+            *(cache.read_through("a1", "u1", load) for _ in range(20))
+        )
+
+        assert loads == 1
+        assert {entry.etag for entry in entries} == {cache.etag_for({"status": "queued"})}
+
+
+class TestEtaEstimator:
+    """Tests for processing-time estimates learned from completed analyses."""
+
+    def _completed(self, pose_seconds=120.0, llm_seconds=20.0, total_frames=3000, retry_count=0):
+        from datetime import timedelta
+
+        start = datetime(2026, 1, 21, 13, 0, tzinfo=timezone.utc)
+        pose_done = start + timedelta(seconds=pose_seconds)
+        llm_start = pose_done + timedelta(seconds=4)
+        llm_done = llm_start + timedelta(seconds=llm_seconds)
+        return Analysis(
+            id=uuid4(), video_id=uuid4(), user_id=uuid4(), subject_id=uuid4(),
+            body_specs_id=uuid4(), status=AnalysisStatus.COMPLETED, total_frames=total_frames,
+            retry_count=retry_count, started_at=start, pose_started_at=start,
+            pose_completed_at=pose_done, stamps_started_at=pose_done,
+            stamps_completed_at=llm_start, llm_started_at=llm_start, llm_completed_at=llm_done,
+            completed_at=llm_done + timedelta(seconds=1),
+        )
+
+    def test_ewma_averages_evenly_until_warmed_up(self):
+        """The first observations are averaged evenly, later ones by the smoothing weight."""
+        from api.services.eta_estimator import ewma
+
+        mean = ewma(None, 0, 10.0, 0.25)
+        mean = ewma(mean, 1, 20.0, 0.25)
+        assert mean == 15.0
+        # Warmed up after 4 observations: weight 0.25 from then on
+        assert ewma(10.0, 8, 20.0, 0.25) == 12.5
+
+    @pytest.mark.asyncio
+    async def test_learns_pose_throughput_per_frame(self):
+        """Pose time scales with frame count at the observed throughput."""
+        from api.services.eta_estimator import DEFAULT_SECONDS, InMemoryEtaEstimator
+
+        estimator = InMemoryEtaEstimator(smoothing=0.1)
+        await estimator.observe(self._completed(pose_seconds=120.0, total_frames=3000))
+
+        assert estimator.stage_seconds("pose_estimation", 6000) == pytest.approx(240.0)
+        assert estimator.stage_seconds("llm_analysis", 6000) == pytest.approx(20.0)
+        assert estimator.average("job") == pytest.approx(145.0)
+
+        # Retried analyses span attempts and are not learned from
+        retried = InMemoryEtaEstimator(smoothing=0.1)
+        await retried.observe(self._completed(pose_seconds=999.0, retry_count=1))
+        assert retried.average("pose_estimation") == DEFAULT_SECONDS["pose_estimation"]
+
+    @pytest.mark.asyncio
+    async def test_remaining_time_credits_the_running_stage(self):
+        """Remaining = rest of the current stage (floored) plus the stages after it."""
+        from datetime import timedelta
+
+        from api.services.eta_estimator import InMemoryEtaEstimator
+
+        estimator = InMemoryEtaEstimator(smoothing=0.1)
+        await estimator.observe(self._completed(pose_seconds=120.0, llm_seconds=20.0))
+        now = datetime(2026, 1, 21, 14, 0, tzinfo=timezone.utc)
+        running = Analysis(
+            status=AnalysisStatus.POSE_ESTIMATION, current_stage="pose_estimation",
+            total_frames=3000, pose_started_at=now - timedelta(seconds=60),
+        )
+        # 60 s of pose left, then 4 s stamps, 20 s LLM, 1 s report
+        assert estimator.remaining_seconds(running, now) == pytest.approx(85.0)
+
+        running.pose_started_at = now - timedelta(seconds=600)
+        assert estimator.remaining_seconds(running, now) == pytest.approx(12.0 + 25.0)
+
+    @pytest.mark.asyncio
+    async def test_queued_estimate_includes_queue_depth(self):
+        """A queued analysis waits for the jobs ahead, shared across worker slots."""
+        from api.services.eta_estimator import InMemoryEtaEstimator
+        from api.services.job_queue import analysis_job_queue
+
+        estimator = InMemoryEtaEstimator(smoothing=0.1)
+        await estimator.observe(self._completed())
+        stats = AsyncMock(return_value={"ready": 4, "in_flight": 2})
+        with patch.object(analysis_job_queue, "stats", stats):
+            await estimator.refresh()
+            # Fresh snapshot: no second queue read
+            await estimator.refresh()
+
+        assert stats.await_count == 1
+        queued = Analysis(status=AnalysisStatus.QUEUED, total_frames=3000)
+        assert estimator.queue_wait_seconds() == pytest.approx(5 * 145.0)
+        assert estimator.remaining_seconds(queued) == pytest.approx(5 * 145.0 + 145.0)
+        assert estimator.estimated_minutes(3000) == 15
+
+
+class TestMetrics:
+    """Tests for the metrics registry and the /metrics endpoint."""
+
+    def test_renders_prometheus_text(self):
+        """Counters, gauges and cumulative histogram buckets in exposition format."""
+        from api.services.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests", ("path",))
+        requests.inc(path='/a"b')
+        requests.inc(2, path='/a"b')
+        registry.gauge("queue_size", "Queue", ("queue",)).set(3, queue="ready")
+        latency = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 5.0):
+            latency.observe(value)
+
+        text = registry.render()
+
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{path="/a\\"b"} 3' in text
+        assert 'queue_size{queue="ready"} 3' in text
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_sum 6.25" in text
+        assert "latency_seconds_count 4" in text
+
+    def test_rejects_inconsistent_labels(self):
+        """Samples must set exactly the declared labels; names keep their type."""
+        from api.services.metrics import MetricsError, MetricsRegistry
+
+        registry = MetricsRegistry()
+        counter = registry.counter("jobs_total", "Jobs", ("status",))
+        assert registry.counter("jobs_total", "Jobs", ("status",)) is counter
+
+        with pytest.raises(MetricsError):
+            counter.inc(stage="pose")
+        with pytest.raises(MetricsError):
+            counter.inc()
+        with pytest.raises(MetricsError):
+            registry.gauge("jobs_total", "Jobs", ("status",))
+
+    @pytest.mark.asyncio
+    async def test_metrics_endpoint_reports_requests_by_route(self, async_client):
+        """Requests are labelled with their route template, and the queue depth is collected."""
+        from api.services.metrics import metrics
+
+        requests = metrics.get("http_requests_total")
+        before = requests.value(method="GET", path="/health", status=200)
+        await async_client.get("/health")
+
+        response = await async_client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert requests.value(method="GET", path="/health", status=200) == before + 1
+        assert 'http_request_duration_seconds_count{method="GET",path="/health"}' in response.text
+        assert 'processing_queue_size{queue="ready"}' in response.text
+
+    @pytest.mark.asyncio
+    async def test_worker_serves_metrics_over_http(self):
+        """The worker's standalone server answers GET /metrics."""
+        from api.services.metrics import MetricsRegistry
+
+        registry = MetricsRegistry()
+        registry.counter("worker_jobs_total", "Jobs").inc()
+        server = await registry.serve("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /metrics HTTP/1.1\r\nHost: worker\r\n\r\n")
+            await writer.drain()
+            raw = await reader.read()
+            writer.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+
+        assert raw.startswith(b"HTTP/1.1 200 OK")
+        assert b"worker_jobs_total 1" in raw
+
+    def test_stamp_detection_counts_stamps_by_type(self):
+        """detect_all_actions counts stamps per action type and times detection."""
+        from api.services.metrics import STAMP_DETECTION_DURATION, STAMPS_DETECTED
+        from api.services.stamp_generation_service import stamp_generation_service
+
+        stamps = (
+            [
+                {"action_type": "jab", "timestamp_seconds": 1.0},
+                {"action_type": "jab", "timestamp_seconds": 2.0},
+            ],
+            [{"action_type": "slip", "timestamp_seconds": 1.5}],
+        )
+        jabs = STAMPS_DETECTED.value(type="jab")
+        detections = STAMP_DETECTION_DURATION.count()
+        with patch.object(
+            stamp_generation_service.detection_service, "detect_actions", return_value=stamps
+        ):
+            stamp_generation_service.detect_all_actions({"frames": [], "fps": 30})
+
+        assert STAMPS_DETECTED.value(type="jab") == jabs + 2
+        assert STAMP_DETECTION_DURATION.count() == detections + 1
@@ -407,6 +407,31 @@ class TestStampDetectionService:
         assert len(strikes) >= 1  # At least one strike detected
         assert strikes[0]["side"] == "right"
 
+    @pytest.mark.parametrize("case", ["0", "1", "2-ties", "3-ties"])
+    def test_detect_strikes_matches_golden_output(self, case):
+        """4-decimal pose data yields the strikes of the original dict detector.
+
+        fixtures/strike_golden.json holds the output of the detector before
+        PoseSequence (no smoothing), as [frame_number, timestamp, action_type,
+        side, confidence, velocity_vector xyz] rows.
+        """
+        import json
+        from pathlib import Path
+
+        from api.services.stamp_detection_service import StampDetectionService
+
+        golden = json.loads((Path(__file__).parent / "fixtures" / "strike_golden.json").read_text())
+        seed, _, ties = case.partition("-")
+        pose_data = _quantized_pose_data(100, int(seed), ties=bool(ties))
+
+        strikes = StampDetectionService(smoothing="none").detect_strikes(pose_data)
+
+        assert [
+            [s["frame_number"], s["timestamp_seconds"], s["action_type"], s["side"],
+             s["confidence"], [s["velocity_vector"][axis] for axis in "xyz"]]
+            for s in strikes
+        ] == golden[case]
+
     def test_detect_defense_guard_up(self):
         """Test guard up detection from pose data.
 
@@ -574,6 +599,190 @@ class TestStampGenerationService:
             assert 0 <= stamp["confidence"] <= 1
 
 
+class TestStampPersistence:
+    """Tests for bulk stamp writes and deletes against a real database."""
+
+    async def test_generate_stamps_bulk_inserts_rows(self, db_session):
+        """Detected stamps are written in one INSERT and their IDs returned."""
+        from sqlalchemy import event
+
+        from api.services.stamp_generation_service import StampGenerationService
+
+        service = StampGenerationService()
+        analysis_id = uuid4()
+        pose_data = {
+            "frames": _create_pose_sequence_for_jab() + [
+                _create_pose_frame(i, guard_up=True) for i in range(60, 70)
+            ] + [_create_base_frame(i) for i in range(70, 80)],
+            "fps": 30.0,
+        }
+        expected = service.detect_all_actions(pose_data)
+
+        statements = []
+        event.listen(
+            db_session.bind.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        stamp_ids = await service.generate_stamps(db_session, analysis_id, pose_data)
+        stored = await service.get_stamps_for_analysis(db_session, analysis_id)
+
+        assert len(stamp_ids) == len(expected) >= 2
+        assert sum(s.startswith("INSERT") for s in statements) == 1
+        assert {s.id for s in stored} == set(stamp_ids)
+        by_id = {s.id: s for s in stored}
+        for stamp_id, stamp_data in zip(stamp_ids, expected):
+            stamp = by_id[stamp_id]
+            assert stamp._action_type == stamp_data["action_type"]
+            assert stamp._side == stamp_data["side"]
+            assert stamp.confidence == stamp_data["confidence"]
+            assert stamp.velocity_vector == stamp_data.get("velocity_vector")
+            assert stamp.created_at is not None
+
+    async def test_insert_stamps_large_input(self, db_session):
+        """Thousands of stamps are written in one call."""
+        from sqlalchemy import func, select
+
+        from api.models.stamp import Stamp
+        from api.services.stamp_generation_service import StampGenerationService
+
+        stamps = [
+            {"timestamp_seconds": i / 10, "frame_number": i, "action_type": "jab",
+             "side": "left", "confidence": 0.8}
+            for i in range(2500)
+        ]
+
+        stamp_ids = await StampGenerationService().insert_stamps(db_session, uuid4(), stamps)
+        count = await db_session.scalar(select(func.count()).select_from(Stamp))
+
+        assert len(set(stamp_ids)) == count == 2500
+
+    async def test_delete_stamps_is_single_statement(self, db_session):
+        """Deleting issues one DELETE (plus the counter reset) and leaves
+        other analyses untouched."""
+        from sqlalchemy import event
+
+        from api.services.stamp_generation_service import StampGenerationService
+
+        service = StampGenerationService()
+        stamps = [
+            {"timestamp_seconds": i / 10, "frame_number": i, "action_type": "duck",
+             "side": "both", "confidence": 0.7}
+            for i in range(5)
+        ]
+        analysis_id, other_id = uuid4(), uuid4()
+        await service.insert_stamps(db_session, analysis_id, stamps)
+        await service.insert_stamps(db_session, other_id, stamps[:2])
+
+        statements = []
+        event.listen(
+            db_session.bind.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        deleted = await service.delete_stamps_for_analysis(db_session, analysis_id)
+
+        assert deleted == 5
+        assert [s.split()[0] for s in statements] == ["DELETE", "UPDATE"]
+        assert await service.get_stamps_for_analysis(db_session, analysis_id) == []
+        assert len(await service.get_stamps_for_analysis(db_session, other_id)) == 2
+
+
+class TestStampCounters:
+    """Tests for stamp counters stored on the analysis."""
+
+    async def test_generate_stamps_stores_counters(self, db_session):
+        """Counters written with the stamps match the detections."""
+        from api.models.analysis import Analysis
+        from api.services.stamp_generation_service import StampGenerationService
+
+        service = StampGenerationService()
+        analysis = _create_analysis()
+        db_session.add(analysis)
+        await db_session.flush()
+        pose_data = {
+            "frames": _create_pose_sequence_for_jab()
+            + [_create_pose_frame(i, guard_up=True) for i in range(60, 70)]
+            + [_create_base_frame(i) for i in range(70, 80)],
+            "fps": 30.0,
+        }
+        detected = service.detect_all_actions(pose_data)
+
+        await service.generate_stamps(db_session, analysis.id, pose_data)
+        stored = await db_session.get(Analysis, analysis.id, populate_existing=True)
+
+        assert stored.stamp_total == len(detected)
+        assert sum(stored.stamp_counts.values()) == len(detected)
+        assert stored.stamp_counts["guard_up"] == 1
+        assert stored.stamp_avg_confidence == pytest.approx(
+            sum(s["confidence"] for s in detected) / len(detected)
+        )
+
+    async def test_summary_reads_counters_without_scanning_stamps(self, db_session):
+        """With counters present the summary never queries the stamps table."""
+        from sqlalchemy import event
+
+        from api.services.stamp_generation_service import StampGenerationService
+
+        service = StampGenerationService()
+        analysis = _create_analysis()
+        db_session.add(analysis)
+        await db_session.flush()
+        pose_data = {"frames": _create_pose_sequence_for_jab(), "fps": 30.0}
+        await service.generate_stamps(db_session, analysis.id, pose_data)
+
+        statements = []
+        event.listen(
+            db_session.bind.sync_engine, "before_cursor_execute",
+            lambda conn, cursor, statement, *args: statements.append(statement),
+        )
+        summary = await service.get_stamp_summary(db_session, analysis.id)
+
+        assert summary.total_stamps == len(service.detect_all_actions(pose_data)) > 0
+        assert not any("stamps" in statement.split("FROM", 1)[-1] for statement in statements)
+
+    async def test_legacy_analysis_falls_back_to_group_by(self, db_session):
+        """Analyses without counters are summarized from the stamp rows."""
+        from api.services.stamp_generation_service import StampGenerationService
+
+        service = StampGenerationService()
+        legacy, current = _create_analysis(), _create_analysis()
+        db_session.add_all([legacy, current])
+        await db_session.flush()
+        stamps = [
+            {"timestamp_seconds": 0.1, "frame_number": 3, "action_type": "jab", "side": "left", "confidence": 0.8},
+            {"timestamp_seconds": 0.9, "frame_number": 27, "action_type": "jab", "side": "right", "confidence": 0.6},
+            {"timestamp_seconds": 2.0, "frame_number": 60, "action_type": "slip", "side": "left", "confidence": 0.7},
+        ]
+        await service.insert_stamps(db_session, legacy.id, stamps)
+        await service.insert_stamps(db_session, current.id, stamps)
+        await service.store_stamp_counters(db_session, current.id, service.compute_stamp_counters(stamps))
+
+        legacy_summary = await service.get_stamp_summary(db_session, legacy.id)
+
+        assert legacy_summary == await service.get_stamp_summary(db_session, current.id)
+        assert legacy_summary.total_stamps == 3
+        assert legacy_summary.strikes["jab"] == 2
+        assert legacy_summary.defense["slip"] == 1
+        assert legacy_summary.avg_confidence == 0.7
+
+    async def test_delete_resets_counters(self, db_session):
+        """Deleting an analysis' stamps zeroes its counters."""
+        from api.services.stamp_generation_service import StampGenerationService
+
+        service = StampGenerationService()
+        analysis = _create_analysis()
+        db_session.add(analysis)
+        await db_session.flush()
+        await service.generate_stamps(
+            db_session, analysis.id, {"frames": _create_pose_sequence_for_jab(), "fps": 30.0}
+        )
+
+        await service.delete_stamps_for_analysis(db_session, analysis.id)
+        summary = await service.get_stamp_summary(db_session, analysis.id)
+
+        assert summary.total_stamps == 0
+        assert summary.no_actions_detected
+
+
 class TestProcessingPipelineIntegration:
     """Tests for stamp generation integration with processing pipeline."""
 
@@ -605,8 +814,414 @@ class TestProcessingPipelineIntegration:
         assert hasattr(analysis, "stamps_completed_at")
 
 
+class TestPoseSequence:
+    """Tests for the array-backed PoseSequence representation."""
+
+    def test_round_trip_pose_data(self):
+        """PoseData converts to arrays and back without losing frames."""
+        from api.services.pose_sequence import PoseSequence
+
+        frames = _create_pose_sequence_for_jab()
+        frames[3]["bounding_box"] = {"x": 10, "y": 20, "width": 30, "height": 40}
+        pose_data = {"analysis_id": "a", "subject_id": "s", "fps": 30.0, "frames": frames}
+
+        sequence = PoseSequence.from_pose_data(pose_data)
+        restored = sequence.to_pose_data()
+
+        assert sequence.landmarks.shape == (60, 33, 4)
+        assert sequence.landmarks.dtype.name == "float32"
+        assert restored["analysis_id"] == "a"
+        assert restored["frames"][3]["bounding_box"] == frames[3]["bounding_box"]
+        assert restored["frames"][0]["bounding_box"] is None
+        for original, converted in zip(frames, restored["frames"]):
+            assert converted["frame_number"] == original["frame_number"]
+            assert converted["timestamp_seconds"] == original["timestamp_seconds"]
+            for a, b in zip(original["joints"], converted["joints"]):
+                assert b["x"] == pytest.approx(a["x"], abs=1e-6)
+                assert b["z"] == pytest.approx(a["z"], abs=1e-6)
+
+    def test_missing_joints_are_nan(self):
+        """Joints absent from a frame are NaN and skipped on export."""
+        from api.services.pose_sequence import PoseSequence
+
+        frame = _create_base_frame(0)
+        frame["joints"] = [j for j in frame["joints"] if j["joint_id"] != 15]
+
+        sequence = PoseSequence.from_frames([frame])
+
+        assert not sequence.present(15)[0]
+        assert sequence.present(16)[0]
+        assert len(sequence.to_pose_data()["frames"][0]["joints"]) == 32
+
+    def test_detectors_accept_sequence_or_dict(self):
+        """Detectors return identical stamps for a dict and a PoseSequence."""
+        from api.services.pose_sequence import PoseSequence
+        from api.services.stamp_detection_service import StampDetectionService
+
+        service = StampDetectionService()
+        frames = (
+            _create_pose_sequence_for_jab()
+            + _create_pose_sequence_for_slip()
+            + [_create_pose_frame(i, guard_up=True) for i in range(10)]
+        )
+        pose_data = {"frames": frames, "fps": 30.0}
+        sequence = PoseSequence.from_pose_data(pose_data)
+
+        assert service.detect_strikes(sequence) == service.detect_strikes(pose_data)
+        assert service.detect_defense(sequence) == service.detect_defense(pose_data)
+
+    def test_sequence_much_smaller_than_dict_form(self):
+        """The array form uses several times less memory than PoseData dicts."""
+        import tracemalloc
+
+        from api.services.pose_sequence import PoseSequence
+
+        tracemalloc.start()
+        frames = [_create_base_frame(i) for i in range(500)]
+        dict_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        sequence = PoseSequence.from_frames(frames)
+
+        assert sequence.nbytes * 5 < dict_bytes
+
+
+class TestVectorizedStrikeDetection:
+    """Parity of the array-based strike detectors with the original dict detector.
+
+    Inputs are 4-decimal, as PoseData is; the reference is
+    _original_detect_strikes on the same data as dicts.
+    """
+
+    @pytest.mark.parametrize("seed", [0, 1, 2, 3])
+    def test_matches_original_detection_on_noisy_sequences(self, seed):
+        """Random-walk sequences yield the stamps of the original detector."""
+        from api.services.stamp_detection_service import StampDetectionService
+
+        service = StampDetectionService(smoothing="none")
+        sequence = _random_pose_sequence(3000, seed)
+
+        assert service.detect_strikes(sequence) == _original_detect_strikes(sequence.to_pose_data())
+
+    @pytest.mark.parametrize("seed", [0, 1, 2, 3])
+    def test_matches_original_detection_at_threshold_ties(self, seed):
+        """Deltas landing exactly on -0.05 and the velocity thresholds classify alike."""
+        from api.services.pose_sequence import PoseSequence
+        from api.services.stamp_detection_service import StampDetectionService
+
+        pose_data = _quantized_pose_data(1500, seed, ties=True)
+        # The wrists do move by exactly -0.05 in y between compared frames
+        wrist_dy = [
+            round(b["y"] - a["y"], 4)
+            for prev, curr in zip(pose_data["frames"], pose_data["frames"][2:])
+            for a in prev["joints"]
+            for b in curr["joints"]
+            if a["joint_id"] == b["joint_id"] and a["joint_id"] in (15, 16)
+        ]
+        assert -0.05 in wrist_dy
+
+        service = StampDetectionService(smoothing="none")
+        expected = _original_detect_strikes(pose_data)
+
+        assert service.detect_strikes(pose_data) == expected
+        assert service.detect_strikes(PoseSequence.from_pose_data(pose_data)) == expected
+
+    def test_matches_original_detection_on_long_same_type_run(self):
+        """Long same-type streaks exercise the stamp-by-stamp merge path."""
+        from api.services.stamp_detection_service import StampDetectionService
+
+        import numpy as np
+
+        service = StampDetectionService(smoothing="none")
+        sequence = _random_pose_sequence(120, seed=7, step=0.0)
+        # Left wrist drifts forward at a varying slow speed for 4 seconds:
+        # one long run of left jabs with fluctuating confidence
+        steps = np.random.default_rng(7).uniform(0.004, 0.007, len(sequence))
+        sequence.landmarks[:, 15, 2] = np.round(-np.cumsum(steps), 4)
+        sequence.confidence[:] = 0.9
+
+        strikes = service.detect_strikes(sequence)
+
+        assert strikes == _original_detect_strikes(sequence.to_pose_data())
+        assert {s["action_type"] for s in strikes} == {"jab"}
+        assert len(strikes) > 5
+
+    def test_matches_original_detection_on_fixtures(self):
+        """Hand-built punch fixtures give the stamps of the original detector."""
+        from api.services.pose_sequence import PoseSequence
+        from api.services.stamp_detection_service import StampDetectionService
+
+        service = StampDetectionService(smoothing="none")
+        for frames in (
+            _create_pose_sequence_for_jab("left"),
+            _create_pose_sequence_for_jab("right"),
+            _create_pose_sequence_for_hook("left"),
+            _create_pose_sequence_for_hook("right"),
+        ):
+            sequence = PoseSequence.from_frames(frames)
+            assert service.detect_strikes(sequence) == _original_detect_strikes(
+                sequence.to_pose_data()
+            )
+
+    def test_merge_keeps_first_most_confident_stamp(self):
+        """Merging keeps one stamp per burst, the first with top confidence."""
+        from api.services.stamp_detection_service import StampDetectionService
+
+        stamps = [
+            {"timestamp_seconds": t, "action_type": "jab", "side": "left", "confidence": c}
+            for t, c in [(0.0, 0.6), (0.1, 0.8), (0.2, 0.8), (1.0, 0.7)]
+        ]
+
+        merged = StampDetectionService()._merge_nearby_stamps(stamps, 30.0)
+
+        assert [(s["timestamp_seconds"], s["confidence"]) for s in merged] == [(0.1, 0.8), (1.0, 0.7)]
+
+
+class TestFusedDetection:
+    """Tests for the single-pass strike and defense detector."""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2, 3, 4])
+    def test_defense_matches_frame_by_frame_scan(self, seed):
+        """Vectorized defense runs emit exactly the scalar state machine stamps."""
+        from api.services.stamp_detection_service import StampDetectionService
+
+        service = StampDetectionService(smoothing="none")
+        sequence = _random_defense_sequence(3000, seed)
+
+        defense = service.detect_defense(sequence)
+
+        assert defense == _reference_detect_defense(service, sequence)
+        assert {d["action_type"] for d in defense} == {"guard_up", "slip", "duck"}
+
+    def test_detect_actions_equals_separate_detectors(self):
+        """The fused pass returns the same stamps as the two detectors."""
+        from api.services.stamp_detection_service import StampDetectionService
+
+        service = StampDetectionService(smoothing="none")
+        sequence = _random_defense_sequence(2000, seed=5)
+
+        strikes, defense = service.detect_actions(sequence)
+
+        assert strikes == service.detect_strikes(sequence)
+        assert defense == service.detect_defense(sequence)
+
+    def test_guard_held_to_end_is_emitted(self):
+        """A guard still up on the last frame is emitted; a duck is not."""
+        from api.services.pose_sequence import PoseSequence
+        from api.services.stamp_detection_service import StampDetectionService
+
+        frames = [_create_pose_frame(i, guard_up=i >= 50) for i in range(60)]
+        frames += [_create_pose_frame(i, duck_motion=True) for i in range(60, 70)]
+        sequence = PoseSequence.from_frames(frames)
+
+        defense = StampDetectionService(smoothing="none").detect_defense(sequence)
+
+        assert defense == _reference_detect_defense(StampDetectionService(smoothing="none"), sequence)
+        assert [d["action_type"] for d in defense] == ["guard_up"]
+
+
+
+class TestStreamingStampDetector:
+    """Tests for the incremental push-based stamp detector."""
+
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_matches_batch_detection(self, seed):
+        """Pushing frames one by one yields exactly the detect_actions stamps."""
+        from api.services.pose_sequence import PoseSequence
+        from api.services.stamp_detection_service import StampDetectionService
+        from api.services.streaming_stamp_detector import StreamingStampDetector
+
+        pose_data = _random_defense_sequence(1500, seed).to_pose_data()
+        # Overlay fast wrist motion so strikes appear among the defense runs
+        strikes_source = _random_pose_sequence(1500, seed).to_pose_data()
+        for frame, source in zip(pose_data["frames"], strikes_source["frames"]):
+            wrists = {j["joint_id"]: j for j in source["joints"] if j["joint_id"] in (13, 14)}
+            frame["joints"] = [wrists.get(j["joint_id"], j) for j in frame["joints"]]
+
+        detector = StreamingStampDetector(fps=30.0)
+        for frame in pose_data["frames"]:
+            detector.push(frame)
+        detector.finish()
+
+        expected = StampDetectionService().detect_actions(PoseSequence.from_pose_data(pose_data))
+        assert detector.split_stamps() == expected
+        assert expected[0] and expected[1]
+
+    def test_strike_emitted_before_stream_ends(self):
+        """A strike is emitted once the merge window has passed."""
+        from api.services.streaming_stamp_detector import StreamingStampDetector
+
+        frames = _create_pose_sequence_for_jab()
+        detector = StreamingStampDetector(fps=30.0)
+
+        emitted_at = None
+        for i, frame in enumerate(frames):
+            if detector.push(frame) and emitted_at is None:
+                emitted_at = i
+
+        assert emitted_at is not None and emitted_at < len(frames) - 1
+        assert detector.stamps[0]["action_type"] in ("jab", "straight")
+        assert detector.finish() == []
+
+    def test_guard_flushed_on_finish(self):
+        """A guard still up at the end is only emitted by finish()."""
+        from api.services.streaming_stamp_detector import StreamingStampDetector
+
+        detector = StreamingStampDetector()
+        for i in range(10):
+            assert detector.push(_create_pose_frame(i, guard_up=True)) == []
+
+        stamps = detector.finish()
+
+        assert [(s["action_type"], s["frame_number"]) for s in stamps] == [("guard_up", 0)]
+
+    def test_push_after_finish_raises(self):
+        """The stream cannot be resumed once finished."""
+        from api.services.streaming_stamp_detector import (
+            StreamingStampDetector,
+            StreamingStampDetectorError,
+        )
+
+        detector = StreamingStampDetector()
+        detector.finish()
+
+        with pytest.raises(StreamingStampDetectorError):
+            detector.push(_create_base_frame(0))
+
+    def test_memory_bounded_by_ring_buffer(self):
+        """Only the last few frames are kept, however long the stream."""
+        from api.services.streaming_stamp_detector import StreamingStampDetector
+
+        detector = StreamingStampDetector()
+        for i in range(200):
+            detector.push(_create_base_frame(i))
+
+        assert len(detector) == 200
+        assert len(detector._ring) == 3
+
+
+class TestLandmarkSmoothing:
+    """Tests for One-Euro and Savitzky-Golay landmark smoothing."""
+
+    def test_savgol_preserves_polynomial_trajectories(self):
+        """A quadratic trajectory is reproduced exactly, edges included."""
+        import numpy as np
+
+        from api.services.landmark_smoothing import savgol_smooth
+
+        t = np.arange(40.0)
+        coords = np.stack([0.01 * t ** 2, 0.3 * t, 2 - 0.5 * t], axis=-1)[:, None, :]
+
+        smoothed = savgol_smooth(coords, window=9, polyorder=2)
+
+        np.testing.assert_allclose(smoothed, coords, atol=1e-9)
+
+    def test_savgol_keeps_raw_values_next_to_gaps(self):
+        """Windows touching a missing joint keep the raw value, not NaN."""
+        import numpy as np
+
+        from api.services.landmark_smoothing import savgol_smooth
+
+        coords = np.random.default_rng(0).normal(0.5, 0.01, size=(30, 2, 3))
+        coords[10, 0] = np.nan
+
+        smoothed = savgol_smooth(coords, window=5, polyorder=2)
+
+        assert np.isnan(smoothed[10, 0]).all()
+        np.testing.assert_array_equal(smoothed[8:13, 0][[0, 1, 3, 4]], coords[8:13, 0][[0, 1, 3, 4]])
+        assert not np.isnan(smoothed[:, 1]).any()
+
+    def test_one_euro_restarts_after_gap(self):
+        """A joint reappearing after a gap starts from its raw value."""
+        import numpy as np
+
+        from api.services.landmark_smoothing import one_euro_smooth
+
+        coords = np.full((10, 1, 3), 0.5)
+        coords[4] = np.nan
+        coords[5:] = 0.8
+
+        smoothed = one_euro_smooth(coords, np.arange(10) / 30.0, 30.0, min_cutoff=1.0, beta=10.0)
+
+        np.testing.assert_allclose(smoothed[:4], 0.5)
+        assert np.isnan(smoothed[4]).all()
+        np.testing.assert_allclose(smoothed[5:], 0.8)
+
+    def test_one_euro_per_frame_matches_batch(self):
+        """OneEuroFilter fed frame by frame equals one_euro_smooth."""
+        import numpy as np
+
+        from api.services.landmark_smoothing import OneEuroFilter, one_euro_smooth
+
+        coords = _random_pose_sequence(200, seed=1).landmarks[..., :3]
+        timestamps = np.arange(200) / 30.0
+
+        batch = one_euro_smooth(coords, timestamps, 30.0, min_cutoff=1.0, beta=10.0)
+        smoother = OneEuroFilter(min_cutoff=1.0, beta=10.0)
+        streamed = np.stack([smoother(row, t, 1 / 30.0) for row, t in zip(coords, timestamps)])
+
+        np.testing.assert_array_equal(batch, streamed)
+
+    @pytest.mark.parametrize("method", ["one_euro", "savgol"])
+    def test_smoothing_removes_jitter_strikes(self, method):
+        """Jitter on a still pose yields strikes raw but none once smoothed."""
+        import numpy as np
+
+        from api.services.pose_sequence import PoseSequence
+        from api.services.stamp_detection_service import StampDetectionService
+
+        coords = np.random.default_rng(2).normal(0.5, 0.003, size=(600, 33, 3))
+        landmarks = np.concatenate([coords, np.full((600, 33, 1), 0.9)], axis=2)
+        sequence = PoseSequence(
+            landmarks=np.round(landmarks, 4).astype(np.float32),
+            confidence=np.full(600, 0.9),
+            timestamps=np.arange(600) / 30.0,
+            frame_numbers=np.arange(600),
+        )
+
+        assert StampDetectionService(smoothing="none").detect_strikes(sequence)
+        assert StampDetectionService(smoothing=method).detect_strikes(sequence) == []
+
+    def test_smoothing_leaves_input_untouched(self):
+        """Smoothing returns a copy; the caller's sequence is unchanged."""
+        import numpy as np
+
+        from api.services.landmark_smoothing import LandmarkSmoother
+
+        sequence = _random_pose_sequence(50, seed=3)
+        before = sequence.landmarks.copy()
+
+        smoothed = LandmarkSmoother("savgol").smooth(sequence)
+
+        np.testing.assert_array_equal(sequence.landmarks, before)
+        np.testing.assert_array_equal(smoothed.landmarks[..., 3], before[..., 3])
+        assert not np.array_equal(smoothed.landmarks, before, equal_nan=True)
+
+    def test_unknown_method_rejected(self):
+        """Unknown methods raise, and Savitzky-Golay cannot stream."""
+        from api.services.landmark_smoothing import LandmarkSmoother, LandmarkSmoothingError
+        from api.services.stamp_detection_service import StampDetectionService
+        from api.services.streaming_stamp_detector import StreamingStampDetector
+
+        with pytest.raises(LandmarkSmoothingError):
+            LandmarkSmoother("kalman")
+        with pytest.raises(LandmarkSmoothingError):
+            StreamingStampDetector(service=StampDetectionService(smoothing="savgol"))
+
 # --- Helper Functions for Test Data ---
 
+def _create_analysis():
+    """Analysis row with placeholder parent IDs (SQLite skips FK checks)."""
+    from api.models.analysis import Analysis
+
+    return Analysis(
+        video_id=uuid4(),
+        user_id=uuid4(),
+        subject_id=uuid4(),
+        body_specs_id=uuid4(),
+    )
+
+
 def _create_pose_sequence_for_jab(arm_side: str = "left") -> list[dict]:
     """Create a sequence of frames simulating a jab punch.
 
@@ -832,3 +1447,228 @@ def _create_pose_frame(
         pass
 
     return frame
+
+
+def _random_pose_sequence(count: int, seed: int, step: float = 0.03):
+    """Random-walk PoseSequence with noisy confidence and dropped joints."""
+    import numpy as np
+
+    from api.services.pose_sequence import PoseSequence
+
+    rng = np.random.default_rng(seed)
+    walk = 0.5 + np.cumsum(rng.normal(0, step, size=(count, 33, 3)), axis=0)
+    landmarks = np.concatenate(
+        [np.round(walk, 4), np.full((count, 33, 1), 0.9)], axis=2
+    ).astype(np.float32)
+    # Drop some wrists/elbows entirely, as when MediaPipe omits a joint
+    landmarks[rng.random(count) < 0.02, 15] = np.nan
+    landmarks[rng.random(count) < 0.02, 14] = np.nan
+
+    return PoseSequence(
+        landmarks=landmarks,
+        confidence=np.round(rng.uniform(0.5, 1.0, count), 2),
+        timestamps=np.arange(count) / 30.0,
+        frame_numbers=np.arange(count),
+        fps=30.0,
+    )
+
+
+def _quantized_pose_data(count: int, seed: int, ties: bool = False) -> dict:
+    """Random-walk PoseData with 4-decimal coordinates, as VideoProcessor emits.
+
+    With ties, joints move in steps whose 2-frame sums land exactly on the
+    strike thresholds (dy == -0.05, 0.008 of travel = 0.12 velocity).
+    """
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    if ties:
+        steps = rng.choice([-0.05, -0.025, -0.004, 0.0, 0.004, 0.025, 0.05], size=(count, 33, 3))
+    else:
+        steps = rng.normal(0, 0.03, size=(count, 33, 3))
+    walk = np.round(0.5 + np.cumsum(steps, axis=0), 4)
+
+    frames = []
+    for i in range(count):
+        joints = [
+            {"joint_id": j, "x": float(walk[i, j, 0]), "y": float(walk[i, j, 1]),
+             "z": float(walk[i, j, 2]), "visibility": 0.9}
+            for j in range(33)
+            if rng.random() > 0.01
+        ]
+        frames.append({
+            "frame_number": i,
+            "timestamp_seconds": round(i / 30.0, 4),
+            "joints": joints,
+            "confidence": float(rng.choice([0.5, 0.8, 0.95])),
+        })
+    return {"fps": 30.0, "frames": frames}
+
+
+def _original_detect_strikes(pose_data: dict) -> list[dict]:
+    """Strike detection as it was on PoseData dicts, before PoseSequence.
+
+    A copy of the original detect_strikes, _detect_arm_strike,
+    _classify_strike and _merge_nearby_stamps (no smoothing), kept as the
+    reference the array-based detectors must match.
+    """
+    import math
+
+    frames = pose_data.get("frames", [])
+    fps = pose_data.get("fps", 30.0)
+    if len(frames) < 3:
+        return []
+
+    def classify(dx, dy, dz, wrist, elbow):
+        abs_dx, abs_dy, abs_dz = abs(dx), abs(dy), abs(dz)
+        is_forward = dz < -0.05
+        is_upward = dy < -0.05
+        is_lateral = abs_dx > 0.1
+        is_extended = abs(wrist.get("z", 0)) > abs(elbow.get("z", 0))
+        if is_upward and abs_dy > abs_dx and abs_dy > abs_dz:
+            return "uppercut"
+        elif is_lateral and abs_dx > abs_dz * 0.8:
+            return "hook"
+        elif is_forward or is_extended:
+            if math.sqrt(dx * dx + dy * dy + dz * dz) < 0.15:
+                return "jab"
+            return "straight"
+        return "jab"
+
+    def arm_strike(prev_frame, curr_frame, side):
+        prev_joints = {j["joint_id"]: j for j in prev_frame.get("joints", [])}
+        curr_joints = {j["joint_id"]: j for j in curr_frame.get("joints", [])}
+        wrist_idx, elbow_idx = (15, 13) if side == "left" else (16, 14)
+        if wrist_idx not in curr_joints or wrist_idx not in prev_joints:
+            return None
+        if elbow_idx not in curr_joints or elbow_idx not in prev_joints:
+            return None
+        prev_wrist, curr_wrist = prev_joints[wrist_idx], curr_joints[wrist_idx]
+
+        time_delta = 2.0 / fps
+        dx = curr_wrist["x"] - prev_wrist["x"]
+        dy = curr_wrist["y"] - prev_wrist["y"]
+        dz = curr_wrist.get("z", 0) - prev_wrist.get("z", 0)
+        velocity = math.sqrt(dx * dx + dy * dy + dz * dz) / time_delta
+        if velocity < 0.12:
+            return None
+        return {
+            "frame_number": curr_frame["frame_number"],
+            "timestamp_seconds": curr_frame["timestamp_seconds"],
+            "action_type": classify(dx, dy, dz, curr_wrist, curr_joints[elbow_idx]),
+            "side": side,
+            "confidence": round(min(0.95, 0.5 + velocity * 2.0), 2),
+            "velocity_vector": {
+                k: round(v, 4)
+                for k, v in {"x": dx / time_delta, "y": dy / time_delta, "z": dz / time_delta}.items()
+            },
+        }
+
+    strikes = []
+    for i in range(2, len(frames)):
+        if frames[i].get("confidence", 0) < 0.7:
+            continue
+        for side in ("left", "right"):
+            strike = arm_strike(frames[i - 2], frames[i], side)
+            if strike:
+                strikes.append(strike)
+
+    strikes.sort(key=lambda s: s["timestamp_seconds"])
+    merged = strikes[:1]
+    for stamp in strikes[1:]:
+        last = merged[-1]
+        if (
+            stamp["action_type"] == last["action_type"]
+            and stamp["side"] == last["side"]
+            and stamp["timestamp_seconds"] - last["timestamp_seconds"] < 0.3
+        ):
+            if stamp["confidence"] > last["confidence"]:
+                merged[-1] = stamp
+        else:
+            merged.append(stamp)
+    return merged
+
+
+def _random_defense_sequence(count: int, seed: int):
+    """Sequence switching guard, duck and slip states in short random blocks."""
+    import numpy as np
+
+    sequence = _random_pose_sequence(count, seed, step=0.0)
+    rng = np.random.default_rng(seed)
+    landmarks = sequence.landmarks
+
+    position = 0
+    center = 0.5
+    while position < count:
+        block = slice(position, position + int(rng.integers(1, 10)))
+        landmarks[block, 15:17, 1] = 0.3 if rng.random() < 0.4 else 0.5
+        landmarks[block, 0, 1] = 0.6 if rng.random() < 0.3 else 0.5
+        if rng.random() < 0.3:
+            # Slip: shoulders shift more than the threshold on every frame
+            for i in range(block.start, min(block.stop, count)):
+                center += 0.06 * rng.choice([-1, 1])
+                landmarks[i, 11, 0] = center - 0.1
+                landmarks[i, 12, 0] = center + 0.1
+        else:
+            landmarks[block, 11, 0] = center - 0.1
+            landmarks[block, 12, 0] = center + 0.1
+        position = block.stop
+
+    landmarks[rng.random(count) < 0.02, 0] = np.nan
+    landmarks[rng.random(count) < 0.02, 11] = np.nan
+    landmarks[rng.random(count) < 0.02, 16] = np.nan
+    sequence.confidence[:] = np.where(rng.random(count) < 0.15, 0.5, 0.9)
+    return sequence
+
+
+def _reference_detect_defense(service, sequence) -> list[dict]:
+    """Frame-by-frame defense state machine using the scalar predicates."""
+    defense = []
+    guard_up_start = slip_start = duck_start = None
+    prev_positions = None
+
+    def stamp(index, action_type, side, confidence):
+        return service._create_defense_stamp(sequence, index, action_type, side, confidence)
+
+    for i in range(len(sequence)):
+        if sequence.confidence[i] < 0.7:
+            continue
+        curr_positions = sequence.landmarks[i]
+
+        if service._is_guard_up(curr_positions):
+            if guard_up_start is None:
+                guard_up_start = i
+        elif guard_up_start is not None:
+            duration = i - guard_up_start
+            if duration >= 3:
+                defense.append(stamp(guard_up_start, "guard_up", "both", min(0.95, 0.7 + duration * 0.02)))
+            guard_up_start = None
+
+        if prev_positions is not None:
+            if service._is_slip(prev_positions, curr_positions):
+                if slip_start is None:
+                    slip_start = i
+            elif slip_start is not None:
+                duration = i - slip_start
+                if duration >= 3:
+                    side = service._get_slip_side(prev_positions, curr_positions)
+                    defense.append(stamp(slip_start, "slip", side, min(0.9, 0.65 + duration * 0.02)))
+                slip_start = None
+
+        if service._is_duck(curr_positions):
+            if duck_start is None:
+                duck_start = i
+        elif duck_start is not None:
+            duration = i - duck_start
+            if duration >= 3:
+                defense.append(stamp(duck_start, "duck", "both", min(0.9, 0.65 + duration * 0.02)))
+            duck_start = None
+
+        prev_positions = curr_positions
+
+    if guard_up_start is not None:
+        duration = len(sequence) - guard_up_start
+        if duration >= 3:
+            defense.append(stamp(guard_up_start, "guard_up", "both", min(0.95, 0.7 + duration * 0.02)))
+    return defense
+
@@ -0,0 +1,626 @@
+"""Tests for video processing (F005 - Pose Estimation Processing).
+
+@feature F005 - Pose Estimation Processing
+
+Tests:
+- AC-025: Video processed with 33-joint XYZ coordinate extraction
+- Frame extraction strategies (seek vs sequential decode)
+"""
+import cv2
+import numpy as np
+import pytest
+
+from api.services.video_processor import VideoProcessingError, VideoProcessor
+
+
+@pytest.fixture
+def synthetic_video(tmp_path):
+    """Write a short clip where each frame's intensity encodes its index.
+
+    Intensity steps of 8 per frame stay distinguishable after lossy encoding.
+    """
+    path = tmp_path / "clip.mp4"
+    writer = cv2.VideoWriter(
+        str(path), cv2.VideoWriter_fourcc(*"mp4v"), 30, (64, 48)
+    )
+    for i in range(90):
+        writer.write(np.full((48, 64, 3), (i % 30) * 8, dtype=np.uint8))
+    writer.release()
+    return str(path)
+
+
+class TestFrameExtraction:
+    """Tests for VideoProcessor.extract_frames read strategies."""
+
+    def test_linear_and_seek_return_same_frames(self, synthetic_video):
+        """Sequential decode yields the same indices and images as seeking."""
+        processor = VideoProcessor()
+
+        seek = processor.extract_frames(synthetic_video, num_frames=12, mode="seek")
+        linear = processor.extract_frames(synthetic_video, num_frames=12, mode="linear")
+
+        assert [f["frame_index"] for f in linear] == [f["frame_index"] for f in seek]
+        assert [f["timestamp_seconds"] for f in linear] == [
+            f["timestamp_seconds"] for f in seek
+        ]
+        for a, b in zip(seek, linear):
+            assert abs(float(a["image"].mean()) - float(b["image"].mean())) < 4.0
+
+    def test_linear_frames_match_sampled_index(self, synthetic_video):
+        """Sequential decode retrieves the frame at each wanted index."""
+        processor = VideoProcessor()
+
+        frames = processor.extract_frames(synthetic_video, num_frames=6, mode="linear")
+
+        assert [f["frame_index"] for f in frames] == [0, 15, 30, 45, 60, 75]
+        for frame in frames:
+            expected = (frame["frame_index"] % 30) * 8
+            assert abs(float(frame["image"].mean()) - expected) < 4.0
+
+    def test_auto_mode_extracts_frames(self, synthetic_video):
+        """Auto mode resolves to a concrete strategy and extracts frames."""
+        processor = VideoProcessor()
+
+        frames = processor.extract_frames(synthetic_video, num_frames=12, mode="auto")
+
+        assert len(frames) == 12
+
+    def test_unknown_mode_rejected(self, synthetic_video):
+        """Unknown extraction modes raise VideoProcessingError."""
+        processor = VideoProcessor()
+
+        with pytest.raises(VideoProcessingError):
+            processor.extract_frames(synthetic_video, mode="random")
+
+    def test_select_mode_prefers_linear_for_dense_sampling(self):
+        """Samples closer together than a keyframe interval decode linearly."""
+        processor = VideoProcessor()
+
+        indices = list(range(0, 900, 10))
+        assert processor.select_extraction_mode(indices, keyframe_interval=60) == "linear"
+
+    def test_select_mode_prefers_seek_for_sparse_sampling(self):
+        """A few samples across a long clip are cheaper to seek."""
+        processor = VideoProcessor()
+
+        indices = [i * 450 for i in range(12)]
+        assert processor.select_extraction_mode(indices, keyframe_interval=60) == "seek"
+
+
+class _RecordingPose:
+    """Stand-in for a MediaPipe Pose graph that records what it was given."""
+
+    def __init__(self):
+        self.seen = []
+
+    def process(self, rgb_image):
+        self.seen.append(rgb_image.copy())
+        return type("Result", (), {"pose_landmarks": None})()
+
+
+class TestPoseEngine:
+    """Tests for the process-pool pose estimation engine."""
+
+    def test_worker_reads_frames_from_shared_memory(self, monkeypatch):
+        """Frames written to shared memory arrive intact in the worker."""
+        from api.services import pose_engine as engine_module
+
+        fake_pose = _RecordingPose()
+        monkeypatch.setattr(engine_module, "_worker_pose", fake_pose)
+
+        frames = [np.full((8, 8, 3), i * 10, dtype=np.uint8) for i in range(3)]
+        shm = engine_module.write_shared_batch(frames)
+        try:
+            results = engine_module._estimate_batch_worker(
+                shm.name, (3, 8, 8, 3), frames[0].dtype.str
+            )
+        finally:
+            engine_module.PoseEstimationEngine._release(shm)
+
+        assert results == [None, None, None]
+        assert [int(f.mean()) for f in fake_pose.seen] == [0, 10, 20]
+
+    def test_worker_frame_error_fails_only_that_frame(self, monkeypatch):
+        """A frame MediaPipe raises on is None; the rest of the batch is kept."""
+        from api.services import pose_engine as engine_module
+
+        class FlakyPose(_RecordingPose):
+            def process(self, rgb_image):
+                if int(rgb_image.mean()) == 10:
+                    raise RuntimeError("bad frame")
+                return super().process(rgb_image)
+
+        fake_pose = FlakyPose()
+        monkeypatch.setattr(engine_module, "_worker_pose", fake_pose)
+
+        frames = [np.full((8, 8, 3), i * 10, dtype=np.uint8) for i in range(3)]
+        shm = engine_module.write_shared_batch(frames)
+        try:
+            results = engine_module._estimate_batch_worker(
+                shm.name, (3, 8, 8, 3), frames[0].dtype.str
+            )
+        finally:
+            engine_module.PoseEstimationEngine._release(shm)
+
+        assert results == [None, None, None]
+        assert [int(f.mean()) for f in fake_pose.seen] == [0, 20]
+
+    def test_batch_from_worker_without_graph_runs_in_process(self, monkeypatch):
+        """A worker whose MediaPipe failed to load hands its batch back."""
+        from concurrent.futures import Future
+
+        from api.services import pose_engine as engine_module
+
+        monkeypatch.setattr(engine_module, "_worker_pose", None)
+        frames = [np.zeros((4, 4, 3), np.uint8)] * 3
+        shm = engine_module.write_shared_batch(frames)
+        future = Future()
+        future.set_result(
+            engine_module._estimate_batch_worker(shm.name, (3, 4, 4, 3), frames[0].dtype.str)
+        )
+
+        engine = engine_module.PoseEstimationEngine(workers=1, batch_size=3)
+        results = engine._collect(future, shm, frames)
+
+        assert future.result() is None
+        assert len(results) == 3
+        assert all(r is None or "landmarks" in r for r in results)
+
+    def test_split_batches_respects_size_and_shape(self):
+        """Batches hold at most batch_size frames of a single shape."""
+        from api.services.pose_engine import PoseEstimationEngine
+
+        engine = PoseEstimationEngine(workers=1, batch_size=2)
+        images = [np.zeros((4, 4, 3), np.uint8)] * 3 + [np.zeros((2, 2, 3), np.uint8)]
+
+        batches = engine._split_batches(images)
+
+        assert [len(b) for b in batches] == [2, 1, 1]
+        assert batches[-1][0].shape == (2, 2, 3)
+
+    def test_falls_back_in_process_without_mediapipe(self):
+        """Without worker MediaPipe the engine still returns one result per frame."""
+        from api.services.pose_engine import PoseEstimationEngine
+
+        engine = PoseEstimationEngine(workers=1, batch_size=2)
+        engine._pool_available = False
+
+        results = engine.estimate_batch([np.zeros((4, 4, 3), np.uint8)] * 3)
+
+        assert len(results) == 3
+        assert all(r is None or "landmarks" in r for r in results)
+
+
+class _FakeLandmark:
+    def __init__(self, visibility):
+        self.x, self.y, self.z, self.visibility = 0.5, 0.5, 0.0, visibility
+
+
+class _FakeTrackingGraph:
+    """Stand-in for a video-mode Pose graph returning fixed visibility."""
+
+    def __init__(self, visibility):
+        self.visibility = visibility
+        self.closed = False
+
+    def process(self, rgb_image):
+        landmarks = type("Landmarks", (), {})()
+        landmarks.landmark = [_FakeLandmark(self.visibility) for _ in range(33)]
+        return type("Result", (), {"pose_landmarks": landmarks})()
+
+    def close(self):
+        self.closed = True
+
+
+class TestPoseTracker:
+    """Tests for the MediaPipe tracking (video) mode."""
+
+    def test_confident_tracking_keeps_graph(self, monkeypatch):
+        """A confidently tracked stream keeps one graph for all frames."""
+        from api.services.pose_tracker import PoseTracker
+
+        graphs = []
+
+        def create_graph(self):
+            graphs.append(_FakeTrackingGraph(0.9))
+            return graphs[-1]
+
+        monkeypatch.setattr(PoseTracker, "_create_graph", create_graph)
+        tracker = PoseTracker(redetect_confidence=0.5)
+
+        for _ in range(5):
+            assert tracker.process(np.zeros((8, 8, 3), np.uint8)) is not None
+
+        assert len(graphs) == 1
+        assert tracker.redetections == 0
+        assert tracker.stats()["frames_tracked"] == 5
+
+    def test_low_confidence_redetects_without_rebuilding_graphs(self, monkeypatch):
+        """Low confidence runs the long-lived detector; each graph is created once per video."""
+        from api.services.pose_tracker import PoseTracker
+
+        graphs = []
+        detectors = []
+
+        def create_graph(self):
+            graphs.append(_FakeTrackingGraph(0.3))
+            return graphs[-1]
+
+        def create_detector(self):
+            detectors.append(_FakeTrackingGraph(0.8))
+            return detectors[-1]
+
+        monkeypatch.setattr(PoseTracker, "_create_graph", create_graph)
+        monkeypatch.setattr(PoseTracker, "_create_detector", create_detector)
+        tracker = PoseTracker(redetect_confidence=0.5)
+
+        for _ in range(3):
+            landmarks = tracker.process(np.zeros((8, 8, 3), np.uint8))
+            # The fresh detection is more confident than the drifting track
+            assert PoseTracker.tracking_confidence(landmarks) == pytest.approx(0.8)
+
+        assert tracker.redetections == 3
+        assert len(graphs) == 1
+        assert len(detectors) == 1
+        assert not graphs[0].closed and not detectors[0].closed
+
+        tracker.close()
+        assert graphs[0].closed and detectors[0].closed
+
+
+class TestPoseModes:
+    """Tests for sparse vs tracking pose modes in analyze_video_file."""
+
+    def test_sparse_mode_samples_twelve_frames(self, synthetic_video):
+        """Sparse mode keeps the original 12-frame sampling."""
+        processor = VideoProcessor()
+
+        result = processor.analyze_video_file(synthetic_video, "vid", pose_mode="sparse")
+
+        assert result["pose_mode"] == "sparse"
+        assert result["total_frames_analyzed"] == 12
+
+    def test_tracking_mode_walks_every_frame(self, synthetic_video):
+        """Tracking mode analyzes consecutive frames with few thumbnails."""
+        processor = VideoProcessor()
+
+        result = processor.analyze_video_file(synthetic_video, "vid", pose_mode="tracking")
+
+        frames = result["frame_results"]
+        assert result["pose_mode"] == "tracking"
+        assert [f["frame_index"] for f in frames] == list(range(90))
+        assert sum("thumbnail_base64" in f for f in frames) <= 12
+
+    def test_tracking_mode_creates_one_graph_per_video(self, synthetic_video, monkeypatch):
+        """A poorly tracked video still loads the tracking and detection graphs once."""
+        from api.services.pose_tracker import PoseTracker
+
+        created = {"graph": 0, "detector": 0}
+
+        def create_graph(self):
+            created["graph"] += 1
+            return _FakeTrackingGraph(0.3)
+
+        def create_detector(self):
+            created["detector"] += 1
+            return _FakeTrackingGraph(0.3)
+
+        monkeypatch.setattr(PoseTracker, "_create_graph", create_graph)
+        monkeypatch.setattr(PoseTracker, "_create_detector", create_detector)
+
+        result = VideoProcessor().analyze_video_file(synthetic_video, "vid", pose_mode="tracking")
+
+        assert result["total_frames_analyzed"] == 90
+        assert created == {"graph": 1, "detector": 1}
+
+    def test_unknown_pose_mode_rejected(self, synthetic_video):
+        """Unknown pose modes raise VideoProcessingError."""
+        processor = VideoProcessor()
+
+        with pytest.raises(VideoProcessingError):
+            processor.analyze_video_file(synthetic_video, "vid", pose_mode="full")
+
+    def test_frame_stride_for_target_fps(self):
+        """Target fps maps to a frame stride; 0 keeps every frame."""
+        assert VideoProcessor._frame_stride(30.0, 0) == 1
+        assert VideoProcessor._frame_stride(30.0, 15.0) == 2
+        assert VideoProcessor._frame_stride(60.0, 10.0) == 6
+        assert VideoProcessor._frame_stride(30.0, 60.0) == 1
+
+
+class TestDensePoseExtraction:
+    """Tests for the dense PoseData extraction pipeline (AC-025, AC-027)."""
+
+    def test_every_frame_emitted_as_pose_frame(self, synthetic_video, monkeypatch):
+        """Each frame yields a PoseFrame with 33 named joints and a bbox."""
+        from api.schemas.analysis import PoseData
+        from api.services.pose_extraction_service import PoseExtractionService
+        from api.services.pose_tracker import PoseTracker
+
+        monkeypatch.setattr(PoseTracker, "_create_graph", lambda self: _FakeTrackingGraph(0.9))
+        service = PoseExtractionService(queue_size=4)
+
+        result = service.extract_pose_data(
+            synthetic_video,
+            "00000000-0000-0000-0000-000000000001",
+            "00000000-0000-0000-0000-000000000002",
+            target_fps=0,
+        )
+
+        pose_data = PoseData.model_validate(result)
+        assert pose_data.total_frames == 90
+        assert pose_data.successful_frames == 90
+        assert [f.frame_number for f in pose_data.frames] == list(range(90))
+        frame = pose_data.frames[0]
+        assert len(frame.joints) == 33
+        assert frame.joints[15].name == "left_wrist"
+        assert frame.confidence == pytest.approx(0.9)
+        assert pose_data.tracking["frames_tracked"] == 90
+
+    def test_streaming_detector_fed_during_extraction(self, synthetic_video, monkeypatch):
+        """A streaming detector sees every pose frame and is finished."""
+        from api.services.pose_extraction_service import PoseExtractionService
+        from api.services.pose_tracker import PoseTracker
+        from api.services.streaming_stamp_detector import StreamingStampDetector
+
+        monkeypatch.setattr(PoseTracker, "_create_graph", lambda self: _FakeTrackingGraph(0.9))
+        detector = StreamingStampDetector()
+
+        result = PoseExtractionService().extract_pose_data(
+            synthetic_video, "a", "s", target_fps=10, detector=detector
+        )
+
+        assert len(detector) == len(result["frames"]) == 30
+        assert detector.fps == pytest.approx(10.0)
+        assert detector.finish() == []  # already finished by the service
+
+    def test_target_fps_strides_frames(self, synthetic_video, monkeypatch):
+        """A target fps below the native rate samples every Nth frame."""
+        from api.services.pose_extraction_service import PoseExtractionService
+        from api.services.pose_tracker import PoseTracker
+
+        monkeypatch.setattr(PoseTracker, "_create_graph", lambda self: _FakeTrackingGraph(0.9))
+
+        result = PoseExtractionService().extract_pose_data(synthetic_video, "a", "s", target_fps=10)
+
+        assert [f["frame_number"] for f in result["frames"]] == list(range(0, 90, 3))
+        assert result["fps"] == pytest.approx(10.0)
+
+    def test_frames_without_pose_counted_as_failed(self, synthetic_video, monkeypatch):
+        """Frames where tracking finds no pose are counted, not emitted."""
+        from api.services.pose_extraction_service import PoseExtractionService
+        from api.services.pose_tracker import PoseTracker
+
+        monkeypatch.setattr(PoseTracker, "_create_graph", lambda self: None)
+
+        result = PoseExtractionService().extract_pose_data(synthetic_video, "a", "s")
+
+        assert result["frames"] == []
+        assert result["failed_frames"] == 90
+
+    def test_bounding_box_in_pixels(self):
+        """Bounding box spans visible joints in pixel coordinates."""
+        from api.services.pose_extraction_service import PoseExtractionService
+
+        joints = [
+            {"x": 0.25, "y": 0.1, "visibility": 0.9},
+            {"x": 0.75, "y": 0.9, "visibility": 0.9},
+            {"x": 0.0, "y": 0.0, "visibility": 0.1},
+        ]
+
+        bbox = PoseExtractionService._bounding_box(joints, 640, 480)
+
+        assert bbox == {"x": 160, "y": 48, "width": 320, "height": 384}
+
+    def test_serializer_error_does_not_hang(self, synthetic_video, monkeypatch):
+        """A failing stage aborts the pipeline instead of deadlocking."""
+        from api.services.pose_extraction_service import (
+            PoseExtractionError,
+            PoseExtractionService,
+        )
+        from api.services.pose_tracker import PoseTracker
+
+        monkeypatch.setattr(PoseTracker, "_create_graph", lambda self: _FakeTrackingGraph(0.9))
+        service = PoseExtractionService(queue_size=2)
+        monkeypatch.setattr(service, "build_pose_frame", lambda *a: 1 / 0)
+
+        with pytest.raises(PoseExtractionError):
+            service.extract_pose_data(synthetic_video, "a", "s")
+
+
+class _SpreadTrackingGraph:
+    """Graph returning landmarks spread over the middle half of its input.
+
+    Records each input shape; returns no pose for inputs in ``blind_shapes``.
+    """
+
+    def __init__(self, shapes, blind_shapes=()):
+        self.shapes = shapes
+        self.blind_shapes = blind_shapes
+
+    def process(self, rgb_image):
+        self.shapes.append(rgb_image.shape[:2])
+        if rgb_image.shape[:2] in self.blind_shapes:
+            return type("Result", (), {"pose_landmarks": None})()
+        landmarks = type("Landmarks", (), {})()
+        landmarks.landmark = [_FakeLandmark(0.9) for _ in range(33)]
+        for i, lm in enumerate(landmarks.landmark):
+            lm.x = lm.y = 0.25 if i % 2 else 0.75
+        return type("Result", (), {"pose_landmarks": landmarks})()
+
+    def close(self):
+        pass
+
+
+class TestSubjectROI:
+    """Tests for subject ROI cropping ahead of pose inference (AC-026)."""
+
+    def test_crop_landmarks_mapped_to_full_frame(self):
+        """Crop-normalized landmarks map back into full-frame space."""
+        from api.services.pose_tracker import SubjectROI
+
+        mapped = SubjectROI.to_full_frame(
+            [_FakeLandmark(0.8)], (100, 50, 300, 250), 400, 500
+        )
+
+        assert mapped[0].x == pytest.approx((100 + 0.5 * 200) / 400)
+        assert mapped[0].y == pytest.approx((50 + 0.5 * 200) / 500)
+        assert mapped[0].visibility == 0.8
+
+    def test_initial_bbox_seeds_padded_region(self):
+        """The selection bbox, padded and clipped, is the first crop."""
+        from api.services.pose_tracker import SubjectROI
+
+        roi = SubjectROI({"x": 16, "y": 12, "width": 32, "height": 24}, padding=0.25)
+
+        assert roi.region(64, 48) == (8, 6, 56, 42)
+        assert not roi.is_full_frame
+
+    def test_region_moves_only_when_subject_nears_edge(self):
+        """Small motion inside the crop keeps it; reaching the edge re-centres."""
+        from api.services.pose_tracker import Landmark, SubjectROI
+
+        roi = SubjectROI({"x": 100, "y": 100, "width": 100, "height": 200}, padding=0.25)
+        region = roi.region(1000, 1000)
+
+        def body(x0, y0, x1, y1):
+            return [Landmark(x0 / 1000, y0 / 1000, 0, 1.0), Landmark(x1 / 1000, y1 / 1000, 0, 1.0)]
+
+        assert roi.update(body(105, 110, 205, 300), 1000, 1000) is False
+        assert roi.region(1000, 1000) == region
+        assert roi.update(body(160, 110, 260, 300), 1000, 1000) is True
+        assert roi.region(1000, 1000) != region
+
+    def test_pipeline_runs_inference_on_subject_crop(self, synthetic_video, monkeypatch):
+        """With a subject bbox, frames are cropped and output stays full-frame."""
+        from api.services.pose_extraction_service import PoseExtractionService
+        from api.services.pose_tracker import PoseTracker
+
+        shapes = []
+        monkeypatch.setattr(PoseTracker, "_create_graph", lambda self: _SpreadTrackingGraph(shapes))
+
+        result = PoseExtractionService().extract_pose_data(
+            synthetic_video, "a", "s",
+            initial_bbox={"x": 16, "y": 12, "width": 32, "height": 24},
+        )
+
+        assert set(shapes) == {(36, 48)}
+        joint = result["frames"][0]["joints"][0]
+        assert joint["x"] == pytest.approx((8 + 0.75 * 48) / 64, abs=1e-4)
+        assert joint["y"] == pytest.approx((6 + 0.75 * 36) / 48, abs=1e-4)
+
+    def test_lost_subject_falls_back_to_full_frame(self, synthetic_video, monkeypatch):
+        """If the crop finds no pose, the same frame is retried uncropped."""
+        from api.services.pose_extraction_service import PoseExtractionService
+        from api.services.pose_tracker import PoseTracker
+
+        shapes = []
+        monkeypatch.setattr(
+            PoseTracker,
+            "_create_graph",
+            lambda self: _SpreadTrackingGraph(shapes, blind_shapes=((36, 48),)),
+        )
+
+        result = PoseExtractionService().extract_pose_data(
+            synthetic_video, "a", "s",
+            initial_bbox={"x": 16, "y": 12, "width": 32, "height": 24},
+        )
+
+        assert shapes[:2] == [(36, 48), (48, 64)]
+        assert result["successful_frames"] == 90
+
+
+    def test_moving_subject_reuses_one_graph_per_view(self, synthetic_video, monkeypatch):
+        """Crop moves and full-frame fallbacks never construct another graph."""
+        from api.services.pose_extraction_service import PoseExtractionService
+        from api.services.pose_tracker import PoseTracker, SubjectROI
+
+        shapes = []
+        graphs = []
+
+        def create_graph(self):
+            graphs.append(_SpreadTrackingGraph(shapes, blind_shapes=((35, 48),)))
+            return graphs[-1]
+
+        def moving_update(self, landmarks, width, height):
+            # The boxer keeps moving: shift the crop by a pixel every frame;
+            # once, shrink it to a shape the graph finds no pose in
+            x0, y0, x1, y1 = self.region(width, height)
+            moves.append(1)
+            shift = 1 if len(moves) % 2 else -1
+            clip = 1 if len(moves) == 10 else 0
+            self._region = (x0 + shift, y0, x1 + shift, y1 - clip)
+            return True
+
+        moves = []
+        monkeypatch.setattr(PoseTracker, "_create_graph", create_graph)
+        monkeypatch.setattr(SubjectROI, "update", moving_update)
+
+        result = PoseExtractionService().extract_pose_data(
+            synthetic_video, "a", "s",
+            initial_bbox={"x": 16, "y": 12, "width": 32, "height": 24},
+        )
+
+        assert result["successful_frames"] == 90
+        assert len(moves) == 90
+        # The fallbacks ran on the full frame
+        assert (48, 64) in shapes
+        # One graph for the crop, one for the full frame, for the whole video
+        assert len(graphs) == 2
+
+
+class TestFramePreprocessor:
+    """Tests for the downscaling stage ahead of pose estimation."""
+
+    def test_downscales_to_max_side_and_converts_to_rgb(self):
+        """Longest side is capped, aspect kept, and channels become RGB."""
+        from api.services.frame_preprocessor import FramePreprocessor
+
+        image = np.zeros((2160, 3840, 3), dtype=np.uint8)
+        image[..., 0] = 255  # blue in BGR
+
+        rgb = FramePreprocessor(max_side=640).prepare(image)
+
+        assert rgb.shape == (360, 640, 3)
+        assert rgb[0, 0].tolist() == [0, 0, 255]
+
+    def test_small_frames_not_upscaled(self):
+        """Frames already within max_side keep their size."""
+        from api.services.frame_preprocessor import FramePreprocessor
+
+        rgb = FramePreprocessor(max_side=640).prepare(np.zeros((48, 64, 3), np.uint8))
+
+        assert rgb.shape == (48, 64, 3)
+
+    def test_output_buffers_reused_in_ring(self):
+        """Output buffers cycle through the pool instead of reallocating."""
+        from api.services.frame_preprocessor import FramePreprocessor
+
+        preprocessor = FramePreprocessor(max_side=32, pool_size=2)
+        frames = [np.full((480, 640, 3), i, np.uint8) for i in range(3)]
+
+        outputs = [preprocessor.prepare(f) for f in frames]
+
+        assert outputs[2] is outputs[0]
+        assert outputs[1] is not outputs[0]
+        assert int(outputs[1].mean()) == 1
+
+    def test_dense_pipeline_runs_on_downscaled_frames(self, synthetic_video, monkeypatch):
+        """ROI and inference use the downscaled frame; output stays full-frame."""
+        from api.config import get_settings
+        from api.services.pose_extraction_service import PoseExtractionService
+        from api.services.pose_tracker import PoseTracker
+
+        monkeypatch.setattr(get_settings(), "pose_input_max_side", 32)
+        shapes = []
+        monkeypatch.setattr(PoseTracker, "_create_graph", lambda self: _SpreadTrackingGraph(shapes))
+
+        result = PoseExtractionService().extract_pose_data(
+            synthetic_video, "a", "s",
+            initial_bbox={"x": 16, "y": 12, "width": 32, "height": 24},
+        )
+
+        assert set(shapes) == {(18, 24)}
+        frame = result["frames"][0]
+        assert frame["joints"][0]["x"] == pytest.approx((8 + 0.75 * 48) / 64, abs=1e-4)
+        assert frame["bounding_box"]["x"] == 20